@@ -0,0 +1,228 @@
+// 牌画像のスプライトシート（アトラス）の生成CLI
+// public/tiles/ の牌画像（縦向き・横向き）を1枚ずつのシートにまとめ、座標をマニフェストに書き出す
+// 実行例: npx vite-node scripts/build-tile-atlas.ts -- --columns 10
+import { readdirSync, readFileSync, writeFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { crc32, deflateSync, inflateSync } from 'node:zlib'
+import type { TileAtlasManifest, TileAtlasSheetName } from '../src/utils/tile-renderer'
+
+const TILES_DIR = fileURLToPath(new URL('../public/tiles/', import.meta.url))
+const MANIFEST_PATH = fileURLToPath(new URL('../src/utils/tile-atlas.json', import.meta.url))
+const SHEET_FILES: Record<TileAtlasSheetName, string> = {
+  upright: 'atlas.png',
+  yoko: 'atlas-yoko.png'
+}
+const PNG_SIGNATURE = Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a])
+const BYTES_PER_PIXEL = 4 // 8bit RGBA のみ扱う
+
+interface Image {
+  width: number
+  height: number
+  pixels: Buffer
+}
+
+/**
+ * 8bit RGBA・インターレースなしのPNGを読み込む
+ */
+function decodePng(file: string): Image {
+  const data = readFileSync(file)
+  if (!data.subarray(0, 8).equals(PNG_SIGNATURE)) {
+    throw new Error(`${file} はPNGではありません`)
+  }
+
+  let width = 0
+  let height = 0
+  const idat: Buffer[] = []
+  for (let offset = 8; offset < data.length;) {
+    const length = data.readUInt32BE(offset)
+    const type = data.toString('ascii', offset + 4, offset + 8)
+    const body = data.subarray(offset + 8, offset + 8 + length)
+    if (type === 'IHDR') {
+      width = body.readUInt32BE(0)
+      height = body.readUInt32BE(4)
+      const bitDepth = body[8]
+      const colorType = body[9]
+      const interlace = body[12]
+      if (bitDepth !== 8 || colorType !== 6 || interlace !== 0) {
+        throw new Error(`${file} は8bit RGBA・インターレースなしのPNGではありません`)
+      }
+    } else if (type === 'IDAT') {
+      idat.push(body)
+    } else if (type === 'IEND') {
+      break
+    }
+    offset += 12 + length
+  }
+
+  const raw = inflateSync(Buffer.concat(idat))
+  const stride = width * BYTES_PER_PIXEL
+  const pixels = Buffer.alloc(stride * height)
+  for (let y = 0; y < height; y++) {
+    const filter = raw[y * (stride + 1)]
+    const source = y * (stride + 1) + 1
+    const row = y * stride
+    for (let x = 0; x < stride; x++) {
+      const left = x >= BYTES_PER_PIXEL ? pixels[row + x - BYTES_PER_PIXEL] : 0
+      const up = y > 0 ? pixels[row - stride + x] : 0
+      const upLeft = x >= BYTES_PER_PIXEL && y > 0 ? pixels[row - stride + x - BYTES_PER_PIXEL] : 0
+      let predictor = 0
+      switch (filter) {
+        case 0: predictor = 0; break
+        case 1: predictor = left; break
+        case 2: predictor = up; break
+        case 3: predictor = (left + up) >>> 1; break
+        case 4: predictor = paeth(left, up, upLeft); break
+        default: throw new Error(`${file} のフィルタ ${filter} は未対応です`)
+      }
+      pixels[row + x] = (raw[source + x] + predictor) & 0xff
+    }
+  }
+  return { width, height, pixels }
+}
+
+function paeth(left: number, up: number, upLeft: number): number {
+  const p = left + up - upLeft
+  const pLeft = Math.abs(p - left)
+  const pUp = Math.abs(p - up)
+  const pUpLeft = Math.abs(p - upLeft)
+  if (pLeft <= pUp && pLeft <= pUpLeft) return left
+  if (pUp <= pUpLeft) return up
+  return upLeft
+}
+
+/**
+ * 8bit RGBA のPNGを書き出す（各行に Sub フィルタをかける）
+ */
+function encodePng(image: Image): Buffer {
+  const stride = image.width * BYTES_PER_PIXEL
+  const raw = Buffer.alloc((stride + 1) * image.height)
+  for (let y = 0; y < image.height; y++) {
+    const row = y * stride
+    const target = y * (stride + 1)
+    raw[target] = 1
+    for (let x = 0; x < stride; x++) {
+      const left = x >= BYTES_PER_PIXEL ? image.pixels[row + x - BYTES_PER_PIXEL] : 0
+      raw[target + 1 + x] = (image.pixels[row + x] - left) & 0xff
+    }
+  }
+
+  const header = Buffer.alloc(13)
+  header.writeUInt32BE(image.width, 0)
+  header.writeUInt32BE(image.height, 4)
+  header[8] = 8 // bit depth
+  header[9] = 6 // RGBA
+  return Buffer.concat([
+    PNG_SIGNATURE,
+    pngChunk('IHDR', header),
+    pngChunk('IDAT', deflateSync(raw, { level: 9 })),
+    pngChunk('IEND', Buffer.alloc(0))
+  ])
+}
+
+function pngChunk(type: string, body: Buffer): Buffer {
+  const chunk = Buffer.alloc(12 + body.length)
+  chunk.writeUInt32BE(body.length, 0)
+  chunk.write(type, 4, 'ascii')
+  body.copy(chunk, 8)
+  chunk.writeUInt32BE(crc32(chunk.subarray(4, 8 + body.length)), 8 + body.length)
+  return chunk
+}
+
+/**
+ * 同じ大きさの画像を columns 列の格子に並べる
+ */
+function packSheet(names: string[], images: Map<string, Image>, columns: number) {
+  const { width, height } = images.get(names[0])!
+  const rows = Math.ceil(names.length / columns)
+  const sheet: Image = {
+    width: width * Math.min(columns, names.length),
+    height: height * rows,
+    pixels: Buffer.alloc(0)
+  }
+  sheet.pixels = Buffer.alloc(sheet.width * sheet.height * BYTES_PER_PIXEL)
+
+  const frames: Record<string, { x: number, y: number }> = {}
+  names.forEach((name, index) => {
+    const image = images.get(name)!
+    if (image.width !== width || image.height !== height) {
+      throw new Error(`${name}.png の大きさ（${image.width}x${image.height}）が他の牌（${width}x${height}）と異なります`)
+    }
+    const x = (index % columns) * width
+    const y = Math.floor(index / columns) * height
+    for (let row = 0; row < height; row++) {
+      image.pixels.copy(
+        sheet.pixels,
+        ((y + row) * sheet.width + x) * BYTES_PER_PIXEL,
+        row * width * BYTES_PER_PIXEL,
+        (row + 1) * width * BYTES_PER_PIXEL
+      )
+    }
+    frames[name] = { x, y }
+  })
+  return { sheet, frames, tileWidth: width, tileHeight: height }
+}
+
+function parseArgs(argv: string[]): { columns: number } {
+  let columns = 10
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i]
+    switch (arg) {
+      case '--columns': {
+        const value = argv[++i]
+        if (value === undefined) {
+          throw new Error(`${arg} に値が指定されていません`)
+        }
+        columns = parseInt(value, 10)
+        break
+      }
+      case '--':
+        break
+      default:
+        throw new Error(`不明な引数です: ${arg}`)
+    }
+  }
+  if (!Number.isInteger(columns) || columns <= 0) {
+    throw new Error('--columns は1以上の整数を指定してください')
+  }
+  return { columns }
+}
+
+function main(): void {
+  const { columns } = parseArgs(process.argv.slice(2))
+  const atlasFiles = new Set(Object.values(SHEET_FILES))
+  const files = readdirSync(TILES_DIR)
+    .filter(file => file.endsWith('.png') && !atlasFiles.has(file))
+    .sort()
+
+  const images = new Map<string, Image>()
+  for (const file of files) {
+    images.set(file.slice(0, -'.png'.length), decodePng(`${TILES_DIR}${file}`))
+  }
+
+  const names: Record<TileAtlasSheetName, string[]> = {
+    upright: [...images.keys()].filter(name => !name.endsWith('-yoko')),
+    yoko: [...images.keys()].filter(name => name.endsWith('-yoko'))
+  }
+
+  const manifest: TileAtlasManifest = { sheets: {}, frames: {} } as TileAtlasManifest
+  for (const sheetName of Object.keys(SHEET_FILES) as TileAtlasSheetName[]) {
+    const { sheet, frames, tileWidth, tileHeight } = packSheet(names[sheetName], images, columns)
+    writeFileSync(`${TILES_DIR}${SHEET_FILES[sheetName]}`, encodePng(sheet))
+    manifest.sheets[sheetName] = {
+      image: `tiles/${SHEET_FILES[sheetName]}`,
+      width: sheet.width,
+      height: sheet.height,
+      tileWidth,
+      tileHeight
+    }
+    for (const [name, frame] of Object.entries(frames)) {
+      manifest.frames[name] = { sheet: sheetName, ...frame }
+    }
+    console.log(`${SHEET_FILES[sheetName]}: ${names[sheetName].length}枚 ${sheet.width}x${sheet.height}`)
+  }
+
+  writeFileSync(MANIFEST_PATH, `${JSON.stringify(manifest, null, 2)}\n`)
+  console.log(`マニフェスト: ${MANIFEST_PATH}`)
+}
+
+main()
@@ -0,0 +1,80 @@
+// 牌操作率・配牌の良さの統計的な検証のCLI
+// 実行例: npx vite-node scripts/manipulation-benchmark.ts -- --trials 500 --rates 0,40,80 --qualities normal,excellent --json
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../src/utils/mahjong-calculator-wrapper'
+import { runManipulationBenchmark, type ManipulationBenchmarkOptions } from '../src/utils/manipulation-benchmark'
+
+const WASM_PATH = fileURLToPath(new URL('../src/mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+function parseArgs(argv: string[]): { options: ManipulationBenchmarkOptions, json: boolean } {
+  const options: ManipulationBenchmarkOptions = { trials: 200 }
+  let json = false
+
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i]
+    const next = () => {
+      const value = argv[++i]
+      if (value === undefined) {
+        throw new Error(`${arg} に値が指定されていません`)
+      }
+      return value
+    }
+
+    switch (arg) {
+      case '--trials':
+        options.trials = parseInt(next(), 10)
+        break
+      case '--rates':
+        options.manipulationRates = next().split(',').map(rate => parseInt(rate, 10))
+        break
+      case '--qualities':
+        options.handQualities = next().split(',')
+        break
+      case '--max-draws':
+        options.maxDraws = parseInt(next(), 10)
+        break
+      case '--seed':
+        options.seed = next()
+        break
+      case '--json':
+        json = true
+        break
+      case '--':
+        break
+      default:
+        throw new Error(`不明な引数です: ${arg}`)
+    }
+  }
+
+  if (!Number.isFinite(options.trials) || options.trials <= 0) {
+    throw new Error(`--trials には1以上の数値を指定してください: ${options.trials}`)
+  }
+
+  return { options, json }
+}
+
+const { options, json } = parseArgs(process.argv.slice(2))
+
+initMahjongCalculatorSync(readFileSync(WASM_PATH))
+
+const result = runManipulationBenchmark(options)
+
+if (json) {
+  console.log(JSON.stringify({ options, result }))
+} else {
+  console.log('配牌        操作率  有効牌率(期待値)  配牌シャンテン  テンパイ率  テンパイまで  ツモ(μs)  配牌(μs)')
+  for (const row of result.rows) {
+    console.log([
+      row.handQuality.padEnd(10),
+      `${row.manipulationRate}%`.padStart(6),
+      `${(row.usefulDrawRatio * 100).toFixed(1)}% (${(row.naturalUsefulRatio * 100).toFixed(1)}%)`.padStart(17),
+      row.averageStartShanten.toFixed(2).padStart(14),
+      `${(row.tenpaiRate * 100).toFixed(1)}%`.padStart(10),
+      row.averageDrawsToTenpai.toFixed(2).padStart(12),
+      row.drawMicros.toFixed(1).padStart(9),
+      row.dealMicros.toFixed(1).padStart(9)
+    ].join('  '))
+  }
+  console.log(`経過時間: ${(result.elapsedMs / 1000).toFixed(2)}s`)
+}
@@ -0,0 +1,94 @@
+// 行動ログの再生CLI（scripts/simulate.ts --save-log で保存したログを GameManager で再実行する）
+// 実行例: npx vite-node scripts/replay.ts -- logs/game-0.json --repeat 100 --json
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../src/utils/mahjong-calculator-wrapper'
+import { replayGameLog, type GameLog } from '../src/utils/game-log'
+
+const WASM_PATH = fileURLToPath(new URL('../src/mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+function parseArgs(argv: string[]): { files: string[], repeat: number, json: boolean } {
+  const files: string[] = []
+  let repeat = 1
+  let json = false
+
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i]
+    switch (arg) {
+      case '--repeat': {
+        const value = argv[++i]
+        if (value === undefined) {
+          throw new Error(`${arg} に値が指定されていません`)
+        }
+        repeat = parseInt(value, 10)
+        break
+      }
+      case '--json':
+        json = true
+        break
+      case '--':
+        break
+      default:
+        if (arg.startsWith('--')) {
+          throw new Error(`不明な引数です: ${arg}`)
+        }
+        files.push(arg)
+    }
+  }
+
+  if (files.length === 0) {
+    throw new Error('再生する行動ログのファイルを指定してください')
+  }
+  if (!Number.isFinite(repeat) || repeat <= 0) {
+    throw new Error(`--repeat には1以上の数値を指定してください: ${repeat}`)
+  }
+
+  return { files, repeat, json }
+}
+
+const { files, repeat, json } = parseArgs(process.argv.slice(2))
+
+initMahjongCalculatorSync(readFileSync(WASM_PATH))
+
+const logs = files.map(file => JSON.parse(readFileSync(file, 'utf-8')) as GameLog)
+
+let replays = 0
+let rounds = 0
+let actions = 0
+const scores: number[][] = []
+const start = performance.now()
+
+for (let i = 0; i < repeat; i++) {
+  for (const log of logs) {
+    const result = replayGameLog(log)
+    replays++
+    rounds += result.rounds
+    actions += log.entries.length
+    if (i === 0) {
+      scores.push(result.scores)
+    }
+  }
+}
+
+const elapsedMs = performance.now() - start
+const stats = {
+  replays,
+  rounds,
+  actions,
+  elapsedMs,
+  replaysPerSec: replays / (elapsedMs / 1000),
+  actionsPerSec: actions / (elapsedMs / 1000),
+  scores
+}
+
+if (json) {
+  console.log(JSON.stringify(stats))
+} else {
+  files.forEach((file, index) => {
+    console.log(`${file}: ${scores[index].join(' / ')}`)
+  })
+  console.log(`再生回数:     ${replays} (${rounds}局, ${actions}行動)`)
+  console.log(`経過時間:     ${(elapsedMs / 1000).toFixed(2)}s`)
+  console.log(`replays/sec:  ${stats.replaysPerSec.toFixed(2)}`)
+  console.log(`actions/sec:  ${stats.actionsPerSec.toFixed(1)}`)
+}
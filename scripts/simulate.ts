@@ -0,0 +1,99 @@
+// ヘッドレス対局シミュレーションのCLI
+// 実行例: npx vite-node scripts/simulate.ts -- --games 20 --cpu normal,hard,super --seed 42 --json
+//         npx vite-node scripts/simulate.ts -- --games 5 --seed 42 --save-log logs  (対局ごとの行動ログを保存)
+import { mkdirSync, readFileSync, writeFileSync } from 'node:fs'
+import { join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../src/utils/mahjong-calculator-wrapper'
+import { runHeadlessSimulation, type HeadlessSimulationOptions, type SimulatorDifficulty } from '../src/utils/headless-simulator'
+
+const WASM_PATH = fileURLToPath(new URL('../src/mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+function parseArgs(argv: string[]): { options: HeadlessSimulationOptions, json: boolean, logDir?: string } {
+  const options: HeadlessSimulationOptions = { games: 10 }
+  let json = false
+  let logDir: string | undefined
+
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i]
+    const next = () => {
+      const value = argv[++i]
+      if (value === undefined) {
+        throw new Error(`${arg} に値が指定されていません`)
+      }
+      return value
+    }
+
+    switch (arg) {
+      case '--games':
+        options.games = parseInt(next(), 10)
+        break
+      case '--game-type':
+        options.gameType = next() as HeadlessSimulationOptions['gameType']
+        break
+      case '--cpu':
+        options.cpuStrengths = next().split(',')
+        break
+      case '--player':
+        options.playerDifficulty = next() as SimulatorDifficulty
+        break
+      case '--manipulation-rate':
+        options.manipulationRate = parseInt(next(), 10)
+        break
+      case '--hand-quality':
+        options.handQuality = next()
+        break
+      case '--seed':
+        options.seed = next()
+        break
+      case '--game-offset':
+        options.gameOffset = parseInt(next(), 10)
+        break
+      case '--agari-renchan':
+        options.agariRenchan = true
+        break
+      case '--json':
+        json = true
+        break
+      case '--save-log':
+        logDir = next()
+        break
+      case '--':
+        break
+      default:
+        throw new Error(`不明な引数です: ${arg}`)
+    }
+  }
+
+  if (!Number.isFinite(options.games) || options.games <= 0) {
+    throw new Error(`--games には1以上の数値を指定してください: ${options.games}`)
+  }
+
+  return { options, json, logDir }
+}
+
+const { options, json, logDir } = parseArgs(process.argv.slice(2))
+
+initMahjongCalculatorSync(readFileSync(WASM_PATH))
+
+if (logDir) {
+  mkdirSync(logDir, { recursive: true })
+  // 行動ログは scripts/replay.ts で再生できる
+  options.onGameEnd = (outcome, gameIndex) => {
+    writeFileSync(join(logDir, `game-${gameIndex}.json`), JSON.stringify(outcome.log))
+  }
+}
+
+const stats = runHeadlessSimulation(options)
+
+if (json) {
+  console.log(JSON.stringify({ options, stats }))
+} else {
+  console.log(`対局数:       ${stats.games} (${stats.rounds}局, 打牌判断${stats.decisions}回)`)
+  console.log(`和了:         ツモ${stats.tsumoWins} / ロン${stats.ronWins} / 流局${stats.draws}`)
+  console.log(`席別和了数:   ${stats.winsBySeat.join(' / ')}`)
+  console.log(`経過時間:     ${(stats.elapsedMs / 1000).toFixed(2)}s`)
+  console.log(`games/sec:    ${stats.gamesPerSec.toFixed(2)}`)
+  console.log(`rounds/sec:   ${stats.roundsPerSec.toFixed(2)}`)
+  console.log(`decisions/sec: ${stats.decisionsPerSec.toFixed(1)}`)
+}
@@ -22,19 +22,26 @@ describe('MahjongTile', () => {
       const wrapper = mount(MahjongTile, {
         props: { tile: mockTile }
       })
-      // 画像のalt属性でテキストを確認
-      const img = wrapper.find('img')
-      expect(img.exists()).toBe(true)
-      expect(img.attributes('alt')).toBe('5萬')
+      // 牌画像のaria-labelでテキストを確認
+      const image = wrapper.find('.tile-image')
+      expect(image.exists()).toBe(true)
+      expect(image.attributes('aria-label')).toBe('5萬')
     })
 
-    it('画像が正しいsrc属性を持つ', () => {
+    it('スプライトシートの牌の位置を背景に指定する', () => {
       const wrapper = mount(MahjongTile, {
         props: { tile: mockTile }
       })
-      const img = wrapper.find('img')
-      expect(img.exists()).toBe(true)
-      expect(img.attributes('src')).toContain('m5')
+      const style = wrapper.find('.tile-image').attributes('style')
+      expect(style).toContain('tiles/atlas.png')
+      expect(style).toContain('background-position')
+    })
+
+    it('横向きの牌は横向きのスプライトシートから表示する', () => {
+      const wrapper = mount(MahjongTile, {
+        props: { tile: mockTile, isYoko: true }
+      })
+      expect(wrapper.find('.tile-image').attributes('style')).toContain('tiles/atlas-yoko.png')
     })
   })
 
@@ -126,15 +133,14 @@ describe('MahjongTile', () => {
   })
 
   describe('画像エラーハンドリング', () => {
-    it('画像読み込みエラー時にフォールバック表示される', async () => {
+    it('スプライトシートにない牌はフォールバック表示される', () => {
+      const invalidTile = { suit: 'honor', rank: 8, id: 'invalid' } as any
       const wrapper = mount(MahjongTile, {
-        props: { tile: mockTile }
+        props: { tile: invalidTile }
       })
-      const img = wrapper.find('img')
-      await img.trigger('error')
-      
+
       // フォールバック表示の確認
-      await wrapper.vm.$nextTick()
+      expect(wrapper.find('.tile-image').exists()).toBe(false)
       expect(wrapper.find('.tile-error').exists()).toBe(true)
     })
   })
@@ -149,8 +155,7 @@ describe('MahjongTile', () => {
       const wrapper = mount(MahjongTile, {
         props: { tile: circleTile }
       })
-      const img = wrapper.find('img')
-      expect(img.attributes('alt')).toBe('3筒')
+      expect(wrapper.find('.tile-image').attributes('aria-label')).toBe('3筒')
     })
 
     it('索子が正しく表示される', () => {
@@ -162,8 +167,7 @@ describe('MahjongTile', () => {
       const wrapper = mount(MahjongTile, {
         props: { tile: bambooTile }
       })
-      const img = wrapper.find('img')
-      expect(img.attributes('alt')).toBe('7索')
+      expect(wrapper.find('.tile-image').attributes('aria-label')).toBe('7索')
     })
 
     it('字牌が正しく表示される', () => {
@@ -175,8 +179,7 @@ describe('MahjongTile', () => {
       const wrapper = mount(MahjongTile, {
         props: { tile: honorTile }
       })
-      const img = wrapper.find('img')
-      expect(img.attributes('alt')).toBe('東')
+      expect(wrapper.find('.tile-image').attributes('aria-label')).toBe('東')
     })
   })
 
@@ -4,15 +4,92 @@ import { createApp } from 'vue'
 import { createPinia } from 'pinia'
 import { createVuetify } from 'vuetify'
 import 'vuetify/styles'
-import * as components from 'vuetify/components'
-import * as directives from 'vuetify/directives'
+// 使うコンポーネントだけを登録し、Vuetify全体を初期バンドルに含めない（ripple等のディレクティブは各コンポーネントが読み込む）
+// テンプレートで新しい v-* コンポーネントを使う場合はここに追加する
+import {
+  VAlert,
+  VApp,
+  VAppBar,
+  VAppBarTitle,
+  VBtn,
+  VCard,
+  VCardActions,
+  VCardSubtitle,
+  VCardText,
+  VCardTitle,
+  VChip,
+  VChipGroup,
+  VCol,
+  VContainer,
+  VDialog,
+  VDivider,
+  VExpandTransition,
+  VIcon,
+  VList,
+  VListItem,
+  VListItemSubtitle,
+  VListItemTitle,
+  VMain,
+  VMenu,
+  VProgressCircular,
+  VRow,
+  VSelect,
+  VSpacer,
+  VSwitch,
+  VTab,
+  VTabs,
+  VTabsWindow,
+  VTabsWindowItem,
+  VTextarea,
+  VTextField,
+  VWindow,
+  VWindowItem,
+} from 'vuetify/components'
 
 import App from './App.vue'
 import router from './router'
+import { installProfilerHandle } from './utils/profiler'
 
 const vuetify = createVuetify({
-  components,
-  directives,
+  components: {
+    VAlert,
+    VApp,
+    VAppBar,
+    VAppBarTitle,
+    VBtn,
+    VCard,
+    VCardActions,
+    VCardSubtitle,
+    VCardText,
+    VCardTitle,
+    VChip,
+    VChipGroup,
+    VCol,
+    VContainer,
+    VDialog,
+    VDivider,
+    VExpandTransition,
+    VIcon,
+    VList,
+    VListItem,
+    VListItemSubtitle,
+    VListItemTitle,
+    VMain,
+    VMenu,
+    VProgressCircular,
+    VRow,
+    VSelect,
+    VSpacer,
+    VSwitch,
+    VTab,
+    VTabs,
+    VTabsWindow,
+    VTabsWindowItem,
+    VTextarea,
+    VTextField,
+    VWindow,
+    VWindowItem,
+  },
   theme: {
     defaultTheme: 'light',
     themes: {
@@ -31,6 +108,9 @@ const vuetify = createVuetify({
   },
 })
 
+// 処理時間の計測の操作口（window.__MAHJONG_PROFILER__）。計測は ?profile 指定時・デバッグパネルで有効にした時のみ
+installProfilerHandle()
+
 const app = createApp(App)
 
 app.use(createPinia())
@@ -38,3 +118,9 @@ app.use(router)
 app.use(vuetify)
 
 app.mount('#app')
+
+// 起動時間（ページの読み込み開始から最初の画面の表示まで）を Performance API で計測できるようにする
+router.isReady().then(() => {
+  performance.mark('haisosa:app-mounted')
+  performance.measure('haisosa:startup', { end: 'haisosa:app-mounted' })
+})
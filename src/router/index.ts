@@ -1,5 +1,6 @@
 import { createRouter, createWebHashHistory } from 'vue-router'
 import HomeView from '../views/HomeView/index.vue'
+import { preloadMahjongWasm } from '../utils/wasm-preload'
 
 const router = createRouter({
   history: createWebHashHistory(),
@@ -18,6 +19,10 @@ const router = createRouter({
       path: '/four-player',
       name: 'four-player',
       component: () => import('../views/FourPlayerGameView/index.vue'),
+      // 対局画面のWASMは画面の読み込みと並行して初期化する（失敗時は画面側の初期化に任せて遷移は止めない）
+      beforeEnter: () => {
+        preloadMahjongWasm().catch(error => console.error('WASM preload failed:', error))
+      },
     },
   ],
 })
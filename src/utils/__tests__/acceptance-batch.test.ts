@@ -0,0 +1,98 @@
+import { describe, it, expect, beforeAll } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import {
+  initMahjongCalculatorSync,
+  calculateDiscardAcceptanceBatch,
+  decodeDiscardAcceptanceBatch,
+  getDiscardBatchLength,
+  calculateShantenFromCounts,
+  getUsefulTilesFromCounts,
+  convertTilesToRustFormat,
+  type DiscardAcceptance
+} from '../mahjong-calculator-wrapper'
+import { createRandom } from '../random'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+// 1枚ずつ切った手牌でシャンテン数・受け入れ牌を個別に計算する（従来の方法）
+function naiveDiscardAcceptances(handCounts: Uint8Array, visibleCounts: Uint8Array): DiscardAcceptance[] {
+  const records: DiscardAcceptance[] = []
+  for (let discardIndex = 0; discardIndex < 34; discardIndex++) {
+    if (handCounts[discardIndex] === 0) continue
+    const counts = handCounts.slice()
+    counts[discardIndex]--
+    const acceptanceTiles = getUsefulTilesFromCounts(counts)
+    records.push({
+      discardIndex,
+      shantenAfterDiscard: calculateShantenFromCounts(counts),
+      acceptanceTiles,
+      remainingCounts: acceptanceTiles.map(t => Math.max(0, 4 - visibleCounts[t] + (t === discardIndex ? 1 : 0)))
+    })
+  }
+  return records
+}
+
+function randomHand(random: () => number): Uint8Array {
+  const wall: number[] = []
+  for (let i = 0; i < 34; i++) {
+    wall.push(i, i, i, i)
+  }
+  const counts = new Uint8Array(34)
+  for (let i = 0; i < 14; i++) {
+    const pick = Math.floor(random() * wall.length)
+    counts[wall[pick]]++
+    wall.splice(pick, 1)
+  }
+  return counts
+}
+
+describe('打牌ごとの受け入れ計算の一括実行', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  it('ランダムな手牌で個別に計算した結果と一致する', () => {
+    const random = createRandom('acceptance-batch')
+    for (let n = 0; n < 200; n++) {
+      const handCounts = randomHand(random)
+      const visibleCounts = handCounts.slice()
+      for (let i = 0; i < 10; i++) {
+        const index = Math.floor(random() * 34)
+        if (visibleCounts[index] < 4) visibleCounts[index]++
+      }
+      const before = Array.from(handCounts)
+
+      const batch = calculateDiscardAcceptanceBatch(handCounts, visibleCounts)
+      const records = decodeDiscardAcceptanceBatch(batch)
+
+      expect(getDiscardBatchLength(batch)).toBe(1 + records.reduce((sum, r) => sum + 3 + r.acceptanceTiles.length * 2, 0))
+      expect(records).toEqual(naiveDiscardAcceptances(handCounts, visibleCounts))
+      // 計算中に増減させた枚数は元に戻っている
+      expect(Array.from(handCounts)).toEqual(before)
+    }
+  })
+
+  it('シャンテン数の上限を超える打牌は受け入れ牌を計算しない', () => {
+    // 1m2m3m 4p5p6p 7s8s9s 東東 5m6m 9p: 9pを切るとテンパイ
+    const handCounts = convertTilesToRustFormat([
+      { suit: 'man', rank: 1 }, { suit: 'man', rank: 2 }, { suit: 'man', rank: 3 },
+      { suit: 'pin', rank: 4 }, { suit: 'pin', rank: 5 }, { suit: 'pin', rank: 6 },
+      { suit: 'sou', rank: 7 }, { suit: 'sou', rank: 8 }, { suit: 'sou', rank: 9 },
+      { suit: 'honor', rank: 1 }, { suit: 'honor', rank: 1 },
+      { suit: 'man', rank: 5 }, { suit: 'man', rank: 6 }, { suit: 'pin', rank: 9 }
+    ] as any)
+
+    const records = decodeDiscardAcceptanceBatch(calculateDiscardAcceptanceBatch(handCounts, handCounts, 0))
+
+    // 牌種ごとに1件ずつ記録される
+    expect(records.map(r => r.discardIndex)).toEqual([0, 1, 2, 4, 5, 12, 13, 14, 17, 24, 25, 26, 27])
+    const tenpai = records.find(r => r.discardIndex === 17)!
+    expect(tenpai.shantenAfterDiscard).toBe(0)
+    expect(tenpai.acceptanceTiles).toEqual([3, 6])
+    expect(tenpai.remainingCounts).toEqual([4, 4])
+    for (const record of records.filter(r => r.shantenAfterDiscard > 0)) {
+      expect(record.acceptanceTiles).toEqual([])
+    }
+  })
+})
@@ -0,0 +1,91 @@
+import { describe, it, expect, beforeAll } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import {
+  initMahjongCalculatorSync,
+  calculateDiscardAcceptanceBatch,
+  getDiscardBatchLength,
+  convertTilesToRustFormat
+} from '../mahjong-calculator-wrapper'
+import { AcceptanceWorkerClient, type AcceptanceWorkerMessage } from '../acceptance-worker-client'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+// acceptance-worker.ts と同じ計算を非同期で返す Worker の代わり
+class FakeWorker {
+  onmessage: ((event: MessageEvent) => void) | null = null
+  onerror: ((event: unknown) => void) | null = null
+  received: AcceptanceWorkerMessage[] = []
+
+  postMessage(message: AcceptanceWorkerMessage): void {
+    this.received.push(message)
+    if (message.type !== 'acceptance') return
+
+    setTimeout(() => {
+      const batch = calculateDiscardAcceptanceBatch(message.handCounts, message.visibleCounts, message.maxShanten)
+      this.onmessage?.({ data: { id: message.id, batch: batch.slice(0, getDiscardBatchLength(batch)) } } as MessageEvent)
+    }, 0)
+  }
+
+  terminate(): void {}
+}
+
+function handCounts(): Uint8Array {
+  // 1m2m3m 4p5p6p 7s8s9s 東東 5m6m 9p
+  return convertTilesToRustFormat([
+    { suit: 'man', rank: 1 }, { suit: 'man', rank: 2 }, { suit: 'man', rank: 3 },
+    { suit: 'pin', rank: 4 }, { suit: 'pin', rank: 5 }, { suit: 'pin', rank: 6 },
+    { suit: 'sou', rank: 7 }, { suit: 'sou', rank: 8 }, { suit: 'sou', rank: 9 },
+    { suit: 'honor', rank: 1 }, { suit: 'honor', rank: 1 },
+    { suit: 'man', rank: 5 }, { suit: 'man', rank: 6 }, { suit: 'pin', rank: 9 }
+  ] as any)
+}
+
+function expectedBatch(counts: Uint8Array, maxShanten: number): number[] {
+  const batch = calculateDiscardAcceptanceBatch(counts.slice(), counts, maxShanten)
+  return Array.from(batch.slice(0, getDiscardBatchLength(batch)))
+}
+
+describe('受け入れ計算Worker', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  it('Workerが使えない環境ではメインスレッドで計算する', async () => {
+    const client = new AcceptanceWorkerClient()
+    const counts = handCounts()
+
+    const batch = await client.request(counts, counts, 0)
+
+    expect(Array.from(batch!)).toEqual(expectedBatch(counts, 0))
+  })
+
+  it('新しい要求を出すと以前の要求はキャンセルされる', async () => {
+    const worker = new FakeWorker()
+    const client = new AcceptanceWorkerClient(() => worker as unknown as Worker)
+    const counts = handCounts()
+
+    const first = client.request(counts, counts, 0)
+    const second = client.request(counts, counts, 8)
+
+    expect(await first).toBeNull()
+    expect(Array.from((await second)!)).toEqual(expectedBatch(counts, 8))
+    expect(worker.received.map(message => message.type)).toEqual(['acceptance', 'cancel', 'acceptance'])
+    // 呼び出し側の配列は転送されずに残る
+    expect(counts.length).toBe(34)
+  })
+
+  it('Workerでエラーが起きた場合は待機中の要求をメインスレッドで計算する', async () => {
+    const worker = new FakeWorker()
+    worker.postMessage = function (message: AcceptanceWorkerMessage) {
+      this.received.push(message)
+    }
+    const client = new AcceptanceWorkerClient(() => worker as unknown as Worker)
+    const counts = handCounts()
+
+    const pending = client.request(counts, counts, 0)
+    worker.onerror?.(new Error('load failed'))
+
+    expect(Array.from((await pending)!)).toEqual(expectedBatch(counts, 0))
+  })
+})
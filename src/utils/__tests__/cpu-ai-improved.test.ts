@@ -83,6 +83,22 @@ describe('改善されたCPU AI', () => {
       
       expect(honorTileSelected).toBe(true)
     })
+
+    it('孤立牌のうち字牌・老頭牌・中張牌の順に捨てる', () => {
+      // 123m456m789p11s4s東 + ツモ9m（4s・東・9mが孤立牌、どれを切っても1シャンテン）
+      const tiles: Tile[] = [
+        createTile('man', 1, 'm1-1'), createTile('man', 2, 'm2-1'), createTile('man', 3, 'm3-1'),
+        createTile('man', 4, 'm4-1'), createTile('man', 5, 'm5-1'), createTile('man', 6, 'm6-1'),
+        createTile('pin', 7, 'p7-1'), createTile('pin', 8, 'p8-1'), createTile('pin', 9, 'p9-1'),
+        createTile('sou', 1, 's1-1'), createTile('sou', 1, 's1-2'),
+        createTile('sou', 4, 's4-1'), createTile('honor', 1, 'h1-1')
+      ]
+
+      expect(ai.decideTileToDiscard(createTestPlayer(tiles), createTile('man', 9, 'm9-1'))).toBe('h1-1')
+
+      const withoutHonor = tiles.filter(t => t.id !== 'h1-1')
+      expect(ai.decideTileToDiscard(createTestPlayer([...withoutHonor, createTile('man', 9, 'm9-1')]), createTile('pin', 1, 'p1-1'))).toBe('m9-1')
+    })
   })
 
   describe('リーチ判定の改善', () => {
@@ -0,0 +1,159 @@
+import { describe, it, expect, beforeAll } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../mahjong-calculator-wrapper'
+import { CpuAIWorkerPool, type CpuAIWorkerMessage } from '../cpu-ai-worker-pool'
+import { CpuAIRegistry, decideCpuTurn, decideCpuRon, toSnapshotPlayer, type CpuTurnSnapshot, type CpuRonSnapshot } from '../cpu-ai-task'
+import { getProfileSnapshot, resetProfiler, setProfilerEnabled } from '../profiler'
+import type { Tile, Player } from '../../stores/fourPlayerMahjong'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+// cpu-ai-worker.ts と同じ判断を非同期で返す Worker の代わり
+class FakeWorker {
+  onmessage: ((event: MessageEvent) => void) | null = null
+  onerror: ((event: unknown) => void) | null = null
+  received: CpuAIWorkerMessage[] = []
+  private registry = new CpuAIRegistry()
+
+  postMessage(message: CpuAIWorkerMessage): void {
+    // 構造化複製できることを確認する
+    const copy = structuredClone(message)
+    this.received.push(copy)
+
+    setTimeout(() => {
+      const data = copy.type === 'turn'
+        ? { id: copy.id, decision: decideCpuTurn(this.registry, copy.snapshot) }
+        : { id: copy.id, ron: decideCpuRon(this.registry, copy.snapshot) }
+      const response = copy.profile ? { ...data, durationMs: 1000 } : data
+      this.onmessage?.({ data: response } as MessageEvent)
+    }, 0)
+  }
+
+  terminate(): void {}
+}
+
+function createTile(suit: Tile['suit'], rank: number, id: string): Tile {
+  return { id, suit, rank, isRed: false }
+}
+
+function createPlayer(tiles: Tile[]): Player {
+  return { id: 1, name: 'CPU', type: 'cpu', tiles, discards: [], melds: [], riichi: false, score: 25000, wind: 'south' }
+}
+
+// 123456789m11p23s（1-4s待ちのテンパイ）
+function tenpaiTiles(): Tile[] {
+  return [
+    ...[1, 2, 3, 4, 5, 6, 7, 8, 9].map(rank => createTile('man', rank, `m${rank}`)),
+    createTile('pin', 1, 'p1-1'), createTile('pin', 1, 'p1-2'),
+    createTile('sou', 2, 's2'), createTile('sou', 3, 's3')
+  ]
+}
+
+function turnSnapshot(seat: number, difficulty: CpuTurnSnapshot['difficulty']): CpuTurnSnapshot {
+  const tiles = tenpaiTiles()
+  return {
+    seat,
+    difficulty,
+    player: toSnapshotPlayer(createPlayer(tiles.slice(1))),
+    drawnTile: createTile('honor', 1, 'z1'),
+    visibleCounts: new Uint8Array(34),
+    wallRemaining: 40,
+    randomSeed: 'seed'
+  }
+}
+
+function ronSnapshot(seat: number, winRank: number): CpuRonSnapshot {
+  return {
+    seat,
+    difficulty: 'medium',
+    player: toSnapshotPlayer(createPlayer(tenpaiTiles())),
+    winTile: createTile('sou', winRank, `s${winRank}-ron`),
+    doraIndicators: []
+  }
+}
+
+describe('CPU判断Workerのプール', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  it('Workerが使えない環境ではメインスレッドで判断する', async () => {
+    const pool = new CpuAIWorkerPool()
+    const snapshot = turnSnapshot(1, 'hard')
+
+    const decision = await pool.decideTurn(snapshot)
+
+    expect(decision).toEqual(decideCpuTurn(new CpuAIRegistry(), snapshot))
+  })
+
+  it('同じ席は同じWorkerが担当し、ロン判断は各Workerで並列に行う', async () => {
+    const workers = [new FakeWorker(), new FakeWorker(), new FakeWorker()]
+    let created = 0
+    const pool = new CpuAIWorkerPool(3, () => workers[created++] as unknown as Worker)
+
+    // Worker は最初に使う時に起動する（席2の担当が最初に起動される）
+    await pool.decideTurn(turnSnapshot(2, 'super'))
+    await pool.decideTurn(turnSnapshot(2, 'medium'))
+    expect(created).toBe(1)
+    expect(workers[0].received.map(message => message.type)).toEqual(['turn', 'turn'])
+
+    // 3人分の要求を待たずに送る
+    const snapshots = [ronSnapshot(1, 5), ronSnapshot(2, 4), ronSnapshot(3, 1)]
+    const ron = pool.decideRon(snapshots)
+    expect(workers.map(worker => worker.received.filter(message => message.type === 'ron').length)).toEqual([1, 1, 1])
+
+    // 結果は要求と同じ順序で返る
+    const registry = new CpuAIRegistry()
+    expect(await ron).toEqual(snapshots.map(snapshot => decideCpuRon(registry, snapshot)))
+  })
+
+  it('同じシードの判断は同じ結果になる', async () => {
+    const pool = new CpuAIWorkerPool(1, () => new FakeWorker() as unknown as Worker)
+    const first = await pool.decideTurn(turnSnapshot(3, 'easy'))
+    const second = await pool.decideTurn(turnSnapshot(3, 'easy'))
+
+    expect(second).toEqual(first)
+  })
+
+  it('Workerでエラーが起きた場合は待機中の要求をメインスレッドで判断する', async () => {
+    const worker = new FakeWorker()
+    worker.postMessage = function (message: CpuAIWorkerMessage) {
+      this.received.push(message)
+      setTimeout(() => this.onerror?.(new Error('load failed')), 0)
+    }
+    const pool = new CpuAIWorkerPool(1, () => worker as unknown as Worker)
+    const snapshot = turnSnapshot(1, 'medium')
+
+    expect(await pool.decideTurn(snapshot)).toEqual(decideCpuTurn(new CpuAIRegistry(), snapshot))
+  })
+
+  it('キャンセルすると待機中の要求は null で解決される', async () => {
+    const pool = new CpuAIWorkerPool(1, () => new FakeWorker() as unknown as Worker)
+    const decision = pool.decideTurn(turnSnapshot(1, 'medium'))
+    const ron = pool.decideRon([ronSnapshot(2, 4)])
+    pool.dispose()
+
+    expect(await decision).toBeNull()
+    expect(await ron).toBeNull()
+  })
+
+  it('計測を有効にするとWorker内の判断時間と往復の時間を記録する', async () => {
+    const pool = new CpuAIWorkerPool(1, () => new FakeWorker() as unknown as Worker)
+    resetProfiler()
+    setProfilerEnabled(true)
+    try {
+      await pool.decideTurn(turnSnapshot(1, 'medium'))
+      await pool.decideRon([ronSnapshot(2, 4), ronSnapshot(3, 1)])
+    } finally {
+      setProfilerEnabled(false)
+    }
+
+    const spans = new Map(getProfileSnapshot().map(span => [span.name, span]))
+    expect(spans.get('CpuAI.decideTileToDiscard')?.maxMs).toBe(1000)
+    expect(spans.get('CpuAI.decideTurn.worker')?.count).toBe(1)
+    expect(spans.get('CpuAI.decideRon')?.count).toBe(2)
+    expect(spans.get('CpuAI.decideRon.worker')?.count).toBe(1)
+    resetProfiler()
+  })
+})
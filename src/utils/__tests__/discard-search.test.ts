@@ -0,0 +1,95 @@
+import { describe, it, expect } from 'vitest'
+import { DiscardSearch } from '../discard-search'
+import { CpuAI } from '../cpu-ai'
+import type { Tile, Player } from '../../stores/fourPlayerMahjong'
+
+// '123m456p789s11z' 形式の表記を34種の枚数配列にする
+function parseCounts(notation: string): Uint8Array {
+  const counts = new Uint8Array(34)
+  const offsets: Record<string, number> = { m: 0, p: 9, s: 18, z: 27 }
+  let ranks: number[] = []
+  for (const char of notation) {
+    if (char in offsets) {
+      for (const rank of ranks) counts[offsets[char] + rank - 1]++
+      ranks = []
+    } else {
+      ranks.push(parseInt(char, 10))
+    }
+  }
+  return counts
+}
+
+function createTile(suit: 'man' | 'pin' | 'sou' | 'honor', rank: number, id: string): Tile {
+  return { id, suit, rank, isRed: false }
+}
+
+describe('打牌の2手先探索', () => {
+  it('テンパイになる打牌のうち和了牌の残りが多い打牌を高く評価する', () => {
+    // 123456789m11p23s5s: 5s切りで1-4s待ち、2s切りで4s待ち
+    const hand = parseCounts('123456789m11p235s')
+    const result = new DiscardSearch().search(hand, hand, { remainingDraws: 10 })
+
+    expect(result.complete).toBe(true)
+    expect(result.shanten[22]).toBe(0) // 5s
+    expect(result.shanten[19]).toBe(0) // 2s
+    expect(result.ukeire[22]).toBe(8)
+    expect(result.ukeire[19]).toBe(4)
+    expect(result.values[22]).toBeGreaterThan(result.values[19])
+    // テンパイが崩れる打牌は候補にしない
+    expect(result.values[0]).toBe(-1)
+    // 手牌にない牌種
+    expect(result.values[33]).toBe(-1)
+  })
+
+  it('見えている牌を除いて和了牌の残り枚数を数える', () => {
+    const hand = parseCounts('123456789m11p235s')
+    const visible = hand.slice()
+    visible[18] = 4 // 1sが4枚見えている
+    visible[21] += 2 // 4sが2枚見えている
+
+    const result = new DiscardSearch().search(hand, visible, { remainingDraws: 10 })
+    expect(result.ukeire[22]).toBe(2)
+    expect(result.ukeire[19]).toBe(2)
+  })
+
+  it('テンパイでない場合は2手先まで評価し、残りツモが多いほど評価値が高い', () => {
+    const hand = parseCounts('123m456p78s13z55z9m2p')
+    const search = new DiscardSearch()
+
+    const short = search.search(hand, hand, { remainingDraws: 3 })
+    expect(short.complete).toBe(true)
+    const shortValues = Array.from(short.values)
+
+    const long = search.search(hand, hand, { remainingDraws: 15 })
+    for (let index = 0; index < 34; index++) {
+      if (shortValues[index] < 0) continue
+      expect(long.values[index]).toBeGreaterThan(shortValues[index])
+    }
+  })
+
+  it('制限時間を過ぎた場合は受け入れ枚数のみで評価する', () => {
+    const hand = parseCounts('123m456p78s13z55z9m2p')
+    const result = new DiscardSearch().search(hand, hand, { remainingDraws: 10, deadline: -1 })
+
+    expect(result.complete).toBe(false)
+    for (let index = 0; index < 34; index++) {
+      if (result.values[index] < 0) continue
+      expect(result.values[index]).toBe(result.ukeire[index] / (136 - 14))
+    }
+  })
+
+  it('super難易度のCPUは探索の評価値で打牌を選ぶ', () => {
+    const tiles: Tile[] = [
+      ...[1, 2, 3, 4, 5, 6, 7, 8, 9].map(rank => createTile('man', rank, `m${rank}`)),
+      createTile('pin', 1, 'p1-1'), createTile('pin', 1, 'p1-2'),
+      createTile('sou', 2, 's2'), createTile('sou', 3, 's3')
+    ]
+    const player: Player = {
+      id: 1, name: 'TestCPU', type: 'cpu', tiles, discards: [], melds: [], riichi: false, score: 25000, wind: 'south'
+    }
+
+    const ai = new CpuAI('super')
+    ai.setSearchTimeBudget(Infinity)
+    expect(ai.decideTileToDiscard(player, createTile('sou', 5, 's5'), undefined, 40)).toBe('s5')
+  })
+})
@@ -0,0 +1,82 @@
+import { describe, it, expect } from 'vitest'
+import { EnhancedDraw } from '../enhanced-draw'
+import { Wall } from '../wall'
+import { createRandom } from '../random'
+import type { Tile } from '../../stores/fourPlayerMahjong'
+
+const SUITS: Tile['suit'][] = ['man', 'pin', 'sou', 'honor']
+
+function createWallTiles(): Tile[] {
+  const tiles: Tile[] = []
+  for (const suit of SUITS) {
+    const maxRank = suit === 'honor' ? 7 : 9
+    for (let rank = 1; rank <= maxRank; rank++) {
+      for (let copy = 0; copy < 4; copy++) {
+        tiles.push({ id: `${suit}-${rank}-${copy}`, suit, rank, isRed: false })
+      }
+    }
+  }
+  return tiles
+}
+
+function createHand(notation: string): Tile[] {
+  const suitByChar: Record<string, Tile['suit']> = { m: 'man', p: 'pin', s: 'sou', z: 'honor' }
+  const hand: Tile[] = []
+  let ranks: number[] = []
+  for (const char of notation) {
+    if (char in suitByChar) {
+      for (const rank of ranks) hand.push({ id: `hand-${char}${rank}-${hand.length}`, suit: suitByChar[char], rank, isRed: false })
+      ranks = []
+    } else {
+      ranks.push(parseInt(char, 10))
+    }
+  }
+  return hand
+}
+
+describe('EnhancedDraw', () => {
+  it('ブースト確率が1の場合は山に残っている有効牌を引く', () => {
+    // 123456789m123p1z: 東単騎
+    const hand = createHand('123456789m123p1z')
+    const wall = new Wall(createWallTiles())
+    const draw = new EnhancedDraw({ boostProbability: 1, random: createRandom('useful') })
+
+    for (let n = 0; n < 20; n++) {
+      const tile = draw.drawEnhancedTile(hand, wall)
+      expect(tile?.suit).toBe('honor')
+      expect(tile?.rank).toBe(1)
+    }
+
+    // 東が山にない場合は通常のツモになる
+    for (let copy = 0; copy < 4; copy++) wall.remove(`honor-1-${copy}`)
+    expect(draw.drawEnhancedTile(hand, wall)).not.toBeNull()
+  })
+
+  it('有効牌は牌種ごとの残り枚数に比例して引く', () => {
+    // 23m の両面（1m・4m待ち）。1m は1枚だけ残す
+    const hand = createHand('23m456789p789s11z')
+    const wall = new Wall(createWallTiles())
+    for (let copy = 0; copy < 3; copy++) wall.remove(`man-1-${copy}`)
+    const draw = new EnhancedDraw({ boostProbability: 1, random: createRandom('weight') })
+
+    let manOne = 0
+    let manFour = 0
+    for (let n = 0; n < 1000; n++) {
+      const tile = draw.drawEnhancedTile(hand, wall)!
+      if (tile.suit === 'man' && tile.rank === 1) manOne++
+      if (tile.suit === 'man' && tile.rank === 4) manFour++
+    }
+    expect(manOne + manFour).toBe(1000)
+    expect(manFour).toBeGreaterThan(manOne * 2)
+  })
+
+  it('清一色モードでは対象の色の牌から引く', () => {
+    const hand = createHand('123456789m123p1z')
+    const wall = new Wall(createWallTiles())
+    const draw = new EnhancedDraw({ boostProbability: 0.5, random: createRandom('chinitsu') })
+
+    for (let n = 0; n < 50; n++) {
+      expect(draw.drawEnhancedTile(hand, wall, 'sou')?.suit).toBe('sou')
+    }
+  })
+})
@@ -0,0 +1,65 @@
+import { describe, it, expect, afterEach, vi } from 'vitest'
+import { installGameDebugHandle, GAME_DEBUG_READY_EVENT, type GameDebugState } from '../game-debug-hook'
+
+const createState = (): GameDebugState => ({
+  gamePhase: 'playing',
+  isTestMode: false,
+  currentPlayerIndex: 0,
+  isHumanTurn: true,
+  hasDrawnTile: true,
+  humanHandSize: 13,
+  wallRemaining: 69,
+  doraCount: 1,
+  round: 1,
+  canTsumo: false,
+  canRon: false,
+  canRiichi: false,
+  canPon: false,
+  canKan: false,
+  canChi: false,
+  canAnkan: false,
+  showWinModal: false,
+  showDrawModal: false,
+  showGameEndModal: false,
+  processingCpuTurn: false,
+  isCalculatingAcceptance: false
+})
+
+const createHandle = () => ({
+  getState: createState,
+  loadTestDeal: vi.fn(createState)
+})
+
+describe('game-debug-hook', () => {
+  afterEach(() => {
+    delete window.__MAHJONG_DEBUG__
+  })
+
+  it('windowにハンドルを登録し、準備完了イベントを発火する', () => {
+    const listener = vi.fn()
+    window.addEventListener(GAME_DEBUG_READY_EVENT, listener)
+
+    installGameDebugHandle(createHandle())
+
+    expect(window.__MAHJONG_DEBUG__?.getState().wallRemaining).toBe(69)
+    expect(listener).toHaveBeenCalledTimes(1)
+    window.removeEventListener(GAME_DEBUG_READY_EVENT, listener)
+  })
+
+  it('登録解除でハンドルが削除される', () => {
+    const uninstall = installGameDebugHandle(createHandle())
+    uninstall()
+
+    expect(window.__MAHJONG_DEBUG__).toBeUndefined()
+  })
+
+  it('後から登録されたハンドルは古い登録解除で消えない', () => {
+    const uninstallOld = installGameDebugHandle(createHandle())
+    const newer = createHandle()
+    installGameDebugHandle(newer)
+
+    uninstallOld()
+
+    expect(window.__MAHJONG_DEBUG__).toBe(newer)
+  })
+})
@@ -0,0 +1,94 @@
+import { describe, it, expect, beforeAll, beforeEach } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../mahjong-calculator-wrapper'
+import { HeadlessSimulator } from '../headless-simulator'
+import { GameManager } from '../game-manager'
+import { replayGameLog, type GameLog } from '../game-log'
+import { createRandom } from '../random'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+describe('シード付き乱数と行動ログ', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  beforeEach(() => {
+    localStorage.clear()
+  })
+
+  it('同じシードの乱数は同じ値を返す', () => {
+    const a = createRandom('seed')
+    const b = createRandom('seed')
+
+    expect([a(), a(), a()]).toEqual([b(), b(), b()])
+  })
+
+  it('同じシードでは配牌・ツモ・打牌まで同じ対局になる', () => {
+    const simulator = new HeadlessSimulator({ games: 1, cpuStrengths: ['easy', 'hard', 'super'] })
+    const first = simulator.playGame('replay-test')
+    const second = simulator.playGame('replay-test')
+
+    expect(second.log.entries).toEqual(first.log.entries)
+    expect(second.scores).toEqual(first.scores)
+  })
+
+  it('行動ログを再生すると同じ点数で終わる', () => {
+    const outcome = new HeadlessSimulator({ games: 1 }).playGame('replay-scores')
+    // ファイルへの保存と同じくJSONを経由する
+    const log = JSON.parse(JSON.stringify(outcome.log)) as GameLog
+
+    const replay = replayGameLog(log)
+
+    expect(replay.scores).toEqual(outcome.scores)
+    expect(replay.rounds).toBe(outcome.rounds.length)
+    expect(replay.manager.actionLog.entries).toEqual(log.entries)
+  })
+
+  it('鳴き・暗カンを含むログを再生できる', () => {
+    const manager = new GameManager({ gameSettings: {}, seed: 'calls', recordResults: false, manipulationRate: 0 })
+    manager.startNewGame()
+    manager.discardTile(0, manager.currentDrawnTile!.id)
+    manager.nextTurn()
+
+    // 1番の捨て牌を2番がポン（牌の種類は再生処理では検証しない）
+    const discarded = manager.drawTileAndKeepSeparate(1)!
+    manager.discardTile(1, discarded.id)
+    const ponPlayer = manager.players[2]
+    const ponTiles = ponPlayer.tiles.splice(0, 2)
+    manager.players[1].discards.pop()
+    manager.addMeld(2, { type: 'pon', tiles: [...ponTiles, discarded], calledTile: discarded, fromPlayer: 1 })
+    manager.currentPlayerIndex = 2
+    manager.discardTile(2, ponPlayer.tiles[0].id)
+    manager.nextTurn()
+
+    // 3番が暗カンして嶺上牌を打牌
+    const kanPlayer = manager.players[3]
+    kanPlayer.tiles.push(manager.drawTileAndKeepSeparate(3)!)
+    manager.currentDrawnTile = null
+    const kanTiles = kanPlayer.tiles.splice(0, 4)
+    manager.addMeld(3, { type: 'kan', tiles: kanTiles, calledTile: kanTiles[0], fromPlayer: 3 })
+    manager.drawKanTile(3)
+    manager.addKanDoraIndicator()
+    manager.setAfterKan(3)
+    manager.sortPlayerHand(kanPlayer)
+    manager.discardTile(3, manager.currentDrawnTile!.id)
+
+    const replay = replayGameLog(JSON.parse(JSON.stringify(manager.actionLog)))
+
+    expect(replay.manager.players.map(p => p.tiles.map(t => t.id))).toEqual(manager.players.map(p => p.tiles.map(t => t.id)))
+    expect(replay.manager.players[2].melds[0].fromPlayer).toBe(1)
+    expect(replay.manager.doraIndicators.map(t => t.id)).toEqual(manager.doraIndicators.map(t => t.id))
+    expect(replay.manager.wallRemaining).toBe(manager.wallRemaining)
+  })
+
+  it('記録と異なる打牌は例外になる', () => {
+    const outcome = new HeadlessSimulator({ games: 1 }).playGame('broken')
+    const log = JSON.parse(JSON.stringify(outcome.log)) as GameLog
+    const index = log.entries.findIndex(entry => entry[0] === 'discard')
+    log.entries[index] = ['discard', 0, 'not-a-tile', 0]
+
+    expect(() => replayGameLog(log)).toThrow()
+  })
+})
@@ -0,0 +1,82 @@
+import { describe, it, expect, beforeAll, beforeEach } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../mahjong-calculator-wrapper'
+import { HeadlessSimulator, runHeadlessSimulation, deriveGameSeed, toYakuKey } from '../headless-simulator'
+import { GameManager } from '../game-manager'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+describe('ヘッドレス対局シミュレーター', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  beforeEach(() => {
+    localStorage.clear()
+  })
+
+  it('東風戦を最後まで進められる', () => {
+    const outcome = new HeadlessSimulator({ games: 1, hakoshita: false }).playGame()
+
+    expect(outcome.rounds.length).toBeGreaterThanOrEqual(4)
+    expect(outcome.scores).toHaveLength(4)
+    expect(outcome.endReason).toMatch(/終了/)
+  })
+
+  it('点数の合計は供託分を除いて変わらない', () => {
+    const outcome = new HeadlessSimulator({ games: 1, cpuStrengths: ['easy', 'hard', 'super'] }).playGame()
+    const total = outcome.scores.reduce((sum, score) => sum + score, 0)
+
+    expect(total).toBeLessThanOrEqual(100000)
+    expect((100000 - total) % 1000).toBe(0)
+  })
+
+  it('対局数・局数・打牌判断数と処理速度を集計する', () => {
+    const stats = runHeadlessSimulation({ games: 2 })
+
+    expect(stats.games).toBe(2)
+    expect(stats.rounds).toBe(stats.tsumoWins + stats.ronWins + stats.draws)
+    expect(stats.winsBySeat.reduce((sum, wins) => sum + wins, 0)).toBe(stats.tsumoWins + stats.ronWins)
+    expect(stats.decisions).toBeGreaterThan(0)
+    expect(stats.gamesPerSec).toBeGreaterThan(0)
+    expect(stats.decisionsPerSec).toBeGreaterThan(stats.roundsPerSec)
+  })
+
+  it('シミュレーション結果を戦績に記録しない', () => {
+    runHeadlessSimulation({ games: 1 })
+
+    expect(localStorage.getItem('mahjongGameRecords')).toBeNull()
+  })
+
+  it('同じシードでは同じ牌山が生成される', () => {
+    const wallIds = (seed: string) => {
+      const manager = new GameManager({ gameSettings: {}, seed, recordResults: false })
+      manager.generateWall()
+      return manager.wall.map(tile => tile.id)
+    }
+
+    expect(wallIds('abc')).toEqual(wallIds('abc'))
+    expect(wallIds('abc')).not.toEqual(wallIds('abd'))
+  })
+
+  it('対局のシードはマスターシードと通し番号から導出される', () => {
+    expect(deriveGameSeed('42', 3)).toBe(deriveGameSeed('42', 3))
+    expect(deriveGameSeed('42', 3)).not.toBe(deriveGameSeed('42', 4))
+  })
+
+  it('役名を戦績のキーに変換する', () => {
+    expect(toYakuKey('断么九')).toBe('tanyao')
+    expect(toYakuKey('場風 東')).toBe('yakuhai')
+    expect(toYakuKey('白')).toBe('yakuhai')
+    expect(toYakuKey('ドラ')).toBeNull()
+  })
+
+  it('シード指定時は集計に役の出現回数と席別の点数が含まれる', () => {
+    const stats = runHeadlessSimulation({ games: 1, seed: 'stats' })
+
+    expect(stats.finalScoreBySeat).toHaveLength(4)
+    expect(stats.winPointsBySeat).toHaveLength(4)
+    expect(Object.values(stats.yakuCounts).every(count => count > 0)).toBe(true)
+  })
+})
@@ -0,0 +1,78 @@
+import { describe, it, expect, beforeAll, beforeEach } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../mahjong-calculator-wrapper'
+import { ByteKeyLruCache, hashBytes } from '../lru-cache'
+import { GameManager } from '../game-manager'
+import type { AcceptanceInfo } from '../mahjong-logic'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+function key(...bytes: number[]): Uint8Array {
+  return Uint8Array.from(bytes)
+}
+
+describe('バイト列をキーにするLRUキャッシュ', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  beforeEach(() => {
+    localStorage.clear()
+  })
+
+  it('容量を超えると最も長く使われていない項目を捨てる', () => {
+    const cache = new ByteKeyLruCache<string>(2)
+    cache.set(key(1), 'a')
+    cache.set(key(2), 'b')
+    // 1 を参照すると 2 が最も古くなる
+    expect(cache.get(key(1))).toBe('a')
+    cache.set(key(3), 'c')
+
+    expect(cache.get(key(2))).toBeUndefined()
+    expect(cache.get(key(1))).toBe('a')
+    expect(cache.get(key(3))).toBe('c')
+    expect(cache.size).toBe(2)
+    expect(cache.hits).toBe(3)
+    expect(cache.misses).toBe(1)
+  })
+
+  it('ハッシュが同じでもキーが異なれば別の項目として扱う', () => {
+    const cache = new ByteKeyLruCache<string>()
+    cache.set(key(1, 2), 'a', 42)
+
+    expect(cache.get(key(2, 1), 42)).toBeUndefined()
+    expect(cache.get(key(1, 2), 42)).toBe('a')
+  })
+
+  it('保存後にキーのバッファを書き換えても影響しない', () => {
+    const cache = new ByteKeyLruCache<string>()
+    const buffer = key(1, 2, 3)
+    cache.set(buffer, 'a')
+    buffer[0] = 9
+
+    expect(cache.get(key(1, 2, 3))).toBe('a')
+    expect(hashBytes(key(1, 2, 3))).not.toBe(hashBytes(key(3, 2, 1)))
+  })
+
+  it('GameManager は同じ手牌・見えている牌の間だけキャッシュを返す', () => {
+    const manager = new GameManager({ gameSettings: {}, seed: 'cache', recordResults: false, acceptanceCacheSize: 8 })
+    manager.startNewGame()
+    const playerIndex = manager.currentPlayerIndex
+    const infos: AcceptanceInfo[] = [
+      { tileIndex: 0, tile: manager.currentDrawnTile!, acceptanceTiles: [1], remainingCounts: [4], totalAcceptance: 4, shantenAfterDiscard: 0 }
+    ]
+
+    expect(manager.getCachedAcceptanceInfo(playerIndex)).toEqual([])
+    manager.setCachedAcceptanceInfo(playerIndex, infos)
+    expect(manager.getCachedAcceptanceInfo(playerIndex)).toBe(infos)
+
+    // 打牌で見えている牌が変わるとキャッシュは使われない
+    manager.discardTile(playerIndex, manager.currentDrawnTile!.id)
+    manager.nextTurn()
+    manager.drawTileAndKeepSeparate(manager.currentPlayerIndex)
+    expect(manager.getCachedAcceptanceInfo(manager.currentPlayerIndex)).toEqual([])
+
+    expect(manager.acceptanceCacheStats).toEqual({ hits: 1, misses: 2, size: 1, capacity: 8 })
+  })
+})
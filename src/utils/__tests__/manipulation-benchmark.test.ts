@@ -0,0 +1,43 @@
+import { describe, it, expect, beforeAll } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync } from '../mahjong-calculator-wrapper'
+import { runManipulationBenchmark } from '../manipulation-benchmark'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+describe('牌操作率・配牌の良さの検証', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  it('設定の組み合わせごとに集計する', () => {
+    const result = runManipulationBenchmark({ trials: 5, manipulationRates: [0, 80], handQualities: ['normal', 'excellent'] })
+
+    expect(result.rows).toHaveLength(4)
+    expect(result.rows.map(row => `${row.handQuality}:${row.manipulationRate}`)).toEqual([
+      'normal:0', 'normal:80', 'excellent:0', 'excellent:80'
+    ])
+    for (const row of result.rows) {
+      expect(row.trials).toBe(5)
+      expect(row.averageStartShanten).toBeGreaterThanOrEqual(0)
+      expect(row.tenpaiRate).toBeLessThanOrEqual(1)
+      expect(row.dealMicros).toBeGreaterThan(0)
+    }
+  })
+
+  it('牌操作率が高いほど有効牌を引く割合が高い', () => {
+    const [low, high] = runManipulationBenchmark({ trials: 30, manipulationRates: [0, 100], handQualities: ['normal'], seed: 'rate' }).rows
+
+    expect(high.usefulDrawRatio).toBeGreaterThan(0.95)
+    expect(low.usefulDrawRatio).toBeLessThan(high.usefulDrawRatio)
+    // 操作なしの場合は山に残っている有効牌の割合に近い
+    expect(Math.abs(low.usefulDrawRatio - low.naturalUsefulRatio)).toBeLessThan(0.1)
+  })
+
+  it('同じシードでは配牌の良さごとの配牌シャンテン数が操作率によらず同じ', () => {
+    const rows = runManipulationBenchmark({ trials: 10, manipulationRates: [0, 80], handQualities: ['good'], seed: 'deal' }).rows
+
+    expect(rows[0].averageStartShanten).toBe(rows[1].averageStartShanten)
+  })
+})
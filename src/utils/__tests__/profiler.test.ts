@@ -0,0 +1,90 @@
+import { describe, it, expect, beforeEach, afterEach } from 'vitest'
+import {
+  spanStart,
+  spanEnd,
+  recordSpan,
+  getProfileSnapshot,
+  resetProfiler,
+  setProfilerEnabled,
+  installProfilerHandle
+} from '../profiler'
+import { calculateShanten } from '../mahjong-logic'
+import type { Tile } from '../../stores/fourPlayerMahjong'
+
+function createTiles(notation: string): Tile[] {
+  const suitByChar: Record<string, Tile['suit']> = { m: 'man', p: 'pin', s: 'sou', z: 'honor' }
+  const tiles: Tile[] = []
+  let ranks: number[] = []
+  for (const char of notation) {
+    if (char in suitByChar) {
+      for (const rank of ranks) tiles.push({ id: `${char}${rank}-${tiles.length}`, suit: suitByChar[char], rank, isRed: false })
+      ranks = []
+    } else {
+      ranks.push(parseInt(char, 10))
+    }
+  }
+  return tiles
+}
+
+describe('処理時間の計測', () => {
+  beforeEach(() => {
+    resetProfiler()
+  })
+
+  afterEach(() => {
+    setProfilerEnabled(false)
+    resetProfiler()
+  })
+
+  it('無効の間は記録しない', () => {
+    setProfilerEnabled(false)
+    const start = spanStart()
+    spanEnd('test', start)
+    calculateShanten(createTiles('123m456p789s1122z'))
+
+    expect(start).toBe(-1)
+    expect(getProfileSnapshot()).toEqual([])
+  })
+
+  it('区間名ごとに回数・p50・p95・最大を集計する', () => {
+    for (let i = 1; i <= 100; i++) {
+      recordSpan('draw', i / 10) // 0.1ms - 10ms
+    }
+    recordSpan('deal', 50)
+
+    const [deal, draw] = getProfileSnapshot()
+    expect(deal.name).toBe('deal')
+    expect(draw.count).toBe(100)
+    expect(draw.maxMs).toBe(10)
+    // 目盛りは約19%刻みのため、その範囲で実際の値と一致する
+    expect(draw.p50Ms).toBeGreaterThanOrEqual(5)
+    expect(draw.p50Ms).toBeLessThanOrEqual(5 * 1.2)
+    expect(draw.p95Ms).toBeGreaterThanOrEqual(9.5)
+    expect(draw.p95Ms).toBeLessThanOrEqual(10)
+    expect(draw.meanMs).toBeCloseTo(5.05, 5)
+  })
+
+  it('計測を有効にすると計測箇所の処理時間を記録する', () => {
+    setProfilerEnabled(true)
+    calculateShanten(createTiles('123m456p789s1122z'))
+    calculateShanten(createTiles('123m456p789s1122z'))
+
+    const span = getProfileSnapshot().find(s => s.name === 'calculateShanten')
+    expect(span?.count).toBe(2)
+  })
+
+  it('windowの操作口から有効化・集計の取得ができる', () => {
+    installProfilerHandle()
+    const handle = window.__MAHJONG_PROFILER__!
+
+    handle.enable()
+    spanEnd('handle', spanStart())
+    expect(handle.isEnabled()).toBe(true)
+    expect(handle.snapshot().map(s => s.name)).toEqual(['handle'])
+
+    handle.reset()
+    handle.disable()
+    expect(handle.snapshot()).toEqual([])
+    expect(handle.isEnabled()).toBe(false)
+  })
+})
@@ -219,7 +219,33 @@ describe('ロンボタンとロン処理', () => {
       expect(winResult.result?.totalHan).toBeGreaterThanOrEqual(6) // 清一色6翻
     })
   })
-  
+
+  describe('鳴いた手牌のロン', () => {
+    it('ポンした後のテンパイ手牌で待ち牌が捨てられた場合、ロンアガリと判定される', () => {
+      gameManager.restoreDeal(0, 0, [
+        ['honor5-2', 'man4-0', 'man6-0', 'man7-0', 'man8-0', 'man9-0', 'pin1-0', 'pin7-0', 'pin8-0', 'pin9-0', 'sou1-0', 'sou2-0', 'sou3-0'],
+        ['man1-0', 'man2-0', 'man3-0', 'pin2-0', 'pin3-0', 'pin4-0', 'sou7-0', 'sou8-0', 'sou9-0', 'honor1-0', 'honor5-0', 'honor5-1', 'honor6-0'],
+        ['honor1-1', 'man1-1', 'man2-1', 'man3-1', 'man4-1', 'man6-1', 'man7-1', 'man8-1', 'man9-1', 'pin1-1', 'pin2-1', 'pin3-1', 'pin4-1'],
+        ['man1-2', 'man2-2', 'man3-2', 'man4-2', 'man6-2', 'man7-2', 'man8-2', 'man9-2', 'pin1-2', 'pin2-2', 'pin3-2', 'pin4-2', 'pin6-2']
+      ], ['sou4-0'], ['sou4-1', 'sou6-0'])
+
+      // 親の白をポンして發を切る: 123m234p789s東 の東単騎（10枚）
+      gameManager.discardTile(0, 'honor5-2')
+      gameManager.applyCall(1, 'pon', ['honor5-0', 'honor5-1', 'honor5-2'], 'honor5-2', 0)
+      gameManager.discardTile(1, 'honor6-0')
+      expect(gameManager.players[1].tiles.length).toBe(10)
+
+      // 他のプレイヤーが東を捨てる（ロン牌）
+      gameManager.discardTile(2, 'honor1-1')
+      const discardedTile = gameManager.lastDiscardedTile!
+
+      expect(gameManager.isWaitingOn(1, discardedTile)).toBe(true)
+      expect(gameManager.isPlayerFuriten(1)).toBe(false)
+      const winResult = gameManager.checkWinConditionForPlayer(1, discardedTile, false)
+      expect(winResult.isWin).toBe(true)
+    })
+  })
+
   describe('ロンタイミング管理', () => {
     it('同一牌の複数回ロンはフリテンで無効となる', () => {
       // フリテンのテストは複雑なのでここでは省略
@@ -62,7 +62,7 @@ vi.mock('riichi-rs-bundlers', () => ({
   }
 }))
 
-import { calculateScore } from '../scoring'
+import { calculateScore, clearScoringCache, getScoringCacheStats } from '../scoring'
 
 describe('Scoring Calculation', () => {
   // Helper function to create tiles
@@ -315,4 +315,70 @@ describe('Scoring Calculation', () => {
       }
     })
   })
+
+  describe('点数計算のキャッシュ', () => {
+    // ロンの13枚（和了牌を除く）
+    const createRonHand = (): Tile[] => [
+      createTile('man', 2, 'man2-0'),
+      createTile('man', 3, 'man3-0'),
+      createTile('man', 4, 'man4-0'),
+      createTile('pin', 5, 'pin5-0'),
+      createTile('pin', 6, 'pin6-0'),
+      createTile('pin', 7, 'pin7-0'),
+      createTile('sou', 2, 'sou2-0'),
+      createTile('sou', 2, 'sou2-1'),
+      createTile('sou', 2, 'sou2-2'),
+      createTile('man', 8, 'man8-0'),
+      createTile('man', 8, 'man8-1'),
+      createTile('man', 8, 'man8-2'),
+      createTile('pin', 3, 'pin3-0')
+    ]
+
+    it('同じ入力は手牌の並び順によらずキャッシュから返す', () => {
+      clearScoringCache()
+      const input = {
+        winningTile: createTile('pin', 3, 'pin3-1'),
+        isTsumo: false,
+        isRiichi: true,
+        doraIndicators: [createTile('man', 1, 'man1-dora')],
+        uradoraIndicators: [],
+        isDealer: false
+      }
+
+      const first = calculateScore({ ...input, hand: createRonHand() })
+      const second = calculateScore({ ...input, hand: createRonHand().reverse() })
+
+      expect(first).not.toBeNull()
+      expect(second).toEqual(first)
+      expect(getScoringCacheStats().misses).toBe(1)
+      expect(getScoringCacheStats().hits).toBe(1)
+
+      // 返した結果を書き換えてもキャッシュには影響しない
+      first!.yaku.length = 0
+      expect(calculateScore({ ...input, hand: createRonHand() })).toEqual(second)
+    })
+
+    it('フラグやドラが異なる入力は別々に計算する', () => {
+      clearScoringCache()
+      const input = {
+        hand: createRonHand(),
+        winningTile: createTile('pin', 3, 'pin3-1'),
+        isTsumo: false,
+        doraIndicators: [],
+        uradoraIndicators: [],
+        isDealer: false
+      }
+
+      const withoutRiichi = calculateScore({ ...input, isRiichi: false })
+      const withRiichi = calculateScore({ ...input, isRiichi: true })
+      const dealer = calculateScore({ ...input, isRiichi: false, isDealer: true })
+      const withDora = calculateScore({ ...input, isRiichi: false, doraIndicators: [createTile('man', 1, 'man1-dora')] })
+
+      expect(withRiichi!.han).toBeGreaterThan(withoutRiichi!.han)
+      expect(dealer!.points).toBeGreaterThan(withoutRiichi!.points)
+      expect(withDora!.han).toBeGreaterThan(withoutRiichi!.han)
+      expect(getScoringCacheStats().hits).toBe(0)
+      expect(getScoringCacheStats().misses).toBe(4)
+    })
+  })
 })
\ No newline at end of file
@@ -0,0 +1,146 @@
+import { describe, it, expect } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import {
+  initMahjongCalculatorSync,
+  calculateShantenFromCounts,
+  getUsefulTilesFromCounts
+} from '../mahjong-calculator-wrapper'
+import { calculateShantenFromTable, getUsefulTilesFromTable, ShantenEvaluator } from '../shanten-table'
+import { calculateShanten } from '../mahjong-logic'
+import { createRandom } from '../random'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+// '123m456p789s11z' 形式の表記を34種の枚数配列にする
+function parseCounts(notation: string): Uint8Array {
+  const counts = new Uint8Array(34)
+  const offsets: Record<string, number> = { m: 0, p: 9, s: 18, z: 27 }
+  let ranks: number[] = []
+  for (const char of notation) {
+    if (char in offsets) {
+      for (const rank of ranks) counts[offsets[char] + rank - 1]++
+      ranks = []
+    } else {
+      ranks.push(parseInt(char, 10))
+    }
+  }
+  return counts
+}
+
+function randomCounts(random: () => number, size: number, kinds: number): Uint8Array {
+  const counts = new Uint8Array(34)
+  let total = 0
+  while (total < size) {
+    const index = Math.floor(random() * kinds)
+    if (counts[index] < 4) {
+      counts[index]++
+      total++
+    }
+  }
+  return counts
+}
+
+describe('テーブル参照によるシャンテン数計算', () => {
+  it('WASM初期化前でも mahjong-logic でシャンテン数を計算できる', () => {
+    const tiles = [1, 2, 3, 4, 5, 6, 7, 8, 9].map(rank => ({ suit: 'man', rank, id: `m${rank}` }))
+    tiles.push({ suit: 'pin', rank: 1, id: 'p1' }, { suit: 'pin', rank: 2, id: 'p2' }, { suit: 'pin', rank: 3, id: 'p3' })
+    tiles.push({ suit: 'honor', rank: 1, id: 'z1' })
+
+    expect(calculateShanten(tiles as any)).toBe(0)
+    expect(calculateShanten([...tiles, { suit: 'honor', rank: 1, id: 'z1-2' }] as any)).toBe(-1)
+  })
+
+  it('一般形・七対子・国士無双のシャンテン数', () => {
+    expect(calculateShantenFromTable(parseCounts('123456789m123p11z'))).toBe(-1)
+    expect(calculateShantenFromTable(parseCounts('1122m3344p5566s7z'))).toBe(0)
+    expect(calculateShantenFromTable(parseCounts('19m19p19s1234567z'))).toBe(0)
+    expect(calculateShantenFromTable(parseCounts('19m19p19s12345677z'))).toBe(-1)
+    expect(calculateShantenFromTable(new Uint8Array(34))).toBe(8)
+  })
+
+  it('受け入れ牌を求める', () => {
+    expect(getUsefulTilesFromTable(parseCounts('123456789m123p1z'))).toEqual([27])
+    // 1シャンテン: 1p の対子・搭子、東の刻子
+    expect(getUsefulTilesFromTable(parseCounts('123456789m1p11z'))).toEqual([9, 10, 11, 27])
+  })
+
+  it('ランダムな手牌でWASMと同じ結果になる', () => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+    const random = createRandom('shanten-table')
+
+    for (const size of [14, 13, 11, 10, 8, 7, 5, 2, 1]) {
+      for (let n = 0; n < 150; n++) {
+        // 全種類・1色・2色の手牌を混ぜる
+        const counts = randomCounts(random, size, [34, 9, 18][n % 3])
+        expect(calculateShantenFromTable(counts)).toBe(calculateShantenFromCounts(counts))
+        if (size === 13) {
+          expect(getUsefulTilesFromTable(counts)).toEqual(getUsefulTilesFromCounts(counts))
+        }
+      }
+    }
+  })
+})
+
+describe('ShantenEvaluator（差分計算）', () => {
+  it('牌を加える・除く場合のシャンテン数を求める', () => {
+    const evaluator = new ShantenEvaluator(parseCounts('123456789m123p1z'))
+    expect(evaluator.shanten).toBe(0)
+    expect(evaluator.shantenIfAdded(27)).toBe(-1)
+    expect(evaluator.shantenIfRemoved(27)).toBe(0)
+    expect(evaluator.shantenIfRemoved(4)).toBe(1)
+    expect(evaluator.getUsefulTiles()).toEqual([27])
+
+    // 問い合わせでは手牌は変わらない
+    expect(Array.from(evaluator.counts)).toEqual(Array.from(parseCounts('123456789m123p1z')))
+
+    evaluator.add(27)
+    expect(evaluator.shanten).toBe(-1)
+    evaluator.remove(0)
+    expect(evaluator.shanten).toBe(0)
+  })
+
+  it('ランダムな増減で毎回計算し直した結果と一致する', () => {
+    const random = createRandom('shanten-evaluator')
+    const discardShanten = new Int8Array(34)
+    const usefulMask = new Uint32Array(2)
+
+    for (let n = 0; n < 60; n++) {
+      const counts = randomCounts(random, 13, [34, 9, 18][n % 3])
+      const evaluator = new ShantenEvaluator(counts)
+
+      for (let step = 0; step < 20; step++) {
+        const index = Math.floor(random() * 34)
+        if (counts[index] < 4) {
+          counts[index]++
+          expect(evaluator.shantenIfAdded(index)).toBe(calculateShantenFromTable(counts))
+          evaluator.add(index)
+        }
+        expect(evaluator.shanten).toBe(calculateShantenFromTable(counts))
+
+        evaluator.getDiscardShanten(discardShanten)
+        for (let i = 0; i < 34; i++) {
+          if (counts[i] === 0) continue
+          counts[i]--
+          expect(discardShanten[i]).toBe(calculateShantenFromTable(counts))
+          counts[i]++
+        }
+
+        // 手牌にある牌を1枚除く
+        let remove = Math.floor(random() * 34)
+        while (counts[remove] === 0) remove = (remove + 1) % 34
+        counts[remove]--
+        evaluator.remove(remove)
+        expect(evaluator.shanten).toBe(calculateShantenFromTable(counts))
+        expect(evaluator.getUsefulTiles()).toEqual(getUsefulTilesFromTable(counts))
+
+        evaluator.getUsefulTileMask(usefulMask)
+        const fromMask: number[] = []
+        for (let i = 0; i < 34; i++) {
+          if (usefulMask[i >>> 5] & (1 << (i & 31))) fromMask.push(i)
+        }
+        expect(fromMask).toEqual(getUsefulTilesFromTable(counts))
+      }
+    }
+  })
+})
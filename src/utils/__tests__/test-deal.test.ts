@@ -0,0 +1,34 @@
+import { describe, it, expect } from 'vitest'
+import { encodeTestDeal, decodeTestDeal, validateTestDeal, parseTileList } from '../test-deal'
+
+describe('test-deal', () => {
+  const players = [
+    { tiles: ['1m', '1m', '1m', '1m', '2p', '3p', '4p', '5p', '6p', '7p', '8p', '9p', '9p'], drawTiles: ['1p', '9p'] },
+    { tiles: ['1m', '2m', '3m', '1p', '2p', '3p', '1s', '2s', '3s', 'ton', 'nan', 'sha', 'pei'], drawTiles: ['haku'] },
+    { tiles: [], drawTiles: [] },
+    { tiles: [], drawTiles: [] }
+  ]
+
+  it('エンコードした配牌を復元できる', () => {
+    expect(decodeTestDeal(encodeTestDeal(players))).toEqual(players)
+  })
+
+  it('省略されたプレイヤーは空の配牌で補完される', () => {
+    const decoded = decodeTestDeal('1m,2m|3m')
+
+    expect(decoded).toHaveLength(4)
+    expect(decoded[0]).toEqual({ tiles: ['1m', '2m'], drawTiles: ['3m'] })
+    expect(decoded[3]).toEqual({ tiles: [], drawTiles: [] })
+  })
+
+  it('空白区切りとカンマ区切りの両方を受け付ける', () => {
+    expect(parseTileList(' 1m 2m,3m  4m ')).toEqual(['1m', '2m', '3m', '4m'])
+  })
+
+  it('手牌枚数を検証する', () => {
+    expect(validateTestDeal(players)).toBeNull()
+    expect(validateTestDeal([{ tiles: ['1m'], drawTiles: [] }])).toContain('プレイヤー1')
+    expect(validateTestDeal([{ tiles: [], drawTiles: [] }])).toContain('プレイヤー1')
+    expect(validateTestDeal([])).not.toBeNull()
+  })
+})
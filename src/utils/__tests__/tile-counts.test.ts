@@ -0,0 +1,121 @@
+import { describe, it, expect, beforeAll, beforeEach } from 'vitest'
+import { readFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { initMahjongCalculatorSync, calculateAcceptanceSync } from '../mahjong-calculator-wrapper'
+import { GameManager } from '../game-manager'
+import { CpuAI } from '../cpu-ai'
+import { TileCountTracker } from '../tile-counts'
+import type { Tile } from '../../stores/fourPlayerMahjong'
+
+const WASM_PATH = fileURLToPath(new URL('../../mahjong_calculator_rs/mahjong_calculator_rs_bg.wasm', import.meta.url))
+
+// 差分更新した枚数と、その時点の手牌・河・鳴き牌から数え直した枚数が一致するか
+function expectCountsConsistent(manager: GameManager) {
+  const fresh = new TileCountTracker()
+  const drawnTile = manager.currentDrawnTile
+  fresh.rebuild(manager.players, manager.doraIndicators, drawnTile, drawnTile ? manager.currentPlayerIndex : -1)
+
+  for (let player = 0; player < 4; player++) {
+    expect(Array.from(manager.tileCounts.hands[player])).toEqual(Array.from(fresh.hands[player]))
+    expect(Array.from(manager.tileCounts.rivers[player])).toEqual(Array.from(fresh.rivers[player]))
+    expect(Array.from(manager.tileCounts.melds[player])).toEqual(Array.from(fresh.melds[player]))
+  }
+  expect(Array.from(manager.tileCounts.visible)).toEqual(Array.from(fresh.visible))
+}
+
+describe('34種の牌の枚数の差分更新', () => {
+  beforeAll(() => {
+    initMahjongCalculatorSync(readFileSync(WASM_PATH))
+  })
+
+  beforeEach(() => {
+    localStorage.clear()
+  })
+
+  it('ツモ・打牌・鳴き・カンドラの後も数え直した枚数と一致する', () => {
+    const manager = new GameManager({ gameSettings: {}, seed: 'counts', recordResults: false })
+    manager.startNewGame()
+    expectCountsConsistent(manager)
+
+    const ais = [0, 1, 2, 3].map(() => new CpuAI('super', manager.random))
+    for (let turn = 0; turn < 20; turn++) {
+      const playerIndex = manager.currentPlayerIndex
+      if (!manager.currentDrawnTile) {
+        manager.drawTileAndKeepSeparate(playerIndex)
+      }
+      const tileId = ais[playerIndex].decideTileToDiscard(
+        manager.players[playerIndex], manager.currentDrawnTile, manager.getVisibleTileCounts(playerIndex)
+      )
+      expect(manager.discardTile(playerIndex, tileId)).toBe(true)
+      expectCountsConsistent(manager)
+
+      if (turn === 5) {
+        // 対面がポン（画面側と同じく、手牌・捨て牌からの除去は呼び出し側で行う）
+        const calledTile = manager.lastDiscardedTile!
+        const caller = (playerIndex + 2) % 4
+        const handTiles = manager.players[caller].tiles.splice(0, 2)
+        manager.players[playerIndex].discards.pop()
+        manager.addMeld(caller, { type: 'pon', tiles: [...handTiles, calledTile], calledTile, fromPlayer: playerIndex })
+        manager.currentPlayerIndex = caller
+        expectCountsConsistent(manager)
+        manager.discardTile(caller, manager.players[caller].tiles[0].id)
+      }
+      if (turn === 9) {
+        manager.addKanDoraIndicator()
+        expectCountsConsistent(manager)
+      }
+
+      manager.nextTurn()
+    }
+
+    manager.advanceToNextRound()
+    expectCountsConsistent(manager)
+  })
+
+  it('見えている枚数から残り枚数を求める', () => {
+    const manager = new GameManager({ gameSettings: {}, seed: 'remaining', recordResults: false })
+    manager.startNewGame()
+
+    const player = manager.players[0]
+    const tiles = manager.currentDrawnTile && manager.currentPlayerIndex === 0
+      ? [...player.tiles, manager.currentDrawnTile]
+      : player.tiles
+    const visibleTiles: Tile[] = [...tiles, ...manager.doraIndicators]
+
+    for (let tileIndex = 0; tileIndex < 34; tileIndex++) {
+      const expected = 4 - visibleTiles.filter(tile => tileIndexOf(tile) === tileIndex).length
+      expect(manager.getRemainingTileCount(0, tileIndex)).toBe(Math.max(0, expected))
+    }
+  })
+
+  it('受け入れ計算は牌の配列と枚数配列で同じ結果になる', () => {
+    const tiles = toTiles(['1m', '2m', '3m', '4p', '5p', '6p', '7s', '8s', '9s', '1z', '1z', '5m', '6m', '9p'])
+    const extraVisible = toTiles(['4m', '4m', '7m'], 'v')
+
+    const fromTiles = calculateAcceptanceSync(tiles, [...tiles, ...extraVisible])
+
+    const counts = new TileCountTracker()
+    counts.rebuild([{ tiles, discards: extraVisible, melds: [] }], [])
+    const fromCounts = calculateAcceptanceSync(tiles, counts.visibleFor(0))
+
+    expect(fromCounts.map(info => [info.tileIndex, info.remainingCounts])).toEqual(
+      fromTiles.map(info => [info.tileIndex, info.remainingCounts])
+    )
+    expect(fromCounts.length).toBeGreaterThan(0)
+  })
+})
+
+function tileIndexOf(tile: Tile): number {
+  const offset = { man: 0, pin: 9, sou: 18, honor: 27 }[tile.suit]
+  return offset + tile.rank - 1
+}
+
+function toTiles(notations: string[], prefix: string = 't'): Tile[] {
+  const suits = { m: 'man', p: 'pin', s: 'sou', z: 'honor' } as const
+  return notations.map((notation, index) => ({
+    id: `${prefix}${index}`,
+    suit: suits[notation[1] as keyof typeof suits],
+    rank: parseInt(notation[0], 10),
+    isRed: false
+  }))
+}
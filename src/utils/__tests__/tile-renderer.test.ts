@@ -1,5 +1,5 @@
 import { describe, it, expect } from 'vitest'
-import { getTileText, getTileImagePath, getTileImagePathYoko, getTileImageUrl } from '../tile-renderer'
+import { getTileText, getTileImagePath, getTileImagePathYoko, getTileImageUrl, getTileImageName, getTileSprite, getTileSpriteStyle } from '../tile-renderer'
 import type { Tile } from '../stores/fourPlayerMahjong'
 
 describe('tile-renderer', () => {
@@ -188,4 +188,52 @@ describe('tile-renderer', () => {
       })
     })
   })
-})
\ No newline at end of file
+
+  describe('getTileSprite', () => {
+    it('赤ドラ・字牌・横向きの画像名を返す', () => {
+      expect(getTileImageName({ suit: 'pin', rank: 5, id: 'red5p', isRed: true })).toBe('0p')
+      expect(getTileImageName({ suit: 'honor', rank: 6, id: 'green' })).toBe('d2')
+      expect(getTileImageName({ suit: 'sou', rank: 3, id: '3s' }, true)).toBe('s3-yoko')
+    })
+
+    it('縦向き・横向きの牌をそれぞれのシートから返す', () => {
+      const tile: Tile = { suit: 'man', rank: 1, id: '1m' }
+      const upright = getTileSprite(tile)!
+      const yoko = getTileSprite(tile, { isYoko: true })!
+
+      expect(upright.url).toContain('tiles/atlas.png')
+      expect(yoko.url).toContain('tiles/atlas-yoko.png')
+      expect(upright.width).toBe(yoko.height)
+      expect(upright.height).toBe(yoko.width)
+    })
+
+    it('全ての牌がシート内の重ならない位置にある', () => {
+      const positions = new Set<string>()
+      for (const suit of ['man', 'pin', 'sou'] as const) {
+        for (let rank = 1; rank <= 9; rank++) {
+          const sprite = getTileSprite({ suit, rank, id: `${suit}${rank}` })!
+          expect(sprite.x + sprite.width).toBeLessThanOrEqual(sprite.sheetWidth)
+          expect(sprite.y + sprite.height).toBeLessThanOrEqual(sprite.sheetHeight)
+          positions.add(`${sprite.x},${sprite.y}`)
+        }
+      }
+      for (let rank = 1; rank <= 7; rank++) {
+        const sprite = getTileSprite({ suit: 'honor', rank, id: `honor${rank}` })!
+        positions.add(`${sprite.x},${sprite.y}`)
+      }
+      expect(positions.size).toBe(34)
+    })
+
+    it('シートにない牌は null を返す', () => {
+      const tile = { suit: 'honor', rank: 8, id: 'invalid' } as any
+      expect(getTileSprite(tile)).toBeNull()
+    })
+
+    it('背景の位置・大きさを要素の大きさに対する割合で返す', () => {
+      const style = getTileSpriteStyle({ url: '/tiles/atlas.png', x: 66, y: 90, width: 66, height: 90, sheetWidth: 198, sheetHeight: 180 })
+      expect(style.backgroundImage).toBe('url(/tiles/atlas.png)')
+      expect(style.backgroundSize).toBe('300% 200%')
+      expect(style.backgroundPosition).toBe('50% 100%')
+    })
+  })
+})
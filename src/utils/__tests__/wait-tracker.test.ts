@@ -0,0 +1,125 @@
+import { describe, it, expect } from 'vitest'
+import { WaitTracker } from '../wait-tracker'
+import { getTileIndex, convertTilesToRustFormat } from '../mahjong-calculator-wrapper'
+import type { Tile } from '../../stores/fourPlayerMahjong'
+
+function createTiles(notation: string, prefix: string = 'tile'): Tile[] {
+  const suitByChar: Record<string, Tile['suit']> = { m: 'man', p: 'pin', s: 'sou', z: 'honor' }
+  const tiles: Tile[] = []
+  let ranks: number[] = []
+  for (const char of notation) {
+    if (char in suitByChar) {
+      for (const rank of ranks) tiles.push({ id: `${prefix}-${char}${rank}-${tiles.length}`, suit: suitByChar[char], rank, isRed: false })
+      ranks = []
+    } else {
+      ranks.push(parseInt(char, 10))
+    }
+  }
+  return tiles
+}
+
+function tileIndex(notation: string): number {
+  return getTileIndex(createTiles(notation)[0])
+}
+
+function handCounts(notation: string): Uint8Array {
+  return convertTilesToRustFormat(createTiles(notation))
+}
+
+describe('待ち牌・フリテンの保持', () => {
+  it('テンパイの手牌の待ち牌を求める', () => {
+    const waits = new WaitTracker()
+    // 23m456p789s11z + 234s: 1m4m 待ち
+    expect(waits.update(1, handCounts('23m456p234789s11z'), 0, [])).toBe(true)
+
+    expect(waits.isWaitingOn(1, tileIndex('1m'))).toBe(true)
+    expect(waits.isWaitingOn(1, tileIndex('4m'))).toBe(true)
+    expect(waits.isWaitingOn(1, tileIndex('5m'))).toBe(false)
+    expect(waits.isFuriten(1)).toBe(false)
+  })
+
+  it('テンパイでない手牌・枚数が合わない手牌は待ち牌なし', () => {
+    const waits = new WaitTracker()
+    expect(waits.update(0, handCounts('159m159p159s1234z'), 0, [])).toBe(true)
+    expect(waits.waitMask(0)).toEqual(new Uint32Array(2))
+
+    expect(waits.update(0, handCounts('23m456p234789s111z'), 0, [])).toBe(false)
+    expect(waits.update(0, handCounts('23m456p234789s11z'), 1, [])).toBe(false)
+  })
+
+  it('鳴きがある手牌は鳴いた面子を含めてテンパイを判定する', () => {
+    const waits = new WaitTracker()
+
+    // 1副露: 123m456p789s1z の東単騎
+    expect(waits.update(0, handCounts('123m456p789s1z'), 1, [])).toBe(true)
+    expect(waits.isWaitingOn(0, tileIndex('1z'))).toBe(true)
+    expect(waits.isWaitingOn(0, tileIndex('2z'))).toBe(false)
+
+    // 2副露: 456p23s11z の1s4s待ち
+    expect(waits.update(1, handCounts('456p23s11z'), 2, [])).toBe(true)
+    expect(waits.isWaitingOn(1, tileIndex('1s'))).toBe(true)
+    expect(waits.isWaitingOn(1, tileIndex('4s'))).toBe(true)
+    expect(waits.isWaitingOn(1, tileIndex('1z'))).toBe(false)
+
+    // 3副露: 11m22p のシャンポン待ち（七対子としては数えない）
+    expect(waits.update(2, handCounts('11m22p'), 3, [])).toBe(true)
+    expect(waits.isWaitingOn(2, tileIndex('1m'))).toBe(true)
+    expect(waits.isWaitingOn(2, tileIndex('2p'))).toBe(true)
+    expect(waits.isWaitingOn(2, tileIndex('3p'))).toBe(false)
+
+    // 4副露: 裸単騎
+    expect(waits.update(3, handCounts('7z'), 4, [])).toBe(true)
+    expect(waits.isWaitingOn(3, tileIndex('7z'))).toBe(true)
+    expect(waits.isWaitingOn(3, tileIndex('6z'))).toBe(false)
+  })
+
+  it('鳴きがある手牌でも面子・搭子が多すぎる形はテンパイとしない', () => {
+    const waits = new WaitTracker()
+    // 1副露: 123m456p の2面子と 13s・78s の2搭子で雀頭がない（鳴きと合わせて5ブロックのため1シャンテン）
+    expect(waits.update(0, handCounts('123m456p1378s'), 1, [])).toBe(true)
+    expect(waits.waitMask(0)).toEqual(new Uint32Array(2))
+  })
+
+  it('鳴きがある手牌でも河に待ち牌があればフリテン', () => {
+    const waits = new WaitTracker()
+    const discards = createTiles('9p', 'river')
+
+    waits.update(1, handCounts('7z'), 4, discards)
+    expect(waits.isFuriten(1)).toBe(false)
+
+    discards.push(...createTiles('7z', 'river2'))
+    waits.update(1, handCounts('7z'), 4, discards)
+    expect(waits.isFuriten(1)).toBe(true)
+  })
+
+  it('河に待ち牌があればフリテン、手牌が変われば判定し直す', () => {
+    const waits = new WaitTracker()
+    const hand = handCounts('23m456p234789s11z')
+    const discards = createTiles('9p1z', 'river')
+
+    waits.update(2, hand, 0, discards)
+    expect(waits.isFuriten(2)).toBe(false)
+
+    // 河に4mを追加（追加分だけ照合する）
+    discards.push(...createTiles('4m', 'river2'))
+    waits.update(2, hand, 0, discards)
+    expect(waits.isFuriten(2)).toBe(true)
+
+    // 3mを切って東を引く: 2m単騎に変わり、河の4mは待ち牌でなくなる
+    hand[tileIndex('3m')]--
+    hand[tileIndex('1z')]++
+    waits.update(2, hand, 0, discards)
+    expect(waits.isWaitingOn(2, tileIndex('4m'))).toBe(false)
+    expect(waits.isWaitingOn(2, tileIndex('2m'))).toBe(true)
+    expect(waits.isFuriten(2)).toBe(false)
+
+    discards.push(...createTiles('2m', 'river3'))
+    waits.update(2, hand, 0, discards)
+    expect(waits.isFuriten(2)).toBe(true)
+
+    // 鳴かれて河から2mが消えた場合は河を数え直す
+    discards.pop()
+    waits.update(2, hand, 0, discards)
+    expect(waits.isFuriten(2)).toBe(false)
+  })
+})
@@ -0,0 +1,111 @@
+import { describe, it, expect } from 'vitest'
+import { Wall, DEAD_WALL_SIZE } from '../wall'
+import type { Tile } from '../../stores/fourPlayerMahjong'
+
+const SUITS: Tile['suit'][] = ['man', 'pin', 'sou', 'honor']
+
+// 136枚の牌を決まった順序で並べ替えた牌山
+function createTiles(): Tile[] {
+  const tiles: Tile[] = []
+  for (const suit of SUITS) {
+    const maxRank = suit === 'honor' ? 7 : 9
+    for (let rank = 1; rank <= maxRank; rank++) {
+      for (let copy = 0; copy < 4; copy++) {
+        tiles.push({ id: `${suit}-${rank}-${copy}`, suit, rank, isRed: false })
+      }
+    }
+  }
+  // 色が偏らないよう 7 個おきに並べ替える（136 と 7 は互いに素）
+  return tiles.map((_, index) => tiles[(index * 7) % tiles.length])
+}
+
+describe('牌山', () => {
+  it('配列の牌山と同じ順序で先頭・末尾・指定位置の牌を引ける', () => {
+    const tiles = createTiles()
+    const wall = new Wall(tiles)
+    const expected = tiles.slice()
+
+    expect(wall.shift()).toBe(expected.shift())
+    expect(wall.pop()).toBe(expected.pop())
+    expect(wall.remove(expected[50].id)).toBe(expected.splice(50, 1)[0])
+    expect(wall.remove(expected[0].id)).toBe(expected.splice(0, 1)[0])
+
+    expect(wall.length).toBe(expected.length)
+    expect(wall.at(10)).toBe(expected[10])
+    expect(wall.fromEnd(1)).toBe(expected[expected.length - 2])
+    expect(wall.toArray()).toEqual(expected)
+    expect(wall.shift()).toBe(expected.shift())
+  })
+
+  it('山にない牌は除けない', () => {
+    const tiles = createTiles()
+    const wall = new Wall(tiles)
+
+    expect(wall.remove(tiles[3].id)).toBe(tiles[3])
+    expect(wall.remove(tiles[3].id)).toBeNull()
+    expect(wall.remove('unknown')).toBeNull()
+    expect(wall.has(tiles[3].id)).toBe(false)
+    expect(wall.length).toBe(135)
+  })
+
+  it('除いた牌を元の位置に戻せる', () => {
+    const tiles = createTiles()
+    const wall = new Wall(tiles)
+
+    wall.remove(tiles[0].id)
+    wall.remove(tiles[70].id)
+    wall.restore(tiles[70].id)
+    wall.restore(tiles[0].id)
+
+    expect(wall.toArray()).toEqual(tiles)
+    expect(wall.shift()).toBe(tiles[0])
+  })
+
+  it('色ごと・牌種ごとの残りの牌を山の並び順で取り出せる', () => {
+    const tiles = createTiles()
+    const wall = new Wall(tiles)
+    wall.shift()
+    const remaining = tiles.slice(1)
+
+    const pinTiles = remaining.filter(tile => tile.suit === 'pin')
+    expect(wall.countOfSuit('pin')).toBe(pinTiles.length)
+    expect(wall.atInSuit('pin', 5)).toBe(pinTiles[5])
+
+    const souFive = remaining.filter(tile => tile.suit === 'sou' && tile.rank === 5)
+    expect(wall.atInType(22, 1)).toBe(souFive[1])
+    expect(wall.atInType(22, souFive.length)).toBeUndefined()
+    expect(wall.typeRemaining[0]).toBe(remaining.filter(tile => tile.suit === 'man' && tile.rank === 1).length)
+  })
+
+  it('スロットで試し引きした牌を戻すと元の牌山に戻る', () => {
+    const tiles = createTiles()
+    const wall = new Wall(tiles)
+
+    const first = wall.slotAt(20)
+    wall.removeSlot(first)
+    const second = wall.slotAtInSuit('honor', 3)
+    wall.removeSlot(second)
+
+    expect(wall.tileOfSlot(first)).toBe(tiles[20])
+    expect(wall.tileOfSlot(second)).toBe(tiles.filter(tile => tile.suit === 'honor')[3])
+    expect(tiles[20].id).toBe('man-2-0')
+    expect(wall.typeOfSlot(first)).toBe(1)
+    expect(wall.length).toBe(134)
+
+    wall.restoreSlot(second)
+    wall.restoreSlot(first)
+    expect(wall.toArray()).toEqual(tiles)
+  })
+
+  it('王牌を除いた枚数をツモ可能な枚数とする', () => {
+    const wall = new Wall(createTiles())
+    expect(wall.liveLength).toBe(136 - DEAD_WALL_SIZE)
+
+    while (wall.length > 10) wall.shift()
+    expect(wall.liveLength).toBe(0)
+
+    wall.reset([])
+    expect(wall.length).toBe(0)
+    expect(wall.shift()).toBeUndefined()
+  })
+})
@@ -0,0 +1,35 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+const { initMahjongCalculator } = vi.hoisted(() => ({ initMahjongCalculator: vi.fn(async () => {}) }))
+
+vi.mock('../mahjong-calculator-wrapper', () => ({ initMahjongCalculator }))
+// scoring は riichi-rs-bundlers（WASM）を読み込むためモックする
+vi.mock('../scoring', () => ({}))
+
+describe('対局画面のWASMの先読み', () => {
+  beforeEach(() => {
+    vi.resetModules()
+    initMahjongCalculator.mockReset()
+    initMahjongCalculator.mockImplementation(async () => {})
+  })
+
+  it('何度呼んでも初期化は1回だけ', async () => {
+    const { preloadMahjongWasm } = await import('../wasm-preload')
+
+    await Promise.all([preloadMahjongWasm(), preloadMahjongWasm()])
+    await preloadMahjongWasm()
+
+    expect(initMahjongCalculator).toHaveBeenCalledTimes(1)
+    expect(performance.getEntriesByName('haisosa:wasm-preload', 'measure').length).toBeGreaterThan(0)
+  })
+
+  it('初期化に失敗した場合は次の呼び出しで読み込み直す', async () => {
+    const { preloadMahjongWasm } = await import('../wasm-preload')
+    initMahjongCalculator.mockRejectedValueOnce(new Error('fetch failed'))
+
+    await expect(preloadMahjongWasm()).rejects.toThrow('fetch failed')
+    await preloadMahjongWasm()
+
+    expect(initMahjongCalculator).toHaveBeenCalledTimes(2)
+  })
+})
@@ -0,0 +1,157 @@
+// 受け入れ計算用 Web Worker（acceptance-worker.ts）の呼び出し側
+// 手牌・見えている牌の枚数配列を転送して計算を依頼し、結果のフラット配列を受け取る
+import {
+  initMahjongCalculator,
+  calculateDiscardAcceptanceBatch,
+  getDiscardBatchLength
+} from './mahjong-calculator-wrapper'
+import { spanStart, spanEnd } from './profiler'
+
+export interface AcceptanceWorkerRequest {
+  type: 'acceptance'
+  id: number
+  handCounts: Uint8Array
+  visibleCounts: Uint8Array
+  maxShanten: number
+}
+
+export interface AcceptanceWorkerCancel {
+  type: 'cancel'
+  id: number
+}
+
+export type AcceptanceWorkerMessage = AcceptanceWorkerRequest | AcceptanceWorkerCancel
+
+export interface AcceptanceWorkerResponse {
+  id: number
+  batch?: Int8Array
+  cancelled?: boolean
+  error?: string
+}
+
+interface PendingRequest {
+  resolve: (batch: Int8Array | null) => void
+  // Worker が使えなくなった時にメインスレッドで計算し直すための入力（転送した配列は使えなくなるため別に保持する）
+  handCounts: Uint8Array
+  visibleCounts: Uint8Array
+  maxShanten: number
+}
+
+function createAcceptanceWorker(): Worker {
+  return new Worker(new URL('./acceptance-worker.ts', import.meta.url), { type: 'module' })
+}
+
+/**
+ * 受け入れ計算を Web Worker で実行する
+ * 新しい要求を出すと以前の要求はキャンセルされ、null で解決される
+ * Worker が使えない環境（Node.js等）や Worker の読み込みに失敗した場合はメインスレッドで計算する
+ */
+export class AcceptanceWorkerClient {
+  private createWorker: () => Worker
+  private worker: Worker | null = null
+  private workerUnavailable = false
+  private nextId = 1
+  private pending = new Map<number, PendingRequest>()
+
+  constructor(createWorker?: () => Worker) {
+    this.createWorker = createWorker ?? createAcceptanceWorker
+    this.workerUnavailable = !createWorker && typeof Worker === 'undefined'
+  }
+
+  /**
+   * 打牌ごとの受け入れ計算（calculateDiscardAcceptanceBatch）を依頼する
+   * @returns 結果のフラット配列（使われている部分のみ）。キャンセルされた場合は null
+   */
+  request(handCounts: Uint8Array, visibleCounts: Uint8Array, maxShanten: number = 8): Promise<Int8Array | null> {
+    this.cancel()
+
+    const worker = this.getWorker()
+    if (!worker) {
+      return computeOnMainThread(handCounts, visibleCounts, maxShanten)
+    }
+
+    const id = this.nextId++
+    const hand = handCounts.slice()
+    const visible = visibleCounts.slice()
+    const message: AcceptanceWorkerRequest = { type: 'acceptance', id, handCounts: hand, visibleCounts: visible, maxShanten }
+
+    // 依頼から結果を受け取るまで（Worker内の計算はメインスレッドの計測に含まれないため、往復の時間を計測する）
+    const start = spanStart()
+    return new Promise<Int8Array | null>(resolve => {
+      this.pending.set(id, { resolve, handCounts: handCounts.slice(), visibleCounts: visibleCounts.slice(), maxShanten })
+      worker.postMessage(message, [hand.buffer, visible.buffer])
+    }).then(batch => {
+      if (batch) spanEnd('calculateAcceptance.worker', start)
+      return batch
+    })
+  }
+
+  /**
+   * 実行中・待機中の要求をキャンセルする（Worker 側では未着手の要求を計算せずに捨てる）
+   */
+  cancel(): void {
+    for (const [id, pending] of this.pending) {
+      const message: AcceptanceWorkerCancel = { type: 'cancel', id }
+      this.worker?.postMessage(message)
+      pending.resolve(null)
+    }
+    this.pending.clear()
+  }
+
+  dispose(): void {
+    this.cancel()
+    this.worker?.terminate()
+    this.worker = null
+  }
+
+  private getWorker(): Worker | null {
+    if (this.worker || this.workerUnavailable) {
+      return this.worker
+    }
+
+    try {
+      const worker = this.createWorker()
+      worker.onmessage = (event: MessageEvent<AcceptanceWorkerResponse>) => this.handleResponse(event.data)
+      worker.onerror = (event) => {
+        console.warn('受け入れ計算Workerでエラーが発生しました。メインスレッドで計算します。', event)
+        this.fallBackToMainThread()
+      }
+      this.worker = worker
+    } catch (error) {
+      console.warn('受け入れ計算Workerを起動できません。メインスレッドで計算します。', error)
+      this.workerUnavailable = true
+    }
+    return this.worker
+  }
+
+  private handleResponse(response: AcceptanceWorkerResponse): void {
+    const pending = this.pending.get(response.id)
+    if (!pending) {
+      // キャンセル済みの要求
+      return
+    }
+    this.pending.delete(response.id)
+
+    if (response.error) {
+      console.error('受け入れ計算エラー:', response.error)
+    }
+    pending.resolve(response.batch ?? null)
+  }
+
+  private fallBackToMainThread(): void {
+    this.worker?.terminate()
+    this.worker = null
+    this.workerUnavailable = true
+
+    for (const pending of this.pending.values()) {
+      computeOnMainThread(pending.handCounts, pending.visibleCounts, pending.maxShanten).then(pending.resolve)
+    }
+    this.pending.clear()
+  }
+}
+
+async function computeOnMainThread(handCounts: Uint8Array, visibleCounts: Uint8Array, maxShanten: number): Promise<Int8Array> {
+  await initMahjongCalculator()
+  const batch = calculateDiscardAcceptanceBatch(handCounts.slice(), visibleCounts, maxShanten)
+  return batch.slice(0, getDiscardBatchLength(batch))
+}
@@ -0,0 +1,61 @@
+// 受け入れ計算用の Web Worker
+// WASMの初期化は起動時に1回だけ行い、打牌ごとの受け入れ計算をメインスレッドの外で実行する
+import {
+  initMahjongCalculator,
+  calculateDiscardAcceptanceBatch,
+  getDiscardBatchLength
+} from './mahjong-calculator-wrapper'
+import type { AcceptanceWorkerMessage, AcceptanceWorkerRequest, AcceptanceWorkerResponse } from './acceptance-worker-client'
+
+const scope = self as unknown as Worker
+const ready = initMahjongCalculator()
+
+// キャンセルされた要求ID
+const cancelledIds = new Set<number>()
+// 受け取った中で最新の要求ID（これより古い要求は計算しない）
+let latestId = 0
+// 処理済みの最新の要求ID（これ以前の要求へのキャンセルは保持しない）
+let processedId = 0
+
+scope.onmessage = (event: MessageEvent<AcceptanceWorkerMessage>) => {
+  const message = event.data
+  if (message.type === 'cancel') {
+    if (message.id > processedId) {
+      cancelledIds.add(message.id)
+    }
+    return
+  }
+
+  latestId = Math.max(latestId, message.id)
+  // 計算の前に、後から届いているキャンセル・新しい要求を先に受け取る
+  setTimeout(() => {
+    void handleRequest(message)
+  }, 0)
+}
+
+async function handleRequest(request: AcceptanceWorkerRequest): Promise<void> {
+  try {
+    await ready
+
+    const cancelled = cancelledIds.has(request.id)
+    processedId = Math.max(processedId, request.id)
+    for (const id of cancelledIds) {
+      if (id <= processedId) cancelledIds.delete(id)
+    }
+    if (cancelled || request.id < latestId) {
+      post({ id: request.id, cancelled: true })
+      return
+    }
+
+    const batch = calculateDiscardAcceptanceBatch(request.handCounts, request.visibleCounts, request.maxShanten)
+    // 内部バッファは次の計算で上書きされるため、使われている部分をコピーして転送する
+    const result = batch.slice(0, getDiscardBatchLength(batch))
+    post({ id: request.id, batch: result }, [result.buffer])
+  } catch (error) {
+    post({ id: request.id, error: String(error) })
+  }
+}
+
+function post(response: AcceptanceWorkerResponse, transfer: Transferable[] = []): void {
+  scope.postMessage(response, transfer)
+}
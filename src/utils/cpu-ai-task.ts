@@ -0,0 +1,144 @@
+// CPUの判断（打牌・リーチ・ロン）の入力と処理
+// 対局の状態を構造化複製できる形（スナップショット）にまとめ、AI Worker（cpu-ai-worker.ts）とメインスレッドの両方で同じ処理を行う
+import type { Tile, Meld, Player } from '../stores/fourPlayerMahjong'
+import { CpuAI } from './cpu-ai'
+import { createRandom } from './random'
+
+export type CpuDifficulty = 'easy' | 'medium' | 'hard' | 'super'
+
+// 判断に必要な項目だけを持つ牌（Vue のリアクティブな牌は Worker に送れないためコピーする）
+export interface SnapshotTile {
+  id: string
+  suit: Tile['suit']
+  rank: number
+  isRed?: boolean
+}
+
+export interface SnapshotMeld {
+  type: Meld['type']
+  tiles: SnapshotTile[]
+  calledTile: SnapshotTile
+  fromPlayer?: number
+}
+
+export interface SnapshotPlayer {
+  tiles: SnapshotTile[]
+  melds: SnapshotMeld[]
+  riichi: boolean
+  score: number
+}
+
+// 手番のCPUの打牌・リーチ判断の入力
+export interface CpuTurnSnapshot {
+  seat: number
+  difficulty: CpuDifficulty
+  // ツモ牌を含まない手牌
+  player: SnapshotPlayer
+  drawnTile: SnapshotTile | null
+  // 見えている牌の枚数（GameManager.getVisibleTileCounts() のコピー）
+  visibleCounts: Uint8Array
+  wallRemaining: number
+  // この判断で使う乱数のシード（GameManager の乱数源から1つ取り出して作る）
+  randomSeed: string
+}
+
+// 捨て牌に対するCPUのロン判断の入力
+export interface CpuRonSnapshot {
+  seat: number
+  difficulty: CpuDifficulty
+  player: SnapshotPlayer
+  winTile: SnapshotTile
+  doraIndicators: SnapshotTile[]
+}
+
+export interface CpuTurnDecision {
+  action: 'discard' | 'riichi'
+  // 捨てる牌（リーチの場合はリーチ宣言牌）
+  tileId?: string
+}
+
+export function toSnapshotTile(tile: Tile | SnapshotTile): SnapshotTile {
+  return { id: tile.id, suit: tile.suit, rank: tile.rank, isRed: tile.isRed }
+}
+
+export function toSnapshotPlayer(player: Player): SnapshotPlayer {
+  return {
+    tiles: player.tiles.map(toSnapshotTile),
+    melds: player.melds.map(meld => ({
+      type: meld.type,
+      tiles: meld.tiles.map(toSnapshotTile),
+      calledTile: toSnapshotTile(meld.calledTile),
+      fromPlayer: meld.fromPlayer
+    })),
+    riichi: player.riichi,
+    score: player.score
+  }
+}
+
+function toPlayer(snapshot: SnapshotPlayer): Player {
+  return {
+    id: 0,
+    name: '',
+    type: 'cpu',
+    tiles: snapshot.tiles,
+    discards: [],
+    melds: snapshot.melds,
+    riichi: snapshot.riichi,
+    score: snapshot.score,
+    wind: 'east'
+  }
+}
+
+/**
+ * 席ごとの CpuAI（評価器・探索の作業領域を席ごとに使い回す）
+ */
+export class CpuAIRegistry {
+  private ais = new Map<number, CpuAI>()
+
+  get(seat: number, difficulty: CpuDifficulty): CpuAI {
+    let ai = this.ais.get(seat)
+    if (!ai) {
+      ai = new CpuAI(difficulty)
+      this.ais.set(seat, ai)
+    }
+    ai.setDifficulty(difficulty)
+    return ai
+  }
+}
+
+/**
+ * 手番のCPUの打牌・リーチを決める（画面側の processCpuTurn の判断と同じ順序）
+ */
+export function decideCpuTurn(registry: CpuAIRegistry, snapshot: CpuTurnSnapshot): CpuTurnDecision {
+  const ai = registry.get(snapshot.seat, snapshot.difficulty)
+  ai.setRandom(createRandom(snapshot.randomSeed))
+
+  const player = toPlayer(snapshot.player)
+  const drawnTile = snapshot.drawnTile
+  const allTiles = drawnTile ? [...player.tiles, drawnTile] : player.tiles
+
+  // リーチ後はツモ切りのみ
+  if (player.riichi && drawnTile) {
+    return { action: 'discard', tileId: drawnTile.id }
+  }
+
+  // リーチ判定（ツモ牌を含めて判定）
+  if (ai.shouldDeclareRiichi({ ...player, tiles: allTiles }, drawnTile)) {
+    const riichiDiscardTile = ai.getRiichiDiscardTile(player, drawnTile)
+    if (riichiDiscardTile) {
+      return { action: 'riichi', tileId: riichiDiscardTile }
+    }
+  }
+
+  // 捨て牌決定
+  const tileId = ai.decideTileToDiscard({ ...player, tiles: allTiles }, drawnTile, snapshot.visibleCounts, snapshot.wallRemaining)
+  return { action: 'discard', tileId }
+}
+
+/**
+ * 捨て牌でCPUがロンするかを決める
+ */
+export function decideCpuRon(registry: CpuAIRegistry, snapshot: CpuRonSnapshot): boolean {
+  const ai = registry.get(snapshot.seat, snapshot.difficulty)
+  return ai.shouldDeclareRon(toPlayer(snapshot.player), snapshot.winTile, snapshot.doraIndicators)
+}
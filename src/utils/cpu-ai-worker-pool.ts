@@ -0,0 +1,197 @@
+// CPUの判断用 Web Worker（cpu-ai-worker.ts）のプール
+// 席ごとに担当の Worker を決めて CpuAI の状態を Worker 内に保持し、捨て牌に対する3人のロン判断は各 Worker で並列に行う
+import { initMahjongCalculator } from './mahjong-calculator-wrapper'
+import { spanStart, spanEnd, recordSpan } from './profiler'
+import {
+  CpuAIRegistry,
+  decideCpuTurn,
+  decideCpuRon,
+  type CpuTurnSnapshot,
+  type CpuRonSnapshot,
+  type CpuTurnDecision
+} from './cpu-ai-task'
+
+export interface CpuAITurnRequest {
+  type: 'turn'
+  id: number
+  snapshot: CpuTurnSnapshot
+  profile?: boolean // Worker 内の判断時間を durationMs で返す
+}
+
+export interface CpuAIRonRequest {
+  type: 'ron'
+  id: number
+  snapshot: CpuRonSnapshot
+  profile?: boolean
+}
+
+export type CpuAIWorkerMessage = CpuAITurnRequest | CpuAIRonRequest
+
+export interface CpuAIWorkerResponse {
+  id: number
+  decision?: CpuTurnDecision
+  ron?: boolean
+  durationMs?: number // Worker 内の判断時間（profile を指定した場合のみ）
+  error?: string
+}
+
+interface PendingRequest {
+  message: CpuAIWorkerMessage
+  resolve: (response: CpuAIWorkerResponse | null) => void
+}
+
+// CPUは3人なので Worker は最大3つ（メインスレッドの分として論理コアを1つ残す）
+const MAX_POOL_SIZE = 3
+
+function defaultPoolSize(): number {
+  const cores = typeof navigator !== 'undefined' && navigator.hardwareConcurrency ? navigator.hardwareConcurrency : 2
+  return Math.max(1, Math.min(MAX_POOL_SIZE, cores - 1))
+}
+
+function createCpuAIWorker(): Worker {
+  return new Worker(new URL('./cpu-ai-worker.ts', import.meta.url), { type: 'module' })
+}
+
+/**
+ * CPUの打牌・リーチ・ロンの判断を Web Worker で実行する
+ * Worker が使えない環境（Node.js等）や Worker でエラーが発生した場合はメインスレッドで判断する
+ * cancel() / dispose() で待機中の要求は null で解決される
+ */
+export class CpuAIWorkerPool {
+  readonly size: number
+  private createWorker: () => Worker
+  private workers: (Worker | null)[]
+  private workerUnavailable = false
+  private nextId = 1
+  private pending = new Map<number, PendingRequest>()
+  // メインスレッドで判断する場合の席ごとの CpuAI
+  private registry = new CpuAIRegistry()
+
+  constructor(size: number = defaultPoolSize(), createWorker?: () => Worker) {
+    this.size = Math.max(1, size)
+    this.createWorker = createWorker ?? createCpuAIWorker
+    this.workers = new Array(this.size).fill(null)
+    this.workerUnavailable = !createWorker && typeof Worker === 'undefined'
+  }
+
+  /**
+   * 手番のCPUの打牌・リーチを判断する
+   * @returns 判断結果。キャンセルされた場合は null
+   */
+  async decideTurn(snapshot: CpuTurnSnapshot): Promise<CpuTurnDecision | null> {
+    const start = spanStart()
+    const response = await this.request(snapshot.seat, { type: 'turn', id: this.nextId++, snapshot, profile: start >= 0 })
+    if (!response) {
+      return null
+    }
+    // Worker 内の計測はメインスレッドの集計に含まれないため、返された判断時間と往復の時間を記録する
+    if (response.durationMs !== undefined) recordSpan('CpuAI.decideTileToDiscard', response.durationMs)
+    spanEnd('CpuAI.decideTurn.worker', start)
+    return response.decision ?? null
+  }
+
+  /**
+   * 捨て牌に対する複数のCPUのロン判断を並列に行う
+   * @returns snapshots と同じ順序のロンするかどうか。キャンセルされた場合は null
+   */
+  async decideRon(snapshots: CpuRonSnapshot[]): Promise<boolean[] | null> {
+    const start = spanStart()
+    const responses = await Promise.all(
+      snapshots.map(snapshot => this.request(snapshot.seat, { type: 'ron', id: this.nextId++, snapshot, profile: start >= 0 }))
+    )
+    if (responses.some(response => response === null)) {
+      return null
+    }
+    for (const response of responses) {
+      if (response!.durationMs !== undefined) recordSpan('CpuAI.decideRon', response!.durationMs)
+    }
+    spanEnd('CpuAI.decideRon.worker', start)
+    return responses.map(response => response!.ron === true)
+  }
+
+  cancel(): void {
+    for (const pending of this.pending.values()) {
+      pending.resolve(null)
+    }
+    this.pending.clear()
+  }
+
+  dispose(): void {
+    this.cancel()
+    for (const worker of this.workers) {
+      worker?.terminate()
+    }
+    this.workers.fill(null)
+  }
+
+  private request(seat: number, message: CpuAIWorkerMessage): Promise<CpuAIWorkerResponse | null> {
+    // 同じ席は同じ Worker が担当し、Worker 内の CpuAI の作業領域を使い回す
+    const worker = this.getWorker(seat % this.size)
+    if (!worker) {
+      return this.computeOnMainThread(message)
+    }
+
+    return new Promise(resolve => {
+      this.pending.set(message.id, { message, resolve })
+      worker.postMessage(message)
+    })
+  }
+
+  private getWorker(index: number): Worker | null {
+    if (this.workers[index] || this.workerUnavailable) {
+      return this.workers[index]
+    }
+
+    try {
+      const worker = this.createWorker()
+      worker.onmessage = (event: MessageEvent<CpuAIWorkerResponse>) => this.handleResponse(event.data)
+      worker.onerror = (event) => {
+        console.warn('CPU判断Workerでエラーが発生しました。メインスレッドで判断します。', event)
+        this.fallBackToMainThread()
+      }
+      this.workers[index] = worker
+    } catch (error) {
+      console.warn('CPU判断Workerを起動できません。メインスレッドで判断します。', error)
+      this.workerUnavailable = true
+    }
+    return this.workers[index]
+  }
+
+  private handleResponse(response: CpuAIWorkerResponse): void {
+    const pending = this.pending.get(response.id)
+    if (!pending) {
+      // キャンセル済みの要求
+      return
+    }
+    this.pending.delete(response.id)
+
+    if (response.error) {
+      // 判断がないと対局が進まないため、メインスレッドで判断し直す
+      console.error('CPU判断エラー:', response.error)
+      this.computeOnMainThread(pending.message).then(pending.resolve)
+      return
+    }
+    pending.resolve(response)
+  }
+
+  private fallBackToMainThread(): void {
+    for (const worker of this.workers) {
+      worker?.terminate()
+    }
+    this.workers.fill(null)
+    this.workerUnavailable = true
+
+    for (const pending of this.pending.values()) {
+      this.computeOnMainThread(pending.message).then(pending.resolve)
+    }
+    this.pending.clear()
+  }
+
+  private async computeOnMainThread(message: CpuAIWorkerMessage): Promise<CpuAIWorkerResponse> {
+    await initMahjongCalculator()
+    if (message.type === 'turn') {
+      return { id: message.id, decision: decideCpuTurn(this.registry, message.snapshot) }
+    }
+    return { id: message.id, ron: decideCpuRon(this.registry, message.snapshot) }
+  }
+}
@@ -0,0 +1,32 @@
+// CPUの判断用の Web Worker（CpuAIWorkerPool から起動する）
+// 席ごとの CpuAI と WASM の計算ライブラリを Worker 内に持ち、スナップショットから打牌・リーチ・ロンを判断する
+import { initMahjongCalculator } from './mahjong-calculator-wrapper'
+import { CpuAIRegistry, decideCpuTurn, decideCpuRon } from './cpu-ai-task'
+import type { CpuAIWorkerMessage, CpuAIWorkerResponse } from './cpu-ai-worker-pool'
+
+const scope = self as unknown as Worker
+const ready = initMahjongCalculator()
+const registry = new CpuAIRegistry()
+
+scope.onmessage = async (event: MessageEvent<CpuAIWorkerMessage>) => {
+  const message = event.data
+  let response: CpuAIWorkerResponse
+
+  try {
+    await ready
+    const start = performance.now()
+    if (message.type === 'turn') {
+      response = { id: message.id, decision: decideCpuTurn(registry, message.snapshot) }
+    } else {
+      response = { id: message.id, ron: decideCpuRon(registry, message.snapshot) }
+    }
+    // Worker 内の計測はメインスレッドの計測に含まれないため、判断時間を返してメインスレッドで集計する
+    if (message.profile) {
+      response.durationMs = performance.now() - start
+    }
+  } catch (error) {
+    response = { id: message.id, error: String(error) }
+  }
+
+  scope.postMessage(response)
+}
@@ -1,11 +1,33 @@
 import type { Tile, Player } from '../stores/fourPlayerMahjong'
-import { calculateShanten, getUsefulTiles, checkWinCondition, calculateAcceptance, findBestAcceptanceTiles, getTileRemainingCount, getTileIndex } from './mahjong-logic'
+import { checkWinCondition, calculateAcceptance, findBestAcceptanceTiles, getTileIndex } from './mahjong-logic'
+import { convertTilesToRustFormat } from './mahjong-calculator-wrapper'
+import type { RandomSource } from './random'
+import { ShantenEvaluator } from './shanten-table'
+import { DiscardSearch } from './discard-search'
+import { spanStart, spanEnd } from './profiler'
+
+// 切る候補にならない牌種の評価値
+const NOT_CANDIDATE = -1
+// 探索の評価値を同じとみなす差（浮動小数点の誤差）
+const SEARCH_VALUE_EPSILON = 1e-9
 
 export class CpuAI {
   private difficulty: 'easy' | 'medium' | 'hard' | 'super'
-
-  constructor(difficulty: 'easy' | 'medium' | 'hard' | 'super' = 'medium') {
+  private random: RandomSource
+  // 打牌候補ごとのシャンテン数を差分で求めるための手牌（呼び出しごとに確保しない）
+  private shantenEvaluator = new ShantenEvaluator()
+  private handCounts = new Uint8Array(34)
+  // 牌種ごとの評価値・受け入れ枚数（呼び出しごとに確保しない）
+  private discardScores = new Int32Array(34)
+  private acceptanceCounts = new Int16Array(34)
+  // super難易度の2手先探索
+  private discardSearch = new DiscardSearch()
+  // 探索の制限時間（ミリ秒、null の場合は getThinkingTime()）
+  private searchTimeBudget: number | null = null
+
+  constructor(difficulty: 'easy' | 'medium' | 'hard' | 'super' = 'medium', random: RandomSource = Math.random) {
     this.difficulty = difficulty
+    this.random = random
   }
 
   // 動的に難易度を設定するメソッド
@@ -13,11 +35,35 @@ export class CpuAI {
     this.difficulty = difficulty
   }
 
+  getDifficulty(): 'easy' | 'medium' | 'hard' | 'super' {
+    return this.difficulty
+  }
+
+  // 乱数源を設定するメソッド（GameManagerと共有してシードで再現可能にする）
+  setRandom(random: RandomSource): void {
+    this.random = random
+  }
+
+  // super難易度の探索の制限時間を設定するメソッド（Infinity で打ち切らない。シードで打牌を再現したい場合に使う）
+  setSearchTimeBudget(milliseconds: number | null): void {
+    this.searchTimeBudget = milliseconds
+  }
+
   /**
    * CPUが捨てる牌を決定する
+   * @param visibleCounts 見えている牌の枚数（GameManager.getVisibleTileCounts()）。省略時は手牌のみを見えている牌とする
+   * @param wallRemaining 山の残り枚数（GameManager.wallRemaining）。super難易度で残りツモ回数の計算に使い、省略時は見えていない牌の枚数から推定する
    */
-  decideTileToDiscard(player: Player, drawnTile: Tile | null): string {
-    const allTiles = drawnTile ? [...player.tiles, drawnTile] : player.tiles
+  decideTileToDiscard(player: Player, drawnTile: Tile | null, visibleCounts?: Uint8Array, wallRemaining?: number): string {
+    const start = spanStart()
+    const tileId = this.decideTileToDiscardUnprofiled(player, drawnTile, visibleCounts, wallRemaining)
+    spanEnd('CpuAI.decideTileToDiscard', start)
+    return tileId
+  }
+
+  private decideTileToDiscardUnprofiled(player: Player, drawnTile: Tile | null, visibleCounts?: Uint8Array, wallRemaining?: number): string {
+    // player.tilesに既にdrawnTileが含まれている場合は重複させない
+    const allTiles = drawnTile && !player.tiles.some(t => t.id === drawnTile.id) ? [...player.tiles, drawnTile] : player.tiles
 
     if (allTiles.length === 0) {
       return ''
@@ -35,8 +81,9 @@ export class CpuAI {
       case 'medium':
         return this.mediumAIDiscard(allTiles)
       case 'hard':
+        return this.hardAIDiscard(allTiles, visibleCounts)
       case 'super':
-        return this.hardAIDiscard(allTiles)
+        return this.superAIDiscard(allTiles, visibleCounts, wallRemaining)
       default:
         return this.randomDiscard(allTiles)
     }
@@ -46,7 +93,7 @@ export class CpuAI {
    * 簡単AI: ランダムに捨てる
    */
   private randomDiscard(tiles: Tile[]): string {
-    const randomIndex = Math.floor(Math.random() * tiles.length)
+    const randomIndex = Math.floor(this.random() * tiles.length)
     return tiles[randomIndex].id
   }
 
@@ -55,282 +102,178 @@ export class CpuAI {
    */
   private mediumAIDiscard(tiles: Tile[]): string {
     // allTilesの最後がツモ牌なので、これを除いた13枚でシャンテン数を計算
-    const handTiles = tiles.slice(0, -1) // 最後のツモ牌を除いた13枚
-    const currentShanten = calculateShanten(handTiles)
-    const candidates: { tileId: string, shanten: number, score: number }[] = []
-
-    for (const tile of tiles) {
-      const remainingTiles = tiles.filter(t => t.id !== tile.id)
-      const newShanten = calculateShanten(remainingTiles)
-
-      // シャンテン数が悪化しない牌のみを候補とする
-      if (newShanten <= currentShanten) {
-        let score = 0
+    const discardShanten = this.calculateDiscardShanten(tiles)
+    const currentShanten = discardShanten[getTileIndex(tiles[tiles.length - 1])]
 
-        // シャンテン数改善への大きなボーナス
-        if (newShanten < currentShanten) {
-          score += 300
-        }
-
-        // 孤立牌を最優先で捨てる
-        if (this.isIsolatedTile(tile, tiles)) {
-          score += 200
-        }
+    this.scoreDiscardTypes(this.handCounts, discardShanten, currentShanten)
+    return this.selectDiscard(tiles, discardShanten, currentShanten)
+  }
 
-        // 塔子の種類と対子数による細かい優先順位
-        const taatsuType = this.getTaatsuType(tile, tiles)
-        const pairCount = this.countPairs(tiles)
-
-        if (taatsuType === 'shanpon' && pairCount >= 3) {
-          // 対子が3つ以上ある場合のシャンポン形
-          if (tile.suit !== 'honor' && tile.rank >= 3 && tile.rank <= 7) {
-            score += 100  // 中張牌の対子
-          } else if (tile.suit !== 'honor' && (tile.rank === 1 || tile.rank === 9)) {
-            score += 120  // 1,9牌の対子
-          } else if (tile.suit === 'honor') {
-            score += 140  // 字牌の対子
-          }
-        } else if (taatsuType === 'penchan') {
-          score += 80  // ペンチャン
-        } else if (taatsuType === 'kanchan') {
-          score += 60  // カンチャン
-        } else if (taatsuType === 'ryanmen') {
-          score += 0   // リャンメンは残したい
-        }
+  /**
+   * 上級AI: より複雑な戦略（受け入れ計算を含む）
+   */
+  private hardAIDiscard(tiles: Tile[], visibleCounts?: Uint8Array): string {
+    // allTilesの最後がツモ牌なので、これを除いた13枚でシャンテン数を計算
+    const discardShanten = this.calculateDiscardShanten(tiles)
+    const currentShanten = discardShanten[getTileIndex(tiles[tiles.length - 1])]
 
-        // その他の基本的な評価
-        if (taatsuType === 'none') {
-          // 塔子を形成していない牌の評価
-          if (tile.suit === 'honor') {
-            score += 50
-          } else if (tile.rank === 1 || tile.rank === 9) {
-            score += 30
-          }
-        }
+    // 14枚の手牌で受け入れ計算を実行（見えている牌の指定がなければ手牌のみ）
+    const acceptanceInfos = calculateAcceptance(tiles, visibleCounts || tiles)
+    const bestAcceptanceTiles = findBestAcceptanceTiles(acceptanceInfos)
 
-        candidates.push({ tileId: tile.id, shanten: newShanten, score })
-      }
+    // 牌種ごとの受け入れ枚数（受け入れ計算の結果がない牌種は -1）
+    const acceptanceCounts = this.acceptanceCounts.fill(-1)
+    for (const info of acceptanceInfos) {
+      acceptanceCounts[info.tileIndex] = info.totalAcceptance
     }
 
-    // 候補がない場合
-    if (candidates.length === 0) {
-      // 最もダメージの少ない牌を選択
-      let minDamage = Infinity
-      let bestTileId = ''
+    this.scoreDiscardTypes(this.handCounts, discardShanten, currentShanten)
 
-      for (const tile of tiles) {
-        const remainingTiles = tiles.filter(t => t.id !== tile.id)
-        const newShanten = calculateShanten(remainingTiles)
-        const damage = newShanten - currentShanten
+    // 受け入れ計算による評価（hard以上のみ）
+    for (let index = 0; index < 34; index++) {
+      const acceptanceCount = acceptanceCounts[index]
+      if (this.discardScores[index] === NOT_CANDIDATE || acceptanceCount < 0) continue
 
-        if (damage < minDamage) {
-          minDamage = damage
-          bestTileId = tile.id
-        }
+      // 最良の受け入れ牌（最小シャンテン数 + 最大受け入れ枚数）の場合は大きなボーナス
+      if (bestAcceptanceTiles.includes(index)) {
+        this.discardScores[index] += 400 // 受け入れ計算による最高評価
+      } else if (acceptanceCount > 0) {
+        // その他の受け入れ牌にも小さなボーナス
+        this.discardScores[index] += Math.min(acceptanceCount * 10, 100)
       }
-
-      return bestTileId || tiles[Math.floor(Math.random() * tiles.length)].id
     }
 
-    // 最も良いスコアの牌を選択
-    candidates.sort((a, b) => b.score - a.score)
-    return candidates[0].tileId
+    return this.selectDiscard(tiles, discardShanten, currentShanten)
   }
 
   /**
-   * 牌が孤立牌かどうかを判定する
+   * 最上級AI: 2手先までの期待値探索（シャンテン数を進められる確率が最も高い牌を切る）
+   * 同じ評価値の場合は受け入れ枚数、上級AIと同じ形の評価値、手牌の順で選ぶ
    */
-  private isIsolatedTile(tile: Tile, tiles: Tile[]): boolean {
-    if (tile.suit === 'honor') {
-      // 字牌の場合は同じ牌が1枚のみで孤立
-      return tiles.filter(t => t.suit === tile.suit && t.rank === tile.rank).length === 1
-    }
-
-    // 数牌の場合：同じ牌が複数あるか、隣接する牌があるかをチェック
-    const sameRankCount = tiles.filter(t => t.suit === tile.suit && t.rank === tile.rank).length
-
-    // 同じ牌が2枚以上あれば孤立ではない（対子・刻子の可能性）
-    if (sameRankCount >= 2) {
-      return false
+  private superAIDiscard(tiles: Tile[], visibleCounts?: Uint8Array, wallRemaining?: number): string {
+    const discardShanten = this.calculateDiscardShanten(tiles)
+    const currentShanten = discardShanten[getTileIndex(tiles[tiles.length - 1])]
+    this.scoreDiscardTypes(this.handCounts, discardShanten, currentShanten)
+
+    const result = this.discardSearch.search(this.handCounts, visibleCounts || this.handCounts, {
+      remainingDraws: wallRemaining === undefined ? undefined : Math.ceil(wallRemaining / 4),
+      deadline: performance.now() + (this.searchTimeBudget ?? this.getThinkingTime())
+    })
+
+    let bestIndex = -1
+    let bestTileId = ''
+    for (const tile of tiles) {
+      const index = getTileIndex(tile)
+      if (result.values[index] < 0) continue
+      if (bestIndex === -1 || this.isBetterSearchResult(result.values, result.ukeire, index, bestIndex)) {
+        bestIndex = index
+        bestTileId = tile.id
+      }
     }
 
-    // 隣接する牌があるかチェック（カンチャン塔子も考慮）
-    const hasNearby = tiles.some(t =>
-      t.suit === tile.suit &&
-      t.rank !== tile.rank &&
-      Math.abs(t.rank - tile.rank) <= 2  // 差が2以内なら塔子の可能性あり
-    )
+    return bestTileId || this.selectDiscard(tiles, discardShanten, currentShanten)
+  }
 
-    return !hasNearby
+  private isBetterSearchResult(values: Float64Array, ukeire: Uint8Array, index: number, bestIndex: number): boolean {
+    const valueDiff = values[index] - values[bestIndex]
+    if (Math.abs(valueDiff) > SEARCH_VALUE_EPSILON) return valueDiff > 0
+    if (ukeire[index] !== ukeire[bestIndex]) return ukeire[index] > ukeire[bestIndex]
+    return this.discardScores[index] > this.discardScores[bestIndex]
   }
 
   /**
-   * 塔子の種類を判定する
+   * 手牌にある牌種ごとに、切る候補としての評価値を discardScores に求める（同じ牌種は1回だけ評価する）
+   * シャンテン数が悪化する牌種は NOT_CANDIDATE とする
    */
-  private getTaatsuType(tile: Tile, tiles: Tile[]): 'ryanmen' | 'kanchan' | 'penchan' | 'shanpon' | 'none' {
-    if (tile.suit === 'honor') {
-      // 字牌は対子のみ考慮
-      const count = tiles.filter(t => t.suit === tile.suit && t.rank === tile.rank).length
-      return count >= 2 ? 'shanpon' : 'none'
-    }
+  private scoreDiscardTypes(counts: Uint8Array, discardShanten: Int8Array, currentShanten: number): void {
+    const scores = this.discardScores.fill(NOT_CANDIDATE)
+    const pairCount = countPairs(counts)
 
-    const suitTiles = tiles.filter(t => t.suit === tile.suit)
-    const sameCount = suitTiles.filter(t => t.rank === tile.rank).length
+    for (let index = 0; index < 34; index++) {
+      if (counts[index] === 0) continue
 
-    // 対子の場合
-    if (sameCount >= 2) {
-      return 'shanpon'
-    }
+      const newShanten = discardShanten[index]
+      // シャンテン数が悪化しない牌のみを候補とする
+      if (newShanten > currentShanten) continue
 
-    // 数牌の塔子判定
-    const hasMinusTwo = suitTiles.some(t => t.rank === tile.rank - 2)
-    const hasMinusOne = suitTiles.some(t => t.rank === tile.rank - 1)
-    const hasPlusOne = suitTiles.some(t => t.rank === tile.rank + 1)
-    const hasPlusTwo = suitTiles.some(t => t.rank === tile.rank + 2)
-
-    // ペンチャン判定 (12, 89)
-    if (tile.rank === 1 && hasPlusOne && !hasPlusTwo) return 'penchan'
-    if (tile.rank === 2 && hasMinusOne && !hasMinusTwo) return 'penchan'
-    if (tile.rank === 8 && hasPlusOne && !hasMinusTwo) return 'penchan'
-    if (tile.rank === 9 && hasMinusOne && !hasMinusTwo) return 'penchan'
-
-    // リャンメン判定
-    if (hasMinusOne && hasPlusOne) return 'ryanmen'
-    if (tile.rank >= 2 && tile.rank <= 8) {
-      if (hasMinusOne || hasPlusOne) return 'ryanmen'
-    }
+      const isHonor = index >= 27
+      const rank = isHonor ? index - 26 : (index % 9) + 1
+      let score = 0
 
-    // カンチャン判定
-    if (hasMinusTwo || hasPlusTwo) return 'kanchan'
+      // シャンテン数改善への大きなボーナス
+      if (newShanten < currentShanten) {
+        score += 300
+      }
 
-    return 'none'
-  }
+      // 孤立牌を最優先で捨てる
+      if (isIsolatedTile(counts, index)) {
+        score += 200
+      }
 
-  /**
-   * 対子の数を数える
-   */
-  private countPairs(tiles: Tile[]): number {
-    const counts = new Map<string, number>()
+      // 塔子の種類と対子数による細かい優先順位
+      const taatsuType = getTaatsuType(counts, index)
+
+      if (taatsuType === 'shanpon' && pairCount >= 3) {
+        // 対子が3つ以上ある場合のシャンポン形
+        if (!isHonor && rank >= 3 && rank <= 7) {
+          score += 100  // 中張牌の対子
+        } else if (!isHonor && (rank === 1 || rank === 9)) {
+          score += 120  // 1,9牌の対子
+        } else if (isHonor) {
+          score += 140  // 字牌の対子
+        }
+      } else if (taatsuType === 'penchan') {
+        score += 80  // ペンチャン
+      } else if (taatsuType === 'kanchan') {
+        score += 60  // カンチャン
+      } else if (taatsuType === 'ryanmen') {
+        score += 0   // リャンメンは残したい
+      }
 
-    for (const tile of tiles) {
-      const key = `${tile.suit}-${tile.rank}`
-      counts.set(key, (counts.get(key) || 0) + 1)
-    }
+      // その他の基本的な評価
+      if (taatsuType === 'none') {
+        // 塔子を形成していない牌の評価
+        if (isHonor) {
+          score += 50
+        } else if (rank === 1 || rank === 9) {
+          score += 30
+        }
+      }
 
-    let pairCount = 0
-    for (const count of counts.values()) {
-      if (count >= 2) pairCount++
+      scores[index] = score
     }
-
-    return pairCount
   }
 
   /**
-   * 上級AI: より複雑な戦略（受け入れ計算を含む）
+   * discardScores の評価値が最も高い牌を選ぶ（同点の場合は手牌で先にある牌）
    */
-  private hardAIDiscard(tiles: Tile[]): string {
-    // allTilesの最後がツモ牌なので、これを除いた13枚でシャンテン数を計算
-    const handTiles = tiles.slice(0, -1) // 最後のツモ牌を除いた13枚
-    const currentShanten = calculateShanten(handTiles)
-    const candidates: { tileId: string, shanten: number, score: number, acceptanceCount?: number }[] = []
-
-    // 14枚の手牌で受け入れ計算を実行
-    const acceptanceInfos = calculateAcceptance(tiles, tiles) // 見える牌として手牌を渡す
-    const bestAcceptanceTiles = findBestAcceptanceTiles(acceptanceInfos)
+  private selectDiscard(tiles: Tile[], discardShanten: Int8Array, currentShanten: number): string {
+    let bestScore = NOT_CANDIDATE
+    let bestTileId = ''
 
     for (const tile of tiles) {
-      const remainingTiles = tiles.filter(t => t.id !== tile.id)
-      const newShanten = calculateShanten(remainingTiles)
-
-      // シャンテン数が悪化しない牌のみを候補とする
-      if (newShanten <= currentShanten) {
-        let score = 0
-
-        // シャンテン数改善への大きなボーナス
-        if (newShanten < currentShanten) {
-          score += 300
-        }
-
-        // 受け入れ計算による評価（hard以上のみ）
-        const tileIndex = getTileIndex(tile)
-        const acceptanceInfo = acceptanceInfos.find(info => info.tileIndex === tileIndex)
-        let acceptanceCount = 0
-        
-        if (acceptanceInfo) {
-          acceptanceCount = acceptanceInfo.totalAcceptance
-          
-          // 最良の受け入れ牌（最小シャンテン数 + 最大受け入れ枚数）の場合は大きなボーナス
-          if (bestAcceptanceTiles.includes(tileIndex)) {
-            score += 400 // 受け入れ計算による最高評価
-          } else if (acceptanceCount > 0) {
-            // その他の受け入れ牌にも小さなボーナス
-            score += Math.min(acceptanceCount * 10, 100)
-          }
-        }
-
-        // 孤立牌を最優先で捨てる
-        if (this.isIsolatedTile(tile, tiles)) {
-          score += 200
-        }
-
-        // 塔子の種類と対子数による細かい優先順位
-        const taatsuType = this.getTaatsuType(tile, tiles)
-        const pairCount = this.countPairs(tiles)
-
-        if (taatsuType === 'shanpon' && pairCount >= 3) {
-          // 対子が3つ以上ある場合のシャンポン形
-          if (tile.suit !== 'honor' && tile.rank >= 3 && tile.rank <= 7) {
-            score += 100  // 中張牌の対子
-          } else if (tile.suit !== 'honor' && (tile.rank === 1 || tile.rank === 9)) {
-            score += 120  // 1,9牌の対子
-          } else if (tile.suit === 'honor') {
-            score += 140  // 字牌の対子
-          }
-        } else if (taatsuType === 'penchan') {
-          score += 80  // ペンチャン
-        } else if (taatsuType === 'kanchan') {
-          score += 60  // カンチャン
-        } else if (taatsuType === 'ryanmen') {
-          score += 0   // リャンメンは残したい
-        }
-
-        // その他の基本的な評価
-        if (taatsuType === 'none') {
-          // 塔子を形成していない牌の評価
-          if (tile.suit === 'honor') {
-            score += 50
-          } else if (tile.rank === 1 || tile.rank === 9) {
-            score += 30
-          }
-        }
-
-        candidates.push({ tileId: tile.id, shanten: newShanten, score, acceptanceCount })
+      const score = this.discardScores[getTileIndex(tile)]
+      if (score > bestScore) {
+        bestScore = score
+        bestTileId = tile.id
       }
     }
 
-    // 候補がない場合次局
-    if (candidates.length === 0) {
-      // 最もダメージの少ない牌を選択
-      let minDamage = Infinity
-      let bestTileId = ''
-
-      for (const tile of tiles) {
-        const remainingTiles = tiles.filter(t => t.id !== tile.id)
-        const newShanten = calculateShanten(remainingTiles)
-        const damage = newShanten - currentShanten
+    if (bestScore !== NOT_CANDIDATE) {
+      return bestTileId
+    }
 
-        if (damage < minDamage) {
-          minDamage = damage
-          bestTileId = tile.id
-        }
+    // 候補がない場合は最もダメージの少ない牌を選択
+    let minDamage = Infinity
+    for (const tile of tiles) {
+      const damage = discardShanten[getTileIndex(tile)] - currentShanten
+      if (damage < minDamage) {
+        minDamage = damage
+        bestTileId = tile.id
       }
-
-      return bestTileId || tiles[Math.floor(Math.random() * tiles.length)].id
     }
 
-    // 最も良いスコアの牌を選択
-    candidates.sort((a, b) => b.score - a.score)
-    return candidates[0].tileId
+    return bestTileId || tiles[Math.floor(this.random() * tiles.length)].id
   }
 
   /**
@@ -347,15 +290,8 @@ export class CpuAI {
 
 
     // 各牌を捨てた時にテンパイになるかチェック
-    let canReach = false
-    for (const tile of allTiles) {
-      const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-      const shanten = calculateShanten(remainingTiles)
-      if (shanten === 0) {
-        canReach = true
-        break
-      }
-    }
+    const discardShanten = this.calculateDiscardShanten(allTiles)
+    const canReach = allTiles.some(tile => discardShanten[getTileIndex(tile)] === 0)
 
     if (!canReach) {
       return false
@@ -365,11 +301,11 @@ export class CpuAI {
     const shouldRiichi = (() => {
       switch (this.difficulty) {
         case 'easy':
-          return Math.random() < 0.7 // 70%の確率
+          return this.random() < 0.7 // 70%の確率
         case 'medium':
-          return Math.random() < 0.85 // 85%の確率
+          return this.random() < 0.85 // 85%の確率
         case 'hard':
-          return Math.random() < 0.95 // 95%の確率
+          return this.random() < 0.95 // 95%の確率
         case 'super':
           return true // 100%リーチ
         default:
@@ -389,10 +325,9 @@ export class CpuAI {
     if (allTiles.length !== 14) return null
 
     // 各牌を捨てた時にテンパイになる牌を探す
+    const discardShanten = this.calculateDiscardShanten(allTiles)
     for (const tile of allTiles) {
-      const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-      const shanten = calculateShanten(remainingTiles)
-      if (shanten === 0) {
+      if (discardShanten[getTileIndex(tile)] === 0) {
         return tile.id
       }
     }
@@ -400,6 +335,14 @@ export class CpuAI {
     return null
   }
 
+  /**
+   * 手牌にある牌種ごとに、1枚切った後のシャンテン数を計算する（同じ牌種は1回だけ、変化した色の表だけを引き直す）
+   */
+  private calculateDiscardShanten(tiles: Tile[]): Int8Array {
+    this.shantenEvaluator.setHand(convertTilesToRustFormat(tiles, this.handCounts))
+    return this.shantenEvaluator.getDiscardShanten()
+  }
+
   /**
    * CPUのターン全体の処理時間（ミリ秒）
    */
@@ -433,7 +376,7 @@ export class CpuAI {
   /**
    * CPUの行動を決定する（統合メソッド）
    */
-  async makeDecision(player: Player, drawnTile: Tile | null): Promise<{
+  async makeDecision(player: Player, drawnTile: Tile | null, visibleCounts?: Uint8Array, wallRemaining?: number): Promise<{
     action: 'discard' | 'riichi'
     tileId?: string
   }> {
@@ -451,11 +394,88 @@ export class CpuAI {
     }
 
     // 捨て牌決定
-    const tileId = this.decideTileToDiscard(player, drawnTile)
+    const tileId = this.decideTileToDiscard(player, drawnTile, visibleCounts, wallRemaining)
     return { action: 'discard', tileId }
   }
 }
 
+/**
+ * 牌が孤立牌かどうかを判定する
+ */
+function isIsolatedTile(counts: Uint8Array, index: number): boolean {
+  // 同じ牌が2枚以上あれば孤立ではない（対子・刻子の可能性）
+  if (counts[index] >= 2) {
+    return false
+  }
+  // 字牌の場合は同じ牌が1枚のみで孤立
+  if (index >= 27) {
+    return true
+  }
+
+  // 数牌の場合：差が2以内の同じ色の牌があれば塔子の可能性あり（カンチャン塔子も考慮）
+  const suitStart = index - (index % 9)
+  for (let nearby = Math.max(suitStart, index - 2); nearby <= Math.min(suitStart + 8, index + 2); nearby++) {
+    if (nearby !== index && counts[nearby] > 0) {
+      return false
+    }
+  }
+  return true
+}
+
+/**
+ * 塔子の種類を判定する
+ */
+function getTaatsuType(counts: Uint8Array, index: number): 'ryanmen' | 'kanchan' | 'penchan' | 'shanpon' | 'none' {
+  if (index >= 27) {
+    // 字牌は対子のみ考慮
+    return counts[index] >= 2 ? 'shanpon' : 'none'
+  }
+
+  // 対子の場合
+  if (counts[index] >= 2) {
+    return 'shanpon'
+  }
+
+  // 数牌の塔子判定（同じ色の範囲内のみ）
+  const rank = (index % 9) + 1
+  const has = (offset: number): boolean => {
+    const nearbyRank = rank + offset
+    return nearbyRank >= 1 && nearbyRank <= 9 && counts[index + offset] > 0
+  }
+  const hasMinusTwo = has(-2)
+  const hasMinusOne = has(-1)
+  const hasPlusOne = has(1)
+  const hasPlusTwo = has(2)
+
+  // ペンチャン判定 (12, 89)
+  if (rank === 1 && hasPlusOne && !hasPlusTwo) return 'penchan'
+  if (rank === 2 && hasMinusOne && !hasMinusTwo) return 'penchan'
+  if (rank === 8 && hasPlusOne && !hasMinusTwo) return 'penchan'
+  if (rank === 9 && hasMinusOne && !hasMinusTwo) return 'penchan'
+
+  // リャンメン判定
+  if (hasMinusOne && hasPlusOne) return 'ryanmen'
+  if (rank >= 2 && rank <= 8) {
+    if (hasMinusOne || hasPlusOne) return 'ryanmen'
+  }
+
+  // カンチャン判定
+  if (hasMinusTwo || hasPlusTwo) return 'kanchan'
+
+  return 'none'
+}
+
+/**
+ * 対子の数を数える
+ */
+function countPairs(counts: Uint8Array): number {
+  let pairCount = 0
+  for (let index = 0; index < 34; index++) {
+    if (counts[index] >= 2) pairCount++
+  }
+  return pairCount
+}
+
 // 各CPU用のAIインスタンス（動的に難易度を適用）
 export const cpuAIs = {
   1: new CpuAI('easy'),
@@ -0,0 +1,201 @@
+// 打牌の2手先までの期待値探索（super難易度のCPU用）
+// 打牌ごとに「残りのツモでシャンテン数を2回進められる確率」を、見えていない牌の枚数から求める
+import { ShantenEvaluator } from './shanten-table'
+import { ByteKeyLruCache } from './lru-cache'
+
+const TILE_TYPE_COUNT = 34
+const TOTAL_TILES = 136
+// 他家3人の手牌と王牌（ドラ表示牌を除く）の枚数の目安（残りツモ数が分からない場合の推定に使う）
+const HIDDEN_HAND_TILES = 39
+const DEAD_WALL_TILES = 13
+// 1回の打牌判断で保持する13枚の手牌の評価の数
+const SUB_HAND_CACHE_SIZE = 4096
+
+export interface DiscardSearchResult {
+  // 牌種ごとの評価値（手牌にない牌種・シャンテン数が最小でない牌種は -1）
+  values: Float64Array
+  // 牌種ごとの切った後のシャンテン数と受け入れ枚数（手牌にない牌種は 0）
+  shanten: Int8Array
+  ukeire: Uint8Array
+  // 時間内に2手先まで評価できたか（false の場合 values は受け入れ枚数のみで評価した値）
+  complete: boolean
+}
+
+export interface DiscardSearchOptions {
+  // 自分の残りツモ回数（省略時は見えていない牌の枚数から推定する）
+  remainingDraws?: number
+  // 探索を打ち切る時刻（performance.now() の値、省略時は打ち切らない）
+  deadline?: number
+}
+
+/**
+ * 14枚の手牌から切る牌を2手先まで評価する
+ * シャンテン数が最小になる打牌のそれぞれについて、受け入れ牌を引いた後の最良の打牌とその受け入れ枚数を求め、
+ * 残りツモ回数のうちにシャンテン数を2回進められる確率（テンパイの打牌は和了できる確率）を評価値とする
+ * 1回の探索の中では、同じ13枚の手牌の受け入れ枚数を1回だけ計算する
+ */
+export class DiscardSearch {
+  private evaluator = new ShantenEvaluator()
+  private drawEvaluator = new ShantenEvaluator()
+  private subHandCache = new ByteKeyLruCache<number>(SUB_HAND_CACHE_SIZE)
+  private hand = new Uint8Array(TILE_TYPE_COUNT)
+  private subHand = new Uint8Array(TILE_TYPE_COUNT)
+  private remaining = new Uint8Array(TILE_TYPE_COUNT)
+  private result: DiscardSearchResult = {
+    values: new Float64Array(TILE_TYPE_COUNT),
+    shanten: new Int8Array(TILE_TYPE_COUNT),
+    ukeire: new Uint8Array(TILE_TYPE_COUNT),
+    complete: true
+  }
+
+  /**
+   * @param handCounts 14枚の手牌の枚数
+   * @param visibleCounts 見えている牌の枚数（自分の手牌を含む。GameManager.getVisibleTileCounts()）
+   * @returns 内部の結果オブジェクト（次の探索で上書きされる）
+   */
+  search(handCounts: Uint8Array, visibleCounts: Uint8Array, options: DiscardSearchOptions = {}): DiscardSearchResult {
+    const { values, shanten, ukeire } = this.result
+    const deadline = options.deadline ?? Infinity
+    const hand = this.hand
+    hand.set(handCounts)
+    this.subHandCache.clear()
+
+    let unseen = TOTAL_TILES
+    for (let index = 0; index < TILE_TYPE_COUNT; index++) {
+      this.remaining[index] = Math.max(0, 4 - visibleCounts[index])
+      unseen -= visibleCounts[index]
+    }
+    unseen = Math.max(1, unseen)
+    const draws = options.remainingDraws ?? Math.ceil(Math.max(0, unseen - HIDDEN_HAND_TILES - DEAD_WALL_TILES) / 4)
+
+    // 1手目: 打牌ごとのシャンテン数と受け入れ枚数
+    values.fill(-1)
+    shanten.fill(0)
+    ukeire.fill(0)
+    this.evaluator.setHand(hand)
+    let bestShanten = Infinity
+    for (let discard = 0; discard < TILE_TYPE_COUNT; discard++) {
+      if (hand[discard] === 0) continue
+      this.evaluator.remove(discard)
+      shanten[discard] = this.evaluator.shanten
+      ukeire[discard] = this.countUkeire(this.evaluator, this.remaining)
+      this.evaluator.add(discard)
+      bestShanten = Math.min(bestShanten, shanten[discard])
+    }
+
+    // 受け入れ枚数のみの評価値（2手先を評価できなかった場合に使う）
+    const fallBack = (): DiscardSearchResult => {
+      for (let discard = 0; discard < TILE_TYPE_COUNT; discard++) {
+        values[discard] = hand[discard] > 0 && shanten[discard] === bestShanten ? ukeire[discard] / unseen : -1
+      }
+      this.result.complete = false
+      return this.result
+    }
+
+    for (let discard = 0; discard < TILE_TYPE_COUNT; discard++) {
+      if (hand[discard] === 0 || shanten[discard] !== bestShanten) continue
+
+      if (bestShanten <= 0) {
+        // テンパイ（または和了形）: 残りツモで和了牌を引く確率
+        values[discard] = 1 - Math.pow(1 - ukeire[discard] / unseen, draws)
+        continue
+      }
+
+      // 2手目: 受け入れ牌ごとに、引いた後の最良の打牌の受け入れ枚数から確率を求める
+      let value = 0
+      this.evaluator.remove(discard)
+      for (let draw = 0; draw < TILE_TYPE_COUNT; draw++) {
+        if (this.remaining[draw] === 0 || this.evaluator.counts[draw] >= 4) continue
+        if (this.evaluator.shantenIfAdded(draw) >= bestShanten) continue
+
+        const firstRate = this.remaining[draw] / unseen
+        const secondRate = this.bestSecondUkeire(discard, draw, bestShanten - 1, handCounts, visibleCounts) / Math.max(1, unseen - 1)
+        value += firstRate * twoStepProbability(ukeire[discard] / unseen, secondRate, draws)
+
+        if (performance.now() > deadline) {
+          this.evaluator.add(discard)
+          return fallBack()
+        }
+      }
+      this.evaluator.add(discard)
+      values[discard] = value
+    }
+
+    this.result.complete = true
+    return this.result
+  }
+
+  /**
+   * 手牌から discard を切って draw を引いた14枚で、シャンテン数が targetShanten のまま切れる牌のうち最大の受け入れ枚数
+   */
+  private bestSecondUkeire(discard: number, draw: number, targetShanten: number, handCounts: Uint8Array, visibleCounts: Uint8Array): number {
+    const subHand = this.subHand
+    subHand.set(this.hand)
+    subHand[discard]--
+    subHand[draw]++
+    this.drawEvaluator.setHand(subHand)
+
+    let best = 0
+    for (let secondDiscard = 0; secondDiscard < TILE_TYPE_COUNT; secondDiscard++) {
+      if (subHand[secondDiscard] === 0) continue
+      if (this.drawEvaluator.shantenIfRemoved(secondDiscard) !== targetShanten) continue
+
+      subHand[secondDiscard]--
+      let count = this.subHandCache.get(subHand)
+      if (count === undefined) {
+        this.drawEvaluator.remove(secondDiscard)
+        count = this.countSubHandUkeire(handCounts, visibleCounts)
+        this.drawEvaluator.add(secondDiscard)
+        this.subHandCache.set(subHand, count)
+      }
+      subHand[secondDiscard]++
+      best = Math.max(best, count)
+    }
+    return best
+  }
+
+  /**
+   * 13枚の手牌（drawEvaluator）の受け入れ枚数。元の手牌になかった牌（引いた牌）は見えている牌として数える
+   */
+  private countSubHandUkeire(handCounts: Uint8Array, visibleCounts: Uint8Array): number {
+    const counts = this.drawEvaluator.counts
+    const currentShanten = this.drawEvaluator.shanten
+    let total = 0
+    for (let index = 0; index < TILE_TYPE_COUNT; index++) {
+      const drawn = Math.max(0, counts[index] - handCounts[index])
+      const remaining = 4 - visibleCounts[index] - drawn
+      if (remaining <= 0 || counts[index] >= 4) continue
+      if (this.drawEvaluator.shantenIfAdded(index) < currentShanten) {
+        total += remaining
+      }
+    }
+    return total
+  }
+
+  private countUkeire(evaluator: ShantenEvaluator, remaining: Uint8Array): number {
+    const currentShanten = evaluator.shanten
+    let total = 0
+    for (let index = 0; index < TILE_TYPE_COUNT; index++) {
+      if (remaining[index] === 0 || evaluator.counts[index] >= 4) continue
+      if (evaluator.shantenIfAdded(index) < currentShanten) {
+        total += remaining[index]
+      }
+    }
+    return total
+  }
+}
+
+/**
+ * 1回目の成功確率 firstRate・2回目の成功確率 secondRate のツモを draws 回行う間に、2回とも成功する確率を
+ * 1回目に特定の牌を引いた場合の分として求める（呼び出し側で1回目の牌ごとの確率を掛けて足し合わせる）
+ * k 回目に1回目が成功する確率 (1 - firstRate)^(k-1) × その牌の確率 に、残り draws - k 回で2回目が成功する確率を掛けて足す
+ */
+function twoStepProbability(firstRate: number, secondRate: number, draws: number): number {
+  let total = 0
+  let firstMiss = 1
+  for (let k = 1; k < draws; k++) {
+    total += firstMiss * (1 - Math.pow(1 - secondRate, draws - k))
+    firstMiss *= 1 - firstRate
+  }
+  return total
+}
@@ -1,18 +1,30 @@
 import type { Tile } from '../stores/mahjong'
-import { getUsefulTiles, createTileFromIndex, calculateShanten } from './mahjong-logic'
-import weighted from 'weighted'
+import { createTileFromIndex, calculateShanten } from './mahjong-logic'
+import { convertTilesToRustFormat } from './mahjong-calculator-wrapper'
+import { ShantenEvaluator } from './shanten-table'
 import seedrandom from 'seedrandom'
+import type { RandomSource } from './random'
+import type { Wall, WallSuit } from './wall'
+import { spanStart, spanEnd } from './profiler'
+
+// 牌種インデックス / 9 から色を引く（0-8: 萬子, 9-17: 筒子, 18-26: 索子, 27-33: 字牌）
+const SUIT_BY_TYPE_OFFSET: WallSuit[] = ['man', 'pin', 'sou', 'honor']
 
 export interface EnhancedDrawOptions {
   boostProbability: number // 有効牌を引く確率 (0.0 - 1.0)
   seed?: string // 再現可能な結果のためのシード
   enableDebugLog?: boolean
+  random?: RandomSource // 外部の乱数源（指定時はseedより優先し、GameManagerと同じ乱数列を使う）
 }
 
 export class EnhancedDraw {
-  private rng: seedrandom.PRNG
-  private options: Required<EnhancedDrawOptions>
+  private rng: RandomSource
+  private options: Required<Omit<EnhancedDrawOptions, 'random'>>
   private tileIdCounter = 1000
+  // 有効牌の計算用（ツモごとに確保しない）
+  private shantenEvaluator = new ShantenEvaluator()
+  private handCounts = new Uint8Array(34)
+  private usefulMask = new Uint32Array(2) // 有効牌の牌種のビットマスク
 
   constructor(options: EnhancedDrawOptions = { boostProbability: 0.8 }) {
     this.options = {
@@ -21,92 +33,89 @@ export class EnhancedDraw {
       enableDebugLog: options.enableDebugLog || false
     }
 
-    this.rng = seedrandom(this.options.seed)
+    this.rng = options.random || seedrandom(this.options.seed)
   }
 
   /**
    * 有効牌を引く確率でのツモシステム（清一色モード対応）
+   * 牌山は牌種ごとの残り枚数で扱い、選んだ牌は牌山から除かない
    */
-  drawEnhancedTile(hand: Tile[], availableTiles: Tile[], chinitsusuitFilter?: string): Tile | null {
-    if (availableTiles.length === 0) return null
-
-    // 清一色モードの場合、利用可能な牌を対象の色でフィルタリング
-    let filteredTiles = availableTiles
-    if (chinitsusuitFilter) {
-      const chinitsuyTiles = availableTiles.filter(tile => tile.suit === chinitsusuitFilter)
-      if (chinitsuyTiles.length > 0) {
-        filteredTiles = chinitsuyTiles
-      }
-      // 対象の色の牌がない場合は全ての牌から選択
-    }
+  drawEnhancedTile(hand: Tile[], wall: Wall, chinitsusuitFilter?: string): Tile | null {
+    const start = spanStart()
+    const tile = this.drawEnhancedTileUnprofiled(hand, wall, chinitsusuitFilter)
+    spanEnd('EnhancedDraw.drawEnhancedTile', start)
+    return tile
+  }
+
+  private drawEnhancedTileUnprofiled(hand: Tile[], wall: Wall, chinitsusuitFilter?: string): Tile | null {
+    if (wall.length === 0) return null
 
-    const usefulTileIndices = getUsefulTiles(hand)
+    // 清一色モードの場合、対象の色の牌から選択（対象の色の牌がない場合は全ての牌から選択）
+    const suitFilter = chinitsusuitFilter && wall.countOfSuit(chinitsusuitFilter as WallSuit) > 0
+      ? chinitsusuitFilter as WallSuit
+      : null
+
+    this.shantenEvaluator.setHand(convertTilesToRustFormat(hand, this.handCounts))
+    const hasUsefulTiles = this.shantenEvaluator.getUsefulTileMask(this.usefulMask)
 
     // 有効牌が存在し、かつブースト確率に当選した場合
     const randomValue = this.rng()
-    if (usefulTileIndices.length > 0 && randomValue < this.options.boostProbability) {
-      return this.drawUsefulTile(usefulTileIndices, filteredTiles)
+    if (hasUsefulTiles && randomValue < this.options.boostProbability) {
+      return this.drawUsefulTile(wall, suitFilter)
     }
 
     // 通常のランダムドロー
-    return this.drawRandomTile(filteredTiles)
+    return this.drawRandomTile(wall, suitFilter)
   }
 
   /**
    * 有効牌からランダムに選択
+   * 牌種ごとの残り枚数を重みとして牌種を選び、その牌種の残りの牌から選ぶ（山に残っている有効牌から等確率で選ぶのと同じ）
    */
-  private drawUsefulTile(usefulIndices: number[], availableTiles: Tile[]): Tile | null {
-    // 利用可能な牌の中から有効牌を抽出
-    const availableUsefulTiles = availableTiles.filter(tile => {
-      const tileIndex = this.getTileIndex(tile)
-      return usefulIndices.includes(tileIndex)
-    })
-
-    if (availableUsefulTiles.length === 0) {
-      // 有効牌が山にない場合は通常ドロー
-      return this.drawRandomTile(availableTiles)
+  private drawUsefulTile(wall: Wall, suitFilter: WallSuit | null): Tile | null {
+    const remaining = wall.typeRemaining
+    let total = 0
+    for (let type = 0; type < 34; type++) {
+      total += this.usefulWeight(type, remaining, suitFilter)
     }
 
-    // 重み付きランダム選択（すべて同じ重みで選択）
-    const weights: Record<string, number> = {}
-    availableUsefulTiles.forEach(tile => {
-      weights[tile.id] = 1
-    })
-
-    const selectedId = weighted.select(weights)
-    const selectedTile = availableUsefulTiles.find(t => t.id === selectedId)!
+    if (total === 0) {
+      // 有効牌が山にない場合は通常ドロー
+      return this.drawRandomTile(wall, suitFilter)
+    }
 
-    return selectedTile
+    // シード付きの乱数を使用
+    let target = Math.floor(this.rng() * total)
+    for (let type = 0; type < 34; type++) {
+      const weight = this.usefulWeight(type, remaining, suitFilter)
+      if (target < weight) {
+        return wall.atInType(type, target) ?? null
+      }
+      target -= weight
+    }
+    return null
   }
 
   /**
-   * 通常のランダムドロー
+   * 有効牌の牌種の山の残り枚数（有効牌でない・清一色モードの対象外の牌種は 0）
    */
-  private drawRandomTile(availableTiles: Tile[]): Tile | null {
-    if (availableTiles.length === 0) return null
-
-    const randomIndex = Math.floor(this.rng() * availableTiles.length)
-    const selectedTile = availableTiles[randomIndex]
-
-    if (this.options.enableDebugLog) {
-    }
-
-    return selectedTile
+  private usefulWeight(type: number, remaining: Uint8Array, suitFilter: WallSuit | null): number {
+    if ((this.usefulMask[type >>> 5] & (1 << (type & 31))) === 0) return 0
+    if (suitFilter && SUIT_BY_TYPE_OFFSET[Math.floor(type / 9)] !== suitFilter) return 0
+    return remaining[type]
   }
 
   /**
-   * 牌からインデックスを取得
+   * 通常のランダムドロー
    */
-  private getTileIndex(tile: Tile): number {
-    if (tile.suit === 'man') {
-      return tile.rank - 1
-    } else if (tile.suit === 'pin') {
-      return tile.rank - 1 + 9
-    } else if (tile.suit === 'sou') {
-      return tile.rank - 1 + 18
-    } else { // honor
-      return tile.rank - 1 + 27
-    }
+  private drawRandomTile(wall: Wall, suitFilter: WallSuit | null): Tile | null {
+    const count = suitFilter ? wall.countOfSuit(suitFilter) : wall.length
+    if (count === 0) return null
+
+    const randomIndex = Math.floor(this.rng() * count)
+    const selectedTile = suitFilter ? wall.atInSuit(suitFilter, randomIndex) : wall.at(randomIndex)
+
+    return selectedTile ?? null
   }
 
   /**
@@ -0,0 +1,63 @@
+// E2Eテスト向けデバッグフック
+// デバッグモード時のみ window.__MAHJONG_DEBUG__ にゲーム状態の参照口を公開する
+import type { PlayerTestData } from './useGameSettings'
+
+// Playwrightから参照するゲーム状態のスナップショット
+export interface GameDebugState {
+  gamePhase: string
+  isTestMode: boolean
+  currentPlayerIndex: number
+  isHumanTurn: boolean
+  hasDrawnTile: boolean
+  humanHandSize: number
+  wallRemaining: number
+  doraCount: number
+  round: number
+  canTsumo: boolean
+  canRon: boolean
+  canRiichi: boolean
+  canPon: boolean
+  canKan: boolean
+  canChi: boolean
+  canAnkan: boolean
+  showWinModal: boolean
+  showDrawModal: boolean
+  showGameEndModal: boolean
+  processingCpuTurn: boolean
+  isCalculatingAcceptance: boolean
+}
+
+export interface GameDebugHandle {
+  // 現在のゲーム状態を取得
+  getState: () => GameDebugState
+  // テスト用配牌を直接適用（テストモックダイアログと同じ経路でGameManagerに渡す）
+  loadTestDeal: (players: PlayerTestData[]) => GameDebugState
+}
+
+declare global {
+  interface Window {
+    __MAHJONG_DEBUG__?: GameDebugHandle
+  }
+}
+
+export const GAME_DEBUG_READY_EVENT = 'mahjong-debug-ready'
+
+/**
+ * デバッグハンドルをwindowに登録
+ * @returns 登録解除関数
+ */
+export function installGameDebugHandle(handle: GameDebugHandle): () => void {
+  if (typeof window === 'undefined') {
+    return () => {}
+  }
+
+  window.__MAHJONG_DEBUG__ = handle
+  window.dispatchEvent(new CustomEvent(GAME_DEBUG_READY_EVENT))
+
+  return () => {
+    // 別のインスタンスが登録し直している場合は触らない
+    if (window.__MAHJONG_DEBUG__ === handle) {
+      delete window.__MAHJONG_DEBUG__
+    }
+  }
+}
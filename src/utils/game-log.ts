@@ -0,0 +1,137 @@
+// 対局の行動ログと再生
+// GameManager が配牌・ツモ・打牌・鳴き・和了・流局を牌IDのタプルで記録し、
+// replayGameLog() で同じ GameManager の処理を乱数・AIなしで最高速度で再実行する
+import type { Tile } from '../stores/fourPlayerMahjong'
+import { GameManager } from './game-manager'
+
+export type GameLogMeldType = 'pon' | 'chi' | 'kan'
+
+// ログの1行（先頭要素で種類を区別する）
+export type GameLogEntry =
+  // 局, 親, 各プレイヤーの手牌, ドラ表示牌, 配牌後の牌山
+  | ['deal', number, number, string[][], string[], string[]]
+  // プレイヤー, ツモ牌（嶺上牌を含む）
+  | ['draw', number, string]
+  // プレイヤー, 捨て牌, リーチ宣言牌なら1
+  | ['discard', number, string, 0 | 1]
+  // プレイヤー, 鳴きの種類, 鳴き牌（全て）, 鳴いた牌, 鳴いた相手（暗カンは自分）
+  | ['call', number, GameLogMeldType, string[], string, number]
+  // カンドラ表示牌
+  | ['kanDora', string]
+  // プレイヤー, 和了牌, ツモなら1, 放銃者（ツモは-1）, 和了点
+  | ['win', number, string, 0 | 1, number, number]
+  // 荒牌平局
+  | ['ryuukyoku']
+
+export interface GameLog {
+  version: 1
+  seed: string
+  settings: {
+    gameType: string
+    agariRenchan: boolean
+    hakoshita: boolean
+  }
+  entries: GameLogEntry[]
+}
+
+export interface GameReplayResult {
+  manager: GameManager
+  scores: number[]
+  rounds: number
+  elapsedMs: number
+}
+
+export function tileIds(tiles: Tile[]): string[] {
+  return tiles.map(tile => tile.id)
+}
+
+/**
+ * 行動ログを GameManager で再生する
+ * 記録時と和了点が一致しない場合は例外を投げる（処理変更による挙動差の検出用）
+ */
+export function replayGameLog(log: GameLog): GameReplayResult {
+  const manager = new GameManager({
+    gameSettings: log.settings,
+    seed: log.seed,
+    recordResults: false
+  })
+
+  let rounds = 0
+  const start = performance.now()
+
+  for (const entry of log.entries) {
+    switch (entry[0]) {
+      case 'deal': {
+        const [, round, dealer, hands, dora, wall] = entry
+        manager.restoreDeal(round, dealer, hands, dora, wall)
+        rounds++
+        break
+      }
+      case 'draw': {
+        const [, playerIndex, tileId] = entry
+        // 鳴き・カン以外のツモは打牌後の nextTurn() でツモ番が回ってくる
+        while (manager.currentPlayerIndex !== playerIndex) {
+          manager.nextTurn()
+        }
+        manager.drawTileById(playerIndex, tileId)
+        break
+      }
+      case 'discard': {
+        const [, playerIndex, tileId, isRiichi] = entry
+        if (isRiichi) {
+          manager.declareRiichi(playerIndex)
+        }
+        manager.resetAfterKan()
+        if (!manager.discardTile(playerIndex, tileId, isRiichi === 1)) {
+          throw new Error(`再生できない打牌です: プレイヤー${playerIndex} ${tileId}`)
+        }
+        break
+      }
+      case 'call': {
+        const [, playerIndex, type, meldTileIds, calledTileId, fromPlayer] = entry
+        manager.applyCall(playerIndex, type, meldTileIds, calledTileId, fromPlayer)
+        break
+      }
+      case 'kanDora': {
+        const [, tileId] = entry
+        manager.addKanDoraIndicator()
+        const indicators = manager.doraIndicators
+        if (indicators[indicators.length - 1]?.id !== tileId) {
+          throw new Error(`カンドラ表示牌が記録と一致しません: ${tileId}`)
+        }
+        break
+      }
+      case 'win': {
+        const [, playerIndex, , isTsumo, fromPlayer, totalPoints] = entry
+        const winTile = isTsumo ? manager.currentDrawnTile : manager.lastDiscardedTile
+        if (!winTile) {
+          throw new Error(`和了牌がありません: プレイヤー${playerIndex}`)
+        }
+
+        const winCheck = manager.checkWinConditionForPlayer(playerIndex, winTile, isTsumo === 1, true)
+        if (!winCheck.isWin || !winCheck.result || winCheck.result.totalPoints !== totalPoints) {
+          throw new Error(`和了結果が記録と一致しません: プレイヤー${playerIndex} 記録${totalPoints}点 再生${winCheck.result?.totalPoints ?? 0}点`)
+        }
+
+        manager.applyKyotakuToWinner(playerIndex)
+        manager.executeScoreTransfer(playerIndex, winCheck.result.paymentInfo, totalPoints, isTsumo === 1, fromPlayer >= 0 ? fromPlayer : undefined)
+        manager.gamePhase = 'finished'
+        break
+      }
+      case 'ryuukyoku': {
+        if (!manager.checkDraw().isDraw) {
+          throw new Error(`流局条件を満たしていません（山残り${manager.wallRemaining}枚）`)
+        }
+        manager.gamePhase = 'finished'
+        break
+      }
+    }
+  }
+
+  return {
+    manager,
+    scores: manager.players.map(player => player.score),
+    rounds,
+    elapsedMs: performance.now() - start
+  }
+}
@@ -1,14 +1,38 @@
-import type { Tile, Player, GamePhase } from '../stores/fourPlayerMahjong'
+import type { Tile, Player, GamePhase, Meld } from '../stores/fourPlayerMahjong'
 import { canRiichi, canRiichiWithMelds, checkWinCondition, calculateShanten, isFuriten, calculateAcceptance, type AcceptanceInfo } from './mahjong-logic'
+import { getTileIndex } from './mahjong-calculator-wrapper'
+import { TileCountTracker, TILE_TYPE_COUNT } from './tile-counts'
+import { WaitTracker } from './wait-tracker'
+import { ByteKeyLruCache, hashBytes } from './lru-cache'
 import { EnhancedDraw } from './enhanced-draw'
+import { Wall, DEAD_WALL_SIZE } from './wall'
+import { spanStart, spanEnd } from './profiler'
+import { calculateShantenFromTable } from './shanten-table'
 import { RecordsManager } from './records-manager'
 import { type PlayerTestData } from './useGameSettings'
+import { createRandom, generateSeed, type RandomSource } from './random'
+import { tileIds, type GameLog, type GameLogEntry, type GameLogMeldType } from './game-log'
+
+// ローカルストレージを使わずに設定を渡すためのオプション（ヘッドレスシミュレーション等で使用）
+export interface GameManagerOptions {
+  // 指定した項目はローカルストレージの設定より優先される
+  gameSettings?: { cpuStrengths?: string[], gameType?: string, agariRenchan?: boolean, hakoshita?: boolean, specialMode?: { chinitsuMode: boolean } }
+  manipulationRate?: number
+  handQuality?: string
+  // 対局結果を戦績（ローカルストレージ）に記録するか（デフォルト: true）
+  recordResults?: boolean
+  // 乱数シード（牌山・配牌・EnhancedDraw・CpuAIの乱数は全てこのシードから生成される）
+  // 省略時はランダムなシードを生成し、seed / actionLog から参照できる
+  seed?: string
+  // 受け入れ計算キャッシュの容量（デフォルト: 100）
+  acceptanceCacheSize?: number
+}
 
 export class GameManager {
   private _players: Player[]
   private _gamePhase: GamePhase
   private _currentPlayerIndex: number
-  private _wall: Tile[]
+  private _wall = new Wall() // 牌山（並び順を保ったまま O(log n) で除去できる）
   private _doraIndicators: Tile[]
   private _currentDrawnTile: Tile | null
   private _round: number
@@ -34,19 +58,36 @@ export class GameManager {
   private _testDrawIndices: number[] = [0, 0, 0, 0] // 各プレイヤーのツモ牌インデックス
   private _firstTakeFlags: boolean[] = [true, true, true, true] // 各プレイヤーの第一ツモフラグ
   
-  // 受け入れ計算キャッシュ
-  private _acceptanceCache: Map<string, AcceptanceInfo[]> = new Map()
-  private _lastHandStates: string[] = ['', '', '', ''] // 各プレイヤーの前回の手牌状態
+  // 受け入れ計算キャッシュ（手牌・見えている牌の枚数をキーにする）
+  private _acceptanceCache: ByteKeyLruCache<AcceptanceInfo[]>
+  private _handStateKey = new Uint8Array(1 + TILE_TYPE_COUNT * 2) // [プレイヤー, 手牌の枚数 × 34, 見えている牌の枚数 × 34]
+  private _options: GameManagerOptions
+  private _seed: string
+  private _random: RandomSource // 対局中の全ての乱数の元
+  private _randomSource: RandomSource = () => this._random() // 外部（EnhancedDraw・CpuAI）に渡す乱数関数（reseed後も同じ関数で参照できる）
+  private _actionLog: GameLogEntry[] = [] // 対局の行動ログ
+  private _tileCounts = new TileCountTracker() // 手牌・河・鳴き牌・見えている牌の34種の枚数（差分更新）
+  private _waits = new WaitTracker() // 各プレイヤーの待ち牌・フリテン（手牌が変わった時だけ計算し直す）
+  private _evaluationCounts = new Uint8Array(34) // 配牌候補の評価用（候補ごとに確保しない）
+  private _candidateSlots = new Int32Array(13) // 配牌候補の牌山のスロット
+  private _bestCandidateSlots = new Int32Array(13)
+
+  constructor(options: GameManagerOptions = {}) {
+    this._options = options
+    this._seed = options.seed !== undefined ? options.seed : generateSeed()
+    this._random = createRandom(this._seed)
+    this._acceptanceCache = new ByteKeyLruCache(options.acceptanceCacheSize ?? 100)
 
-  constructor() {
-    
     // ローカルストレージから設定を読み込み
     const savedSettings = this.loadGameSettings()
     this._gameSettings = savedSettings
 
     // 牌操作率設定を適用してEnhancedDrawを初期化
     const manipulationRate = this.getManipulationRate()
-    this._enhancedDraw = new EnhancedDraw({ boostProbability: manipulationRate / 100 })
+    this._enhancedDraw = new EnhancedDraw({
+      boostProbability: manipulationRate / 100,
+      random: this._randomSource
+    })
 
     this._players = [
       { id: 0, name: 'あなた', type: 'human', tiles: [], discards: [], melds: [], riichi: false, score: 25000, wind: 'east' },
@@ -56,7 +97,6 @@ export class GameManager {
     ]
     this._gamePhase = 'waiting'
     this._currentPlayerIndex = 0
-    this._wall = []
     this._doraIndicators = []
     this._currentDrawnTile = null
     this._round = 1
@@ -87,8 +127,9 @@ export class GameManager {
     this._currentPlayerIndex = index
   }
 
+  // 残りの牌山を並び順どおりの配列で返す（呼び出しごとに配列を作る。ログ・テスト用）
   get wall(): Tile[] {
-    return this._wall
+    return this._wall.toArray()
   }
 
   get doraIndicators(): Tile[] {
@@ -103,6 +144,8 @@ export class GameManager {
       // 王牌（リンシャン牌）からドラ表示牌を取得
       const newDoraIndicator = this._wall.pop()!
       this._doraIndicators.push(newDoraIndicator)
+      this._tileCounts.flipDora(newDoraIndicator)
+      this.logAction(['kanDora', newDoraIndicator.id])
     }
   }
 
@@ -119,9 +162,9 @@ export class GameManager {
 
     // 表ドラと同数の裏ドラを山の後方から取得
     for (let i = 0; i < doraCount; i++) {
-      const uradoraIndex = this._wall.length - 2 - i
-      if (uradoraIndex >= 0) {
-        uradoraIndicators.push(this._wall[uradoraIndex])
+      const uradora = this._wall.fromEnd(1 + i)
+      if (uradora) {
+        uradoraIndicators.push(uradora)
       }
     }
 
@@ -153,7 +196,7 @@ export class GameManager {
   }
 
   get wallRemaining(): number {
-    return Math.max(0, this._wall.length - 14)
+    return this._wall.liveLength
   }
 
   /**
@@ -226,19 +269,107 @@ export class GameManager {
     // TODO: 鳴きの検出ロジックが必要
   }
 
-  generateWall(): void {
-    const tiles: Tile[] = []
+  /**
+   * 乱数シードを再設定（EnhancedDraw・CpuAIに渡した乱数関数にも反映される）
+   */
+  reseed(newSeed?: string): void {
+    this._seed = newSeed || generateSeed()
+    this._random = createRandom(this._seed)
+  }
+
+  get seed(): string {
+    return this._seed
+  }
+
+  // EnhancedDraw・CpuAIと共有する乱数関数
+  get random(): RandomSource {
+    return this._randomSource
+  }
+
+  /**
+   * 現在の対局の行動ログ（startNewGameからの全ての行動）
+   */
+  get actionLog(): GameLog {
+    return {
+      version: 1,
+      seed: this._seed,
+      settings: {
+        gameType: this._gameSettings.gameType,
+        agariRenchan: this._gameSettings.agariRenchan,
+        hakoshita: this._gameSettings.hakoshita
+      },
+      entries: this._actionLog
+    }
+  }
+
+  /**
+   * 34種の牌の枚数（ツモ・打牌・鳴き・カンドラのたびに差分更新される）
+   */
+  get tileCounts(): TileCountTracker {
+    return this._tileCounts
+  }
+
+  /**
+   * 指定プレイヤーから見えている牌の枚数（自分の手牌とツモ牌 + 全員の河・鳴き牌 + ドラ表示牌）
+   * calculateAcceptance / getTileRemainingCount の visibleTiles にそのまま渡せる。戻り値は次の呼び出しで上書きされる
+   */
+  getVisibleTileCounts(playerIndex: number): Uint8Array {
+    return this._tileCounts.visibleFor(playerIndex)
+  }
 
+  /**
+   * 指定プレイヤーから見た牌の残り枚数
+   */
+  getRemainingTileCount(playerIndex: number, tileIndex: number): number {
+    return this._tileCounts.remaining(playerIndex, tileIndex)
+  }
+
+  // 手牌・河・鳴き牌を直接設定した後に枚数を数え直す
+  private rebuildTileCounts(): void {
+    const drawnPlayerIndex = this._currentDrawnTile ? this._currentPlayerIndex : -1
+    this._tileCounts.rebuild(this._players, this._doraIndicators, this._currentDrawnTile, drawnPlayerIndex)
+  }
+
+  private logAction(entry: GameLogEntry): void {
+    this._actionLog.push(entry)
+  }
+
+  private logDeal(): void {
+    this.logAction([
+      'deal',
+      this._round,
+      this._dealer,
+      this._players.map(player => tileIds(player.tiles)),
+      tileIds(this._doraIndicators),
+      tileIds(this._wall.toArray())
+    ])
+  }
+
+  generateWall(): void {
     // 清一色モードかどうかチェック
     const isChinitsuMode = this._gameSettings.specialMode?.chinitsuMode || false
     
     if (isChinitsuMode) {
       // 清一色モードの場合、各局ごとにランダムに色を選択
       const suits: ('man' | 'pin' | 'sou')[] = ['man', 'pin', 'sou']
-      this._chinitsuSuit = suits[Math.floor(Math.random() * suits.length)]
+      this._chinitsuSuit = suits[Math.floor(this._random() * suits.length)]
     }
-    
+
     // 清一色モードでも通常通り全色の牌を生成
+    const tiles = this.createAllTiles()
+
+    for (let i = tiles.length - 1; i > 0; i--) {
+      const j = Math.floor(this._random() * (i + 1))
+        ;[tiles[i], tiles[j]] = [tiles[j], tiles[i]]
+    }
+
+    this._wall.reset(tiles)
+  }
+
+  // 136枚の牌を生成（並びは固定）
+  private createAllTiles(): Tile[] {
+    const tiles: Tile[] = []
+
     for (const suit of ['man', 'pin', 'sou'] as const) {
       for (let rank = 1; rank <= 9; rank++) {
         for (let i = 0; i < 4; i++) {
@@ -266,12 +397,7 @@ export class GameManager {
       }
     }
 
-    for (let i = tiles.length - 1; i > 0; i--) {
-      const j = Math.floor(Math.random() * (i + 1))
-        ;[tiles[i], tiles[j]] = [tiles[j], tiles[i]]
-    }
-
-    this._wall = tiles
+    return tiles
   }
 
   dealInitialHands(): void {
@@ -293,9 +419,14 @@ export class GameManager {
     this._players.forEach(player => {
       this.sortPlayerHand(player)
     })
+
+    this.rebuildTileCounts()
   }
 
   private getHandQualitySetting(): string {
+    if (this._options.handQuality !== undefined) {
+      return this._options.handQuality
+    }
     try {
       const gameSettings = localStorage.getItem('mahjong-game-settings')
       if (gameSettings) {
@@ -338,90 +469,100 @@ export class GameManager {
 
       // 選択された手牌を配牌
       bestHand.forEach(tile => {
-        const wallIndex = this._wall.findIndex(t => t.id === tile.id)
-        if (wallIndex !== -1) {
-          this._wall.splice(wallIndex, 1)
+        if (this._wall.remove(tile.id)) {
           player.tiles.push(tile)
         }
       })
     }
   }
 
+  /**
+   * 複数の候補から最も評価の高い13枚を選ぶ
+   * 候補は牌山のスロットとして作業用バッファに試し引きし（牌山からは一時的に除いて戻す）、枚数配列で評価する
+   * Tile の配列にするのは選ばれた候補のみ
+   */
   private selectBestHand(candidates: number, isHumanPlayer: boolean = false): Tile[] {
-    let bestHand: Tile[] = []
+    const start = spanStart()
+    const hand = this.selectBestHandUnprofiled(candidates, isHumanPlayer)
+    spanEnd('GameManager.selectBestHand', start)
+    return hand
+  }
+
+  private selectBestHandUnprofiled(candidates: number, isHumanPlayer: boolean = false): Tile[] {
     let bestScore = -1
+    let bestSize = 0
     const isChinitsuMode = this._gameSettings.specialMode?.chinitsuMode || false
+    const chinitsuSuit = isChinitsuMode && isHumanPlayer ? this._chinitsuSuit : null
+    const candidateSlots = this._candidateSlots
+    const bestSlots = this._bestCandidateSlots
+    const counts = this._evaluationCounts
 
     for (let i = 0; i < candidates; i++) {
-      const candidateHand: Tile[] = []
-      const wallCopy = [...this._wall]
+      let size = 0
+      counts.fill(0)
 
       // 13枚の候補手牌を生成
       for (let j = 0; j < 13; j++) {
-        if (isChinitsuMode && isHumanPlayer && this._chinitsuSuit) {
-          // 清一色モードかつ人間プレイヤーの場合、100%の確率で対象の色の牌を選ぶ
-          const targetSuitTiles = wallCopy.filter(tile => tile.suit === this._chinitsuSuit)
-          if (targetSuitTiles.length > 0) {
-            const randomIndex = Math.floor(Math.random() * targetSuitTiles.length)
-            const selectedTile = targetSuitTiles[randomIndex]
-            const wallIndex = wallCopy.findIndex(t => t.id === selectedTile.id)
-            if (wallIndex !== -1) {
-              candidateHand.push(wallCopy.splice(wallIndex, 1)[0])
-              continue
-            }
-          }
-        }
-        
-        // 通常の牌選択または清一色モードでフォールバック
-        if (wallCopy.length > 0) {
-          const randomIndex = Math.floor(Math.random() * wallCopy.length)
-          candidateHand.push(wallCopy.splice(randomIndex, 1)[0])
+        let slot = -1
+        // 清一色モードかつ人間プレイヤーの場合、100%の確率で対象の色の牌を選ぶ
+        const targetSuitCount = chinitsuSuit ? this._wall.countOfSuit(chinitsuSuit) : 0
+        if (targetSuitCount > 0) {
+          slot = this._wall.slotAtInSuit(chinitsuSuit!, Math.floor(this._random() * targetSuitCount))
+        } else if (this._wall.length > 0) {
+          // 通常の牌選択または清一色モードでフォールバック
+          slot = this._wall.slotAt(Math.floor(this._random() * this._wall.length))
         }
+        if (slot < 0) continue
+
+        this._wall.removeSlot(slot)
+        candidateSlots[size++] = slot
+        counts[this._wall.typeOfSlot(slot)]++
+      }
+      for (let j = 0; j < size; j++) {
+        this._wall.restoreSlot(candidateSlots[j])
       }
 
       // 手牌を評価
-      const score = this.evaluateHand(candidateHand)
+      const score = this.evaluateHandCounts(counts, size)
 
       if (score > bestScore) {
         bestScore = score
-        bestHand = candidateHand
+        bestSize = size
+        bestSlots.set(candidateSlots)
       }
     }
 
+    const bestHand: Tile[] = []
+    for (let j = 0; j < bestSize; j++) {
+      bestHand.push(this._wall.tileOfSlot(bestSlots[j]))
+    }
     return bestHand
   }
 
-  private evaluateHand(hand: Tile[]): number {
+  /**
+   * 候補の手牌（枚数配列）の評価値
+   */
+  private evaluateHandCounts(counts: Uint8Array, tileCount: number): number {
     let score = 0
 
-    // シャンテン数による評価
-    const shanten = calculateShanten(hand)
+    // シャンテン数による評価（配牌候補の評価のみなので、WASMを呼ばずにテーブルで求める）
+    const shanten = tileCount > 0 ? calculateShantenFromTable(counts) : 8
     score += (8 - shanten) * 100 // シャンテン数が少ないほど高スコア
 
     // ドラ牌による評価
     if (this._doraIndicators.length > 0) {
-      const doraCount = this.countDoraTiles(hand)
+      const doraCount = this.countDoraTiles(counts)
       score += doraCount * 20
     }
 
     return score
   }
 
-  private countDoraTiles(hand: Tile[]): number {
+  private countDoraTiles(counts: Uint8Array): number {
     if (this._doraIndicators.length === 0) return 0
 
-    let count = 0
     const doraIndicator = this._doraIndicators[0]
-    const doranumber = this.getNextTileNumber(doraIndicator)
-
-    hand.forEach(tile => {
-      const tileNumber = this.convertTileToNumber(tile)
-      if (tileNumber === doranumber) {
-        count++
-      }
-    })
-
-    return count
+    return counts[this.getNextTileNumber(doraIndicator)]
   }
 
   private getNextTileNumber(tile: Tile): number {
@@ -438,15 +579,10 @@ export class GameManager {
     return 0
   }
 
-  private convertTileToNumber(tile: Tile): number {
-    if (tile.suit === 'man') return tile.rank - 1
-    if (tile.suit === 'pin') return tile.rank + 8
-    if (tile.suit === 'sou') return tile.rank + 17
-    if (tile.suit === 'honor') return tile.rank + 26
-    return 0
-  }
-
   private getManipulationRate(): number {
+    if (this._options.manipulationRate !== undefined) {
+      return this._options.manipulationRate
+    }
     try {
       const gameSettings = localStorage.getItem('mahjong-game-settings')
       if (gameSettings) {
@@ -480,12 +616,21 @@ export class GameManager {
   }
 
   drawTileAndKeepSeparate(playerIndex: number): Tile | null {
+    const tile = this.drawTileForTurn(playerIndex)
+    if (tile) {
+      this._tileCounts.draw(playerIndex, tile)
+      this.logAction(['draw', playerIndex, tile.id])
+    }
+    return tile
+  }
+
+  private drawTileForTurn(playerIndex: number): Tile | null {
     // テストモードの場合は専用の処理
     if (this._testMode.isActive) {
       const testTile = this.getTestDrawTile(playerIndex)
       if (testTile) {
         // テストモード時でも牌山から1枚除去して数値を正しく表示
-        if (this._wall.length > 14) {
+        if (this._wall.length > DEAD_WALL_SIZE) {
           this._wall.shift() // 実際の山から1枚除去
         }
         this._currentDrawnTile = testTile
@@ -499,12 +644,21 @@ export class GameManager {
 
   // カン後のリンシャン牌を引く（テストモードではツモインデックスをインクリメントしない）
   drawKanTile(playerIndex: number): Tile | null {
+    const tile = this.drawKanTileForTurn(playerIndex)
+    if (tile) {
+      this._tileCounts.draw(playerIndex, tile)
+      this.logAction(['draw', playerIndex, tile.id])
+    }
+    return tile
+  }
+
+  private drawKanTileForTurn(playerIndex: number): Tile | null {
     // テストモードの場合は専用の処理
     if (this._testMode.isActive) {
       const testTile = this.getTestKanTile(playerIndex)
       if (testTile) {
         // テストモード時でも牌山から1枚除去して数値を正しく表示
-        if (this._wall.length > 14) {
+        if (this._wall.length > DEAD_WALL_SIZE) {
           this._wall.shift() // 実際の山から1枚除去
         }
         this._currentDrawnTile = testTile
@@ -516,6 +670,22 @@ export class GameManager {
     return this.drawTileInternal(playerIndex)
   }
 
+  /**
+   * 行動ログの再生用: 指定したIDの牌を山から引く
+   */
+  drawTileById(playerIndex: number, tileId: string): Tile {
+    const tile = this._wall.remove(tileId)
+    if (!tile) {
+      throw new Error(`牌山に ${tileId} がありません`)
+    }
+
+    this._currentDrawnTile = tile
+    this.clearFirstTakeFlag(playerIndex)
+    this._tileCounts.draw(playerIndex, tile)
+    this.logAction(['draw', playerIndex, tile.id])
+    return tile
+  }
+
   // 清一色モード用の配牌メソッド
   private drawChinitsuTileForDeal(): Tile | null {
     const isChinitsuMode = this._gameSettings.specialMode?.chinitsuMode || false
@@ -524,18 +694,13 @@ export class GameManager {
     }
 
     // 清一色モードで対象の色の牌を探す
-    const targetSuitTiles = this._wall.filter(tile => tile.suit === this._chinitsuSuit)
+    const targetSuitCount = this._wall.countOfSuit(this._chinitsuSuit)
     
-    if (targetSuitTiles.length > 0) {
-      // 対象の色の牌がある場合、ランダムに選択
-      const randomIndex = Math.floor(Math.random() * targetSuitTiles.length)
-      const selectedTile = targetSuitTiles[randomIndex]
-      
-      // 山から除去
-      const wallIndex = this._wall.findIndex(t => t.id === selectedTile.id)
-      if (wallIndex !== -1) {
-        this._wall.splice(wallIndex, 1)
-      }
+    if (targetSuitCount > 0) {
+      // 対象の色の牌がある場合、ランダムに選択して山から除去
+      const randomIndex = Math.floor(this._random() * targetSuitCount)
+      const selectedTile = this._wall.atInSuit(this._chinitsuSuit, randomIndex)!
+      this._wall.remove(selectedTile.id)
       
       return selectedTile
     }
@@ -547,7 +712,7 @@ export class GameManager {
   private drawTileInternal(playerIndex: number): Tile | null {
 
     // 14枚残しで終了
-    if (this._wall.length <= 14) return null
+    if (this._wall.length <= DEAD_WALL_SIZE) return null
 
     // 清一色モードの処理は通常のEnhancedDraw処理内で行う
 
@@ -586,10 +751,7 @@ export class GameManager {
         
         if (drawnTile) {
           // 山から引いた牌を除去
-          const index = this._wall.findIndex(t => t.id === drawnTile.id)
-          if (index !== -1) {
-            this._wall.splice(index, 1)
-          }
+          this._wall.remove(drawnTile.id)
           tile = drawnTile
         }
       } else {
@@ -604,17 +766,14 @@ export class GameManager {
         
         if (drawnTile) {
           // 山から引いた牌を除去
-          const index = this._wall.findIndex(t => t.id === drawnTile.id)
-          if (index !== -1) {
-            this._wall.splice(index, 1)
-          }
+          this._wall.remove(drawnTile.id)
           tile = drawnTile
         }
       }
     }
 
     // 通常の引き方（該当しない難易度の場合、または有効牌が引けなかった場合）
-    if (!tile && this._wall.length > 14) {
+    if (!tile && this._wall.length > DEAD_WALL_SIZE) {
       tile = this._wall.shift()!
     }
 
@@ -646,6 +805,8 @@ export class GameManager {
       // 一発フラグの管理
       this.updateIppatsuFlags(playerIndex, isRiichiDeclaration)
 
+      this._tileCounts.discard(playerIndex, tile)
+      this.logAction(['discard', playerIndex, tile.id, isRiichiDeclaration ? 1 : 0])
       return true
     }
 
@@ -671,12 +832,71 @@ export class GameManager {
     // 一発フラグの管理
     this.updateIppatsuFlags(playerIndex, isRiichiDeclaration)
 
+    this._tileCounts.discard(playerIndex, tile)
+    this.logAction(['discard', playerIndex, tile.id, isRiichiDeclaration ? 1 : 0])
     return true
   }
 
+  /**
+   * 鳴き牌を追加して行動ログに記録する（手牌・捨て牌からの除去は呼び出し側で行う）
+   */
+  addMeld(playerIndex: number, meld: Meld): void {
+    this._players[playerIndex].melds.push(meld)
+    this._tileCounts.call(playerIndex, meld)
+    this.logAction(['call', playerIndex, meld.type, tileIds(meld.tiles), meld.calledTile.id, meld.fromPlayer ?? playerIndex])
+  }
+
+  /**
+   * 行動ログの再生用: 記録された鳴きを手牌・捨て牌に反映する
+   */
+  applyCall(playerIndex: number, type: GameLogMeldType, meldTileIds: string[], calledTileId: string, fromPlayer: number): void {
+    const player = this._players[playerIndex]
+    const isAnkan = fromPlayer === playerIndex
+
+    // 暗カンはツモ牌を手牌に加えてから行う
+    if (isAnkan && this._currentDrawnTile) {
+      player.tiles.push(this._currentDrawnTile)
+      this._currentDrawnTile = null
+    }
+
+    let calledTile: Tile | undefined
+    if (!isAnkan) {
+      const discards = this._players[fromPlayer].discards
+      if (discards[discards.length - 1]?.id !== calledTileId) {
+        throw new Error(`鳴いた牌 ${calledTileId} がプレイヤー${fromPlayer}の最後の捨て牌ではありません`)
+      }
+      calledTile = discards.pop()!
+    }
+
+    const meldTiles = meldTileIds.map(id => {
+      if (calledTile && id === calledTile.id) {
+        return calledTile
+      }
+      const index = player.tiles.findIndex(t => t.id === id)
+      if (index === -1) {
+        throw new Error(`プレイヤー${playerIndex}の手牌に ${id} がありません`)
+      }
+      return player.tiles.splice(index, 1)[0]
+    })
+
+    this.addMeld(playerIndex, {
+      type,
+      tiles: meldTiles,
+      calledTile: calledTile || meldTiles[0],
+      fromPlayer
+    })
+
+    if (type === 'kan') {
+      this.setAfterKan(playerIndex)
+    }
+    this.sortPlayerHand(player)
+    this._currentPlayerIndex = playerIndex
+  }
+
   addTileToHand(playerIndex: number, tile: Tile): void {
     const player = this._players[playerIndex]
     player.tiles.push(tile)
+    this._tileCounts.draw(playerIndex, tile)
     this.sortPlayerHand(player)
   }
 
@@ -716,10 +936,52 @@ export class GameManager {
 
     this.generateWall()
     this.dealInitialHands()
+    this.logDeal()
 
     this._gamePhase = 'playing'
   }
 
+  /**
+   * 行動ログの再生用: 記録された配牌・牌山で局を開始する（advanceToNextRoundの牌山生成・配牌の代わり）
+   */
+  restoreDeal(round: number, dealer: number, hands: string[][], doraIndicators: string[], wall: string[]): void {
+    this._round = round
+    this._dealer = dealer
+    this.updatePlayerWinds()
+
+    this._gamePhase = 'dealing'
+    this._currentPlayerIndex = dealer
+    this._currentDrawnTile = null
+    this._lastDiscardedTile = null
+    this._lastDiscardPlayerIndex = null
+    this._discardOrder = 0
+    this._ippatsuFlags = [false, false, false, false]
+    this._currentTurn = 1
+    this.resetFirstTakeFlags()
+
+    const tilesById = new Map(this.createAllTiles().map(tile => [tile.id, tile]))
+    const toTiles = (ids: string[]) => ids.map(id => {
+      const tile = tilesById.get(id)
+      if (!tile) {
+        throw new Error(`再生できない牌です: ${id}`)
+      }
+      return tile
+    })
+
+    this._players.forEach((player, index) => {
+      player.tiles = toTiles(hands[index])
+      player.discards = []
+      player.melds = []
+      player.riichi = false
+    })
+    this._doraIndicators = toTiles(doraIndicators)
+    this._wall.reset(toTiles(wall))
+    this.rebuildTileCounts()
+
+    this.logDeal()
+    this._gamePhase = 'playing'
+  }
+
   private updatePlayerWinds(): void {
     const winds = ['east', 'south', 'west', 'north'] as const
     this._players.forEach((player, index) => {
@@ -730,6 +992,10 @@ export class GameManager {
   }
 
   startNewGame(): void {
+    // 同じシードから乱数列をやり直し、行動ログを空にする
+    this._random = createRandom(this._seed)
+    this._actionLog = []
+
     this._players.forEach(player => {
       player.tiles = []
       player.discards = []
@@ -751,6 +1017,7 @@ export class GameManager {
 
     this.generateWall()
     this.dealInitialHands()
+    this.logDeal()
 
     // ゲーム開始時刻を記録
     this._gameStartTime = new Date()
@@ -764,7 +1031,7 @@ export class GameManager {
     this._gamePhase = 'waiting'
     this._currentPlayerIndex = 0
     this._currentDrawnTile = null
-    this._wall = []
+    this._wall.reset([])
     this._doraIndicators = []
     this._round = 1
     this._dealer = 0
@@ -776,6 +1043,11 @@ export class GameManager {
     this._currentTurn = 1
     this._gameStartTime = null
 
+    // シード未指定の場合は次の対局用に新しいシードを生成
+    if (this._options.seed === undefined) {
+      this.reseed()
+    }
+
     this._players.forEach(player => {
       player.tiles = []
       player.discards = []
@@ -850,6 +1122,11 @@ export class GameManager {
   } {
     const player = this._players[playerIndex]
 
+    // ロンは待ち牌でない・フリテンの場合は役・点数を計算せずに上がれないと判定する
+    if (!isTsumo && (!this.isWaitingOn(playerIndex, winTile) || this.isPlayerFuriten(playerIndex))) {
+      return { isWin: false }
+    }
+
     // ツモの場合は手牌+勝利牌で判定、ロンの場合は手牌+勝利牌で判定
     // 注意：ツモの場合はwinTileが既にplayer.tilesに含まれている可能性がある
     let allTiles: Tile[]
@@ -897,11 +1174,6 @@ export class GameManager {
       )
 
       if (winResult.isWin) {
-        // ロンの場合のみフリテンチェックを実行（あがり確定後）
-        if (!isTsumo && isFuriten(player.tiles, player.discards)) {
-          return { isWin: false } // フリテンの場合はロン不可
-        }
-
         if (shouldResetFlags) {
           // 実際の上がり確定時のみ一発フラグをリセット
           this._ippatsuFlags.fill(false)
@@ -934,6 +1206,9 @@ export class GameManager {
   // 点数移動を実行する
   executeScoreTransfer(winnerIndex: number, paymentInfo: string, totalPoints: number, isTsumo: boolean, ronTargetIndex?: number): void {
     const winner = this._players[winnerIndex]
+    const winTile = isTsumo ? this._currentDrawnTile : this._lastDiscardedTile
+    this.logAction(['win', winnerIndex, winTile?.id ?? '', isTsumo ? 1 : 0, ronTargetIndex ?? -1, totalPoints])
+
     const isWinnerDealer = winnerIndex === this._dealer
 
     if (isTsumo) {
@@ -1027,17 +1302,13 @@ export class GameManager {
       return false
     }
 
-    // まず簡単なシャンテン数チェックで和了可能性を確認
-    const allTiles = [...this.humanPlayer.tiles, this._lastDiscardedTile]
-    const convertedTiles = allTiles.map(t => ({ id: t.id, suit: t.suit, rank: t.rank, isRed: t.isRed }))
-    const shanten = calculateShanten(convertedTiles)
-
-    // シャンテン数が-1でない場合は和了不可
-    if (shanten !== -1) {
+    // 待ち牌でない・フリテンの場合は和了不可（手牌が変わっていなければビットの参照のみ）
+    if (!this.isWaitingOn(0, this._lastDiscardedTile) || this.isPlayerFuriten(0)) {
       return false
     }
 
-    // シャンテン数が-1の場合のみ詳細な役・点数チェック
+    // 待ち牌の場合のみ詳細な役・点数チェック
+    const allTiles = [...this.humanPlayer.tiles, this._lastDiscardedTile]
     try {
       const isDealer = 0 === this._dealer // Human player is always index 0
       const winResult = checkWinCondition(
@@ -1046,7 +1317,7 @@ export class GameManager {
         false,                     // ロンなのでfalse
         this.humanPlayer.riichi,
         this._doraIndicators,
-        this.humanPlayer.riichi && this._wall.length >= 2 ? [this._wall[this._wall.length - 2]] : [],
+        this.humanPlayer.riichi && this._wall.length >= 2 ? [this._wall.fromEnd(1)!] : [],
         isDealer,                  // Pass dealer status for accurate scoring
         this._ippatsuFlags[0],     // 人間プレイヤーの一発フラグ
         this.humanPlayer.melds,    // 人間プレイヤーのメルド情報
@@ -1057,20 +1328,45 @@ export class GameManager {
         false                      // 地和フラグ（ロンでは不可）
       )
       
-      // あがり形かつ点数が0より大きい場合、最後にフリテンチェック
-      if (winResult.isWin && winResult.totalPoints > 0) {
-        // フリテンチェック（あがり確定後に実行）
-        if (isFuriten(this.humanPlayer.tiles, this.humanPlayer.discards)) {
-          return false // フリテンの場合はロン不可
-        }
-        return true
-      }
-      return false
+      // あがり形かつ点数が0より大きい場合
+      return winResult.isWin && winResult.totalPoints > 0
     } catch (error) {
       return false
     }
   }
 
+  /**
+   * 牌が指定プレイヤーの待ち牌か（ロンできる形になるか）
+   * 手牌が 13 - 3×鳴きの数 の枚数でない場合（テスト等で手牌を直接設定した場合）は絞り込まずに true を返す
+   */
+  isWaitingOn(playerIndex: number, tile: Tile): boolean {
+    if (!this.updateWaits(playerIndex)) {
+      return true
+    }
+    return this._waits.isWaitingOn(playerIndex, getTileIndex(tile))
+  }
+
+  /**
+   * 指定プレイヤーがフリテンか（自分の河に待ち牌がある）
+   */
+  isPlayerFuriten(playerIndex: number): boolean {
+    if (!this.updateWaits(playerIndex)) {
+      const player = this._players[playerIndex]
+      return isFuriten(player.tiles, player.discards)
+    }
+    return this._waits.isFuriten(playerIndex)
+  }
+
+  // 差分更新している手牌の枚数配列から待ち牌・フリテンを更新する
+  // ツモ牌を持っている間や手牌を直接設定した場合など、手牌が 13 - 3×鳴きの数 の枚数でなければ false
+  private updateWaits(playerIndex: number): boolean {
+    const player = this._players[playerIndex]
+    if (player.tiles.length + player.melds.length * 3 !== 13) {
+      return false
+    }
+    return this._waits.update(playerIndex, this._tileCounts.hands[playerIndex], player.melds.length, player.discards)
+  }
+
   clearLastDiscard(): void {
     this._lastDiscardedTile = null
     this._lastDiscardPlayerIndex = null
@@ -1131,6 +1427,18 @@ export class GameManager {
 
   // ローカルストレージからゲーム設定を読み込み
   private loadGameSettings(): { cpuStrengths: string[], gameType: string, agariRenchan: boolean, hakoshita: boolean, specialMode?: { chinitsuMode: boolean } } {
+    // オプションで設定が渡されている場合はローカルストレージを参照しない
+    const overrides = this._options.gameSettings
+    if (overrides) {
+      return {
+        cpuStrengths: overrides.cpuStrengths || ['normal', 'normal', 'normal'],
+        gameType: overrides.gameType || 'tonpuusen',
+        agariRenchan: overrides.agariRenchan || false,
+        hakoshita: overrides.hakoshita !== undefined ? overrides.hakoshita : true,
+        specialMode: overrides.specialMode || { chinitsuMode: false }
+      }
+    }
+
     try {
       // まず mahjongGameSettings から設定を読み込み
       const settingsJson = localStorage.getItem('mahjongGameSettings')
@@ -1199,7 +1507,7 @@ export class GameManager {
   // 流局処理
   checkDraw(): { isDraw: boolean, drawData?: any } {
     // 山が14枚以下になった場合の流局（14枚残し）
-    if (this._wall.length <= 14) {
+    if (this._wall.length <= DEAD_WALL_SIZE) {
       return this.processDraw('荒牌平局')
     }
 
@@ -1207,6 +1515,8 @@ export class GameManager {
   }
 
   private processDraw(reason: string): { isDraw: true, drawData: any } {
+    this.logAction(['ryuukyoku'])
+
     // テンパイ判定
     const playersDrawData = this._players.map(player => {
       const isTenpai = this.isPlayerTenpai(player)
@@ -1307,7 +1617,7 @@ export class GameManager {
     const isNaturalEnd = endReason.includes('終了') && !endReason.includes('トビ')
 
     // 自然終了の場合は記録に追加
-    if (isNaturalEnd) {
+    if (isNaturalEnd && this._options.recordResults !== false) {
       this.recordGameEnd(true) // 完了したゲームとして記録
     }
 
@@ -1430,6 +1740,8 @@ export class GameManager {
         }
       }
     }
+
+    this.rebuildTileCounts()
   }
 
   // 牌文字列をTileオブジェクトに変換
@@ -1551,42 +1863,17 @@ export class GameManager {
     this._firstTakeFlags = [true, true, true, true]
   }
 
-  // 手牌状態を文字列キーに変換
-  private generateHandStateKey(playerIndex: number, tiles: Tile[], currentDrawnTile: Tile | null): string {
-    const allTiles = currentDrawnTile ? [...tiles, currentDrawnTile] : tiles
-    
-    // 牌をソートして一意のキーを生成
-    const sortedTiles = allTiles
-      .map(tile => `${tile.suit}${tile.rank}${tile.isRed ? 'r' : ''}`)
-      .sort()
-      .join(',')
-    
-    // 見えている牌も含める（河、ドラ表示牌など）
-    const visibleTiles = this.getVisibleTiles()
-    const visibleKey = visibleTiles
-      .map(tile => `${tile.suit}${tile.rank}${tile.isRed ? 'r' : ''}`)
-      .sort()
-      .join(',')
-    
-    return `${playerIndex}_${this._currentTurn}_${sortedTiles}_${visibleKey}`
+  // 手牌状態（プレイヤー・手牌の枚数・見えている牌の枚数）をキャッシュのキーに書き込み、ハッシュを返す
+  // キーは内部バッファのため、呼び出しごとに確保しない
+  private writeHandStateKey(playerIndex: number): number {
+    const key = this._handStateKey
+    key[0] = playerIndex
+    key.set(this._tileCounts.hands[playerIndex], 1)
+    key.set(this._tileCounts.visible, 1 + TILE_TYPE_COUNT)
+    return hashBytes(key)
   }
 
-  // 見えている牌を取得
-  private getVisibleTiles(): Tile[] {
-    const visibleTiles: Tile[] = []
-    
-    // 全プレイヤーの河
-    for (const player of this._players) {
-      visibleTiles.push(...player.discards)
-    }
-    
-    // ドラ表示牌
-    visibleTiles.push(...this._doraIndicators)
-    
-    return visibleTiles
-  }
-
-  // キャッシュされた受け入れ情報を取得（なければ計算）
+  // キャッシュされた受け入れ情報を取得（なければ空配列）
   getCachedAcceptanceInfo(playerIndex: number): AcceptanceInfo[] {
     const player = this._players[playerIndex]
     const currentDrawnTile = playerIndex === this._currentPlayerIndex ? this._currentDrawnTile : null
@@ -1597,53 +1884,31 @@ export class GameManager {
       return []
     }
     
-    const handStateKey = this.generateHandStateKey(playerIndex, player.tiles, currentDrawnTile)
-    
-    // 前回と同じ手牌状態ならキャッシュから取得
-    if (this._lastHandStates[playerIndex] === handStateKey && this._acceptanceCache.has(handStateKey)) {
-      return this._acceptanceCache.get(handStateKey)!
-    }
+    const hash = this.writeHandStateKey(playerIndex)
     
     // キャッシュがない場合は空配列を返す（重い計算は呼び出し側で行う）
-    return []
+    return this._acceptanceCache.get(this._handStateKey, hash) || []
   }
 
   // 受け入れ情報をキャッシュに保存
   setCachedAcceptanceInfo(playerIndex: number, acceptanceInfo: AcceptanceInfo[]): void {
-    const player = this._players[playerIndex]
-    const currentDrawnTile = playerIndex === this._currentPlayerIndex ? this._currentDrawnTile : null
-    
-    const handStateKey = this.generateHandStateKey(playerIndex, player.tiles, currentDrawnTile)
-    
-    // キャッシュに保存
-    this._acceptanceCache.set(handStateKey, acceptanceInfo)
-    this._lastHandStates[playerIndex] = handStateKey
-    
-    // 古いキャッシュをクリア（メモリ効率のため）
-    this.cleanupOldCache()
-  }
-
-  // 古いキャッシュをクリア
-  private cleanupOldCache(): void {
-    // キャッシュサイズが100を超えた場合、古いエントリを削除
-    if (this._acceptanceCache.size > 100) {
-      const entries = Array.from(this._acceptanceCache.entries())
-      // 最初の50エントリを削除
-      for (let i = 0; i < 50; i++) {
-        this._acceptanceCache.delete(entries[i][0])
-      }
-    }
+    const hash = this.writeHandStateKey(playerIndex)
+    this._acceptanceCache.set(this._handStateKey, acceptanceInfo, hash)
   }
 
-  // 最後の手牌状態キーを取得
-  getLastHandStateKey(playerIndex: number): string {
-    return this._lastHandStates[playerIndex] || ''
+  // 受け入れキャッシュの使用状況（ヒット数・ミス数・件数・容量）
+  get acceptanceCacheStats(): { hits: number, misses: number, size: number, capacity: number } {
+    return {
+      hits: this._acceptanceCache.hits,
+      misses: this._acceptanceCache.misses,
+      size: this._acceptanceCache.size,
+      capacity: this._acceptanceCache.capacity
+    }
   }
 
-  // 新しいゲーム開始時にキャッシュをクリア
+  // 新しい局の開始時にキャッシュをクリア
   clearAcceptanceCache(): void {
     this._acceptanceCache.clear()
-    this._lastHandStates = ['', '', '', '']
   }
 
   // 清一色モードかどうかを取得
@@ -0,0 +1,345 @@
+// ヘッドレス対局シミュレーター
+// DOM・Vueに依存せず GameManager と CpuAI だけで対局を最後まで進め、処理速度を計測する
+// 0番（人間席）も CpuAI に打たせ、4人ともAIで対局する
+import type { Tile } from '../stores/fourPlayerMahjong'
+import { GameManager } from './game-manager'
+import { CpuAI } from './cpu-ai'
+import type { GameLog } from './game-log'
+import { YAKU_NAME_TO_KEY } from '../types/records'
+
+export type SimulatorDifficulty = 'easy' | 'medium' | 'hard' | 'super'
+
+export interface HeadlessSimulationOptions {
+  games: number
+  gameType?: 'tonpuusen' | 'tonnanssen'
+  // CPU1〜3の強さ（ゲーム設定と同じ表記: easy / normal / hard / super）
+  cpuStrengths?: string[]
+  // 0番（人間席）を操作するAIの強さ
+  playerDifficulty?: SimulatorDifficulty
+  manipulationRate?: number
+  handQuality?: string
+  agariRenchan?: boolean
+  hakoshita?: boolean
+  // 1局あたりの打牌数の上限（進行が止まった場合の安全装置）
+  maxActionsPerRound?: number
+  // マスターシード（指定時は各対局のシードを「マスターシード:通し番号」から導出する）
+  seed?: string
+  // 対局の通し番号の開始位置（並列実行時に各シャードへ割り当てる）
+  gameOffset?: number
+  // 1対局終了ごとに呼ばれる（行動ログの保存など）
+  onGameEnd?: (outcome: GameOutcome, gameIndex: number) => void
+}
+
+// 1局の結果
+export interface RoundOutcome {
+  type: 'tsumo' | 'ron' | 'draw'
+  winner?: number
+  loser?: number
+  totalPoints?: number
+  yaku?: string[]
+}
+
+// 1半荘（東風戦・東南戦）の結果
+export interface GameOutcome {
+  scores: number[]
+  rounds: RoundOutcome[]
+  endReason: string
+  log: GameLog
+}
+
+export interface HeadlessSimulationStats {
+  games: number
+  rounds: number
+  decisions: number
+  tsumoWins: number
+  ronWins: number
+  draws: number
+  winsBySeat: number[]
+  winPointsBySeat: number[] // 和了点の合計
+  finalScoreBySeat: number[] // 終局時の持ち点の合計
+  yakuCounts: Record<string, number> // 役ごとの出現回数（キーは YAKU_NAME_TO_KEY の値）
+  elapsedMs: number
+  gamesPerSec: number
+  roundsPerSec: number
+  decisionsPerSec: number
+}
+
+const DEFAULT_MAX_ACTIONS_PER_ROUND = 200
+
+// 役牌は「場風 東」「白」等の個別名で返るため、戦績と同じ yakuhai にまとめる
+const YAKUHAI_NAMES = /^(場風|自風) |^(白|發|中)$/
+
+/**
+ * 役名を戦績のキーに変換（ドラ等の役ではないものは null）
+ */
+export function toYakuKey(yakuName: string): string | null {
+  if (YAKU_NAME_TO_KEY[yakuName]) {
+    return YAKU_NAME_TO_KEY[yakuName]
+  }
+  return YAKUHAI_NAMES.test(yakuName) ? 'yakuhai' : null
+}
+
+/**
+ * マスターシードと対局の通し番号から対局ごとのシードを導出
+ * シャード数に関わらず同じ通し番号の対局は同じシードになる
+ */
+export function deriveGameSeed(masterSeed: string, gameIndex: number): string {
+  return `${masterSeed}:${gameIndex}`
+}
+
+type WinResult = NonNullable<ReturnType<GameManager['checkWinConditionForPlayer']>['result']>
+
+export class HeadlessSimulator {
+  private options: HeadlessSimulationOptions
+  private ais: CpuAI[] = []
+  private _decisions = 0
+
+  constructor(options: HeadlessSimulationOptions) {
+    this.options = options
+  }
+
+  // これまでに行ったAIの打牌判断の回数
+  get decisions(): number {
+    return this._decisions
+  }
+
+  /**
+   * 指定された対局数を実行し、結果の集計と処理速度を返す
+   */
+  run(): HeadlessSimulationStats {
+    const stats: HeadlessSimulationStats = {
+      games: 0,
+      rounds: 0,
+      decisions: 0,
+      tsumoWins: 0,
+      ronWins: 0,
+      draws: 0,
+      winsBySeat: [0, 0, 0, 0],
+      winPointsBySeat: [0, 0, 0, 0],
+      finalScoreBySeat: [0, 0, 0, 0],
+      yakuCounts: {},
+      elapsedMs: 0,
+      gamesPerSec: 0,
+      roundsPerSec: 0,
+      decisionsPerSec: 0
+    }
+
+    const startDecisions = this._decisions
+    const start = performance.now()
+
+    const gameOffset = this.options.gameOffset || 0
+
+    for (let i = 0; i < this.options.games; i++) {
+      const seed = this.options.seed !== undefined ? deriveGameSeed(this.options.seed, gameOffset + i) : undefined
+      const outcome = this.playGame(seed)
+      this.options.onGameEnd?.(outcome, gameOffset + i)
+      stats.games++
+      stats.rounds += outcome.rounds.length
+      outcome.scores.forEach((score, seat) => {
+        stats.finalScoreBySeat[seat] += score
+      })
+
+      for (const round of outcome.rounds) {
+        if (round.type === 'draw') {
+          stats.draws++
+          continue
+        }
+        if (round.type === 'tsumo') {
+          stats.tsumoWins++
+        } else {
+          stats.ronWins++
+        }
+        stats.winsBySeat[round.winner!]++
+        stats.winPointsBySeat[round.winner!] += round.totalPoints || 0
+
+        for (const yakuName of round.yaku || []) {
+          const key = toYakuKey(yakuName)
+          if (key) {
+            stats.yakuCounts[key] = (stats.yakuCounts[key] || 0) + 1
+          }
+        }
+      }
+    }
+
+    stats.elapsedMs = performance.now() - start
+    stats.decisions = this._decisions - startDecisions
+
+    const seconds = stats.elapsedMs / 1000
+    if (seconds > 0) {
+      stats.gamesPerSec = stats.games / seconds
+      stats.roundsPerSec = stats.rounds / seconds
+      stats.decisionsPerSec = stats.decisions / seconds
+    }
+
+    return stats
+  }
+
+  /**
+   * 1半荘を最後まで進める
+   * @param seed 乱数シード（省略時は再現性なし）
+   */
+  playGame(seed?: string): GameOutcome {
+    const manager = this.createGameManager(seed)
+    this.ais = manager.players.map(player => {
+      const ai = new CpuAI(player.type === 'human' ? (this.options.playerDifficulty || 'medium') : (player.difficulty || 'medium'), manager.random)
+      // 探索を時間で打ち切ると実行環境によって打牌が変わるため、シードから同じ対局を再現できるよう打ち切らない
+      ai.setSearchTimeBudget(Infinity)
+      return ai
+    })
+
+    const rounds: RoundOutcome[] = []
+    manager.startNewGame()
+
+    for (;;) {
+      rounds.push(this.playRound(manager))
+
+      // 画面側の onContinueGame / onContinueFromDraw と同じ順序で進行
+      const gameEndCheck = manager.checkGameEnd()
+      if (gameEndCheck.isGameEnd) {
+        return {
+          scores: manager.players.map(player => player.score),
+          rounds,
+          endReason: gameEndCheck.gameEndData.endReason,
+          log: manager.actionLog
+        }
+      }
+
+      manager.advanceToNextRound()
+    }
+  }
+
+  private createGameManager(seed?: string): GameManager {
+    return new GameManager({
+      gameSettings: {
+        cpuStrengths: this.options.cpuStrengths || ['normal', 'normal', 'normal'],
+        gameType: this.options.gameType || 'tonpuusen',
+        agariRenchan: this.options.agariRenchan || false,
+        hakoshita: this.options.hakoshita !== undefined ? this.options.hakoshita : true
+      },
+      manipulationRate: this.options.manipulationRate !== undefined ? this.options.manipulationRate : 80,
+      handQuality: this.options.handQuality || 'good',
+      recordResults: false,
+      seed
+    })
+  }
+
+  /**
+   * 1局を終局まで進める（ツモ → ツモ和了判定 → 打牌 → ロン判定 → 流局判定）
+   */
+  private playRound(manager: GameManager): RoundOutcome {
+    const maxActions = this.options.maxActionsPerRound || DEFAULT_MAX_ACTIONS_PER_ROUND
+
+    for (let action = 0; action < maxActions; action++) {
+      const playerIndex = manager.currentPlayerIndex
+
+      // 局開始直後・ターン移動直後はツモ牌がないので引く
+      const drawnTile = manager.currentDrawnTile || manager.drawTileAndKeepSeparate(playerIndex)
+      if (!drawnTile) {
+        const drawCheck = manager.checkDraw()
+        if (drawCheck.isDraw) {
+          manager.gamePhase = 'finished'
+          return { type: 'draw' }
+        }
+        throw new Error(`ツモできませんでした（プレイヤー${playerIndex}、山残り${manager.wallRemaining}枚）`)
+      }
+
+      const tsumoCheck = manager.checkWinConditionForPlayer(playerIndex, drawnTile, true)
+      if (tsumoCheck.isWin && tsumoCheck.result) {
+        return this.settleWin(manager, playerIndex, drawnTile, true, tsumoCheck.result)
+      }
+
+      this.discard(manager, playerIndex, drawnTile)
+
+      const ronOutcome = this.checkRon(manager, playerIndex)
+      if (ronOutcome) {
+        return ronOutcome
+      }
+
+      manager.nextTurn()
+
+      const drawCheck = manager.checkDraw()
+      if (drawCheck.isDraw) {
+        manager.gamePhase = 'finished'
+        return { type: 'draw' }
+      }
+    }
+
+    throw new Error(`1局の打牌数が上限（${maxActions}）を超えました`)
+  }
+
+  // 画面側の processCpuTurn と同じ判断でリーチ・打牌を行う
+  private discard(manager: GameManager, playerIndex: number, drawnTile: Tile): void {
+    const player = manager.players[playerIndex]
+    const ai = this.ais[playerIndex]
+    this._decisions++
+
+    if (!player.riichi && ai.shouldDeclareRiichi(player, drawnTile)) {
+      const riichiDiscardTile = ai.getRiichiDiscardTile(player, drawnTile)
+      if (riichiDiscardTile && manager.declareRiichi(playerIndex)) {
+        manager.discardTile(playerIndex, riichiDiscardTile, true)
+        return
+      }
+    }
+
+    const tileId = ai.decideTileToDiscard(player, drawnTile, manager.getVisibleTileCounts(playerIndex), manager.wallRemaining)
+    if (!manager.discardTile(playerIndex, tileId)) {
+      // AIが手牌にない牌を選んだ場合はツモ切り
+      manager.discardTile(playerIndex, drawnTile.id)
+    }
+  }
+
+  // 捨て牌に対するロン判定（打牌者の下家から順に判定し、最初にロンしたプレイヤーのみ上がる）
+  private checkRon(manager: GameManager, discardPlayerIndex: number): RoundOutcome | null {
+    const discardedTile = manager.lastDiscardedTile
+    if (!discardedTile) {
+      return null
+    }
+
+    for (let offset = 1; offset < 4; offset++) {
+      const playerIndex = (discardPlayerIndex + offset) % 4
+      const player = manager.players[playerIndex]
+      const ai = this.ais[playerIndex]
+
+      // 待ち牌でない・フリテンのプレイヤーは役の判定をしない
+      if (!manager.isWaitingOn(playerIndex, discardedTile) || manager.isPlayerFuriten(playerIndex)) {
+        continue
+      }
+      if (!ai.shouldDeclareRon(player, discardedTile, manager.doraIndicators)) {
+        continue
+      }
+
+      // フリテン等で上がれない場合は見逃し
+      const ronCheck = manager.checkWinConditionForPlayer(playerIndex, discardedTile, false)
+      if (ronCheck.isWin && ronCheck.result) {
+        return this.settleWin(manager, playerIndex, discardedTile, false, ronCheck.result, discardPlayerIndex)
+      }
+    }
+
+    return null
+  }
+
+  // 画面側の handleCpuWinWithResult / handleCpuRon と同じ手順で点数移動を行う
+  private settleWin(manager: GameManager, winnerIndex: number, winTile: Tile, isTsumo: boolean, result: WinResult, loserIndex?: number): RoundOutcome {
+    // 実際の上がり確定時に一発フラグをリセット
+    manager.checkWinConditionForPlayer(winnerIndex, winTile, isTsumo, true)
+
+    manager.applyKyotakuToWinner(winnerIndex)
+    manager.executeScoreTransfer(winnerIndex, result.paymentInfo, result.totalPoints, isTsumo, loserIndex)
+    manager.gamePhase = 'finished'
+
+    return {
+      type: isTsumo ? 'tsumo' : 'ron',
+      winner: winnerIndex,
+      loser: loserIndex,
+      totalPoints: result.totalPoints,
+      yaku: result.yaku.map(yaku => yaku.name)
+    }
+  }
+}
+
+/**
+ * ヘッドレス対局を実行して集計結果を返す
+ */
+export function runHeadlessSimulation(options: HeadlessSimulationOptions): HeadlessSimulationStats {
+  return new HeadlessSimulator(options).run()
+}
@@ -0,0 +1,98 @@
+// 34種の枚数配列などのバイト列をキーにする LRU キャッシュ
+// キーは FNV-1a の32bitハッシュで引き、衝突に備えてキーのバイト列も保持して比較する
+
+const FNV_OFFSET_BASIS = 0x811c9dc5
+const FNV_PRIME = 0x01000193
+
+/**
+ * バイト列の FNV-1a ハッシュ（32bit）
+ */
+export function hashBytes(bytes: Uint8Array): number {
+  let hash = FNV_OFFSET_BASIS
+  for (let i = 0; i < bytes.length; i++) {
+    hash ^= bytes[i]
+    hash = Math.imul(hash, FNV_PRIME)
+  }
+  return hash >>> 0
+}
+
+interface LruEntry<V> {
+  key: Uint8Array
+  value: V
+}
+
+function sameBytes(a: Uint8Array, b: Uint8Array): boolean {
+  if (a.length !== b.length) return false
+  for (let i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) return false
+  }
+  return true
+}
+
+/**
+ * 容量を超えると最も長く使われていない項目を捨てるキャッシュ
+ * Map の挿入順を利用し、参照時に末尾へ移動・追加時に先頭を削除する（いずれも O(1)）
+ */
+export class ByteKeyLruCache<V> {
+  readonly capacity: number
+  private _entries = new Map<number, LruEntry<V>>()
+  private _hits = 0
+  private _misses = 0
+
+  constructor(capacity: number = 100) {
+    this.capacity = Math.max(1, capacity)
+  }
+
+  get size(): number {
+    return this._entries.size
+  }
+
+  get hits(): number {
+    return this._hits
+  }
+
+  get misses(): number {
+    return this._misses
+  }
+
+  /**
+   * @param key キーのバイト列（呼び出し側のバッファをそのまま渡してよい）
+   * @param hash key のハッシュ（省略時は hashBytes で計算）
+   */
+  get(key: Uint8Array, hash: number = hashBytes(key)): V | undefined {
+    const entry = this._entries.get(hash)
+    if (!entry || !sameBytes(entry.key, key)) {
+      this._misses++
+      return undefined
+    }
+
+    this._hits++
+    this._entries.delete(hash)
+    this._entries.set(hash, entry)
+    return entry.value
+  }
+
+  /**
+   * @param key キーのバイト列（キャッシュ側でコピーして保持する）
+   * @param hash key のハッシュ（省略時は hashBytes で計算）
+   */
+  set(key: Uint8Array, value: V, hash: number = hashBytes(key)): void {
+    // ハッシュが衝突した古い項目は上書きする
+    this._entries.delete(hash)
+    this._entries.set(hash, { key: key.slice(), value })
+
+    if (this._entries.size > this.capacity) {
+      const oldest = this._entries.keys().next().value as number
+      this._entries.delete(oldest)
+    }
+  }
+
+  clear(): void {
+    this._entries.clear()
+  }
+
+  resetStats(): void {
+    this._hits = 0
+    this._misses = 0
+  }
+}
@@ -1,12 +1,14 @@
 import type { Tile } from '../stores/mahjong'
 import type { Tile as FourPlayerTile } from '../stores/fourPlayerMahjong'
 import init, { 
+  initSync,
   calc_shanten, 
   calc_acceptance,
   tile_to_string,
   get_acceptance_string_js,
   AcceptanceResultJS
 } from '../mahjong_calculator_rs/mahjong_calculator_rs.js'
+import { spanStart, spanEnd } from './profiler'
 
 // WASM初期化フラグ
 let isInitialized = false
@@ -21,13 +23,35 @@ export async function initMahjongCalculator(): Promise<void> {
   }
 }
 
+/**
+ * WASMモジュールが初期化済みか（未初期化の間は mahjong-logic がテーブル参照の計算を使う）
+ */
+export function isMahjongCalculatorInitialized(): boolean {
+  return isInitialized
+}
+
+/**
+ * WASMバイナリを直接渡して同期的に初期化（Node.js等、fetchでWASMを読み込めない環境用）
+ * @param wasmBytes mahjong_calculator_rs_bg.wasm の内容
+ */
+export function initMahjongCalculatorSync(wasmBytes: BufferSource): void {
+  if (!isInitialized) {
+    initSync({ module: wasmBytes })
+    isInitialized = true
+  }
+}
+
 /**
  * Tile配列を34要素のUint8Arrayに変換
  * @param tiles Tile配列
+ * @param out 書き込み先（指定時は0クリアして再利用し、新たな配列を確保しない）
  * @returns 34要素のUint8Array（0-33: 1m-9m,1p-9p,1s-9s,東南西北白發中）
  */
-export function convertTilesToRustFormat(tiles: Tile[] | FourPlayerTile[]): Uint8Array {
-  const rustTiles = new Uint8Array(34)
+export function convertTilesToRustFormat(tiles: Tile[] | FourPlayerTile[], out?: Uint8Array): Uint8Array {
+  const rustTiles = out || new Uint8Array(34)
+  if (out) {
+    rustTiles.fill(0)
+  }
   
   for (const tile of tiles) {
     const index = getTileIndex(tile)
@@ -163,9 +187,21 @@ export function calculateShantenSync(tiles: Tile[] | FourPlayerTile[]): number {
     return 8
   }
   
+  return calculateShantenFromCounts(convertTilesToRustFormat(tiles))
+}
+
+/**
+ * 34種の枚数配列から同期的にシャンテン数を計算（初期化済みの場合）
+ * GameManager が保持している枚数配列をそのまま渡せるため、Tile配列からの変換が不要
+ */
+export function calculateShantenFromCounts(counts: Uint8Array): number {
+  if (!isInitialized) {
+    console.warn('WASM未初期化です。非同期版を使用してください。')
+    return 8
+  }
+
   try {
-    const rustTiles = convertTilesToRustFormat(tiles)
-    return calc_shanten(rustTiles)
+    return calc_shanten(counts)
   } catch (error) {
     console.error('シャンテン計算エラー:', error)
     return 8
@@ -180,10 +216,21 @@ export function getUsefulTilesSync(tiles: Tile[] | FourPlayerTile[]): number[] {
     console.warn('WASM未初期化です。非同期版を使用してください。')
     return []
   }
+
+  return getUsefulTilesFromCounts(convertTilesToRustFormat(tiles))
+}
+
+/**
+ * 34種の枚数配列から同期的に受け入れ牌（シャンテン数が下がる牌のインデックス）を計算
+ */
+export function getUsefulTilesFromCounts(counts: Uint8Array): number[] {
+  if (!isInitialized) {
+    console.warn('WASM未初期化です。非同期版を使用してください。')
+    return []
+  }
   
   try {
-    const rustTiles = convertTilesToRustFormat(tiles)
-    const result = calc_acceptance(rustTiles)
+    const result = calc_acceptance(counts)
     
     const acceptanceTiles = Array.from(result.acceptance_tiles)
     const acceptanceShanten = Array.from(result.acceptance_shanten)
@@ -260,14 +307,18 @@ export async function tileIndexToStringRust(index: number): Promise<string> {
 /**
  * 指定された牌の残り枚数を計算
  * @param tileIndex 牌のインデックス（0-33）
- * @param visibleTiles 見えている牌
+ * @param visibleTiles 見えている牌（34種の枚数配列も可）
  * @returns 残り枚数
  */
 export function getTileRemainingCount(
   tileIndex: number,
-  visibleTiles: Tile[] | FourPlayerTile[]
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array
 ): number {
   const maxCount = 4
+
+  if (visibleTiles instanceof Uint8Array) {
+    return Math.max(0, maxCount - visibleTiles[tileIndex])
+  }
   
   let visibleCount = 0
   for (const tile of visibleTiles) {
@@ -289,15 +340,136 @@ export interface AcceptanceInfo {
   shantenAfterDiscard: number
 }
 
+// 打牌ごとの受け入れ計算結果（フラット配列）のレイアウト
+// [記録数, (切る牌, 切った後のシャンテン数, 受け入れ牌の種類数n, (受け入れ牌, 残り枚数) × n) × 記録数]
+export const DISCARD_BATCH_BUFFER_SIZE = 1 + 14 * (3 + 34 * 2)
+const discardBatchBuffer = new Int8Array(DISCARD_BATCH_BUFFER_SIZE)
+
+/**
+ * 14枚の手牌の全ての打牌候補（牌種ごと）について、切った後のシャンテン数・受け入れ牌・残り枚数をまとめて計算する
+ * 結果は1つのフラットな Int8Array に書き込み、打牌ごとのオブジェクトや配列を作らない
+ * @param handCounts 14枚の手牌の枚数配列（計算中に増減させ、終了時には元に戻す）
+ * @param visibleCounts 見えている牌の枚数配列（手牌を含む）。残り枚数は切った牌を見えている牌から除いて数える
+ * @param maxShanten 受け入れ牌を計算する打牌のシャンテン数の上限（超える打牌はシャンテン数のみ記録する）
+ * @returns 内部バッファ（次の呼び出しで上書きされる）。レイアウトは DISCARD_BATCH_BUFFER_SIZE の定義を参照
+ */
+export function calculateDiscardAcceptanceBatch(
+  handCounts: Uint8Array,
+  visibleCounts: Uint8Array,
+  maxShanten: number = 8
+): Int8Array {
+  const out = discardBatchBuffer
+  if (!isInitialized) {
+    console.warn('WASM未初期化です。非同期版を使用してください。')
+    out[0] = 0
+    return out
+  }
+
+  const start = spanStart()
+  let offset = 1
+  let records = 0
+
+  for (let discardIndex = 0; discardIndex < 34; discardIndex++) {
+    if (handCounts[discardIndex] === 0) continue
+
+    handCounts[discardIndex]--
+    try {
+      // 受け入れ牌まで求める場合は calc_acceptance の current_shanten を使い、calc_shanten を呼ばない
+      let shanten = maxShanten >= 8 ? 8 : calc_shanten(handCounts)
+      let acceptanceTiles: Uint8Array | null = null
+      let acceptanceShanten: Int8Array | null = null
+
+      if (maxShanten >= 8 || shanten <= maxShanten) {
+        const result = calc_acceptance(handCounts)
+        shanten = result.current_shanten
+        acceptanceTiles = result.acceptance_tiles
+        acceptanceShanten = result.acceptance_shanten
+        result.free()
+      }
+
+      out[offset] = discardIndex
+      out[offset + 1] = shanten
+      const countOffset = offset + 2
+      offset += 3
+
+      let usefulCount = 0
+      if (acceptanceTiles && acceptanceShanten && shanten <= maxShanten) {
+        for (let i = 0; i < acceptanceTiles.length; i++) {
+          if (acceptanceShanten[i] < shanten) {
+            const tileIndex = acceptanceTiles[i]
+            out[offset] = tileIndex
+            out[offset + 1] = Math.max(0, 4 - visibleCounts[tileIndex] + (tileIndex === discardIndex ? 1 : 0))
+            offset += 2
+            usefulCount++
+          }
+        }
+      }
+      out[countOffset] = usefulCount
+      records++
+    } finally {
+      handCounts[discardIndex]++
+    }
+  }
+
+  out[0] = records
+  spanEnd('calculateDiscardAcceptanceBatch', start)
+  return out
+}
+
+export interface DiscardAcceptance {
+  discardIndex: number
+  shantenAfterDiscard: number
+  acceptanceTiles: number[]
+  remainingCounts: number[]
+}
+
+/**
+ * calculateDiscardAcceptanceBatch の結果のうち、使われている先頭からの長さ
+ * Worker から結果を転送する時など、必要な部分だけ切り出す場合に使う
+ */
+export function getDiscardBatchLength(batch: Int8Array): number {
+  let offset = 1
+  for (let record = 0; record < batch[0]; record++) {
+    offset += 3 + batch[offset + 2] * 2
+  }
+  return offset
+}
+
+/**
+ * calculateDiscardAcceptanceBatch の結果を打牌ごとの記録に変換する
+ */
+export function decodeDiscardAcceptanceBatch(batch: Int8Array): DiscardAcceptance[] {
+  const records: DiscardAcceptance[] = []
+  let offset = 1
+  for (let record = 0; record < batch[0]; record++) {
+    const usefulCount = batch[offset + 2]
+    const acceptanceTiles: number[] = []
+    const remainingCounts: number[] = []
+    for (let i = 0; i < usefulCount; i++) {
+      acceptanceTiles.push(batch[offset + 3 + i * 2])
+      remainingCounts.push(batch[offset + 3 + i * 2 + 1])
+    }
+    records.push({
+      discardIndex: batch[offset],
+      shantenAfterDiscard: batch[offset + 1],
+      acceptanceTiles,
+      remainingCounts
+    })
+    offset += 3 + usefulCount * 2
+  }
+  return records
+}
+
 /**
  * 同期的な受け入れ計算（初期化済みの場合）
+ * calculateDiscardAcceptanceBatch で牌種ごとに1度だけ計算し、テンパイになる打牌を手牌の順に返す
  * @param tiles 14枚の手牌
- * @param visibleTiles 見えている牌
+ * @param visibleTiles 見えている牌（手牌を含む）。GameManager.getVisibleTileCounts() の枚数配列も可
  * @returns 各牌を切った時の受け入れ情報
  */
 export function calculateAcceptanceSync(
   tiles: Tile[] | FourPlayerTile[],
-  visibleTiles: Tile[] | FourPlayerTile[] = []
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array = []
 ): AcceptanceInfo[] {
   if (!isInitialized) {
     console.warn('WASM未初期化です。非同期版を使用してください。')
@@ -308,15 +480,29 @@ export function calculateAcceptanceSync(
     return []
   }
   
+  const handCounts = convertTilesToRustFormat(tiles)
+  const visibleCounts = toVisibleCounts(tiles, visibleTiles, handCounts)
+  
+  let batch: Int8Array
+  try {
+    batch = calculateDiscardAcceptanceBatch(handCounts, visibleCounts, 0)
+  } catch (error) {
+    console.error('受け入れ計算エラー:', error)
+    return []
+  }
+  
+  // テンパイになる打牌の受け入れ牌・残り枚数を牌種ごとに取り出す
+  const tenpaiDiscards = new Map<number, DiscardAcceptance>()
+  for (const record of decodeDiscardAcceptanceBatch(batch)) {
+    if (record.shantenAfterDiscard === 0) {
+      tenpaiDiscards.set(record.discardIndex, record)
+    }
+  }
+  
   const results: AcceptanceInfo[] = []
   const calculatedTileTypes = new Set<string>()
   
-  const handTileIds = new Set(tiles.map(tile => tile.id))
-  const otherVisibleTiles = visibleTiles.filter(tile => !handTileIds.has(tile.id))
-  
-  for (let i = 0; i < tiles.length; i++) {
-    const tileToDiscard = tiles[i]
-    
+  for (const tileToDiscard of tiles) {
     const tileTypeKey = `${tileToDiscard.suit}_${tileToDiscard.rank}_${tileToDiscard.isRed || false}`
     if (calculatedTileTypes.has(tileTypeKey)) {
       const existingResult = results.find(r => 
@@ -333,39 +519,48 @@ export function calculateAcceptanceSync(
       continue
     }
     
-    const remainingTiles = [...tiles]
-    remainingTiles.splice(i, 1)
-    
-    if (remainingTiles.length === 13) {
-      const currentShanten = calculateShantenSync(remainingTiles)
+    const discardIndex = getTileIndex(tileToDiscard)
+    const discard = tenpaiDiscards.get(discardIndex)
+    if (discard) {
+      results.push({
+        tileIndex: discardIndex,
+        tile: tileToDiscard,
+        acceptanceTiles: discard.acceptanceTiles,
+        remainingCounts: discard.remainingCounts,
+        totalAcceptance: discard.remainingCounts.reduce((sum, count) => sum + count, 0),
+        shantenAfterDiscard: 0
+      })
       
-      if (currentShanten === 0) {
-        const acceptanceTiles = getUsefulTilesSync(remainingTiles)
-        
-        const visibleTilesAfterDiscard = [...remainingTiles, ...otherVisibleTiles]
-        
-        const remainingCounts = acceptanceTiles.map(tileIndex =>
-          getTileRemainingCount(tileIndex, visibleTilesAfterDiscard)
-        )
-        const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-        
-        results.push({
-          tileIndex: getTileIndex(tileToDiscard),
-          tile: tileToDiscard,
-          acceptanceTiles,
-          remainingCounts,
-          totalAcceptance,
-          shantenAfterDiscard: 0
-        })
-        
-        calculatedTileTypes.add(tileTypeKey)
-      }
+      calculatedTileTypes.add(tileTypeKey)
     }
   }
   
   return results
 }
 
+/**
+ * 見えている牌を34種の枚数配列にする（手牌は必ず含める）
+ * @param handCounts 手牌の枚数配列（Tile配列で渡された場合の重複除外に使う）
+ */
+function toVisibleCounts(
+  tiles: Tile[] | FourPlayerTile[],
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array,
+  handCounts: Uint8Array
+): Uint8Array {
+  if (visibleTiles instanceof Uint8Array) {
+    return visibleTiles
+  }
+
+  const handTileIds = new Set(tiles.map(tile => tile.id))
+  const visibleCounts = handCounts.slice()
+  for (const tile of visibleTiles) {
+    if (!handTileIds.has(tile.id)) {
+      visibleCounts[getTileIndex(tile)]++
+    }
+  }
+  return visibleCounts
+}
+
 /**
  * 14枚の手牌から各牌を切った時の受け入れ計算（Rustライブラリ使用）
  * @param tiles 14枚の手牌
@@ -374,66 +569,8 @@ export function calculateAcceptanceSync(
  */
 export async function calculateAcceptanceRust(
   tiles: Tile[] | FourPlayerTile[],
-  visibleTiles: Tile[] | FourPlayerTile[] = []
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array = []
 ): Promise<AcceptanceInfo[]> {
-  if (tiles.length !== 14) {
-    return []
-  }
-  
-  const results: AcceptanceInfo[] = []
-  const calculatedTileTypes = new Set<string>()
-  
-  const handTileIds = new Set(tiles.map(tile => tile.id))
-  const otherVisibleTiles = visibleTiles.filter(tile => !handTileIds.has(tile.id))
-  
-  for (let i = 0; i < tiles.length; i++) {
-    const tileToDiscard = tiles[i]
-    
-    const tileTypeKey = `${tileToDiscard.suit}_${tileToDiscard.rank}_${tileToDiscard.isRed || false}`
-    if (calculatedTileTypes.has(tileTypeKey)) {
-      const existingResult = results.find(r => 
-        r.tile.suit === tileToDiscard.suit && 
-        r.tile.rank === tileToDiscard.rank && 
-        (r.tile as any).isRed === tileToDiscard.isRed
-      )
-      if (existingResult) {
-        results.push({
-          ...existingResult,
-          tile: tileToDiscard
-        })
-      }
-      continue
-    }
-    
-    const remainingTiles = [...tiles]
-    remainingTiles.splice(i, 1)
-    
-    if (remainingTiles.length === 13) {
-      const currentShanten = await calculateShantenRust(remainingTiles)
-      
-      if (currentShanten === 0) {
-        const acceptanceTiles = await getUsefulTilesRust(remainingTiles)
-        
-        const visibleTilesAfterDiscard = [...remainingTiles, ...otherVisibleTiles]
-        
-        const remainingCounts = acceptanceTiles.map(tileIndex =>
-          getTileRemainingCount(tileIndex, visibleTilesAfterDiscard)
-        )
-        const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-        
-        results.push({
-          tileIndex: getTileIndex(tileToDiscard),
-          tile: tileToDiscard,
-          acceptanceTiles,
-          remainingCounts,
-          totalAcceptance,
-          shantenAfterDiscard: 0
-        })
-        
-        calculatedTileTypes.add(tileTypeKey)
-      }
-    }
-  }
-  
-  return results
-}
\ No newline at end of file
+  await initMahjongCalculator()
+  return calculateAcceptanceSync(tiles, visibleTiles)
+}
@@ -2,12 +2,17 @@ import type { Tile } from '../stores/mahjong'
 import type { Tile as FourPlayerTile } from '../stores/fourPlayerMahjong'
 import { 
   calculateShantenSync,
+  calculateShantenFromCounts as calculateShantenFromCountsSync,
   getUsefulTilesSync,
   getTileIndex as getRustTileIndex,
   createTileFromIndex,
   initMahjongCalculator,
-  calculateAcceptanceSync
+  isMahjongCalculatorInitialized,
+  calculateAcceptanceSync,
+  convertTilesToRustFormat
 } from './mahjong-calculator-wrapper'
+import { calculateShantenFromTable, getUsefulTilesFromTable } from './shanten-table'
+import { spanStart, spanEnd } from './profiler'
 
 // ライブラリの初期化
 let isLibraryInitialized = false
@@ -41,26 +46,52 @@ export function convertTilesToSyantenFormat(tiles: Tile[] | FourPlayerTile[]): [
 }
 
 export function calculateShanten(tiles: Tile[] | FourPlayerTile[]): number {
+  const start = spanStart()
+  const shanten = calculateShantenUnprofiled(tiles)
+  spanEnd('calculateShanten', start)
+  return shanten
+}
+
+function calculateShantenUnprofiled(tiles: Tile[] | FourPlayerTile[]): number {
   // 初期化をバックグラウンドで実行（ノンブロッキング）
   if (!isLibraryInitialized) {
     ensureInitialized().catch(console.error)
   }
   
-  // Rustライブラリが利用可能であれば使用、そうでなければフォールバック
+  // Rustライブラリが利用可能であれば使用、そうでなければフォールバック（初期化完了前も含む）
+  if (!isMahjongCalculatorInitialized()) {
+    return fallbackCalculateShanten(tiles)
+  }
   try {
     return calculateShantenSync(tiles)
   } catch (error) {
     console.warn('Rustライブラリでエラーが発生しました。フォールバック処理を実行します。', error)
-    // 簡易フォールバック（実際は古いsyantenライブラリの結果）
     return fallbackCalculateShanten(tiles)
   }
 }
 
+/**
+ * 34種の枚数配列からシャンテン数を計算（GameManager の枚数配列を変換せずに使う）
+ */
+export function calculateShantenFromCounts(counts: Uint8Array): number {
+  if (!isLibraryInitialized) {
+    ensureInitialized().catch(console.error)
+  }
+
+  if (!isMahjongCalculatorInitialized()) {
+    return calculateShantenFromTable(counts)
+  }
+  try {
+    return calculateShantenFromCountsSync(counts)
+  } catch (error) {
+    console.warn('Rustライブラリでエラーが発生しました。フォールバック処理を実行します。', error)
+    return calculateShantenFromTable(counts)
+  }
+}
+
+// テーブル参照によるシャンテン計算（フォールバック用、WASMと同じ結果になる）
 function fallbackCalculateShanten(tiles: Tile[] | FourPlayerTile[]): number {
-  // 簡易的なシャンテン計算（フォールバック用）
-  if (tiles.length === 0) return 8
-  if (tiles.length === 14) return -1 // 仮の和了判定
-  return Math.max(0, Math.floor((14 - tiles.length) / 3))
+  return calculateShantenFromTable(convertTilesToRustFormat(tiles))
 }
 
 // 鳴き牌を考慮したシャンテン数計算
@@ -96,6 +127,9 @@ export function getUsefulTiles(tiles: Tile[] | FourPlayerTile[]): number[] {
     ensureInitialized().catch(console.error)
   }
   
+  if (!isMahjongCalculatorInitialized()) {
+    return fallbackGetUsefulTiles(tiles)
+  }
   try {
     return getUsefulTilesSync(tiles)
   } catch (error) {
@@ -105,24 +139,7 @@ export function getUsefulTiles(tiles: Tile[] | FourPlayerTile[]): number[] {
 }
 
 function fallbackGetUsefulTiles(tiles: Tile[] | FourPlayerTile[]): number[] {
-  const currentShanten = calculateShanten(tiles)
-  if (currentShanten === -1) return []
-
-  const useful: number[] = []
-
-  // 全ての可能な牌をテスト (34種類)
-  for (let i = 0; i < 34; i++) {
-    const testTile = createTileFromIndex(i, 'test')
-    const testTiles = [...tiles, testTile]
-
-    const newShanten = calculateShanten(testTiles)
-
-    if (newShanten < currentShanten) {
-      useful.push(i)
-    }
-  }
-
-  return useful
+  return getUsefulTilesFromTable(convertTilesToRustFormat(tiles))
 }
 
 // 鳴き牌を考慮した有効牌計算
@@ -155,10 +172,10 @@ function getFourthTileOpportunities(tiles: Tile[], melds: Array<{ type: 'pon' |
   const opportunities: number[] = []
 
   // 手牌内で同じ牌が3枚ある場合
-  const tileCounts = countTilesByIndex(tiles)
-  for (const [index, count] of Object.entries(tileCounts)) {
-    if (count === 3) {
-      opportunities.push(parseInt(index))
+  const tileCounts = convertTilesToRustFormat(tiles)
+  for (let index = 0; index < tileCounts.length; index++) {
+    if (tileCounts[index] === 3) {
+      opportunities.push(index)
     }
   }
 
@@ -174,18 +191,6 @@ function getFourthTileOpportunities(tiles: Tile[], melds: Array<{ type: 'pon' |
   return opportunities
 }
 
-// 牌をインデックス別にカウント
-function countTilesByIndex(tiles: Tile[]): Record<number, number> {
-  const counts: Record<number, number> = {}
-
-  for (const tile of tiles) {
-    const index = getTileIndex(tile)
-    counts[index] = (counts[index] || 0) + 1
-  }
-
-  return counts
-}
-
 // 牌からインデックスを取得（ラッパー関数を使用）
 export function getTileIndex(tile: Tile): number {
   return getRustTileIndex(tile)
@@ -294,7 +299,14 @@ export function calculateScore(yaku: string[], han: number, fu: number): number
 import { calculateScore as calculateRiichiScore } from './scoring'
 
 // 麻雀の上がり判定（詳細版）
-export function checkWinCondition(tiles: FourPlayerTile[], winTile: FourPlayerTile, isTsumo: boolean, riichi: boolean, doraIndicators: FourPlayerTile[], uradoraIndicators: FourPlayerTile[] = [], isDealer: boolean = false, isIppatsu: boolean = false, melds: Array<{ type: 'pon' | 'kan' | 'chi', tiles: FourPlayerTile[], calledTile: FourPlayerTile, fromPlayer?: number }> = [], isHaitei: boolean = false, isDoubleRiichi: boolean = false, isRinshanKaihou: boolean = false, isTenho: boolean = false, isChiho: boolean = false): {
+export function checkWinCondition(...args: Parameters<typeof checkWinConditionUnprofiled>): ReturnType<typeof checkWinConditionUnprofiled> {
+  const start = spanStart()
+  const result = checkWinConditionUnprofiled(...args)
+  spanEnd('checkWinCondition', start)
+  return result
+}
+
+function checkWinConditionUnprofiled(tiles: FourPlayerTile[], winTile: FourPlayerTile, isTsumo: boolean, riichi: boolean, doraIndicators: FourPlayerTile[], uradoraIndicators: FourPlayerTile[] = [], isDealer: boolean = false, isIppatsu: boolean = false, melds: Array<{ type: 'pon' | 'kan' | 'chi', tiles: FourPlayerTile[], calledTile: FourPlayerTile, fromPlayer?: number }> = [], isHaitei: boolean = false, isDoubleRiichi: boolean = false, isRinshanKaihou: boolean = false, isTenho: boolean = false, isChiho: boolean = false): {
   isWin: boolean
   yaku: Array<{ name: string; han: number }>
   totalHan: number
@@ -622,12 +634,22 @@ export type { AcceptanceInfo } from './mahjong-calculator-wrapper'
 /**
  * 14枚の手牌から各牌を切った時の受け入れ計算
  * @param tiles 14枚の手牌（ツモ牌含む）
- * @param visibleTiles 見えている牌（手牌+ツモ牌+河+ドラ表示牌など）
+ * @param visibleTiles 見えている牌（手牌+ツモ牌+河+ドラ表示牌など）。GameManager.getVisibleTileCounts() の枚数配列も可
  * @returns 各牌を切った時の受け入れ情報
  */
 export function calculateAcceptance(
   tiles: Tile[] | FourPlayerTile[],
-  visibleTiles: Tile[] | FourPlayerTile[] = []
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array = []
+): AcceptanceInfo[] {
+  const start = spanStart()
+  const acceptance = calculateAcceptanceUnprofiled(tiles, visibleTiles)
+  spanEnd('calculateAcceptance', start)
+  return acceptance
+}
+
+function calculateAcceptanceUnprofiled(
+  tiles: Tile[] | FourPlayerTile[],
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array
 ): AcceptanceInfo[] {
   if (tiles.length !== 14) {
     return [] // 14枚でない場合は空を返す
@@ -639,6 +661,9 @@ export function calculateAcceptance(
   }
   
   // Rustライブラリが利用可能であれば高速版を使用
+  if (!isMahjongCalculatorInitialized()) {
+    return fallbackCalculateAcceptance(tiles, visibleTiles)
+  }
   try {
     return calculateAcceptanceSync(tiles, visibleTiles)
   } catch (error) {
@@ -649,14 +674,21 @@ export function calculateAcceptance(
 
 function fallbackCalculateAcceptance(
   tiles: Tile[] | FourPlayerTile[],
-  visibleTiles: Tile[] | FourPlayerTile[] = []
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array = []
 ): AcceptanceInfo[] {
   const results: AcceptanceInfo[] = []
   const calculatedTileTypes = new Set<string>() // 計算済みの牌種を記録
   
   // 効率化：手牌以外の見えている牌を事前に計算
   const handTileIds = new Set(tiles.map(tile => tile.id))
-  const otherVisibleTiles = visibleTiles.filter(tile => !handTileIds.has(tile.id))
+  const handCounts = convertTilesToRustFormat(tiles)
+  let otherVisibleCounts: Uint8Array
+  if (visibleTiles instanceof Uint8Array) {
+    // 枚数配列は手牌を含むため、手牌分を差し引く
+    otherVisibleCounts = visibleTiles.map((count, index) => Math.max(0, count - handCounts[index]))
+  } else {
+    otherVisibleCounts = convertTilesToRustFormat(visibleTiles.filter(tile => !handTileIds.has(tile.id)))
+  }
 
   // 各牌を1枚ずつ切ってテンパイになるかチェック
   for (let i = 0; i < tiles.length; i++) {
@@ -680,37 +712,34 @@ function fallbackCalculateAcceptance(
       continue
     }
     
-    const remainingTiles = [...tiles]
-    remainingTiles.splice(i, 1) // i番目の牌を切る
-
-    if (remainingTiles.length === 13) {
-      const currentShanten = calculateShanten(remainingTiles)
-
-      if (currentShanten === 0) {
-        // テンパイの場合、受け入れ牌を計算
-        const acceptanceTiles = getUsefulTiles(remainingTiles)
-        
-        // この牌を切った後の見えている牌を計算（切った後の手牌 + その他の見えている牌）
-        const visibleTilesAfterDiscard = [...remainingTiles, ...otherVisibleTiles]
-        
-        const remainingCounts = acceptanceTiles.map(tileIndex =>
-          getTileRemainingCount(tileIndex, visibleTilesAfterDiscard)
-        )
-        const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
+    // i番目の牌を切った手牌（枚数配列を一時的に減らし、計算後に戻す）
+    const discardIndex = getTileIndex(tileToDiscard)
+    handCounts[discardIndex]--
+    const currentShanten = calculateShantenFromTable(handCounts)
+
+    if (currentShanten === 0) {
+      // テンパイの場合、受け入れ牌を計算
+      const acceptanceTiles = getUsefulTilesFromTable(handCounts)
+
+      // この牌を切った後の見えている牌（切った後の手牌 + その他の見えている牌）から残り枚数を求める
+      const remainingCounts = acceptanceTiles.map(tileIndex =>
+        Math.max(0, 4 - handCounts[tileIndex] - otherVisibleCounts[tileIndex])
+      )
+      const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
+
+      results.push({
+        tileIndex: discardIndex,
+        tile: tileToDiscard,
+        acceptanceTiles,
+        remainingCounts,
+        totalAcceptance,
+        shantenAfterDiscard: 0 // テンパイなので0
+      })
 
-        results.push({
-          tileIndex: getTileIndex(tileToDiscard),
-          tile: tileToDiscard,
-          acceptanceTiles,
-          remainingCounts,
-          totalAcceptance,
-          shantenAfterDiscard: 0 // テンパイなので0
-        })
-        
-        // この牌種を計算済みとしてマーク
-        calculatedTileTypes.add(tileTypeKey)
-      }
+      // この牌種を計算済みとしてマーク
+      calculatedTileTypes.add(tileTypeKey)
     }
+    handCounts[discardIndex]++
   }
 
   return results
@@ -719,16 +748,20 @@ function fallbackCalculateAcceptance(
 /**
  * 指定された牌の残り枚数を計算（見えている牌を除外）
  * @param tileIndex 牌のインデックス（0-33）
- * @param visibleTiles 見えている牌（手牌+ツモ牌+河+ドラ表示牌など）
+ * @param visibleTiles 見えている牌（手牌+ツモ牌+河+ドラ表示牌など）。34種の枚数配列を渡すと走査せずに求める
  * @returns 残り枚数
  */
 export function getTileRemainingCount(
   tileIndex: number,
-  visibleTiles: Tile[] | FourPlayerTile[]
+  visibleTiles: Tile[] | FourPlayerTile[] | Uint8Array
 ): number {
   // 通常の牌は4枚、赤ドラは考慮しない（簡略化）
   const maxCount = 4
 
+  if (visibleTiles instanceof Uint8Array) {
+    return Math.max(0, maxCount - visibleTiles[tileIndex])
+  }
+
   // 見えている牌のうち、指定インデックスの牌をカウント
   let visibleCount = 0
   for (const tile of visibleTiles) {
@@ -0,0 +1,175 @@
+// 牌操作率・配牌の良さの設定ごとの統計的な検証
+// GameManager で配牌と0番（人間席）のツモを繰り返し、有効牌を引く割合・配牌のシャンテン数・テンパイまでのツモ数と処理時間を集計する
+import { GameManager } from './game-manager'
+import { CpuAI } from './cpu-ai'
+import { ShantenEvaluator } from './shanten-table'
+import { convertTilesToRustFormat, getTileIndex } from './mahjong-calculator-wrapper'
+import { createRandom } from './random'
+import { deriveGameSeed } from './headless-simulator'
+
+export const DEFAULT_MANIPULATION_RATES = [0, 20, 40, 60, 80]
+export const DEFAULT_HAND_QUALITIES = ['normal', 'good', 'excellent']
+// 1局の自分のツモ回数の目安（山の70枚を4人で引く）
+const DEFAULT_MAX_DRAWS = 18
+
+export interface ManipulationBenchmarkOptions {
+  // 設定の組み合わせごとの試行（配牌からテンパイまで）の回数
+  trials: number
+  manipulationRates?: number[]
+  handQualities?: string[]
+  // 1試行のツモ回数の上限（この回数でテンパイしなければ未到達として数える）
+  maxDraws?: number
+  // マスターシード（試行ごとのシードは「マスターシード:通し番号」から導出する。設定の組み合わせ間で同じ番号を使う）
+  seed?: string
+}
+
+// 設定の組み合わせ1つの集計結果
+export interface ManipulationBenchmarkRow {
+  manipulationRate: number
+  handQuality: string
+  trials: number
+  draws: number
+  // 有効牌（引く前の手牌のシャンテン数を下げる牌）を引いた割合
+  usefulDrawRatio: number
+  // 引く直前の山に残っている有効牌の割合の平均（操作なしで引いた場合の期待値）
+  naturalUsefulRatio: number
+  // 配牌13枚のシャンテン数の平均
+  averageStartShanten: number
+  // 上限までにテンパイした試行の割合と、テンパイまでのツモ回数の平均（テンパイした試行のみ）
+  tenpaiRate: number
+  averageDrawsToTenpai: number
+  // 1回あたりの処理時間（マイクロ秒）
+  // ツモ: GameManager.drawTileAndKeepSeparate（EnhancedDraw.drawEnhancedTile と牌山からの除去）
+  // 配牌: GameManager.startNewGame（牌山の生成、selectBestHand による配牌候補の選択、4人分の配牌）
+  drawMicros: number
+  dealMicros: number
+}
+
+export interface ManipulationBenchmarkResult {
+  rows: ManipulationBenchmarkRow[]
+  elapsedMs: number
+}
+
+interface TrialTotals {
+  draws: number
+  usefulDraws: number
+  naturalUsefulRatioSum: number
+  startShantenSum: number
+  tenpaiTrials: number
+  drawsToTenpaiSum: number
+  drawMs: number
+  dealMs: number
+}
+
+/**
+ * 牌操作率と配牌の良さの組み合わせごとに、配牌からテンパイまでを trials 回繰り返して集計する
+ * 打牌は hard 難易度の CpuAI で選び、他家はツモ・打牌しない（0番のツモの分布だけを見る）
+ */
+export function runManipulationBenchmark(options: ManipulationBenchmarkOptions): ManipulationBenchmarkResult {
+  const start = performance.now()
+  const rows: ManipulationBenchmarkRow[] = []
+  const rates = options.manipulationRates ?? DEFAULT_MANIPULATION_RATES
+  const qualities = options.handQualities ?? DEFAULT_HAND_QUALITIES
+  const masterSeed = options.seed ?? 'manipulation-benchmark'
+
+  for (const handQuality of qualities) {
+    for (const manipulationRate of rates) {
+      rows.push(runSetting(manipulationRate, handQuality, options.trials, options.maxDraws ?? DEFAULT_MAX_DRAWS, masterSeed))
+    }
+  }
+
+  return { rows, elapsedMs: performance.now() - start }
+}
+
+function runSetting(manipulationRate: number, handQuality: string, trials: number, maxDraws: number, masterSeed: string): ManipulationBenchmarkRow {
+  const manager = new GameManager({
+    gameSettings: { cpuStrengths: ['normal', 'normal', 'normal'], gameType: 'tonpuusen' },
+    manipulationRate,
+    handQuality,
+    recordResults: false
+  })
+  const ai = new CpuAI('hard', createRandom(`${masterSeed}:ai`))
+  ai.setSearchTimeBudget(Infinity)
+  const evaluator = new ShantenEvaluator()
+  const counts = new Uint8Array(34)
+  const usefulMask = new Uint32Array(2)
+  const totals: TrialTotals = {
+    draws: 0,
+    usefulDraws: 0,
+    naturalUsefulRatioSum: 0,
+    startShantenSum: 0,
+    tenpaiTrials: 0,
+    drawsToTenpaiSum: 0,
+    drawMs: 0,
+    dealMs: 0
+  }
+
+  for (let trial = 0; trial < trials; trial++) {
+    manager.reseed(deriveGameSeed(masterSeed, trial))
+    // 親（0番）の第一ツモまで行われる
+    const dealStart = performance.now()
+    manager.startNewGame()
+    totals.dealMs += performance.now() - dealStart
+
+    const player = manager.players[0]
+    evaluator.setHand(convertTilesToRustFormat(player.tiles, counts))
+    totals.startShantenSum += evaluator.shanten
+
+    // 第一ツモは配牌と同時に行われるため、有効牌の割合には第2ツモ以降を数える
+    let drawnTile = manager.currentDrawnTile
+    for (let draw = 1; drawnTile; draw++) {
+      evaluator.add(getTileIndex(drawnTile))
+      if (evaluator.shanten <= 0) {
+        totals.tenpaiTrials++
+        totals.drawsToTenpaiSum += draw
+        break
+      }
+      if (draw >= maxDraws) break
+
+      const tileId = ai.decideTileToDiscard({ ...player, tiles: [...player.tiles, drawnTile] }, drawnTile)
+      manager.discardTile(0, tileId)
+      evaluator.setHand(convertTilesToRustFormat(player.tiles, counts))
+
+      evaluator.getUsefulTileMask(usefulMask)
+      const natural = naturalUsefulRatio(manager, usefulMask)
+
+      const drawStart = performance.now()
+      drawnTile = manager.drawTileAndKeepSeparate(0)
+      totals.drawMs += performance.now() - drawStart
+      if (!drawnTile) break
+
+      const type = getTileIndex(drawnTile)
+      totals.draws++
+      totals.naturalUsefulRatioSum += natural
+      if (usefulMask[type >>> 5] & (1 << (type & 31))) totals.usefulDraws++
+    }
+  }
+
+  return {
+    manipulationRate,
+    handQuality,
+    trials,
+    draws: totals.draws,
+    usefulDrawRatio: totals.draws > 0 ? totals.usefulDraws / totals.draws : 0,
+    naturalUsefulRatio: totals.draws > 0 ? totals.naturalUsefulRatioSum / totals.draws : 0,
+    averageStartShanten: trials > 0 ? totals.startShantenSum / trials : 0,
+    tenpaiRate: trials > 0 ? totals.tenpaiTrials / trials : 0,
+    averageDrawsToTenpai: totals.tenpaiTrials > 0 ? totals.drawsToTenpaiSum / totals.tenpaiTrials : 0,
+    drawMicros: totals.draws > 0 ? totals.drawMs * 1000 / totals.draws : 0,
+    dealMicros: trials > 0 ? totals.dealMs * 1000 / trials : 0
+  }
+}
+
+/**
+ * 山に残っている牌のうち有効牌の割合（GameManager.wall は配列を作るため、計測区間の外で呼ぶ）
+ */
+function naturalUsefulRatio(manager: GameManager, usefulMask: Uint32Array): number {
+  const wall = manager.wall
+  if (wall.length === 0) return 0
+  let useful = 0
+  for (const tile of wall) {
+    const type = getTileIndex(tile)
+    if (usefulMask[type >>> 5] & (1 << (type & 31))) useful++
+  }
+  return useful / wall.length
+}
@@ -0,0 +1,151 @@
+// 対局エンジンの処理時間の計測（シャンテン数・受け入れ・和了判定・CPUの打牌判断・ツモ・配牌・PlayerAreaの描画）
+// 無効の間は spanStart / spanEnd が真偽値の判定1回だけで返るため、計測箇所を常に残しておける
+// 有効にすると区間名ごとに回数・合計・最大と対数目盛りのヒストグラムを集計し、p50/p95を求める
+
+// ヒストグラムの目盛り: 1µsから2倍ごとに4分割（約19%刻み）、約1秒まで
+const BUCKETS_PER_OCTAVE = 4
+const BUCKET_COUNT = 20 * BUCKETS_PER_OCTAVE + 1
+
+export const PROFILER_STORAGE_KEY = 'mahjong-profiler'
+
+export interface ProfileSpanSummary {
+  name: string
+  count: number
+  totalMs: number
+  meanMs: number
+  p50Ms: number
+  p95Ms: number
+  maxMs: number
+}
+
+export interface ProfilerHandle {
+  enable: () => void
+  disable: () => void
+  reset: () => void
+  isEnabled: () => boolean
+  // 区間名ごとの集計（合計時間の長い順）
+  snapshot: () => ProfileSpanSummary[]
+}
+
+declare global {
+  interface Window {
+    __MAHJONG_PROFILER__?: ProfilerHandle
+  }
+}
+
+interface SpanStats {
+  count: number
+  totalMs: number
+  maxMs: number
+  buckets: Uint32Array
+}
+
+let enabled = false
+const spans = new Map<string, SpanStats>()
+
+/**
+ * 計測区間の開始（無効の間は -1 を返し、spanEnd は何もしない）
+ */
+export function spanStart(): number {
+  return enabled ? performance.now() : -1
+}
+
+/**
+ * 計測区間の終了
+ * @param name 区間名
+ * @param start spanStart の戻り値
+ */
+export function spanEnd(name: string, start: number): void {
+  if (start < 0 || !enabled) return
+  recordSpan(name, performance.now() - start)
+}
+
+/**
+ * 計測済みの時間を区間に加える
+ */
+export function recordSpan(name: string, durationMs: number): void {
+  let stats = spans.get(name)
+  if (!stats) {
+    stats = { count: 0, totalMs: 0, maxMs: 0, buckets: new Uint32Array(BUCKET_COUNT) }
+    spans.set(name, stats)
+  }
+  stats.count++
+  stats.totalMs += durationMs
+  if (durationMs > stats.maxMs) stats.maxMs = durationMs
+  stats.buckets[bucketIndex(durationMs)]++
+}
+
+function bucketIndex(durationMs: number): number {
+  const micros = durationMs * 1000
+  if (micros <= 1) return 0
+  return Math.min(BUCKET_COUNT - 1, Math.ceil(Math.log2(micros) * BUCKETS_PER_OCTAVE))
+}
+
+// 目盛りの上端（ms）
+function bucketUpperMs(index: number): number {
+  return Math.pow(2, index / BUCKETS_PER_OCTAVE) / 1000
+}
+
+function percentile(stats: SpanStats, ratio: number): number {
+  const target = Math.ceil(stats.count * ratio)
+  let seen = 0
+  for (let i = 0; i < BUCKET_COUNT; i++) {
+    seen += stats.buckets[i]
+    if (seen >= target) {
+      // 目盛りの上端は最大値を超えないようにする（最後の目盛りは上限がないため最大値）
+      return i === BUCKET_COUNT - 1 ? stats.maxMs : Math.min(bucketUpperMs(i), stats.maxMs)
+    }
+  }
+  return stats.maxMs
+}
+
+export function isProfilerEnabled(): boolean {
+  return enabled
+}
+
+export function setProfilerEnabled(value: boolean): void {
+  enabled = value
+}
+
+export function resetProfiler(): void {
+  spans.clear()
+}
+
+/**
+ * 区間名ごとの集計（合計時間の長い順）
+ */
+export function getProfileSnapshot(): ProfileSpanSummary[] {
+  return [...spans.entries()]
+    .map(([name, stats]) => ({
+      name,
+      count: stats.count,
+      totalMs: stats.totalMs,
+      meanMs: stats.totalMs / stats.count,
+      p50Ms: percentile(stats, 0.5),
+      p95Ms: percentile(stats, 0.95),
+      maxMs: stats.maxMs
+    }))
+    .sort((a, b) => b.totalMs - a.totalMs)
+}
+
+/**
+ * window.__MAHJONG_PROFILER__ に計測の操作口を登録する（Playwright・デバッグパネルから参照）
+ * URLに ?profile（ハッシュのクエリも可）がある場合、または localStorage に有効の設定がある場合は計測を開始する
+ */
+export function installProfilerHandle(): void {
+  if (typeof window === 'undefined') return
+
+  window.__MAHJONG_PROFILER__ = {
+    enable: () => setProfilerEnabled(true),
+    disable: () => setProfilerEnabled(false),
+    reset: resetProfiler,
+    isEnabled: isProfilerEnabled,
+    snapshot: getProfileSnapshot
+  }
+
+  const { search, hash } = window.location
+  const requested = /[?&]profile(=|&|$)/.test(search) || /[?&]profile(=|&|$)/.test(hash)
+  if (requested || window.localStorage?.getItem(PROFILER_STORAGE_KEY) === 'true') {
+    setProfilerEnabled(true)
+  }
+}
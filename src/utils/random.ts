@@ -0,0 +1,27 @@
+// 乱数源の共通定義
+// GameManager が1つの乱数源を持ち、EnhancedDraw と CpuAI にも同じものを渡して対局全体を1つのシードで再現可能にする
+import seedrandom from 'seedrandom'
+
+// 0以上1未満の値を返す乱数関数（Math.random と同じ形）
+export type RandomSource = () => number
+
+/**
+ * シード付きの乱数源を生成
+ */
+export function createRandom(seed: string): RandomSource {
+  return seedrandom(seed)
+}
+
+/**
+ * 新しいシード文字列を生成（シード未指定の対局でも後から再現できるように記録する）
+ */
+export function generateSeed(): string {
+  return Math.random().toString(36).slice(2, 12)
+}
+
+/**
+ * 0以上max未満の整数をランダムに返す
+ */
+export function randomInt(random: RandomSource, max: number): number {
+  return Math.floor(random() * max)
+}
@@ -1,5 +1,6 @@
 import { calc, Tile as RsTile, Yaku as RsYaku } from 'riichi-rs-bundlers'
 import type { Tile } from '../stores/fourPlayerMahjong'
+import { ByteKeyLruCache } from './lru-cache'
 
 export interface ScoringInput {
   hand: Tile[]
@@ -36,6 +37,74 @@ export interface ScoringResult {
   }>
 }
 
+// 点数計算結果のキャッシュ
+// 同じ打牌に対するCPUのロン判定・画面のロン/ツモボタン判定・WinModalの表示で、同じ入力の calc が繰り返されるため、
+// calc に渡す入力を正規化したバイト列をキーにして結果を保持する
+const SCORE_CACHE_CAPACITY = 256
+// キーの最大長: ヘッダ4 + 手牌(長さ+14) + ドラ(長さ+10) + 鳴き(個数 + 4×(種別+長さ+4))
+const SCORE_KEY_MAX_LENGTH = 64
+
+const scoreCache = new ByteKeyLruCache<ScoringResult | null>(SCORE_CACHE_CAPACITY)
+const scoreKey = new Uint8Array(SCORE_KEY_MAX_LENGTH)
+
+export interface ScoringCacheStats {
+  hits: number
+  misses: number
+  size: number
+  hitRate: number
+}
+
+/**
+ * 点数計算キャッシュのヒット数・ミス数（計測用）
+ */
+export function getScoringCacheStats(): ScoringCacheStats {
+  const total = scoreCache.hits + scoreCache.misses
+  return {
+    hits: scoreCache.hits,
+    misses: scoreCache.misses,
+    size: scoreCache.size,
+    hitRate: total > 0 ? scoreCache.hits / total : 0
+  }
+}
+
+export function clearScoringCache(): void {
+  scoreCache.clear()
+  scoreCache.resetStats()
+}
+
+/**
+ * calc に渡す入力のキー（riichiOptions のフラグ、赤ドラ枚数、上がり牌、手牌、ドラ、鳴き）をバイト列に書き込む
+ * @returns キーの長さ
+ */
+function writeScoreKey(
+  flags: number,
+  akaCount: number,
+  winTileNumber: number,
+  closedPart: number[],
+  doraNumbers: number[],
+  openPart: Array<[boolean, number[]]>
+): number {
+  let length = 0
+  scoreKey[length++] = flags
+  scoreKey[length++] = akaCount
+  scoreKey[length++] = winTileNumber
+  scoreKey[length++] = closedPart.length
+  for (const tile of closedPart) scoreKey[length++] = tile
+  scoreKey[length++] = doraNumbers.length
+  for (const tile of doraNumbers) scoreKey[length++] = tile
+  scoreKey[length++] = openPart.length
+  for (const [isOpen, tiles] of openPart) {
+    scoreKey[length++] = isOpen ? 1 : 0
+    scoreKey[length++] = tiles.length
+    for (const tile of tiles) scoreKey[length++] = tile
+  }
+  return length
+}
+
+function copyScoringResult(result: ScoringResult | null): ScoringResult | null {
+  return result ? { ...result, yaku: result.yaku.map(yaku => ({ ...yaku })) } : null
+}
+
 // outgoing_tenから支払い形式を計算
 function formatPaymentInfo(outgoingTen: [number, number] | null, totalPoints: number, isTsumo: boolean, isDealer: boolean): { paymentInfo: string, totalPoints: number } {
   if (isTsumo && outgoingTen) {
@@ -321,6 +390,8 @@ export function calculateScore(input: ScoringInput): ScoringResult | null {
       } else {
         closedPart = convertTilesToNumbers(input.hand) as number[]
       }
+      // ツモと同じく並べ替えておく（キャッシュのキーが手牌の並び順によらないように）
+      closedPart.sort((a, b) => a - b)
     }
     // ドラ指示牌から実際のドラ牌に変換
     const doraNumbers = convertDoraIndicatorsToDora(input.doraIndicators) as number[]
@@ -370,7 +441,7 @@ export function calculateScore(input: ScoringInput): ScoringResult | null {
     }
 
     // Convert melds to riichi-rs format: [is_open, Tile[]]
-    const openPart: any[] = []
+    const openPart: Array<[boolean, number[]]> = []
     if (input.melds && input.melds.length > 0) {
       for (const meld of input.melds) {
         const meldTiles = convertTilesToNumbers(meld.tiles).sort((a, b) => a - b)
@@ -397,11 +468,29 @@ export function calculateScore(input: ScoringInput): ScoringResult | null {
 
 
 
+    // 同じ入力の計算結果があれば calc を呼ばない
+    const flags =
+      (input.isTsumo ? 1 : 0) |
+      (input.isRiichi ? 2 : 0) |
+      (input.isDealer ? 4 : 0) |
+      (riichiOptions.double_riichi ? 8 : 0) |
+      (riichiOptions.ippatsu ? 16 : 0) |
+      (riichiOptions.last_tile ? 32 : 0) |
+      (riichiOptions.after_kan ? 64 : 0) |
+      (riichiOptions.first_take ? 128 : 0)
+    const keyLength = writeScoreKey(flags, akaCount, winTileNumber, closedPart, allDoraNumbers, openPart)
+    const key = scoreKey.subarray(0, keyLength)
+    const cached = scoreCache.get(key)
+    if (cached !== undefined) {
+      return copyScoringResult(cached)
+    }
+
     // Call riichi-rs-bundlers calc function
     const result = calc(riichiInput)
 
 
     if (!result.is_agari) {
+      scoreCache.set(key, null)
       return null
     }
 
@@ -428,7 +517,7 @@ export function calculateScore(input: ScoringInput): ScoringResult | null {
     // 支払い形式と合計点数を計算
     const payment = formatPaymentInfo(result.outgoing_ten || null, result.ten, input.isTsumo, input.isDealer)
 
-    return {
+    const scoringResult: ScoringResult = {
       han: result.han,
       fu: result.fu,
       points: result.ten,
@@ -437,6 +526,8 @@ export function calculateScore(input: ScoringInput): ScoringResult | null {
       yakuman: result.yakuman,
       yaku
     }
+    scoreCache.set(key, scoringResult)
+    return copyScoringResult(scoringResult)
   } catch (error) {
     return null
   }
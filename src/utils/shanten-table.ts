@@ -0,0 +1,529 @@
+// テーブル参照によるシャンテン数計算（WASM未初期化時・エラー時のフォールバック）
+// 色（萬子・筒子・索子・字牌）ごとの枚数を5進数で符号化し、その色で取れる面子・搭子の組み合わせを表に記録して、4色の表を組み合わせる
+// 表は色ごとの符号をキーに、初めて出現した時に計算して保存する（全パターンの表は数MBになるため同梱しない）
+
+// 1色の表の値: (雀頭の有無 h, 面子数 m) ごとに取れる搭子数の最大値（0-4、不可能な組み合わせは UNREACHABLE）を3bitずつ詰める
+const UNREACHABLE = 7
+const MAX_BLOCKS = 4
+const suitTable = new Map<number, number>()
+const honorTable = new Map<number, number>()
+
+const TERMINAL_INDICES = [0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33]
+
+function slot(head: number, mentsu: number): number {
+  return (head * (MAX_BLOCKS + 1) + mentsu) * 3
+}
+
+function readTaatsu(value: number, head: number, mentsu: number): number {
+  return (value >>> slot(head, mentsu)) & 7
+}
+
+function pack(best: number[]): number {
+  let value = 0
+  for (let head = 0; head < 2; head++) {
+    for (let mentsu = 0; mentsu <= MAX_BLOCKS; mentsu++) {
+      const taatsu = best[head * (MAX_BLOCKS + 1) + mentsu]
+      value |= (taatsu < 0 ? UNREACHABLE : taatsu) << slot(head, mentsu)
+    }
+  }
+  return value
+}
+
+/**
+ * 残りの牌の表の値に、取り除いたブロック（面子・雀頭・搭子・浮き牌）を加えた結果を best に反映する
+ */
+function mergeBlock(best: number[], rest: number, addHead: number, addMentsu: number, addTaatsu: number): void {
+  for (let head = 0; head + addHead < 2; head++) {
+    for (let mentsu = 0; mentsu + addMentsu <= MAX_BLOCKS; mentsu++) {
+      const taatsu = readTaatsu(rest, head, mentsu)
+      if (taatsu === UNREACHABLE) continue
+
+      const index = (head + addHead) * (MAX_BLOCKS + 1) + mentsu + addMentsu
+      const total = Math.min(taatsu + addTaatsu, MAX_BLOCKS)
+      if (total > best[index]) {
+        best[index] = total
+      }
+    }
+  }
+}
+
+/**
+ * 1色の表の値を作る
+ * 最も小さい牌を含むブロックを1つ取り除き、残りの牌の表の値（同じ表から再帰的に取得）と組み合わせる
+ * @param counts 1色分の枚数（計算中に増減させ、終了時には元に戻す）
+ * @param isHonor 字牌（順子・両面・嵌張を作らない）
+ */
+function buildEntry(counts: number[], isHonor: boolean): number {
+  // best[h * 5 + m] = 搭子数の最大値（-1: 不可能）
+  const best = new Array((MAX_BLOCKS + 1) * 2).fill(-1)
+
+  let position = 0
+  while (position < counts.length && counts[position] === 0) {
+    position++
+  }
+  if (position >= counts.length) {
+    best[0] = 0
+    return pack(best)
+  }
+
+  const removeAndMerge = (offsets: number[], addHead: number, addMentsu: number, addTaatsu: number): void => {
+    for (const offset of offsets) counts[position + offset]--
+    mergeBlock(best, lookupSuit(counts, isHonor), addHead, addMentsu, addTaatsu)
+    for (const offset of offsets) counts[position + offset]++
+  }
+
+  const count = counts[position]
+  const hasNext = !isHonor && position + 1 < counts.length && counts[position + 1] > 0
+  const hasNextNext = !isHonor && position + 2 < counts.length && counts[position + 2] > 0
+
+  // 刻子
+  if (count >= 3) removeAndMerge([0, 0, 0], 0, 1, 0)
+  // 順子
+  if (hasNext && hasNextNext) removeAndMerge([0, 1, 2], 0, 1, 0)
+  if (count >= 2) {
+    // 雀頭
+    removeAndMerge([0, 0], 1, 0, 0)
+    // 対子（搭子として数える）
+    removeAndMerge([0, 0], 0, 0, 1)
+  }
+  // 両面・辺張
+  if (hasNext) removeAndMerge([0, 1], 0, 0, 1)
+  // 嵌張
+  if (hasNextNext) removeAndMerge([0, 2], 0, 0, 1)
+  // 浮き牌
+  removeAndMerge([0], 0, 0, 0)
+
+  return pack(best)
+}
+
+/**
+ * 1色分の枚数の表の値を取得する（未計算なら計算して保存する）
+ */
+function lookupSuit(counts: number[], isHonor: boolean): number {
+  let code = 0
+  for (let i = 0; i < counts.length; i++) {
+    code = code * 5 + counts[i]
+  }
+
+  const table = isHonor ? honorTable : suitTable
+  let value = table.get(code)
+  if (value === undefined) {
+    value = buildEntry(counts, isHonor)
+    table.set(code, value)
+  }
+  return value
+}
+
+// 表の値の計算用（1色分の枚数、呼び出しごとに確保しない）
+const suitCounts: number[] = new Array(9).fill(0)
+const honorCounts: number[] = new Array(7).fill(0)
+
+/**
+ * 34種の枚数配列のうち1色分の表の値を取得する
+ */
+function lookup(counts: Uint8Array, start: number, length: number, isHonor: boolean): number {
+  let code = 0
+  for (let i = 0; i < length; i++) {
+    code = code * 5 + counts[start + i]
+  }
+
+  const value = (isHonor ? honorTable : suitTable).get(code)
+  if (value !== undefined) {
+    return value
+  }
+
+  const work = isHonor ? honorCounts : suitCounts
+  for (let i = 0; i < length; i++) {
+    work[i] = counts[start + i]
+  }
+  return lookupSuit(work, isHonor)
+}
+
+// 4色の組み合わせの作業用（(雀頭の有無, 面子数) ごとの搭子数の最大値、呼び出しごとに確保しない）
+const combined = new Int8Array((MAX_BLOCKS + 1) * 2)
+const nextCombined = new Int8Array((MAX_BLOCKS + 1) * 2)
+
+/**
+ * (雀頭の有無, 面子数) ごとの搭子数の最大値 source に1色の表の値を組み合わせ、target に書き込む
+ */
+function combineStep(source: Int8Array, value: number, target: Int8Array): void {
+  target.fill(-1)
+
+  for (let head = 0; head < 2; head++) {
+    for (let mentsu = 0; mentsu <= MAX_BLOCKS; mentsu++) {
+      const taatsu = source[head * (MAX_BLOCKS + 1) + mentsu]
+      if (taatsu < 0) continue
+
+      for (let suitHead = 0; suitHead + head < 2; suitHead++) {
+        for (let suitMentsu = 0; suitMentsu + mentsu <= MAX_BLOCKS; suitMentsu++) {
+          const suitTaatsu = readTaatsu(value, suitHead, suitMentsu)
+          if (suitTaatsu === UNREACHABLE) continue
+
+          const index = (head + suitHead) * (MAX_BLOCKS + 1) + mentsu + suitMentsu
+          const total = Math.min(taatsu + suitTaatsu, MAX_BLOCKS)
+          if (total > target[index]) {
+            target[index] = total
+          }
+        }
+      }
+    }
+  }
+}
+
+/**
+ * 組み合わせた結果から一般形のシャンテン数を求める
+ * @param meldCount 鳴いた面子の数（手牌で作る面子と搭子は合わせて 4 - meldCount まで）
+ */
+function shantenFromCombined(source: Int8Array, meldCount: number = 0): number {
+  const maxBlocks = MAX_BLOCKS - meldCount
+  let shanten = 8
+  for (let head = 0; head < 2; head++) {
+    for (let mentsu = 0; mentsu <= maxBlocks; mentsu++) {
+      const taatsu = source[head * (MAX_BLOCKS + 1) + mentsu]
+      if (taatsu < 0) continue
+      // 面子と搭子は合わせて4つまで
+      const usableTaatsu = Math.min(taatsu, maxBlocks - mentsu)
+      shanten = Math.min(shanten, 8 - (mentsu + meldCount) * 2 - usableTaatsu - head)
+    }
+  }
+  return shanten
+}
+
+/**
+ * 4色の表の値を組み合わせて一般形のシャンテン数を求める
+ */
+function combineSuitValues(values: ArrayLike<number>, meldCount: number = 0): number {
+  combined.fill(-1)
+  combined[0] = 0
+
+  for (let suit = 0; suit < 4; suit++) {
+    combineStep(combined, values[suit], nextCombined)
+    combined.set(nextCombined)
+  }
+  return shantenFromCombined(combined, meldCount)
+}
+
+function suitOf(index: number): number {
+  return index < 27 ? Math.floor(index / 9) : 3
+}
+
+function lookupSuitOf(counts: Uint8Array, suit: number): number {
+  return suit === 3 ? lookup(counts, 27, 7, true) : lookup(counts, suit * 9, 9, false)
+}
+
+// 一般形の計算用（4色の表の値、呼び出しごとに確保しない）
+const generalValues = new Int32Array(4)
+
+/**
+ * 一般形（4面子1雀頭）のシャンテン数
+ * @param counts 34種の枚数配列（0-33: 1m-9m,1p-9p,1s-9s,東南西北白發中）
+ */
+export function calculateGeneralShantenFromTable(counts: Uint8Array): number {
+  for (let suit = 0; suit < 4; suit++) {
+    generalValues[suit] = lookupSuitOf(counts, suit)
+  }
+  return combineSuitValues(generalValues)
+}
+
+/**
+ * 七対子のシャンテン数
+ * WASM（calc_shanten）と同じく、対子の種類数のみで数える（種類数が7未満の場合の補正はしない）
+ */
+export function calculateChiitoitsuShantenFromTable(counts: Uint8Array): number {
+  let pairs = 0
+  for (let i = 0; i < 34; i++) {
+    if (counts[i] >= 2) pairs++
+  }
+  return 6 - pairs
+}
+
+/**
+ * 国士無双のシャンテン数
+ */
+export function calculateKokushiShantenFromTable(counts: Uint8Array): number {
+  let kinds = 0
+  let hasPair = false
+  for (const index of TERMINAL_INDICES) {
+    if (counts[index] > 0) kinds++
+    if (counts[index] >= 2) hasPair = true
+  }
+  return 13 - kinds - (hasPair ? 1 : 0)
+}
+
+/**
+ * シャンテン数（一般形・七対子・国士無双の最小値、-1: 和了）
+ * WASM（calc_shanten）と同じく、手牌の枚数によらず七対子・国士無双も含める
+ */
+export function calculateShantenFromTable(counts: Uint8Array): number {
+  let tileCount = 0
+  for (let i = 0; i < 34; i++) {
+    tileCount += counts[i]
+  }
+  if (tileCount === 0) {
+    return 8
+  }
+
+  return Math.min(
+    calculateGeneralShantenFromTable(counts),
+    calculateChiitoitsuShantenFromTable(counts),
+    calculateKokushiShantenFromTable(counts)
+  )
+}
+
+/**
+ * 受け入れ牌（1枚加えるとシャンテン数が下がる牌のインデックス）
+ * @param counts 34種の枚数配列（計算中に増減させ、終了時には元に戻す）
+ */
+export function getUsefulTilesFromTable(counts: Uint8Array): number[] {
+  const currentShanten = calculateShantenFromTable(counts)
+  const useful: number[] = []
+  if (currentShanten === -1) {
+    return useful
+  }
+
+  for (let i = 0; i < 34; i++) {
+    if (counts[i] >= 4) continue
+    counts[i]++
+    if (calculateShantenFromTable(counts) < currentShanten) {
+      useful.push(i)
+    }
+    counts[i]--
+  }
+  return useful
+}
+
+/**
+ * 手牌を保持し、1枚加える・除く場合のシャンテン数を差分で求める
+ * 色ごとの表の値・七対子の対子数・国士無双の么九牌の種類数を保持し、牌を1枚増減させる時は変化した色の表だけを引き直す
+ * 結果は calculateShantenFromTable と同じ（WASMの calc_shanten と同じ定義）
+ */
+export class ShantenEvaluator {
+  // 保持している手牌の枚数（直接書き換えず setHand / add / remove を使う）
+  readonly counts = new Uint8Array(34)
+  private suitValues = new Int32Array(4)
+  // 色ごとに、その色以外の3色を組み合わせた結果（1枚の増減ではその色の表の値を1回組み合わせるだけで済む）
+  private partials = [0, 1, 2, 3].map(() => new Int8Array((MAX_BLOCKS + 1) * 2))
+  private partialsValid = false
+  private tileCount = 0
+  private pairs = 0
+  private terminalKinds = 0
+  private terminalPairs = 0
+  private cachedShanten: number | null = null
+
+  constructor(counts?: Uint8Array) {
+    if (counts) {
+      this.setHand(counts)
+    } else {
+      this.recalculate()
+    }
+  }
+
+  /**
+   * 手牌を設定する（枚数配列はコピーして保持する）
+   */
+  setHand(counts: Uint8Array): void {
+    this.counts.set(counts)
+    this.recalculate()
+  }
+
+  add(index: number): void {
+    this.applyDelta(index, 1)
+  }
+
+  remove(index: number): void {
+    if (this.counts[index] === 0) return
+    this.applyDelta(index, -1)
+  }
+
+  /**
+   * 保持している手牌のシャンテン数（-1: 和了）
+   */
+  get shanten(): number {
+    if (this.cachedShanten === null) {
+      this.cachedShanten = this.evaluate(combineSuitValues(this.suitValues), this.tileCount, this.pairs, this.terminalKinds, this.terminalPairs)
+    }
+    return this.cachedShanten
+  }
+
+  /**
+   * 鳴いた面子がある場合のシャンテン数（鳴いた面子を含めた4面子1雀頭の一般形のみ。鳴きがなければ shanten と同じ）
+   */
+  shantenWithMelds(meldCount: number): number {
+    if (meldCount === 0) return this.shanten
+    return combineSuitValues(this.suitValues, meldCount)
+  }
+
+  /**
+   * 牌を1枚除いた場合のシャンテン数（手牌は変更しない）
+   */
+  shantenIfRemoved(index: number): number {
+    if (this.counts[index] === 0) return this.shanten
+    return this.shantenWithDelta(index, -1)
+  }
+
+  /**
+   * 牌を1枚加えた場合のシャンテン数（手牌は変更しない）
+   */
+  shantenIfAdded(index: number): number {
+    if (this.counts[index] >= 4) return this.shanten
+    return this.shantenWithDelta(index, 1)
+  }
+
+  /**
+   * 手牌にある牌種ごとに、1枚切った後のシャンテン数を求める（手牌にない牌種は 0 のまま）
+   */
+  getDiscardShanten(out: Int8Array = new Int8Array(34)): Int8Array {
+    out.fill(0)
+    for (let index = 0; index < 34; index++) {
+      if (this.counts[index] > 0) {
+        out[index] = this.shantenWithDelta(index, -1)
+      }
+    }
+    return out
+  }
+
+  /**
+   * 受け入れ牌（1枚加えるとシャンテン数が下がる牌のインデックス）
+   */
+  getUsefulTiles(): number[] {
+    const currentShanten = this.shanten
+    const useful: number[] = []
+    if (currentShanten === -1) {
+      return useful
+    }
+
+    for (let index = 0; index < 34; index++) {
+      if (this.counts[index] >= 4) continue
+      if (this.shantenWithDelta(index, 1) < currentShanten) {
+        useful.push(index)
+      }
+    }
+    return useful
+  }
+
+  /**
+   * 受け入れ牌のビットマスク（牌種 i は out[i >>> 5] の (i & 31) ビット目）
+   * @param meldCount 鳴いた面子の数（shantenWithMelds と同じく一般形のみで数える）
+   * @returns 受け入れ牌があるか
+   */
+  getUsefulTileMask(out: Uint32Array, meldCount: number = 0): boolean {
+    out.fill(0)
+    const currentShanten = this.shantenWithMelds(meldCount)
+    if (currentShanten === -1) {
+      return false
+    }
+
+    let found = false
+    for (let index = 0; index < 34; index++) {
+      if (this.counts[index] >= 4) continue
+      if (this.shantenWithDelta(index, 1, meldCount) < currentShanten) {
+        out[index >>> 5] |= 1 << (index & 31)
+        found = true
+      }
+    }
+    return found
+  }
+
+  private recalculate(): void {
+    this.tileCount = 0
+    this.pairs = 0
+    for (let index = 0; index < 34; index++) {
+      this.tileCount += this.counts[index]
+      if (this.counts[index] >= 2) this.pairs++
+    }
+
+    this.terminalKinds = 0
+    this.terminalPairs = 0
+    for (const index of TERMINAL_INDICES) {
+      if (this.counts[index] > 0) this.terminalKinds++
+      if (this.counts[index] >= 2) this.terminalPairs++
+    }
+
+    for (let suit = 0; suit < 4; suit++) {
+      this.suitValues[suit] = lookupSuitOf(this.counts, suit)
+    }
+    this.cachedShanten = null
+    this.partialsValid = false
+  }
+
+  private applyDelta(index: number, delta: 1 | -1): void {
+    const before = this.counts[index]
+    const after = before + delta
+    this.counts[index] = after
+
+    this.tileCount += delta
+    this.pairs += pairDelta(before, after)
+    if (isTerminal(index)) {
+      this.terminalKinds += kindDelta(before, after)
+      this.terminalPairs += pairDelta(before, after)
+    }
+
+    const suit = suitOf(index)
+    this.suitValues[suit] = lookupSuitOf(this.counts, suit)
+    this.cachedShanten = null
+    this.partialsValid = false
+  }
+
+  private shantenWithDelta(index: number, delta: 1 | -1, meldCount: number = 0): number {
+    const before = this.counts[index]
+    const after = before + delta
+    const suit = suitOf(index)
+
+    // 変化する色の表だけを引き直し、その他の3色の組み合わせと組み合わせる
+    this.counts[index] = after
+    const value = lookupSuitOf(this.counts, suit)
+    this.counts[index] = before
+    combineStep(this.getPartial(suit), value, nextCombined)
+    if (meldCount > 0) {
+      return shantenFromCombined(nextCombined, meldCount)
+    }
+
+    const terminal = isTerminal(index)
+    return this.evaluate(
+      shantenFromCombined(nextCombined),
+      this.tileCount + delta,
+      this.pairs + pairDelta(before, after),
+      this.terminalKinds + (terminal ? kindDelta(before, after) : 0),
+      this.terminalPairs + (terminal ? pairDelta(before, after) : 0)
+    )
+  }
+
+  private getPartial(suit: number): Int8Array {
+    if (!this.partialsValid) {
+      for (let target = 0; target < 4; target++) {
+        combined.fill(-1)
+        combined[0] = 0
+        for (let other = 0; other < 4; other++) {
+          if (other === target) continue
+          combineStep(combined, this.suitValues[other], nextCombined)
+          combined.set(nextCombined)
+        }
+        this.partials[target].set(combined)
+      }
+      this.partialsValid = true
+    }
+    return this.partials[suit]
+  }
+
+  private evaluate(generalShanten: number, tileCount: number, pairs: number, terminalKinds: number, terminalPairs: number): number {
+    if (tileCount === 0) {
+      return 8
+    }
+
+    const chiitoitsu = 6 - pairs
+    const kokushi = 13 - terminalKinds - (terminalPairs > 0 ? 1 : 0)
+    return Math.min(generalShanten, chiitoitsu, kokushi)
+  }
+}
+
+function isTerminal(index: number): boolean {
+  return index >= 27 || index % 9 === 0 || index % 9 === 8
+}
+
+function pairDelta(before: number, after: number): number {
+  return (after >= 2 ? 1 : 0) - (before >= 2 ? 1 : 0)
+}
+
+function kindDelta(before: number, after: number): number {
+  return (after > 0 ? 1 : 0) - (before > 0 ? 1 : 0)
+}
@@ -0,0 +1,61 @@
+// テスト用配牌（テストモックと同じPlayerTestData）のURLエンコード・検証
+import type { PlayerTestData } from './useGameSettings'
+
+// URLクエリのキー（例: #/four-player?deal=1m,1m,1m|1p,9p;;;）
+export const TEST_DEAL_QUERY_KEY = 'deal'
+
+const PLAYER_SEPARATOR = ';'
+const SECTION_SEPARATOR = '|'
+const TILE_SEPARATOR = ','
+
+// 牌文字列をパース（空白・カンマ区切りの両方に対応）
+export function parseTileList(input: string): string[] {
+  return input.trim().split(/[\s,]+/).filter(tile => tile.length > 0)
+}
+
+/**
+ * テスト用配牌をURLクエリ用の文字列に変換
+ * プレイヤーは ; 区切り、手牌とツモ牌は | 区切り、牌は , 区切り
+ */
+export function encodeTestDeal(players: PlayerTestData[]): string {
+  return players
+    .map(player => `${player.tiles.join(TILE_SEPARATOR)}${SECTION_SEPARATOR}${player.drawTiles.join(TILE_SEPARATOR)}`)
+    .join(PLAYER_SEPARATOR)
+}
+
+// URLクエリの文字列からテスト用配牌を復元（4人分に揃える）
+export function decodeTestDeal(param: string): PlayerTestData[] {
+  const sections = param.split(PLAYER_SEPARATOR)
+  const players: PlayerTestData[] = []
+
+  for (let i = 0; i < 4; i++) {
+    const [tiles = '', drawTiles = ''] = (sections[i] ?? '').split(SECTION_SEPARATOR)
+    players.push({ tiles: parseTileList(tiles), drawTiles: parseTileList(drawTiles) })
+  }
+
+  return players
+}
+
+/**
+ * テスト用配牌の検証
+ * 手牌は13枚または14枚（未指定のプレイヤーは空で可）
+ * @returns エラーメッセージ（問題なければnull）
+ */
+export function validateTestDeal(players: PlayerTestData[]): string | null {
+  if (players.length === 0 || players.length > 4) {
+    return `プレイヤー数が不正です: ${players.length}`
+  }
+
+  for (let i = 0; i < players.length; i++) {
+    const count = players[i].tiles.length
+    if (count !== 0 && count !== 13 && count !== 14) {
+      return `プレイヤー${i + 1}の手牌枚数が不正です: ${count}枚`
+    }
+  }
+
+  if (players[0].tiles.length === 0) {
+    return 'プレイヤー1の手牌が指定されていません'
+  }
+
+  return null
+}
@@ -0,0 +1,112 @@
+// 34種の牌の枚数（Uint8Array）を局の進行に合わせて差分更新する
+// インデックスは mahjong-calculator-wrapper の getTileIndex と同じ（0-33: 1m-9m,1p-9p,1s-9s,東南西北白發中）
+import type { Tile, Meld } from '../stores/fourPlayerMahjong'
+import { getTileIndex, convertTilesToRustFormat } from './mahjong-calculator-wrapper'
+
+export const TILE_TYPE_COUNT = 34
+
+interface CountablePlayer {
+  tiles: Tile[]
+  discards: Tile[]
+  melds: Meld[]
+}
+
+/**
+ * 各プレイヤーの手牌・河・鳴き牌と、全員から見えている牌（河・鳴き牌・ドラ表示牌）の枚数
+ * 手牌の枚数にはツモ牌を含む
+ */
+export class TileCountTracker {
+  readonly hands: Uint8Array[] = [0, 1, 2, 3].map(() => new Uint8Array(TILE_TYPE_COUNT))
+  readonly rivers: Uint8Array[] = [0, 1, 2, 3].map(() => new Uint8Array(TILE_TYPE_COUNT))
+  readonly melds: Uint8Array[] = [0, 1, 2, 3].map(() => new Uint8Array(TILE_TYPE_COUNT))
+  readonly visible = new Uint8Array(TILE_TYPE_COUNT)
+
+  // visibleFor() の戻り値（呼び出しごとに確保しない）
+  private _visibleForBuffer = new Uint8Array(TILE_TYPE_COUNT)
+
+  /**
+   * 現在の手牌・河・鳴き牌・ドラ表示牌から全ての枚数を数え直す（配牌時・テスト手牌の設定時）
+   */
+  rebuild(players: CountablePlayer[], doraIndicators: Tile[], drawnTile: Tile | null = null, drawnPlayerIndex: number = -1): void {
+    this.visible.fill(0)
+
+    players.forEach((player, index) => {
+      convertTilesToRustFormat(player.tiles, this.hands[index])
+      convertTilesToRustFormat(player.discards, this.rivers[index])
+      this.melds[index].fill(0)
+      for (const meld of player.melds) {
+        for (const tile of meld.tiles) {
+          this.melds[index][getTileIndex(tile)]++
+        }
+      }
+
+      for (let i = 0; i < TILE_TYPE_COUNT; i++) {
+        this.visible[i] += this.rivers[index][i] + this.melds[index][i]
+      }
+    })
+
+    if (drawnTile && drawnPlayerIndex >= 0) {
+      this.hands[drawnPlayerIndex][getTileIndex(drawnTile)]++
+    }
+
+    for (const tile of doraIndicators) {
+      this.visible[getTileIndex(tile)]++
+    }
+  }
+
+  draw(playerIndex: number, tile: Tile): void {
+    this.hands[playerIndex][getTileIndex(tile)]++
+  }
+
+  discard(playerIndex: number, tile: Tile): void {
+    const index = getTileIndex(tile)
+    this.hands[playerIndex][index]--
+    this.rivers[playerIndex][index]++
+    this.visible[index]++
+  }
+
+  /**
+   * 鳴き（ポン・チー・明カン・暗カン）を反映する
+   * 鳴いた牌は相手の河から鳴き牌へ移るだけなので、見えている枚数は手牌から出した分だけ増える
+   */
+  call(playerIndex: number, meld: Meld): void {
+    const fromPlayer = meld.fromPlayer ?? playerIndex
+    const calledFromRiver = fromPlayer !== playerIndex
+
+    for (const tile of meld.tiles) {
+      const index = getTileIndex(tile)
+      this.melds[playerIndex][index]++
+
+      if (calledFromRiver && tile.id === meld.calledTile.id) {
+        this.rivers[fromPlayer][index]--
+      } else {
+        this.hands[playerIndex][index]--
+        this.visible[index]++
+      }
+    }
+  }
+
+  flipDora(tile: Tile): void {
+    this.visible[getTileIndex(tile)]++
+  }
+
+  /**
+   * 指定プレイヤーから見えている牌（自分の手牌 + 河・鳴き牌・ドラ表示牌）
+   * 戻り値は内部バッファのため、次の呼び出しで上書きされる
+   */
+  visibleFor(playerIndex: number): Uint8Array {
+    const hand = this.hands[playerIndex]
+    const out = this._visibleForBuffer
+    for (let i = 0; i < TILE_TYPE_COUNT; i++) {
+      out[i] = this.visible[i] + hand[i]
+    }
+    return out
+  }
+
+  /**
+   * 指定プレイヤーから見た牌の残り枚数
+   */
+  remaining(playerIndex: number, tileIndex: number): number {
+    return Math.max(0, 4 - this.visible[tileIndex] - this.hands[playerIndex][tileIndex])
+  }
+}
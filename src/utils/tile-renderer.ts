@@ -1,4 +1,34 @@
 import type { Tile } from '../stores/fourPlayerMahjong'
+import tileAtlasManifest from './tile-atlas.json'
+
+export type TileAtlasSheetName = 'upright' | 'yoko'
+
+/**
+ * 牌画像のスプライトシートのマニフェスト（scripts/build-tile-atlas.ts で生成）
+ * frames のキーは public/tiles/ の画像ファイル名（拡張子なし）
+ */
+export interface TileAtlasManifest {
+  sheets: Record<TileAtlasSheetName, {
+    image: string // public からの相対パス
+    width: number
+    height: number
+    tileWidth: number
+    tileHeight: number
+  }>
+  frames: Record<string, { sheet: TileAtlasSheetName, x: number, y: number }>
+}
+
+export interface TileSprite {
+  url: string
+  x: number
+  y: number
+  width: number
+  height: number
+  sheetWidth: number
+  sheetHeight: number
+}
+
+const atlas = tileAtlasManifest as TileAtlasManifest
 
 // publicディレクトリのパスベース（本番では /haisosa-mahjong/、開発では /）
 const getBasePath = (): string => {
@@ -9,42 +39,14 @@ const getBasePath = (): string => {
  * 牌から画像ファイル名を生成
  */
 export function getTileImagePath(tile: Tile): string {
-  const basePath = getBasePath()
-  
-  if (tile.suit === 'man') {
-    return tile.isRed ? `${basePath}tiles/0m.png` : `${basePath}tiles/m${tile.rank}.png`
-  } else if (tile.suit === 'pin') {
-    return tile.isRed ? `${basePath}tiles/0p.png` : `${basePath}tiles/p${tile.rank}.png`
-  } else if (tile.suit === 'sou') {
-    return tile.isRed ? `${basePath}tiles/0s.png` : `${basePath}tiles/s${tile.rank}.png`
-  } else { // honor
-    if (tile.rank <= 4) {
-      return `${basePath}tiles/w${tile.rank}.png` // 風牌
-    } else {
-      return `${basePath}tiles/d${tile.rank - 4}.png` // 三元牌 (5->1, 6->2, 7->3)
-    }
-  }
+  return `${getBasePath()}tiles/${getTileImageName(tile)}.png`
 }
 
 /**
  * 横向き牌の画像パスを取得（鳴き牌用）
  */
 export function getTileImagePathYoko(tile: Tile): string {
-  const basePath = getBasePath()
-  
-  if (tile.suit === 'man') {
-    return tile.isRed ? `${basePath}tiles/0m-yoko.png` : `${basePath}tiles/m${tile.rank}-yoko.png`
-  } else if (tile.suit === 'pin') {
-    return tile.isRed ? `${basePath}tiles/0p-yoko.png` : `${basePath}tiles/p${tile.rank}-yoko.png`
-  } else if (tile.suit === 'sou') {
-    return tile.isRed ? `${basePath}tiles/0s-yoko.png` : `${basePath}tiles/s${tile.rank}-yoko.png`
-  } else { // honor
-    if (tile.rank <= 4) {
-      return `${basePath}tiles/w${tile.rank}-yoko.png` // 風牌
-    } else {
-      return `${basePath}tiles/d${tile.rank - 4}-yoko.png` // 三元牌 (5->1, 6->2, 7->3)
-    }
-  }
+  return `${getBasePath()}tiles/${getTileImageName(tile, true)}.png`
 }
 
 /**
@@ -78,4 +80,52 @@ export function getTileText(tile: Tile): string {
   
   const honorMap = ['', '東', '南', '西', '北', '白', '發', '中']
   return honorMap[tile.rank] || '?'
-}
\ No newline at end of file
+}
+
+/**
+ * 牌の画像名（public/tiles/ のファイル名から拡張子を除いたもの）
+ */
+export function getTileImageName(tile: Tile, isYoko: boolean = false): string {
+  let name: string
+  if (tile.suit === 'man' || tile.suit === 'pin' || tile.suit === 'sou') {
+    const suitChar = tile.suit === 'man' ? 'm' : tile.suit === 'pin' ? 'p' : 's'
+    name = tile.isRed ? `0${suitChar}` : `${suitChar}${tile.rank}`
+  } else {
+    name = tile.rank <= 4 ? `w${tile.rank}` : `d${tile.rank - 4}` // 風牌・三元牌 (5->1, 6->2, 7->3)
+  }
+  return isYoko ? `${name}-yoko` : name
+}
+
+/**
+ * スプライトシート上の牌の位置（シートにない牌の場合は null）
+ */
+export function getTileSprite(tile: Tile, options: { isYoko?: boolean } = {}): TileSprite | null {
+  const frame = atlas.frames[getTileImageName(tile, options.isYoko)]
+  if (!frame) {
+    return null
+  }
+  const sheet = atlas.sheets[frame.sheet]
+  return {
+    url: `${getBasePath()}${sheet.image}`,
+    x: frame.x,
+    y: frame.y,
+    width: sheet.tileWidth,
+    height: sheet.tileHeight,
+    sheetWidth: sheet.width,
+    sheetHeight: sheet.height
+  }
+}
+
+/**
+ * スプライトシートから牌を表示するCSS（要素の大きさに合わせて拡大縮小されるよう割合で指定する）
+ */
+export function getTileSpriteStyle(sprite: TileSprite): Record<string, string> {
+  const percent = (offset: number, tileSize: number, sheetSize: number) =>
+    sheetSize > tileSize ? `${(offset / (sheetSize - tileSize)) * 100}%` : '0%'
+  return {
+    backgroundImage: `url(${sprite.url})`,
+    backgroundSize: `${(sprite.sheetWidth / sprite.width) * 100}% ${(sprite.sheetHeight / sprite.height) * 100}%`,
+    backgroundPosition: `${percent(sprite.x, sprite.width, sprite.sheetWidth)} ${percent(sprite.y, sprite.height, sprite.sheetHeight)}`,
+    backgroundRepeat: 'no-repeat'
+  }
+}
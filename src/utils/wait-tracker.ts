@@ -0,0 +1,98 @@
+// 各プレイヤーの待ち牌（34種のビットマスク）とフリテンを保持し、手牌が変わった時だけ計算し直す
+// 捨て牌ごとのロン判定を、待ち牌のビットの参照とフリテンのフラグの参照で済ませるために使う
+import type { Tile } from '../stores/fourPlayerMahjong'
+import { getTileIndex } from './mahjong-calculator-wrapper'
+import { ShantenEvaluator } from './shanten-table'
+import { TILE_TYPE_COUNT } from './tile-counts'
+
+/**
+ * 待ち牌は手牌（鳴き牌を除く 13 - 3×鳴きの数 の枚数）がテンパイの場合の、和了形になる牌種
+ * 鳴きがある場合は鳴いた面子を含めた4面子1雀頭の一般形のみで数える
+ * フリテンは mahjong-logic の isFuriten と同じく、自分の河に待ち牌があるかどうか
+ *
+ * 手牌は GameManager が差分更新している枚数配列（TileCountTracker）を受け取り、前回と比べて
+ * 変わっていれば待ち牌を求め直す。河は追加の分だけ待ち牌と照合する（鳴かれて減った場合は数え直す）
+ */
+export class WaitTracker {
+  private masks = new Uint32Array(8)
+  private playerMasks = [0, 1, 2, 3].map(index => this.masks.subarray(index * 2, index * 2 + 2))
+  private hands = [0, 1, 2, 3].map(() => new Uint8Array(TILE_TYPE_COUNT))
+  private meldCounts = new Int32Array(4).fill(-1)
+  private furiten = [false, false, false, false]
+  private checkedDiscards = new Int32Array(4)
+  private evaluator = new ShantenEvaluator()
+
+  /**
+   * 手牌・鳴きの数・河が前回から変わっていれば待ち牌・フリテンを更新する
+   * @param handCounts 手牌の34種の枚数（鳴き牌を除く）
+   * @param meldCount 鳴いた面子の数（暗カンを含む）
+   * @returns 待ち牌を求められたか（手牌が 13 - 3×鳴きの数 の枚数でない場合は false）
+   */
+  update(playerIndex: number, handCounts: Uint8Array, meldCount: number, discards: Tile[]): boolean {
+    if (countTiles(handCounts) + meldCount * 3 !== 13) {
+      this.meldCounts[playerIndex] = -1
+      return false
+    }
+
+    const mask = this.playerMasks[playerIndex]
+    if (this.meldCounts[playerIndex] !== meldCount || !sameCounts(this.hands[playerIndex], handCounts)) {
+      this.hands[playerIndex].set(handCounts)
+      this.meldCounts[playerIndex] = meldCount
+      this.evaluator.setHand(handCounts)
+      if (this.evaluator.shantenWithMelds(meldCount) === 0) {
+        this.evaluator.getUsefulTileMask(mask, meldCount)
+      } else {
+        mask.fill(0)
+      }
+      this.furiten[playerIndex] = false
+      this.checkedDiscards[playerIndex] = 0
+    }
+
+    if (discards.length < this.checkedDiscards[playerIndex]) {
+      this.furiten[playerIndex] = false
+      this.checkedDiscards[playerIndex] = 0
+    }
+    for (let i = this.checkedDiscards[playerIndex]; i < discards.length && !this.furiten[playerIndex]; i++) {
+      const index = getTileIndex(discards[i])
+      this.furiten[playerIndex] = (mask[index >>> 5] & (1 << (index & 31))) !== 0
+    }
+    this.checkedDiscards[playerIndex] = discards.length
+    return true
+  }
+
+  /**
+   * 直前の update で求めた待ち牌に牌種が含まれるか
+   */
+  isWaitingOn(playerIndex: number, tileIndex: number): boolean {
+    return (this.playerMasks[playerIndex][tileIndex >>> 5] & (1 << (tileIndex & 31))) !== 0
+  }
+
+  /**
+   * 直前の update で求めたフリテン
+   */
+  isFuriten(playerIndex: number): boolean {
+    return this.furiten[playerIndex]
+  }
+
+  /**
+   * 待ち牌のビットマスク（牌種 i は [i >>> 5] の (i & 31) ビット目。内部バッファのため書き換えない）
+   */
+  waitMask(playerIndex: number): Uint32Array {
+    return this.playerMasks[playerIndex]
+  }
+}
+
+function countTiles(counts: Uint8Array): number {
+  let total = 0
+  for (let i = 0; i < TILE_TYPE_COUNT; i++) {
+    total += counts[i]
+  }
+  return total
+}
+
+function sameCounts(a: Uint8Array, b: Uint8Array): boolean {
+  for (let i = 0; i < TILE_TYPE_COUNT; i++) {
+    if (a[i] !== b[i]) return false
+  }
+  return true
+}
@@ -0,0 +1,297 @@
+// 牌山
+// 牌山の並び（スロット）は局の開始時に固定し、引いた牌は生存フラグを下ろすだけにする
+// 生存フラグの累積和を Fenwick 木で持ち、「残りの k 番目の牌」「牌の除去」を O(log n) で行う（並び順は配列の牌山と同じ）
+import type { Tile } from '../stores/fourPlayerMahjong'
+import { getTileIndex } from './mahjong-calculator-wrapper'
+import { TILE_TYPE_COUNT } from './tile-counts'
+
+// 王牌の枚数（山の後方14枚。ツモはこの手前で終わる）
+export const DEAD_WALL_SIZE = 14
+
+export type WallSuit = Tile['suit']
+
+const SUITS: WallSuit[] = ['man', 'pin', 'sou', 'honor']
+
+function suitIndex(suit: WallSuit): number {
+  return SUITS.indexOf(suit)
+}
+
+/**
+ * 1始まりの Fenwick 木（生存している牌の数の累積和）
+ */
+class FenwickTree {
+  private tree: Int32Array
+  private topBit = 1
+
+  constructor(size: number) {
+    this.tree = new Int32Array(size + 1)
+    while (this.topBit * 2 <= size) this.topBit *= 2
+  }
+
+  clear(): void {
+    this.tree.fill(0)
+  }
+
+  // slot は0始まり
+  add(slot: number, delta: number): void {
+    for (let i = slot + 1; i < this.tree.length; i += i & -i) {
+      this.tree[i] += delta
+    }
+  }
+
+  /**
+   * 累積和が k + 1 になる最初のスロット（生存している牌のうち k 番目、0始まり）
+   */
+  find(k: number): number {
+    let position = 0
+    let rest = k + 1
+    for (let bit = this.topBit; bit > 0; bit >>= 1) {
+      const next = position + bit
+      if (next < this.tree.length && this.tree[next] < rest) {
+        position = next
+        rest -= this.tree[next]
+      }
+    }
+    return position
+  }
+}
+
+/**
+ * 牌山
+ * - shift / pop: 先頭・末尾の牌を引く（ならし O(log n)）
+ * - at / remove / restore: 残りの k 番目の牌の参照、指定した牌の除去・戻し（O(log n)）
+ * - 色ごと・牌種ごとの残り枚数と、その中の k 番目の牌を求められる（清一色モード・EnhancedDraw用）
+ */
+export class Wall {
+  private slots: Tile[] = []
+  private alive = new Uint8Array(0)
+  private tree = new FenwickTree(0)
+  private suitTrees: FenwickTree[] = []
+  private suitCounts = new Int32Array(SUITS.length)
+  private slotTypes = new Uint8Array(0)
+  private slotById = new Map<string, number>()
+  // 牌種ごとのスロット（昇順、各4枚まで）
+  private typeSlots: number[][] = Array.from({ length: TILE_TYPE_COUNT }, () => [])
+  private typeCounts = new Uint8Array(TILE_TYPE_COUNT)
+  private head = 0
+  private tail = -1
+  private _length = 0
+
+  constructor(tiles: Tile[] = []) {
+    this.reset(tiles)
+  }
+
+  /**
+   * 牌山を並び順どおりに設定する
+   */
+  reset(tiles: Tile[]): void {
+    const size = tiles.length
+    if (size !== this.slots.length) {
+      this.alive = new Uint8Array(size)
+      this.slotTypes = new Uint8Array(size)
+      this.tree = new FenwickTree(size)
+      this.suitTrees = SUITS.map(() => new FenwickTree(size))
+    } else {
+      this.tree.clear()
+      this.suitTrees.forEach(tree => tree.clear())
+    }
+
+    this.slots = tiles.slice()
+    this.slotById.clear()
+    this.suitCounts.fill(0)
+    this.typeCounts.fill(0)
+    this.typeSlots.forEach(slots => { slots.length = 0 })
+
+    for (let slot = 0; slot < size; slot++) {
+      const tile = tiles[slot]
+      const suit = suitIndex(tile.suit)
+      this.alive[slot] = 1
+      this.tree.add(slot, 1)
+      this.suitTrees[suit].add(slot, 1)
+      this.suitCounts[suit]++
+      this.slotById.set(tile.id, slot)
+      const type = getTileIndex(tile)
+      this.slotTypes[slot] = type
+      this.typeSlots[type].push(slot)
+      this.typeCounts[type]++
+    }
+
+    this.head = 0
+    this.tail = size - 1
+    this._length = size
+  }
+
+  get length(): number {
+    return this._length
+  }
+
+  /**
+   * 王牌を除いたツモ可能な枚数
+   */
+  get liveLength(): number {
+    return Math.max(0, this._length - DEAD_WALL_SIZE)
+  }
+
+  /**
+   * 牌種ごとの残り枚数（内部バッファ）
+   */
+  get typeRemaining(): Uint8Array {
+    return this.typeCounts
+  }
+
+  has(tileId: string): boolean {
+    const slot = this.slotById.get(tileId)
+    return slot !== undefined && this.alive[slot] === 1
+  }
+
+  /**
+   * 先頭の牌を引く
+   */
+  shift(): Tile | undefined {
+    if (this._length === 0) return undefined
+    while (!this.alive[this.head]) this.head++
+    const tile = this.slots[this.head]
+    this.kill(this.head)
+    return tile
+  }
+
+  /**
+   * 末尾の牌を引く
+   */
+  pop(): Tile | undefined {
+    if (this._length === 0) return undefined
+    while (!this.alive[this.tail]) this.tail--
+    const tile = this.slots[this.tail]
+    this.kill(this.tail)
+    return tile
+  }
+
+  /**
+   * 残りの牌のうち先頭から index 番目（0始まり）の牌
+   */
+  at(index: number): Tile | undefined {
+    const slot = this.slotAt(index)
+    return slot < 0 ? undefined : this.slots[slot]
+  }
+
+  /**
+   * 残りの牌のうち先頭から index 番目（0始まり）の牌のスロット（範囲外は -1）
+   */
+  slotAt(index: number): number {
+    if (index < 0 || index >= this._length) return -1
+    return this.tree.find(index)
+  }
+
+  tileOfSlot(slot: number): Tile {
+    return this.slots[slot]
+  }
+
+  /**
+   * スロットの牌の牌種（0-33）
+   */
+  typeOfSlot(slot: number): number {
+    return this.slotTypes[slot]
+  }
+
+  /**
+   * 残りの牌のうち末尾から offset 番目（0始まり）の牌（王牌の参照用）
+   */
+  fromEnd(offset: number): Tile | undefined {
+    return this.at(this._length - 1 - offset)
+  }
+
+  /**
+   * 指定した色の残り枚数
+   */
+  countOfSuit(suit: WallSuit): number {
+    return this.suitCounts[suitIndex(suit)]
+  }
+
+  /**
+   * 指定した色の残りの牌のうち先頭から index 番目（0始まり）の牌
+   */
+  atInSuit(suit: WallSuit, index: number): Tile | undefined {
+    const slot = this.slotAtInSuit(suit, index)
+    return slot < 0 ? undefined : this.slots[slot]
+  }
+
+  /**
+   * 指定した色の残りの牌のうち先頭から index 番目（0始まり）の牌のスロット（範囲外は -1）
+   */
+  slotAtInSuit(suit: WallSuit, index: number): number {
+    const suitIdx = suitIndex(suit)
+    if (index < 0 || index >= this.suitCounts[suitIdx]) return -1
+    return this.suitTrees[suitIdx].find(index)
+  }
+
+  /**
+   * 指定した牌種（0-33）の残りの牌のうち山の並び順で index 番目（0始まり）の牌
+   */
+  atInType(type: number, index: number): Tile | undefined {
+    for (const slot of this.typeSlots[type]) {
+      if (!this.alive[slot]) continue
+      if (index === 0) return this.slots[slot]
+      index--
+    }
+    return undefined
+  }
+
+  /**
+   * 指定した牌を山から除く
+   * @returns 除いた牌。山にない場合は null
+   */
+  remove(tileId: string): Tile | null {
+    const slot = this.slotById.get(tileId)
+    if (slot === undefined || !this.alive[slot]) return null
+    this.kill(slot)
+    return this.slots[slot]
+  }
+
+  /**
+   * remove() で除いた牌を元の位置に戻す（配牌候補の試し引き用）
+   */
+  restore(tileId: string): void {
+    const slot = this.slotById.get(tileId)
+    if (slot !== undefined) this.restoreSlot(slot)
+  }
+
+  /**
+   * 指定したスロットの牌を山から除く（配牌候補の試し引き用。除いた牌は restoreSlot() で戻す）
+   */
+  removeSlot(slot: number): void {
+    if (this.alive[slot]) this.kill(slot)
+  }
+
+  restoreSlot(slot: number): void {
+    if (this.alive[slot]) return
+    this.updateSlot(slot, 1)
+    this.head = Math.min(this.head, slot)
+    this.tail = Math.max(this.tail, slot)
+  }
+
+  /**
+   * 残りの牌を並び順どおりの配列にする（ログ・テスト用）
+   */
+  toArray(): Tile[] {
+    const tiles: Tile[] = []
+    for (let slot = this.head; slot <= this.tail; slot++) {
+      if (this.alive[slot]) tiles.push(this.slots[slot])
+    }
+    return tiles
+  }
+
+  private kill(slot: number): void {
+    this.updateSlot(slot, -1)
+  }
+
+  private updateSlot(slot: number, delta: 1 | -1): void {
+    const type = this.slotTypes[slot]
+    const suit = type < 27 ? Math.floor(type / 9) : 3
+    this.alive[slot] = delta > 0 ? 1 : 0
+    this.tree.add(slot, delta)
+    this.suitTrees[suit].add(slot, delta)
+    this.suitCounts[suit] += delta
+    this.typeCounts[type] += delta
+    this._length += delta
+  }
+}
@@ -0,0 +1,26 @@
+// 対局画面で使うWASM（シャンテン・受け入れ計算の mahjong_calculator_rs、点数計算の riichi-rs）の先読み
+// ホーム画面では読み込まず、/four-player へ向かう時（開始ボタンへのホバー・フォーカス、ルートへの遷移）に初めて読み込む
+
+let preloadPromise: Promise<void> | null = null
+
+/**
+ * 対局画面のWASMを読み込んで初期化する（何度呼んでも読み込みは1回だけ）
+ * 失敗した場合は次の呼び出しで読み込み直す
+ */
+export function preloadMahjongWasm(): Promise<void> {
+  if (!preloadPromise) {
+    performance.mark('haisosa:wasm-preload-start')
+    preloadPromise = Promise.all([
+      import('./mahjong-calculator-wrapper').then(({ initMahjongCalculator }) => initMahjongCalculator()),
+      // scoring は riichi-rs-bundlers を静的に読み込むため、モジュールの評価でWASMが初期化される
+      import('./scoring')
+    ]).then(() => {
+      performance.mark('haisosa:wasm-ready')
+      performance.measure('haisosa:wasm-preload', 'haisosa:wasm-preload-start', 'haisosa:wasm-ready')
+    }).catch(error => {
+      preloadPromise = null
+      throw error
+    })
+  }
+  return preloadPromise
+}
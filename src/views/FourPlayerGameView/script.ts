@@ -1,8 +1,11 @@
-import { computed, ref, watch, onMounted, nextTick } from 'vue'
+import { computed, ref, watch, onMounted, onBeforeUnmount, nextTick, toRaw } from 'vue'
 import { GameManager } from '../../utils/game-manager'
 import { cpuAIs } from '../../utils/cpu-ai'
-import { calculateShanten, calculateShantenWithMelds, canRiichi, checkWinCondition, calculateAcceptance, findBestAcceptanceTiles, getTileIndex, getUsefulTiles, getTileRemainingCount, createTileFromIndex, isFuriten, type AcceptanceInfo } from '../../utils/mahjong-logic'
-import { calculateAcceptanceSync } from '../../utils/mahjong-calculator-wrapper'
+import { calculateShanten, calculateShantenWithMelds, canRiichi, checkWinCondition, findBestAcceptanceTiles, getTileIndex, getTileRemainingCount, createTileFromIndex, isFuriten, type AcceptanceInfo } from '../../utils/mahjong-logic'
+import { convertTilesToRustFormat, decodeDiscardAcceptanceBatch, type DiscardAcceptance } from '../../utils/mahjong-calculator-wrapper'
+import { AcceptanceWorkerClient } from '../../utils/acceptance-worker-client'
+import { CpuAIWorkerPool } from '../../utils/cpu-ai-worker-pool'
+import { toSnapshotPlayer, toSnapshotTile, type CpuTurnSnapshot, type CpuRonSnapshot } from '../../utils/cpu-ai-task'
 import { defaultEnhancedDraw } from '../../utils/enhanced-draw'
 import type { Tile } from '../../stores/fourPlayerMahjong'
 import PlayerArea from '../../components/PlayerArea.vue'
@@ -17,15 +20,18 @@ import ActionPanel from '../../components/ActionPanel.vue'
 import DoraPanel from '../../components/DoraPanel.vue'
 import TestModeDialog from '../../components/TestModeDialog.vue'
 import AcceptancePopup from '../../components/AcceptancePopup.vue'
-import { useRouter } from 'vue-router'
-import { useGameSettings } from '../../utils/useGameSettings'
+import { useRouter, useRoute } from 'vue-router'
+import { useGameSettings, type PlayerTestData } from '../../utils/useGameSettings'
 import { SoundManager } from '../../utils/sound-manager'
 import { isDebugMode } from '../../utils/env'
+import { installGameDebugHandle, type GameDebugState } from '../../utils/game-debug-hook'
+import { TEST_DEAL_QUERY_KEY, decodeTestDeal, validateTestDeal } from '../../utils/test-deal'
 
 export function useFourPlayerGameView() {
   const gameManagerInstance = ref<GameManager>(new GameManager())
   const router = useRouter()
-  const { settings } = useGameSettings()
+  const route = useRoute()
+  const { settings, toggleTestMode, updateTestModeData } = useGameSettings()
 
   // 設定変更の監視（牌操作率の更新）
   watch(() => settings.value.manipulationRate, (newRate, oldRate) => {
@@ -86,6 +92,12 @@ export function useFourPlayerGameView() {
   // 計算実行中ロック
   let isCalculationRunning = ref(false)
 
+  // 受け入れ計算用 Worker と、最後に開始した受け入れ計算の通し番号
+  const acceptanceWorker = new AcceptanceWorkerClient()
+  // CPUの打牌・リーチ・ロン判断用のAI Worker
+  const cpuAIWorkerPool = new CpuAIWorkerPool()
+  let acceptanceRequestSeq = 0
+
   // Sound mute state
   const isMuted = ref(false)
 
@@ -128,6 +140,7 @@ export function useFourPlayerGameView() {
   function cancelCurrentCalculation() {
     isCalculationCancelled.value = true
     isCalculatingAcceptance.value = false
+    acceptanceWorker.cancel()
   }
 
   const canDraw = computed(() => {
@@ -416,13 +429,31 @@ export function useFourPlayerGameView() {
           ai.setDifficulty(player.difficulty)
         }
 
-        const allTiles = currentDrawnTile.value ? [...player.tiles, currentDrawnTile.value] : player.tiles
+        // 盤面のスナップショットをAI Workerに渡して判断する（思考時間の待機と並行して計算する）
+        const manager = gameManagerInstance.value
+        const snapshot: CpuTurnSnapshot = {
+          seat: currentIndex,
+          difficulty: ai.getDifficulty(),
+          player: toSnapshotPlayer(player),
+          drawnTile: currentDrawnTile.value ? toSnapshotTile(currentDrawnTile.value) : null,
+          visibleCounts: manager.getVisibleTileCounts(currentIndex).slice(),
+          wallRemaining: manager.wallRemaining,
+          // GameManagerと同じ乱数源から判断ごとのシードを作り、シードから対局を再現できるようにする
+          randomSeed: manager.random().toString(36)
+        }
+        const [decision] = await Promise.all([
+          cpuAIWorkerPool.decideTurn(snapshot),
+          new Promise(resolve => setTimeout(resolve, ai.getThinkingTime()))
+        ])
 
-        const decision = await ai.makeDecision({ ...player, tiles: allTiles }, currentDrawnTile.value)
+        // 画面を離れた等でキャンセルされた
+        if (!decision) {
+          return
+        }
 
         if (decision.action === 'riichi') {
-          // リーチ宣言前にテンパイにするための捨て牌を決定
-          const riichiDiscardTile = ai.getRiichiDiscardTile(player, currentDrawnTile.value)
+          // リーチ宣言時にテンパイにするための捨て牌
+          const riichiDiscardTile = decision.tileId
 
           if (riichiDiscardTile) {
             // リーチ宣言
@@ -806,7 +837,7 @@ export function useFourPlayerGameView() {
       }
 
       // 鳴き牌に追加
-      humanPlayer.melds.push({
+      gameManagerInstance.value.addMeld(0, {
         type: 'pon',
         tiles: [sameRankTiles[0], sameRankTiles[1], tile],
         calledTile: tile,
@@ -850,7 +881,7 @@ export function useFourPlayerGameView() {
       }
 
       // 鳴き牌に追加
-      humanPlayer.melds.push({
+      gameManagerInstance.value.addMeld(0, {
         type: 'kan',
         tiles: [sameRankTiles[0], sameRankTiles[1], sameRankTiles[2], tile],
         calledTile: tile,
@@ -917,12 +948,6 @@ export function useFourPlayerGameView() {
       }
     })
 
-    humanPlayer.melds.push({
-      type: 'chi',
-      tiles: meldTiles,
-      calledTile: tile
-    })
-
     // 捨て牌を削除し、どのプレイヤーから鳴いたかを記録
     const lastDiscardPlayer = gameManagerInstance.value.players.find(p =>
       p.discards.length > 0 && p.discards[p.discards.length - 1].id === tile.id
@@ -933,11 +958,12 @@ export function useFourPlayerGameView() {
       lastDiscardPlayer.discards.pop()
     }
 
-    // 鳴き牌の fromPlayer フィールドを更新
-    const lastMeld = humanPlayer.melds[humanPlayer.melds.length - 1]
-    if (lastMeld) {
-      lastMeld.fromPlayer = fromPlayerIndex
-    }
+    gameManagerInstance.value.addMeld(0, {
+      type: 'chi',
+      tiles: meldTiles,
+      calledTile: tile,
+      fromPlayer: fromPlayerIndex
+    })
 
     // 人間プレイヤーのターンに設定
     gameManagerInstance.value.currentPlayerIndex = 0
@@ -979,7 +1005,7 @@ export function useFourPlayerGameView() {
       }
 
       // 暗カンを鳴き牌に追加
-      humanPlayer.melds.push({
+      gameManagerInstance.value.addMeld(0, {
         type: 'kan',
         tiles: targetTiles,
         calledTile: targetTiles[0], // 暗カンの場合は自分の牌
@@ -1476,14 +1502,13 @@ export function useFourPlayerGameView() {
     // 計算開始前にキャンセルフラグをリセット
     isCalculationCancelled.value = false
 
-    // 手牌状態をチェックして重複計算を避ける
-    const handStateKey = allTiles.map(t => `${t.suit}${t.rank}${t.isRed ? 'r' : ''}`).sort().join(',')
-    const lastHandStateKey = gameManagerInstance.value.getLastHandStateKey(0)
-
-    if (lastHandStateKey === handStateKey && acceptanceInfos.value.length > 0) {
+    // 同じ手牌状態で計算済みの結果を表示中なら再計算しない
+    const cachedResults = player.melds.length === 0 ? gameManagerInstance.value.getCachedAcceptanceInfo(0) : []
+    if (cachedResults.length > 0 && toRaw(cachedResults) === toRaw(acceptanceInfos.value)) {
       return
     }
 
+    const requestSeq = ++acceptanceRequestSeq
     isCalculatingAcceptance.value = true
     
     // Vue の DOM 更新を強制して即座にローディングマスクを表示
@@ -1505,44 +1530,25 @@ export function useFourPlayerGameView() {
         return
       }
 
-      // 見えている牌を収集
-      const visibleTiles = [...allTiles]
-      for (const p of players.value) {
-        visibleTiles.push(...p.discards)
-      }
-      visibleTiles.push(...doraIndicators.value)
+      // 見えている牌の枚数（手牌 + 河・鳴き牌・ドラ表示牌）をGameManagerの差分更新済みの値から取得
+      // 計算は非同期で続くため、内部バッファをコピーして使う
+      const visibleTiles = gameManagerInstance.value.getVisibleTileCounts(0).slice()
 
-      if (shantenNum === -1) {
-        // 和了形の場合：各牌を切った時の待ち牌を計算
-        if (player.melds.length > 0) {
-          acceptanceInfos.value = await calculateWinningHandInfoForMelds(allTiles, visibleTiles, player.melds)
-        } else {
-          acceptanceInfos.value = await calculateWinningHandInfo(allTiles, visibleTiles)
-        }
-        isUsefulTilesMode.value = false
-        bestAcceptanceTiles.value = [] // 和了形では全ての牌が切れるので、特に優先する牌はない
-      } else if (shantenNum === 0) {
-        // テンパイの場合：各牌を切った時の受け入れ計算
-        if (player.melds.length > 0) {
-          // 鳴き牌がある場合は手牌のみで受け入れ計算（mahjong_calculator_rsが鳴き牌を考慮）
-          acceptanceInfos.value = await calculateAcceptanceForMeldsWithCancel(allTiles, visibleTiles, player.melds)
-        } else {
-          // 鳴き牌がない場合は通常の計算
-          acceptanceInfos.value = await calculateAcceptanceOptimizedWithCancel(allTiles, visibleTiles)
-        }
-        isUsefulTilesMode.value = false
-      } else {
-        // シャンテン数1以上の場合：有効牌計算
-        if (player.melds.length > 0) {
-          // 鳴き牌がある場合は手牌のみで有効牌計算
-          acceptanceInfos.value = await calculateUsefulTilesForMeldsWithCancel(allTiles, visibleTiles, player.melds)
-        } else {
-          // 鳴き牌がない場合は通常の計算（14枚のみ）
-          acceptanceInfos.value = await calculateUsefulTilesInfoOptimizedWithCancel(allTiles, visibleTiles)
-        }
-        isUsefulTilesMode.value = true
+      const mode = shantenNum === -1 ? 'winning' : shantenNum === 0 ? 'tenpai' : 'useful'
+
+      // 鳴き牌がない場合は、同じ手牌で計算済みの結果があればそれを使う
+      const results = mode !== 'winning' && cachedResults.length > 0
+        ? cachedResults
+        : await calculateAcceptanceInWorker(allTiles, visibleTiles, player.melds, mode)
+
+      // 新しい計算に置き換えられた場合
+      if (!results || requestSeq !== acceptanceRequestSeq) {
+        return
       }
 
+      acceptanceInfos.value = results
+      isUsefulTilesMode.value = mode === 'useful'
+
 
       // キャンセルチェック
       if (isCalculationCancelled.value) {
@@ -1563,653 +1569,75 @@ export function useFourPlayerGameView() {
       } else {
       }
     } finally {
-      if (!isCalculationCancelled.value) {
-        const calculationEndTime = performance.now()
-        const calculationDuration = calculationEndTime - calculationStartTime
-        isCalculatingAcceptance.value = false
+      // 後から始まった計算がある場合は、フラグの更新をそちらに任せる
+      if (requestSeq === acceptanceRequestSeq) {
+        if (!isCalculationCancelled.value) {
+          const calculationEndTime = performance.now()
+          const calculationDuration = calculationEndTime - calculationStartTime
+          isCalculatingAcceptance.value = false
+        }
+        isCalculationRunning.value = false
       }
-      isCalculationRunning.value = false
     }
   }
 
-  // キャッシュを使用したテンパイ時の受け入れ計算（キャンセル対応版）
-  async function calculateAcceptanceOptimizedWithCancel(allTiles: any[], visibleTiles: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        const startTime = performance.now()
-
-        // キャンセルチェック
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        // まずキャッシュから取得を試みる
-        const cacheStartTime = performance.now()
-
-        // ローディングマスクは人間ターン開始時に既に表示済み
-
-        const cachedResults = gameManagerInstance.value.getCachedAcceptanceInfo(0)
-        if (cachedResults.length > 0) {
-          const cacheEndTime = performance.now()
-          const cacheDuration = cacheEndTime - cacheStartTime
-
-          // キャッシュがある場合はローディングマスクを表示しない
-
-          // 最終キャンセルチェック
-          if (isCalculationCancelled.value) {
-            resolve([])
-            return
-          }
-
-          resolve(cachedResults)
-          return
-        } else {
-          const cacheEndTime = performance.now()
-          const cacheDuration = cacheEndTime - cacheStartTime
-        }
-
-
-        // 最終キャンセルチェック
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        // キャッシュにない場合のみ全計算を実行
-        // 受け入れ計算開始時にローディングマスクを表示
-        isCalculatingAcceptance.value = true
-
-        // Rustライブラリを使用して受け入れ計算を実行
-        try {
-          const rustResults = calculateAcceptanceSync(allTiles, visibleTiles)
-          resolve(rustResults)
-          return
-        } catch (error) {
-          console.warn('Rustライブラリでエラーが発生しました。フォールバック処理を実行します。', error)
-        }
-
-        // フォールバック処理
-        const results: AcceptanceInfo[] = []
-        const calculatedTileTypes = new Set<string>()
-
-        for (const tile of allTiles) {
-          // 定期的なキャンセルチェック
-          if (isCalculationCancelled.value) {
-            resolve([])
-            return
-          }
-
-          const tileTypeKey = `${tile.suit}-${tile.rank}-${tile.isRed || false}`
-
-          // 同じ牌種は一度だけ計算
-          if (calculatedTileTypes.has(tileTypeKey)) {
-            // 既に計算済みの牌種の結果をコピー
-            const existingResult = results.find(r =>
-              r.tile.suit === tile.suit &&
-              r.tile.rank === tile.rank &&
-              (r.tile.isRed || false) === (tile.isRed || false)
-            )
-            if (existingResult) {
-              results.push({
-                ...existingResult,
-                tile: tile,
-                tileIndex: getTileIndex(tile)
-              })
-            }
-            continue
-          }
-
-          calculatedTileTypes.add(tileTypeKey)
-
-          // この牌を除いた残りの手牌
-          const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-
-          // この牌を切った後の見えている牌を計算（切った後の手牌13枚 + 河 + ドラ）
-          const visibleTilesForThis = [...remainingTiles]
-          for (const p of players.value) {
-            visibleTilesForThis.push(...p.discards)
-          }
-          visibleTilesForThis.push(...doraIndicators.value)
-
-          // この牌を切った後の受け入れ計算
-          const acceptanceResult = calculateAcceptance(remainingTiles, visibleTilesForThis)
-
-          if (acceptanceResult.length > 0) {
-            results.push(acceptanceResult[0])
-          }
-        }
-
-
-        // 最終キャンセルチェック
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // キャッシュを使用したテンパイ時の受け入れ計算（全牌対象）
-  async function calculateAcceptanceOptimized(allTiles: any[], visibleTiles: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        const startTime = performance.now()
-
-        // まずキャッシュから取得を試みる
-        const cachedResults = gameManagerInstance.value.getCachedAcceptanceInfo(0)
-        if (cachedResults.length > 0) {
-          resolve(cachedResults)
-          return
-        }
-
-        // キャッシュにない場合のみ全計算を実行
-        const results: AcceptanceInfo[] = []
-        const calculatedTileTypes = new Set<string>()
-
-        for (const tile of allTiles) {
-          const tileTypeKey = `${tile.suit}-${tile.rank}-${tile.isRed || false}`
-
-          // 同じ牌種は一度だけ計算
-          if (calculatedTileTypes.has(tileTypeKey)) {
-            // 既に計算済みの牌種の結果をコピー
-            const existingResult = results.find(r =>
-              r.tile.suit === tile.suit &&
-              r.tile.rank === tile.rank &&
-              (r.tile.isRed || false) === (tile.isRed || false)
-            )
-            if (existingResult) {
-              results.push({
-                ...existingResult,
-                tile: tile,
-                tileIndex: getTileIndex(tile)
-              })
-            }
-            continue
-          }
-
-          calculatedTileTypes.add(tileTypeKey)
-
-          // この牌を除いた残りの手牌
-          const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-
-          // この牌を切った後の受け入れ計算
-          const acceptanceResult = calculateAcceptance(remainingTiles, visibleTiles)
-
-          if (acceptanceResult.length > 0) {
-            const acceptanceInfo = acceptanceResult[0] // 最初の結果を使用
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles: acceptanceInfo.acceptanceTiles,
-              remainingCounts: acceptanceInfo.remainingCounts,
-              totalAcceptance: acceptanceInfo.totalAcceptance,
-              shantenAfterDiscard: acceptanceInfo.shantenAfterDiscard
-            })
-          } else {
-            // テンパイを崩す牌の場合は有効牌を計算
-            const shantenAfterDiscard = calculateShanten(remainingTiles)
-            const usefulTileIndices = getUsefulTiles(remainingTiles) // インデックス配列を直接取得
-            const usefulRemainingCounts: number[] = []
-
-            for (const tileIndex of usefulTileIndices) {
-              const remainingCount = getTileRemainingCount(tileIndex, visibleTiles)
-              usefulRemainingCounts.push(remainingCount)
-            }
-
-            const totalUseful = usefulRemainingCounts.reduce((sum, count) => sum + count, 0)
-
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles: usefulTileIndices,
-              remainingCounts: usefulRemainingCounts,
-              totalAcceptance: totalUseful,
-              shantenAfterDiscard: shantenAfterDiscard
-            })
-          }
-        }
-
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // キャッシュを使用した有効牌計算（キャンセル対応版）
-  async function calculateUsefulTilesInfoOptimizedWithCancel(allTiles: any[], visibleTiles: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        const functionStartTime = performance.now()
-
-        // キャンセルチェック
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        // まずはキャッシュから受け入れ情報を取得
-        const cacheStartTime = performance.now()
-        const cachedResults = gameManagerInstance.value.getCachedAcceptanceInfo(0)
-
-        // キャッシュにあればそれを返す（テンパイの場合）
-        if (cachedResults.length > 0) {
-
-          // 最終キャンセルチェック
-          if (isCalculationCancelled.value) {
-            resolve([])
-            return
-          }
-
-          resolve(cachedResults)
-          return
-        }
-
-        // キャッシュにない場合、従来の計算を実行（シャンテン数1以上）
-        const results: AcceptanceInfo[] = []
-        const calculatedTileTypes = new Set<string>() // 計算済みの牌種を記録
-
-        // forloop1: 手牌の切る牌→ 残り13枚を temp_tiles とします
-        for (let i = 0; i < allTiles.length; i++) {
-          // 定期的なキャンセルチェック
-          if (isCalculationCancelled.value) {
-            resolve([])
-            return
-          }
-
-          const tileToDiscard = allTiles[i]
-
-          // 同じ種類の牌が既に計算済みかチェック
-          const tileTypeKey = `${tileToDiscard.suit}_${tileToDiscard.rank}_${tileToDiscard.isRed || false}`
-          if (calculatedTileTypes.has(tileTypeKey)) {
-            // 同じ牌種は既に計算済みなので、既存の結果をコピーして牌情報だけ更新
-            const existingResult = results.find(r =>
-              r.tile.suit === tileToDiscard.suit &&
-              r.tile.rank === tileToDiscard.rank &&
-              (r.tile as any).isRed === tileToDiscard.isRed
-            )
-            if (existingResult) {
-              results.push({
-                ...existingResult,
-                tile: tileToDiscard // 実際の牌情報を更新
-              })
-            }
-            continue
-          }
-
-          // 計算済みとしてマーク
-          calculatedTileTypes.add(tileTypeKey)
-
-          const remainingTiles = [...allTiles]
-          remainingTiles.splice(i, 1) // i番目の牌を切る
-
-          if (remainingTiles.length === 13) {
-            const currentShanten = calculateShanten(remainingTiles)
-
-            // 有効牌を取得
-            const usefulTiles = getUsefulTiles(remainingTiles)
-            const remainingCounts = usefulTiles.map(tileIndex =>
-              getTileRemainingCount(tileIndex, visibleTiles)
-            )
-            const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-
-            results.push({
-              tileIndex: getTileIndex(tileToDiscard),
-              tile: tileToDiscard,
-              acceptanceTiles: usefulTiles,
-              remainingCounts,
-              totalAcceptance,
-              shantenAfterDiscard: currentShanten
-            })
-          }
-        }
-
-
-        // 最終キャンセルチェック
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // キャッシュを使用した有効牌計算（シャンテン数1以上）
-  async function calculateUsefulTilesInfoOptimized(allTiles: any[], visibleTiles: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        const functionStartTime = performance.now()
-
-        // まずはキャッシュから受け入れ情報を取得
-        const cacheStartTime = performance.now()
-        const cachedResults = gameManagerInstance.value.getCachedAcceptanceInfo(0)
-
-        // キャッシュにあればそれを返す（テンパイの場合）
-        if (cachedResults.length > 0) {
-          resolve(cachedResults)
-          return
-        }
-
-        // キャッシュにない場合、従来の計算を実行（シャンテン数1以上）
-        const results: AcceptanceInfo[] = []
-        const calculatedTileTypes = new Set<string>() // 計算済みの牌種を記録
-
-        // forloop1: 手牌の切る牌→ 残り13枚を temp_tiles とします
-        for (let i = 0; i < allTiles.length; i++) {
-          const tileToDiscard = allTiles[i]
-
-          // 同じ種類の牌が既に計算済みかチェック
-          const tileTypeKey = `${tileToDiscard.suit}_${tileToDiscard.rank}_${tileToDiscard.isRed || false}`
-          if (calculatedTileTypes.has(tileTypeKey)) {
-            // 同じ牌種は既に計算済みなので、既存の結果をコピーして牌情報だけ更新
-            const existingResult = results.find(r =>
-              r.tile.suit === tileToDiscard.suit &&
-              r.tile.rank === tileToDiscard.rank &&
-              (r.tile as any).isRed === tileToDiscard.isRed
-            )
-            if (existingResult) {
-              results.push({
-                ...existingResult,
-                tile: tileToDiscard // 実際の牌情報を更新
-              })
-            }
-            continue
-          }
-
-          const tempTiles = [...allTiles]
-          tempTiles.splice(i, 1) // i番目の牌を切る
-
-          if (tempTiles.length === 13) {
-            const currentShanten = calculateShanten(tempTiles)
-            const usefulTileIndices: number[] = []
-            const remainingCounts: number[] = []
-
-            // forloop2: すべての牌種（34種類）
-            for (let tileIndex = 0; tileIndex < 34; tileIndex++) {
-              // 孤立牌の場合、絶対に不要なので以降の処理をスキップ
-              if (isIsolatedTile(tempTiles, tileIndex)) {
-                continue
-              }
-
-              // そうでない場合、有効牌かどうか判定
-              const testTile = createTileFromIndex(tileIndex, 'test')
-              const testTiles = [...tempTiles, testTile]
-              const newShanten = calculateShanten(testTiles)
-
-              if (newShanten < currentShanten) {
-                usefulTileIndices.push(tileIndex)
-                remainingCounts.push(getTileRemainingCount(tileIndex, visibleTiles))
-              }
-            }
-
-            const totalUseful = remainingCounts.reduce((sum, count) => sum + count, 0)
-
-            if (usefulTileIndices.length > 0) {
-              results.push({
-                tileIndex: getTileIndex(tileToDiscard),
-                tile: tileToDiscard,
-                acceptanceTiles: usefulTileIndices,
-                remainingCounts,
-                totalAcceptance: totalUseful,
-                shantenAfterDiscard: currentShanten
-              })
-
-              // この牌種を計算済みとしてマーク
-              calculatedTileTypes.add(tileTypeKey)
-            }
-          }
-        }
-
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // 鳴き牌がある場合の受け入れ計算（キャンセル対応版）
-  async function calculateAcceptanceForMeldsWithCancel(allTiles: any[], visibleTiles: any[], melds: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        const results: AcceptanceInfo[] = []
-        const calculatedTileTypes = new Set<string>()
-
-        for (const tile of allTiles) {
-          if (isCalculationCancelled.value) {
-            resolve([])
-            return
-          }
-
-          const tileTypeKey = `${tile.suit}-${tile.rank}-${tile.isRed || false}`
-
-          if (calculatedTileTypes.has(tileTypeKey)) {
-            const existingResult = results.find(r =>
-              r.tile.suit === tile.suit &&
-              r.tile.rank === tile.rank &&
-              (r.tile.isRed || false) === (tile.isRed || false)
-            )
-            if (existingResult) {
-              results.push({
-                ...existingResult,
-                tile: tile,
-                tileIndex: getTileIndex(tile)
-              })
-            }
-            continue
-          }
-
-          calculatedTileTypes.add(tileTypeKey)
-
-          // この牌を除いた残りの手牌
-          const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-
-          // 鳴き牌を考慮したシャンテン数計算
-          const shantenAfterDiscard = calculateShantenWithMelds(remainingTiles, melds)
-
-          if (shantenAfterDiscard === 0) {
-            // テンパイの場合：受け入れ牌を計算（手牌のみをRustライブラリに渡す）
-            const usefulTileIndices = getUsefulTiles(remainingTiles)
-            const remainingCounts = usefulTileIndices.map(tileIndex =>
-              getTileRemainingCount(tileIndex, visibleTiles)
-            )
-            const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles: usefulTileIndices,
-              remainingCounts,
-              totalAcceptance,
-              shantenAfterDiscard: 0
-            })
-          }
-        }
-
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // 鳴き牌がある場合の有効牌計算（キャンセル対応版）
-  async function calculateUsefulTilesForMeldsWithCancel(allTiles: any[], visibleTiles: any[], melds: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        if (isCalculationCancelled.value) {
-          resolve([])
-          return
-        }
-
-        const results: AcceptanceInfo[] = []
-        const calculatedTileTypes = new Set<string>()
-
-        // 現在のシャンテン数を計算
-        const currentShanten = calculateShantenWithMelds(allTiles, melds)
-
-        for (const tile of allTiles) {
-          if (isCalculationCancelled.value) {
-            resolve([])
-            return
-          }
-
-          const tileTypeKey = `${tile.suit}-${tile.rank}-${tile.isRed || false}`
-
-          if (calculatedTileTypes.has(tileTypeKey)) {
-            const existingResult = results.find(r =>
-              r.tile.suit === tile.suit &&
-              r.tile.rank === tile.rank &&
-              (r.tile.isRed || false) === (tile.isRed || false)
-            )
-            if (existingResult) {
-              results.push({
-                ...existingResult,
-                tile: tile,
-                tileIndex: getTileIndex(tile)
-              })
-            }
-            continue
-          }
-
-          calculatedTileTypes.add(tileTypeKey)
-
-          // この牌を除いた残りの手牌
-          const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-
-          // この牌を切った後のシャンテン数
-          const shantenAfterDiscard = calculateShantenWithMelds(remainingTiles, melds)
-
-          // 有効牌を計算（シャンテン数を下げる牌）
-          const usefulTileIndices: number[] = []
-          for (let tileIdx = 0; tileIdx < 34; tileIdx++) {
-            const testTile = createTileFromIndex(tileIdx, 'test')
-            const testTiles = [...remainingTiles, testTile]
-            const newShanten = calculateShantenWithMelds(testTiles, melds)
-
-            if (newShanten < shantenAfterDiscard) {
-              usefulTileIndices.push(tileIdx)
-            }
-          }
-          const remainingCounts = usefulTileIndices.map(tileIndex =>
-            getTileRemainingCount(tileIndex, visibleTiles)
-          )
-          const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-
-          if (usefulTileIndices.length > 0) {
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles: usefulTileIndices,
-              remainingCounts,
-              totalAcceptance,
-              shantenAfterDiscard
-            })
-          }
-        }
-
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // 和了形の場合の情報計算（鳴きなし）
-  async function calculateWinningHandInfo(allTiles: any[], visibleTiles: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        const results: AcceptanceInfo[] = []
+  /**
+   * 各牌を切った時の受け入れ情報を Worker で計算する
+   * 新しい計算を依頼すると実行中の計算はキャンセルされる
+   * @param mode 和了形（全ての牌）・テンパイ（テンパイを維持する牌）・有効牌（シャンテン数1以上）
+   * @returns 受け入れ情報。キャンセルされた場合は null
+   */
+  async function calculateAcceptanceInWorker(
+    allTiles: Tile[],
+    visibleTiles: Uint8Array,
+    melds: any[],
+    mode: 'winning' | 'tenpai' | 'useful'
+  ): Promise<AcceptanceInfo[] | null> {
+    const meldCount = melds.length
+    // 鳴き牌がある場合は calculateShantenWithMelds と同じく、手牌のシャンテン数から面子数を引く
+    const maxShanten = mode === 'useful' ? 8 : meldCount
+    const batch = await acceptanceWorker.request(convertTilesToRustFormat(allTiles), visibleTiles, maxShanten)
+    if (!batch || isCalculationCancelled.value) {
+      return null
+    }
+
+    const discards = new Map<number, DiscardAcceptance>()
+    for (const record of decodeDiscardAcceptanceBatch(batch)) {
+      if (meldCount > 0) {
+        record.shantenAfterDiscard = Math.max(-1, record.shantenAfterDiscard - meldCount)
+      }
+      discards.set(record.discardIndex, record)
+    }
 
-        // 和了形では、どの牌を切っても和了形が崩れる
-        // 各牌を切った後の受け入れ牌を計算
-        for (const tile of allTiles) {
-          const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-          const shantenAfterDiscard = calculateShanten(remainingTiles)
-
-          if (shantenAfterDiscard === 0) {
-            // テンパイになる場合、受け入れ牌を計算
-            const acceptanceTiles = getUsefulTiles(remainingTiles)
-            const remainingCounts = acceptanceTiles.map(tileIndex =>
-              getTileRemainingCount(tileIndex, visibleTiles)
-            )
-            const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles,
-              remainingCounts,
-              totalAcceptance,
-              shantenAfterDiscard: 0
-            })
-          } else {
-            // テンパイでなくなる場合
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles: [],
-              remainingCounts: [],
-              totalAcceptance: 0,
-              shantenAfterDiscard
-            })
-          }
-        }
+    const results: AcceptanceInfo[] = []
+    for (const tile of allTiles) {
+      const tileIndex = getTileIndex(tile)
+      const discard = discards.get(tileIndex)
+      if (!discard) continue
+
+      const isTenpai = discard.shantenAfterDiscard === 0
+      if (mode === 'tenpai' && !isTenpai) continue
+      // 鳴き牌がある場合は有効牌のある打牌のみ表示する
+      if (mode === 'useful' && meldCount > 0 && discard.acceptanceTiles.length === 0) continue
+
+      // 和了形でテンパイでなくなる打牌はシャンテン数のみ表示する
+      const withAcceptance = mode !== 'winning' || isTenpai
+      const remainingCounts = withAcceptance ? discard.remainingCounts : []
+      results.push({
+        tileIndex,
+        tile,
+        acceptanceTiles: withAcceptance ? discard.acceptanceTiles : [],
+        remainingCounts,
+        totalAcceptance: remainingCounts.reduce((sum, count) => sum + count, 0),
+        shantenAfterDiscard: discard.shantenAfterDiscard
+      })
+    }
 
-        resolve(results)
-      }, 0)
-    })
-  }
-
-  // 和了形の場合の情報計算（鳴きあり）
-  async function calculateWinningHandInfoForMelds(allTiles: any[], visibleTiles: any[], melds: any[]): Promise<AcceptanceInfo[]> {
-    return new Promise((resolve) => {
-      setTimeout(() => {
-        const results: AcceptanceInfo[] = []
-
-        // 和了形では、どの牌を切っても和了形が崩れる
-        // 各牌を切った後の受け入れ牌を計算
-        for (const tile of allTiles) {
-          const remainingTiles = allTiles.filter(t => t.id !== tile.id)
-          const shantenAfterDiscard = calculateShantenWithMelds(remainingTiles, melds)
-
-          if (shantenAfterDiscard === 0) {
-            // テンパイになる場合、受け入れ牌を計算
-            const acceptanceTiles = getUsefulTiles(remainingTiles)
-            const remainingCounts = acceptanceTiles.map(tileIndex =>
-              getTileRemainingCount(tileIndex, visibleTiles)
-            )
-            const totalAcceptance = remainingCounts.reduce((sum, count) => sum + count, 0)
-
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles,
-              remainingCounts,
-              totalAcceptance,
-              shantenAfterDiscard: 0
-            })
-          } else {
-            // テンパイでなくなる場合
-            results.push({
-              tile: tile,
-              tileIndex: getTileIndex(tile),
-              acceptanceTiles: [],
-              remainingCounts: [],
-              totalAcceptance: 0,
-              shantenAfterDiscard
-            })
-          }
-        }
-
-        resolve(results)
-      }, 0)
-    })
+    return results
   }
 
   // 13枚の手牌での有効牌計算
-  async function calculateUsefulTilesFor13Tiles(tiles: any[], visibleTiles: any[]): Promise<AcceptanceInfo[]> {
+  async function calculateUsefulTilesFor13Tiles(tiles: any[], visibleTiles: Uint8Array): Promise<AcceptanceInfo[]> {
     return new Promise((resolve) => {
       setTimeout(() => {
         const results: AcceptanceInfo[] = []
@@ -2372,28 +1800,41 @@ export function useFourPlayerGameView() {
     const lastDiscardedTile = gameManagerInstance.value.lastDiscardedTile
     const doraIndicators = gameManagerInstance.value.doraIndicators
 
-    // 捨て牌を出したプレイヤー以外の全プレイヤーをチェック（人間プレイヤーは除く）  
-    for (let i = 1; i <= 3; i++) {
-      if (i === discardPlayerIndex) continue // 捨てたプレイヤー自身はスキップ
-
+    // 捨て牌を出したプレイヤー以外の全プレイヤーを下家から順にチェック（人間プレイヤーは除く）
+    const snapshots: CpuRonSnapshot[] = []
+    for (let offset = 1; offset <= 3; offset++) {
+      const i = (discardPlayerIndex + offset) % 4
       const player = players.value[i]
       if (player.type !== 'cpu') continue
+      // 待ち牌でない・フリテンのCPUはAI Workerに問い合わせない
+      if (!gameManagerInstance.value.isWaitingOn(i, lastDiscardedTile) || gameManagerInstance.value.isPlayerFuriten(i)) continue
+
+      snapshots.push({
+        seat: i,
+        difficulty: cpuAIs[i as 1 | 2 | 3].getDifficulty(),
+        player: toSnapshotPlayer(player),
+        winTile: toSnapshotTile(lastDiscardedTile),
+        doraIndicators: doraIndicators.map(toSnapshotTile)
+      })
+    }
+    if (snapshots.length === 0) {
+      return false
+    }
 
-      const ai = cpuAIs[i as 1 | 2 | 3]
-      if (!ai) continue
+    // 各CPUのロン判断はAI Workerで並列に行い、打牌者の下家に近い順に最初にロンするCPUが上がる
+    const ronDecisions = await cpuAIWorkerPool.decideRon(snapshots)
+    if (!ronDecisions) {
+      return false
+    }
 
-      // CPUがロンできるかチェック
-      if (ai.canRon(player, lastDiscardedTile, doraIndicators)) {
-        // CPUがロンするかどうかを決定（難易度に応じた確率）
-        if (ai.shouldDeclareRon(player, lastDiscardedTile, doraIndicators)) {
-          // CPUのロン処理を実行
-          await handleCpuRon(i, discardPlayerIndex, lastDiscardedTile)
-          return true
-        }
-      }
+    const ronIndex = ronDecisions.indexOf(true)
+    if (ronIndex === -1) {
+      return false
     }
 
-    return false
+    // CPUのロン処理を実行
+    await handleCpuRon(snapshots[ronIndex].seat, discardPlayerIndex, lastDiscardedTile)
+    return true
   }
 
   async function handleCpuRon(winnerIndex: number, loserIndex: number, winTile: any) {
@@ -2461,7 +1902,8 @@ export function useFourPlayerGameView() {
       gameManagerInstance.value.startNewGame()
 
       setTimeout(() => {
-        if (gameManagerInstance.value.gamePhase === 'playing') {
+        // startNewGame内で親の第一ツモ済みの場合は引き直さない（テスト用配牌のツモ順がずれるため）
+        if (gameManagerInstance.value.gamePhase === 'playing' && !gameManagerInstance.value.currentDrawnTile) {
           gameManagerInstance.value.drawTileAndKeepSeparate(currentPlayerIndex.value)
         }
       }, 100)
@@ -2517,6 +1959,74 @@ export function useFourPlayerGameView() {
     }
   })
 
+  // E2Eテスト用のゲーム状態スナップショット
+  function getDebugState(): GameDebugState {
+    return {
+      gamePhase: gamePhase.value,
+      isTestMode: gameManagerInstance.value.isTestMode,
+      currentPlayerIndex: currentPlayerIndex.value,
+      isHumanTurn: isHumanTurn.value,
+      hasDrawnTile: !!currentDrawnTile.value,
+      humanHandSize: humanPlayer.value.tiles.length,
+      wallRemaining: wallRemaining.value,
+      doraCount: doraIndicators.value.length,
+      round: round.value,
+      canTsumo: canTsumo.value,
+      canRon: canRon.value,
+      canRiichi: canDeclareRiichi.value,
+      canPon: canPon.value,
+      canKan: canKan.value,
+      canChi: canChi.value,
+      canAnkan: canAnkan.value,
+      showWinModal: showWinModal.value,
+      showDrawModal: showDrawModal.value,
+      showGameEndModal: showGameEndModal.value,
+      processingCpuTurn: processingCpuTurn.value,
+      isCalculatingAcceptance: isCalculatingAcceptance.value
+    }
+  }
+
+  // テスト用配牌を直接適用（テストモックダイアログの「テストモード開始」と同じ処理）
+  function loadTestDeal(players: PlayerTestData[]): GameDebugState {
+    const error = validateTestDeal(players)
+    if (error) {
+      throw new Error(error)
+    }
+
+    for (let i = 0; i < 4; i++) {
+      const player = players[i] ?? { tiles: [], drawTiles: [] }
+      updateTestModeData(i, { tiles: [...player.tiles], drawTiles: [...player.drawTiles] })
+    }
+    if (!settings.value.testMode.isActive) {
+      toggleTestMode()
+    }
+    onTestModeApplied()
+
+    return getDebugState()
+  }
+
+  // デバッグモード時のみPlaywrightから状態を参照できるようにする
+  let uninstallDebugHandle: (() => void) | null = null
+  if (isDebugMode) {
+    onMounted(() => {
+      uninstallDebugHandle = installGameDebugHandle({ getState: getDebugState, loadTestDeal })
+
+      // URLで配牌が指定されている場合は開始直後に適用（例: #/four-player?deal=...）
+      const dealParam = route.query[TEST_DEAL_QUERY_KEY]
+      if (typeof dealParam === 'string' && dealParam.length > 0) {
+        try {
+          loadTestDeal(decodeTestDeal(dealParam))
+        } catch (error) {
+          console.error('Failed to load test deal from URL:', error)
+        }
+      }
+    })
+    onBeforeUnmount(() => {
+      uninstallDebugHandle?.()
+      uninstallDebugHandle = null
+    })
+  }
+
   // ライフサイクルフック
   onMounted(async () => {
 
@@ -2542,6 +2052,11 @@ export function useFourPlayerGameView() {
     }
   })
 
+  onBeforeUnmount(() => {
+    acceptanceWorker.dispose()
+    cpuAIWorkerPool.dispose()
+  })
+
   return {
     // refs
     gameManagerInstance,
@@ -2641,10 +2156,7 @@ export function useFourPlayerGameView() {
     onGameEndModalClose,
     checkForDraw,
     updateAcceptanceInfo,
-    calculateAcceptanceOptimized,
-    calculateUsefulTilesInfoOptimized,
-    calculateAcceptanceForMeldsWithCancel,
-    calculateUsefulTilesForMeldsWithCancel,
+    calculateAcceptanceInWorker,
     isIsolatedTile,
     onTileHover,
     onTileLeave,
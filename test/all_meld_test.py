@@ -11,6 +11,26 @@
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
+from deal_fixture import load_test_deal
+from game_state import get_game_state, open_four_player_game, try_wait_for_state
+
+async def run_all_meld_types(page, base_url: str) -> bool:
+    """全メルドタイプの表示テスト（起動済みのページ上で実行するシナリオ本体）"""
+    try:
+        print(" 全メルドタイプ表示テストを開始...")
+        # 4人対戦画面を開き、配牌完了まで待機
+        await open_four_player_game(page, base_url)
+        
+        # 各メルドタイプをテスト
+        return await test_ankan_detailed(page)
+        
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return False
+
 
 async def test_all_meld_types(base_url: str, headless: bool = True):
     """全メルドタイプの表示テスト"""
@@ -23,27 +43,7 @@ async def test_all_meld_types(base_url: str, headless: bool = True):
         page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
         
         try:
-            print(" 全メルドタイプ表示テストを開始...")
-            await page.goto(base_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # 4人対戦開始
-            start_button = page.get_by_role("button", name="人対戦を開始")
-            await start_button.click()
-            await page.wait_for_timeout(2000)
-            
-            # ページリロード
-            await page.reload()
-            await page.wait_for_timeout(2000)
-            
-            # 各メルドタイプをテスト
-            await test_ankan_detailed(page)
-            
-        except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
-            
+            return await run_all_meld_types(page, base_url)
         finally:
             await browser.close()
 
@@ -51,32 +51,18 @@ async def test_ankan_detailed(page):
     """暗カンの詳細表示テスト"""
     print(" 暗カンの詳細表示テストを開始...")
     
-    # テストモック起動
-    test_mock_button = page.get_by_role("button", name="テストモック起動")
-    await test_mock_button.click()
-    await page.wait_for_timeout(1000)
-    
-    # 手牌設定（暗カン可能な手牌）
-    hand_textbox = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-    await hand_textbox.click()
-    await hand_textbox.fill("1m 1m 1m 1m 3m 3m 3m 5m 5m 5m 7m 7m 7m")
-    
-    # ツモ牌設定
-    draw_textbox = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-    await draw_textbox.click()
-    await draw_textbox.fill("6p")
-    
-    # テストモード開始
-    start_test_button = page.get_by_role("button", name="テストモード開始")
-    await start_test_button.click()
-    await page.wait_for_timeout(3000)
+    # テスト用配牌を直接適用（暗カン可能な手牌）
+    await load_test_deal(page, [
+        ("1m 1m 1m 1m 3m 3m 3m 5m 5m 5m 7m 7m 7m", "6p"),
+    ])
     
     # 暗カン実行
     ankan_button = page.get_by_role("button", name="暗カン")
-    if await ankan_button.is_visible():
+    if await try_wait_for_state(page, "ankan_available", 5000) and await ankan_button.is_visible():
         print(" 暗カンを実行...")
+        state = await get_game_state(page)
         await ankan_button.click()
-        await page.wait_for_timeout(2000)
+        await try_wait_for_state(page, "dora_changed", 5000, doraCount=state["doraCount"])
         
         # 暗カンのメルド表示を詳細確認
         await analyze_meld_display(page, "暗カン")
@@ -89,9 +75,11 @@ async def test_ankan_detailed(page):
         
         # メルドタイルの実際のクラス名と属性を確認
         await check_meld_tile_attributes(page)
+        return True
         
     else:
         print("❌ 暗カンボタンが見つかりません")
+        return False
 
 async def analyze_meld_display(page, meld_type):
     """メルド表示を詳細分析"""
@@ -172,13 +160,13 @@ async def check_meld_tile_attributes(page):
             print(f"  クラス: {classes}")
             print(f"  HTML: {outer_html[:100]}...")  # 最初の100文字のみ表示
             
-            # img要素の確認
-            img_element = tile.locator('img')
-            if await img_element.count() > 0:
-                img_src = await img_element.get_attribute('src') or ""
-                img_alt = await img_element.get_attribute('alt') or ""
-                print(f"  画像src: {img_src}")
-                print(f"  画像alt: {img_alt}")
+            # 牌画像（スプライトシート）の確認
+            image_element = tile.locator('.tile-image')
+            if await image_element.count() > 0:
+                image_style = await image_element.get_attribute('style') or ""
+                image_label = await image_element.get_attribute('aria-label') or ""
+                print(f"  画像style: {image_style}")
+                print(f"  画像label: {image_label}")
 
 async def main():
     parser = argparse.ArgumentParser(description='全メルドタイプ表示テスト')
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+並列バッチシミュレーション - 対局をシャードに分割し、CPUコア数分の子プロセスで同時に実行して結果を統合する
+
+各シャードは simulate.py の run_simulation() で scripts/simulate.ts を別プロセスとして起動する。
+対局ごとのシードは「マスターシード:対局の通し番号」から導出されるため、
+同じマスターシードであればシャード数を変えても各対局の牌山は同じになる。
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# test/ 直下のスクリプトをモジュールとして読み込めるようにする
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from simulate import run_simulation  # noqa: E402
+
+# シャード間で単純に合計する項目
+SUM_KEYS = ["games", "rounds", "decisions", "tsumoWins", "ronWins", "draws"]
+SEAT_KEYS = ["winsBySeat", "winPointsBySeat", "finalScoreBySeat"]
+
+
+def split_games(total: int, shards: int) -> list:
+    """対局数をシャードに分割し、(通し番号の開始位置, 対局数) のリストを返す"""
+    shards = max(1, min(shards, total))
+    base, extra = divmod(total, shards)
+    ranges = []
+    offset = 0
+    for i in range(shards):
+        count = base + (1 if i < extra else 0)
+        ranges.append((offset, count))
+        offset += count
+    return ranges
+
+
+def merge_stats(shard_stats: list) -> dict:
+    """シャードごとの集計結果を1つに統合"""
+    merged = {key: 0 for key in SUM_KEYS}
+    merged.update({key: [0, 0, 0, 0] for key in SEAT_KEYS})
+    merged["yakuCounts"] = {}
+
+    for stats in shard_stats:
+        for key in SUM_KEYS:
+            merged[key] += stats[key]
+        for key in SEAT_KEYS:
+            merged[key] = [a + b for a, b in zip(merged[key], stats[key])]
+        for yaku, count in stats["yakuCounts"].items():
+            merged["yakuCounts"][yaku] = merged["yakuCounts"].get(yaku, 0) + count
+
+    return merged
+
+
+def summarize(merged: dict) -> dict:
+    """統合結果から席別の和了率・平均点と役の出現頻度を計算"""
+    rounds = merged["rounds"]
+    games = merged["games"]
+    total_wins = merged["tsumoWins"] + merged["ronWins"]
+
+    seats = []
+    for seat in range(4):
+        wins = merged["winsBySeat"][seat]
+        seats.append({
+            "seat": seat,
+            "winRate": wins / rounds if rounds else 0.0,
+            "averageWinPoints": merged["winPointsBySeat"][seat] / wins if wins else 0.0,
+            "averageFinalScore": merged["finalScoreBySeat"][seat] / games if games else 0.0,
+        })
+
+    yaku = sorted(
+        ({"key": key, "count": count, "perWin": count / total_wins if total_wins else 0.0}
+         for key, count in merged["yakuCounts"].items()),
+        key=lambda item: item["count"], reverse=True,
+    )
+
+    return {"seats": seats, "yaku": yaku}
+
+
+def run_batch(games: int, workers: int, seed: str, **options):
+    """
+    シャードを並列実行して統合結果を返す
+
+    Returns:
+        (統合した集計結果, シャードごとの集計結果, 実経過時間[秒])
+    """
+    ranges = split_games(games, workers)
+
+    def run_shard(shard_range):
+        offset, count = shard_range
+        return run_simulation(count, seed=seed, game_offset=offset, **options)["stats"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        shard_stats = list(executor.map(run_shard, ranges))
+    wall_time = time.perf_counter() - start
+
+    return merge_stats(shard_stats), shard_stats, wall_time
+
+
+def print_report(merged: dict, shard_stats: list, wall_time: float, top_yaku: int):
+    """シャード別の処理時間と統合結果を表示"""
+    print("=" * 60)
+    print(f" 並列バッチシミュレーション結果 (shards={len(shard_stats)})")
+    print("=" * 60)
+    for i, stats in enumerate(shard_stats):
+        print(f" shard {i}: {stats['games']:4d}対局 {stats['elapsedMs'] / 1000:7.2f}s "
+              f"({stats['gamesPerSec']:.2f} games/sec)")
+
+    shard_time = sum(s["elapsedMs"] for s in shard_stats) / 1000
+    print("-" * 60)
+    print(f" 対局数:             {merged['games']} ({merged['rounds']}局, 打牌判断{merged['decisions']}回)")
+    print(f" 和了:               ツモ{merged['tsumoWins']} / ロン{merged['ronWins']} / 流局{merged['draws']}")
+    print(f" シャード合計時間:   {shard_time:7.2f}s")
+    print(f" 実経過時間:         {wall_time:7.2f}s (プロセス起動を含む)")
+    if wall_time > 0:
+        print(f" games/sec (全体):   {merged['games'] / wall_time:7.2f}")
+        print(f" 並列化による短縮率: {shard_time / wall_time:7.2f}x")
+
+    summary = summarize(merged)
+    print("-" * 60)
+    print(" 席   和了率   平均和了点   平均持ち点")
+    for seat in summary["seats"]:
+        print(f" {seat['seat']}   {seat['winRate'] * 100:6.1f}%   {seat['averageWinPoints']:9.0f}   "
+              f"{seat['averageFinalScore']:9.0f}")
+
+    print("-" * 60)
+    print(" 役の出現回数（和了あたり）")
+    for item in summary["yaku"][:top_yaku]:
+        print(f" {item['key']:<20} {item['count']:6d} ({item['perWin'] * 100:5.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='並列バッチシミュレーション')
+    parser.add_argument('--games', type=int, default=100,
+                       help='全体の対局数')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='シャード数（同時に起動するプロセス数、デフォルトはCPUコア数）')
+    parser.add_argument('--seed', default='0',
+                       help='マスターシード')
+    parser.add_argument('--game-type', choices=['tonpuusen', 'tonnanssen'],
+                       help='対局形式（省略時は東風戦）')
+    parser.add_argument('--cpu', nargs=3, choices=['easy', 'normal', 'hard', 'super'],
+                       help='CPU1〜3の強さ')
+    parser.add_argument('--player', choices=['easy', 'medium', 'hard', 'super'],
+                       help='0番（人間席）を操作するAIの強さ')
+    parser.add_argument('--manipulation-rate', type=int,
+                       help='牌操作率（0-100）')
+    parser.add_argument('--top-yaku', type=int, default=15,
+                       help='表示する役の数')
+    parser.add_argument('--json', action='store_true',
+                       help='統合結果をJSONで出力')
+
+    args = parser.parse_args()
+
+    merged, shard_stats, wall_time = run_batch(
+        args.games, args.workers, args.seed,
+        game_type=args.game_type,
+        cpu=args.cpu,
+        player=args.player,
+        manipulation_rate=args.manipulation_rate,
+    )
+
+    if args.json:
+        print(json.dumps({
+            "seed": args.seed,
+            "wallTime": wall_time,
+            "merged": merged,
+            "summary": summarize(merged),
+            "shards": shard_stats,
+        }, ensure_ascii=False))
+    else:
+        print_report(merged, shard_stats, wall_time, args.top_yaku)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
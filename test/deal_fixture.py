@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+テスト用配牌フィクスチャ - テストモックダイアログを操作せず、配牌を1回のevaluateで直接適用する
+
+デバッグモードで公開される window.__MAHJONG_DEBUG__.loadTestDeal() を使用する。
+配牌は (手牌, ツモ牌) のタプル、または {"tiles": [...], "drawTiles": [...]} の辞書で指定する。
+牌の表記はテストモックと同じ（1m-9m, 1p-9p, 1s-9s, 1w-4w, 1d-3d, ton/nan/sha/pei/haku/hatsu/chun）。
+"""
+
+from urllib.parse import quote
+
+from game_state import wait_for_debug_handle, wait_for_state
+
+# 未指定のCPUプレイヤーに使う配牌（テストモックダイアログの既定値と同じ）
+DEFAULT_CPU_DEAL = ("1m 2m 3m 1p 2p 3p 1s 2s 3s ton nan sha pei", "haku hatsu chun")
+
+
+def _tile_list(value) -> list:
+    if isinstance(value, str):
+        return value.replace(",", " ").split()
+    return list(value)
+
+
+def normalize_deal(players) -> list:
+    """配牌指定を PlayerTestData 形式の4人分のリストに揃える"""
+    normalized = []
+    for player in list(players)[:4]:
+        if isinstance(player, dict):
+            tiles, draw_tiles = player.get("tiles", []), player.get("drawTiles", [])
+        else:
+            tiles, draw_tiles = player
+        normalized.append({"tiles": _tile_list(tiles), "drawTiles": _tile_list(draw_tiles)})
+
+    while len(normalized) < 4:
+        tiles, draw_tiles = DEFAULT_CPU_DEAL
+        normalized.append({"tiles": _tile_list(tiles), "drawTiles": _tile_list(draw_tiles)})
+
+    return normalized
+
+
+def encode_deal(players) -> str:
+    """URLクエリ用の文字列に変換（src/utils/test-deal.ts の encodeTestDeal と同じ形式）"""
+    return ";".join(
+        f"{','.join(p['tiles'])}|{','.join(p['drawTiles'])}" for p in normalize_deal(players)
+    )
+
+
+def deal_url(base_url: str, players) -> str:
+    """配牌を埋め込んだ4人対戦画面のURLを生成"""
+    return f"{base_url.rstrip('/')}/#/four-player?deal={quote(encode_deal(players), safe=',|;')}"
+
+
+async def load_test_deal(page, players) -> dict:
+    """
+    表示中の4人対戦画面に配牌を適用し、テストモードで自分のツモ番になるまで待機
+
+    例:
+        await load_test_deal(page, [("1m 1m 1m 1m 2p 3p 4p 5p 6p 7p 8p 9p 9p", "1p 9p")])
+    """
+    await wait_for_debug_handle(page)
+    await page.evaluate(
+        "(players) => window.__MAHJONG_DEBUG__.loadTestDeal(players)", normalize_deal(players)
+    )
+    return await wait_for_state(page, "test_mode_ready")
+
+
+async def open_with_test_deal(page, base_url: str, players) -> dict:
+    """配牌を埋め込んだURLで4人対戦画面を直接開く"""
+    await page.goto(deal_url(base_url, players))
+    await wait_for_debug_handle(page)
+    return await wait_for_state(page, "test_mode_ready")
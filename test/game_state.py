@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+ゲーム状態待機ヘルパー - 固定時間のsleepではなく、ゲームが指定した状態に到達した時点で待機を解除する
+
+アプリがデバッグモードで起動している場合に公開される window.__MAHJONG_DEBUG__ を参照する。
+timeout は失敗時の上限としてのみ使用し、状態に到達すれば即座に次の処理へ進む。
+"""
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+DEFAULT_TIMEOUT = 15000
+
+# 状態名 → 判定式（s: getState()の結果, p: wait_for_stateに渡したパラメータ）
+STATE_PREDICATES = {
+    "ready": "s.gamePhase === 'playing'",
+    "test_mode_ready": "s.isTestMode && s.isHumanTurn && s.hasDrawnTile && !s.processingCpuTurn",
+    "human_turn": "s.isHumanTurn && s.hasDrawnTile && !s.processingCpuTurn",
+    "cpu_turn": "!s.isHumanTurn",
+    "acceptance_ready": "!s.isCalculatingAcceptance",
+    "tsumo_available": "s.canTsumo",
+    "ron_available": "s.canRon",
+    "riichi_available": "s.canRiichi",
+    "ankan_available": "s.canAnkan",
+    "pon_available": "s.canPon",
+    "kan_available": "s.canKan",
+    "chi_available": "s.canChi",
+    "win_modal_open": "s.showWinModal",
+    "draw_modal_open": "s.showDrawModal",
+    "game_end_modal_open": "s.showGameEndModal",
+    "modal_closed": "!s.showWinModal && !s.showDrawModal && !s.showGameEndModal",
+    "wall_changed": "s.wallRemaining !== p.wallRemaining",
+    "dora_changed": "s.doraCount !== p.doraCount",
+    "round_changed": "s.round !== p.round",
+}
+
+
+class GameStateTimeout(Exception):
+    """指定した状態に上限時間内に到達しなかった"""
+
+
+async def wait_for_debug_handle(page, timeout: int = DEFAULT_TIMEOUT):
+    """デバッグハンドルが登録されるまで待機"""
+    try:
+        await page.wait_for_function("() => !!window.__MAHJONG_DEBUG__", timeout=timeout)
+    except PlaywrightTimeoutError:
+        raise GameStateTimeout(
+            "window.__MAHJONG_DEBUG__ が見つかりません（デバッグモードで起動しているか確認してください）"
+        )
+
+
+async def get_game_state(page) -> dict:
+    """現在のゲーム状態を取得"""
+    return await page.evaluate(
+        "() => window.__MAHJONG_DEBUG__ ? window.__MAHJONG_DEBUG__.getState() : null"
+    )
+
+
+async def wait_for_any_state(page, names, timeout: int = DEFAULT_TIMEOUT, **params):
+    """
+    いずれかの状態に到達するまで待機
+
+    Returns:
+        (到達した状態名, その時点のゲーム状態)
+    """
+    unknown = [name for name in names if name not in STATE_PREDICATES]
+    if unknown:
+        raise ValueError(f"未定義の状態です: {unknown}")
+
+    checks = " ".join(
+        f"if ({STATE_PREDICATES[name]}) return {{ name: '{name}', state: s }};" for name in names
+    )
+    expression = (
+        "(p) => { const h = window.__MAHJONG_DEBUG__; if (!h) return false; "
+        f"const s = h.getState(); {checks} return false; }}"
+    )
+
+    try:
+        handle = await page.wait_for_function(expression, arg=params, timeout=timeout, polling="raf")
+    except PlaywrightTimeoutError:
+        state = await get_game_state(page)
+        raise GameStateTimeout(f"状態 {list(names)} に {timeout}ms 以内に到達しませんでした: {state}")
+
+    result = await handle.json_value()
+    return result["name"], result["state"]
+
+
+async def wait_for_state(page, name: str, timeout: int = DEFAULT_TIMEOUT, **params) -> dict:
+    """
+    指定した状態に到達するまで待機
+
+    例:
+        await wait_for_state(page, "human_turn")
+        await wait_for_state(page, "wall_changed", wallRemaining=state["wallRemaining"])
+    """
+    _, state = await wait_for_any_state(page, [name], timeout, **params)
+    return state
+
+
+async def try_wait_for_state(page, name: str, timeout: int = DEFAULT_TIMEOUT, **params) -> bool:
+    """指定した状態に到達すればTrue、上限時間を過ぎればFalseを返す"""
+    try:
+        await wait_for_state(page, name, timeout, **params)
+        return True
+    except GameStateTimeout:
+        return False
+
+
+async def open_four_player_game(page, base_url: str, timeout: int = DEFAULT_TIMEOUT) -> dict:
+    """トップページから4人対戦画面を開き、配牌が終わるまで待機"""
+    await page.goto(base_url)
+    await page.wait_for_load_state('networkidle')
+
+    start_button = page.get_by_role("button", name="人対戦を開始")
+    await start_button.click()
+    await wait_for_debug_handle(page, timeout)
+
+    # 既存テストと同様に一度リロードしてから開始する
+    await page.reload()
+    await wait_for_debug_handle(page, timeout)
+    return await wait_for_state(page, "ready", timeout)
@@ -14,157 +14,140 @@
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
+from deal_fixture import load_test_deal
+from game_state import get_game_state, open_four_player_game, try_wait_for_state, wait_for_state
 
-async def test_kan_comprehensive(base_url: str, headless: bool = True):
-    """カン機能統合テスト: 1pツモ→1m暗カン→カンドラ確認→リンシャンツモ（9p）"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)  # WSL環境では常にheadless
-        page = await browser.new_page()
+async def run_kan_comprehensive(page, base_url: str) -> bool:
+    """カン機能統合テスト: 1pツモ→1m暗カン→カンドラ確認→リンシャンツモ（9p）（起動済みのページ上で実行するシナリオ本体）"""
+    try:
+        print(" カン機能統合テストを開始...")
+        # 4人対戦画面を開き、配牌完了まで待機
+        await open_four_player_game(page, base_url)
         
-        # コンソールログを出力
-        page.on("console", lambda msg: print(f" CONSOLE: {msg.text}"))
-        page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
+        # テスト用配牌を直接適用（カン→リンシャンツモ上がり可能な形）
+        await load_test_deal(page, [
+            ("1m 1m 1m 1m 2p 3p 4p 5p 6p 7p 8p 9p 9p", "1p 9p"),
+        ])
         
-        try:
-            print(" カン機能統合テストを開始...")
-            await page.goto(base_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # 4人対戦開始
-            start_button = page.get_by_role("button", name="人対戦を開始")
-            await start_button.click()
-            await page.wait_for_timeout(2000)
-            
-            # ページリロード
-            await page.reload()
-            await page.wait_for_timeout(2000)
-            
-            # テストモック起動
-            test_mock_button = page.get_by_role("button", name="テストモック起動")
-            await test_mock_button.click()
-            await page.wait_for_timeout(1000)
-            
-            # 手牌設定（カン→リンシャンツモ上がり可能な形）
-            hand_textbox = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await hand_textbox.click()
-            await hand_textbox.fill("1m 1m 1m 1m 2p 3p 4p 5p 6p 7p 8p 9p 9p")
+        print("✅ テストモード開始完了")
+        
+        # 初期ドラ数確認
+        initial_dora_count = await count_dora_indicators(page)
+        print(f" 初期ドラ表示数: {initial_dora_count}")
+        
+        # 暗カン実行
+        ankan_button = page.get_by_role("button", name="暗カン")
+        if await try_wait_for_state(page, "ankan_available", 5000) and await ankan_button.is_visible():
+            print(" 暗カンを実行...")
+            state = await get_game_state(page)
+            await ankan_button.click()
+            await try_wait_for_state(page, "dora_changed", 5000, doraCount=state["doraCount"])
+            print("✅ 暗カン完了")
             
-            # ツモ牌設定
-            draw_textbox = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await draw_textbox.click()
-            await draw_textbox.fill("1p 9p")
+            # カン後のドラ数確認
+            post_kan_dora_count = await count_dora_indicators(page)
+            print(f" カン後ドラ表示数: {post_kan_dora_count}")
             
-            # テストモード開始
-            start_test_button = page.get_by_role("button", name="テストモード開始")
-            await start_test_button.click()
-            await page.wait_for_timeout(3000)
+            # 新ドラが追加されたかチェック
+            if post_kan_dora_count > initial_dora_count:
+                print("✅ カン新ドラが正常に追加されました")
+            else:
+                print(f"❌ カン新ドラが追加されていません (初期:{initial_dora_count}, カン後:{post_kan_dora_count})")
+                return False
             
-            print("✅ テストモード開始完了")
+            print(" カン後の状態を調査...")
             
-            # 初期ドラ数確認
-            initial_dora_count = await count_dora_indicators(page)
-            print(f" 初期ドラ表示数: {initial_dora_count}")
+            # カン後、すぐにリンシャンツモできるか確認
+            # ツモボタンの確認（リンシャンツモ）
+            tsumo_button = page.get_by_role("button", name="ツモ")
+            tsumo_visible = await try_wait_for_state(page, "tsumo_available", 5000) and await tsumo_button.is_visible()
+            print(f" リンシャンツモボタン表示: {tsumo_visible}")
             
-            # 暗カン実行
-            ankan_button = page.get_by_role("button", name="暗カン")
-            if await ankan_button.is_visible():
-                print(" 暗カンを実行...")
-                await ankan_button.click()
-                await page.wait_for_timeout(2000)
-                print("✅ 暗カン完了")
-                
-                # カン後のドラ数確認
-                post_kan_dora_count = await count_dora_indicators(page)
-                print(f" カン後ドラ表示数: {post_kan_dora_count}")
-                
-                # 新ドラが追加されたかチェック
-                if post_kan_dora_count > initial_dora_count:
-                    print("✅ カン新ドラが正常に追加されました")
-                else:
-                    print(f"❌ カン新ドラが追加されていません (初期:{initial_dora_count}, カン後:{post_kan_dora_count})")
-                    return False
+            if tsumo_visible:
+                print("✅ リンシャンツモボタンが表示されています！")
                 
-                print(" カン後の状態を調査...")
+                # リンシャンツモを実行
+                print(" リンシャンツモ（9p）を実行...")
+                await tsumo_button.click()
+                await try_wait_for_state(page, "win_modal_open", 5000)
                 
-                # カン後、すぐにリンシャンツモできるか確認
-                await page.wait_for_timeout(2000)
+                # Win Modal確認と裏ドラ数検証
+                win_modal = page.locator('.modal-container, .v-dialog')
+                win_modal_visible = await win_modal.is_visible()
+                print(f" Win Modal表示: {win_modal_visible}")
                 
-                # ツモボタンの確認（リンシャンツモ）
-                tsumo_button = page.get_by_role("button", name="ツモ")
-                tsumo_visible = await tsumo_button.is_visible()
-                print(f" リンシャンツモボタン表示: {tsumo_visible}")
-                
-                if tsumo_visible:
-                    print("✅ リンシャンツモボタンが表示されています！")
+                if win_modal_visible:
+                    print("✅ Win Modalが表示されました")
                     
-                    # リンシャンツモを実行
-                    print(" リンシャンツモ（9p）を実行...")
-                    await tsumo_button.click()
-                    await page.wait_for_timeout(3000)
+                    # 裏ドラ数確認（リンシャンツモの場合、リーチしていないので裏ドラは0）
+                    uradora_count = await count_uradora_in_modal(page, win_modal)
+                    print(f" Win Modal内の裏ドラ表示数: {uradora_count}")
+                    print(f" リンシャンツモ（リーチなし）のため、裏ドラは0が期待されます")
                     
-                    # Win Modal確認と裏ドラ数検証
-                    win_modal = page.locator('.modal-container, .v-dialog')
-                    win_modal_visible = await win_modal.is_visible()
-                    print(f" Win Modal表示: {win_modal_visible}")
+                    if uradora_count == 0:
+                        print("✅ 裏ドラなし（リーチしていないため正常）")
+                        print("   - カン新ドラ追加: 正常")
+                        print("   - カン→リンシャンツモ: 正常")
+                        print("   - 嶺上開花: 正常")
+                    else:
+                        print(f"❌ リーチしていないのに裏ドラが表示されています (実際:{uradora_count})")
                     
-                    if win_modal_visible:
-                        print("✅ Win Modalが表示されました")
-                        
-                        # 裏ドラ数確認（リンシャンツモの場合、リーチしていないので裏ドラは0）
-                        uradora_count = await count_uradora_in_modal(page, win_modal)
-                        print(f" Win Modal内の裏ドラ表示数: {uradora_count}")
-                        print(f" リンシャンツモ（リーチなし）のため、裏ドラは0が期待されます")
+                    # 次の局へボタンを確認・クリック
+                    next_game_button = page.get_by_role("button", name="次の局へ")
+                    if await next_game_button.is_visible():
+                        print(" 次の局へボタンをクリック...")
                         
-                        if uradora_count == 0:
-                            print("✅ 裏ドラなし（リーチしていないため正常）")
-                            print("   - カン新ドラ追加: 正常")
-                            print("   - カン→リンシャンツモ: 正常")
-                            print("   - 嶺上開花: 正常")
-                        else:
-                            print(f"❌ リーチしていないのに裏ドラが表示されています (実際:{uradora_count})")
+                        # 成功時のスクリーンショットを撮影
+                        import os
+                        os.makedirs('test/screenshots', exist_ok=True)
+                        await page.screenshot(path='test/screenshots/kan_comprehensive_test.png')
+                        print(" カン統合テストのスクリーンショットを保存")
                         
-                        # 次の局へボタンを確認・クリック
-                        next_game_button = page.get_by_role("button", name="次の局へ")
-                        if await next_game_button.is_visible():
-                            print(" 次の局へボタンをクリック...")
-                            
-                            # 成功時のスクリーンショットを撮影
-                            import os
-                            os.makedirs('test/screenshots', exist_ok=True)
-                            await page.screenshot(path='test/screenshots/kan_comprehensive_test.png')
-                            print(" カン統合テストのスクリーンショットを保存")
-                            
-                            await next_game_button.click()
-                            await page.wait_for_timeout(2000)
-                            print("✅ 次の局への遷移が完了しました！")
-                            print(" カン統合テスト成功：暗カン→カンドラ追加→リンシャンツモ（嶺上開花）→次の局へ")
-                            return True  # 成功時は処理終了
-                        else:
-                            print("❌ 次の局へボタンが見つかりません")
-                            await debug_buttons(page)
-                            return False
+                        await next_game_button.click()
+                        await wait_for_state(page, "modal_closed")
+                        print("✅ 次の局への遷移が完了しました！")
+                        print(" カン統合テスト成功：暗カン→カンドラ追加→リンシャンツモ（嶺上開花）→次の局へ")
+                        return True  # 成功時は処理終了
                     else:
-                        print("❌ Win Modalが表示されていません")
+                        print("❌ 次の局へボタンが見つかりません")
                         await debug_buttons(page)
                         return False
                 else:
-                    print("❌ リンシャンツモボタンが表示されていません")
+                    print("❌ Win Modalが表示されていません")
                     await debug_buttons(page)
-                    await debug_game_state(page)
                     return False
             else:
-                print("❌ 暗カンボタンが見つかりません")
+                print("❌ リンシャンツモボタンが表示されていません")
+                await debug_buttons(page)
+                await debug_game_state(page)
                 return False
-                
-        except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
+        else:
+            print("❌ 暗カンボタンが見つかりません")
             return False
             
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return False
+
+
+async def test_kan_comprehensive(base_url: str, headless: bool = True):
+    """カン機能統合テスト: 1pツモ→1m暗カン→カンドラ確認→リンシャンツモ（9p）"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)  # WSL環境では常にheadless
+        page = await browser.new_page()
+        
+        # コンソールログを出力
+        page.on("console", lambda msg: print(f" CONSOLE: {msg.text}"))
+        page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
+        
+        try:
+            return await run_kan_comprehensive(page, base_url)
         finally:
             await browser.close()
-    
     return False
 
 async def count_dora_indicators(page):
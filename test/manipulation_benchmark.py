@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+牌操作率・配牌の良さの統計的な検証 - 設定ごとに配牌とツモを大量に繰り返し、比較表を表示する
+
+Node側のCLI（scripts/manipulation-benchmark.ts）を vite-node で実行し、JSON出力を受け取って表示する。
+有効牌を引いた割合を「山に残っている有効牌の割合（操作なしの期待値）」と並べ、
+牌操作率の設定どおりに偏っているか（公平性）と、ツモ・配牌の処理時間（コスト）を同時に確認できる。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARK_SCRIPT = os.path.join("scripts", "manipulation-benchmark.ts")
+
+
+def build_command(trials: int, rates=None, qualities=None, max_draws=None, seed=None) -> list:
+    """scripts/manipulation-benchmark.ts の実行コマンドを組み立てる"""
+    command = ["npx", "vite-node", BENCHMARK_SCRIPT, "--", "--trials", str(trials), "--json"]
+    if rates:
+        command += ["--rates", ",".join(str(rate) for rate in rates)]
+    if qualities:
+        command += ["--qualities", ",".join(qualities)]
+    if max_draws is not None:
+        command += ["--max-draws", str(max_draws)]
+    if seed is not None:
+        command += ["--seed", str(seed)]
+    return command
+
+
+def run_benchmark(trials: int, **options) -> dict:
+    """
+    ベンチマークを実行し、{"options": ..., "result": {"rows": [...], "elapsedMs": ...}} を返す
+
+    例:
+        result = run_benchmark(500, rates=[0, 80], qualities=["normal"])
+        print(result["result"]["rows"][0]["usefulDrawRatio"])
+    """
+    env = dict(os.environ)
+    env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --experimental-wasm-modules".strip()
+
+    completed = subprocess.run(
+        build_command(trials, **options),
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"ベンチマークに失敗しました:\n{completed.stderr}")
+
+    # ライブラリのログが混ざる場合があるため、JSONの行だけを読む
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"ベンチマーク結果を取得できませんでした:\n{completed.stdout}")
+
+
+def print_table(rows: list, elapsed_ms: float):
+    """設定ごとの比較表を表示"""
+    header = (f"{'配牌':<10} {'操作率':>6} {'有効牌率':>8} {'期待値':>7} {'差':>7} "
+              f"{'配牌シャンテン':>8} {'テンパイ率':>8} {'テンパイまで':>8} {'ツモμs':>8} {'配牌μs':>8}")
+    print("=" * 100)
+    print(" 牌操作率・配牌の良さの検証")
+    print("=" * 100)
+    print(header)
+    print("-" * 100)
+
+    for row in rows:
+        useful = row["usefulDrawRatio"] * 100
+        natural = row["naturalUsefulRatio"] * 100
+        print(f"{row['handQuality']:<10} {row['manipulationRate']:>5}% "
+              f"{useful:>7.1f}% {natural:>6.1f}% {useful - natural:>+6.1f}% "
+              f"{row['averageStartShanten']:>14.2f} {row['tenpaiRate'] * 100:>9.1f}% "
+              f"{row['averageDrawsToTenpai']:>12.2f} "
+              f"{row['drawMicros']:>8.1f} {row['dealMicros']:>8.1f}")
+
+    print("-" * 100)
+    print(f" 試行数: {rows[0]['trials'] if rows else 0}回/設定   経過時間: {elapsed_ms / 1000:.2f}s")
+    print(" 有効牌率: 引く前の手牌のシャンテン数を下げる牌を引いた割合 / 期待値: 引く直前の山に残っている有効牌の割合")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='牌操作率・配牌の良さの統計的な検証')
+    parser.add_argument('--trials', type=int, default=200,
+                       help='設定の組み合わせごとの試行回数（配牌からテンパイまで）')
+    parser.add_argument('--rates', type=int, nargs='+',
+                       help='牌操作率（0-100、省略時は 0 20 40 60 80）')
+    parser.add_argument('--qualities', nargs='+', choices=['normal', 'good', 'excellent'],
+                       help='配牌の良さ（省略時は全て）')
+    parser.add_argument('--max-draws', type=int,
+                       help='1試行のツモ回数の上限（省略時は18）')
+    parser.add_argument('--seed',
+                       help='乱数シード（設定の組み合わせ間で同じ牌山から始める）')
+    parser.add_argument('--json', action='store_true',
+                       help='結果をJSONで出力')
+
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        args.trials,
+        rates=args.rates,
+        qualities=args.qualities,
+        max_draws=args.max_draws,
+        seed=args.seed,
+    )
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        print_table(result["result"]["rows"], result["result"]["elapsedMs"])
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
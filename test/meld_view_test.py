@@ -11,6 +11,29 @@
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
+from deal_fixture import load_test_deal
+from game_state import get_game_state, open_four_player_game, try_wait_for_state
+
+async def run_meld_displays(page, base_url: str) -> bool:
+    """メルド表示の総合テスト（起動済みのページ上で実行するシナリオ本体）"""
+    try:
+        print(" メルド表示テストを開始...")
+        # 4人対戦画面を開き、配牌完了まで待機
+        await open_four_player_game(page, base_url)
+        
+        # 暗カンテスト
+        await test_ankan_display(page)
+        
+        # Win Modalでのメルド表示テスト
+        return await test_win_modal_meld_display(page)
+        
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return False
+
 
 async def test_meld_displays(base_url: str, headless: bool = True):
     """メルド表示の総合テスト"""
@@ -23,30 +46,7 @@ async def test_meld_displays(base_url: str, headless: bool = True):
         page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
         
         try:
-            print(" メルド表示テストを開始...")
-            await page.goto(base_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # 4人対戦開始
-            start_button = page.get_by_role("button", name="人対戦を開始")
-            await start_button.click()
-            await page.wait_for_timeout(2000)
-            
-            # ページリロード
-            await page.reload()
-            await page.wait_for_timeout(2000)
-            
-            # 暗カンテスト
-            await test_ankan_display(page)
-            
-            # Win Modalでのメルド表示テスト
-            await test_win_modal_meld_display(page)
-            
-        except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
-            
+            return await run_meld_displays(page, base_url)
         finally:
             await browser.close()
 
@@ -54,34 +54,20 @@ async def test_ankan_display(page):
     """暗カン表示テスト"""
     print(" 暗カン表示テストを開始...")
     
-    # テストモック起動
-    test_mock_button = page.get_by_role("button", name="テストモック起動")
-    await test_mock_button.click()
-    await page.wait_for_timeout(1000)
-    
-    # 手牌設定（暗カン可能な手牌）
-    hand_textbox = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-    await hand_textbox.click()
-    await hand_textbox.fill("1m 1m 1m 1m 3m 3m 3m 5m 5m 5m 7m 7m 7m")
-    
-    # ツモ牌設定
-    draw_textbox = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-    await draw_textbox.click()
-    await draw_textbox.fill("6p 5p")
-    
-    # テストモード開始
-    start_test_button = page.get_by_role("button", name="テストモード開始")
-    await start_test_button.click()
-    await page.wait_for_timeout(3000)
+    # テスト用配牌を直接適用（暗カン可能な手牌）
+    await load_test_deal(page, [
+        ("1m 1m 1m 1m 3m 3m 3m 5m 5m 5m 7m 7m 7m", "6p 5p"),
+    ])
     
     print("✅ テストモード開始完了")
     
     # 暗カン実行
     ankan_button = page.get_by_role("button", name="暗カン")
-    if await ankan_button.is_visible():
+    if await try_wait_for_state(page, "ankan_available", 5000) and await ankan_button.is_visible():
         print(" 暗カンを実行...")
+        state = await get_game_state(page)
         await ankan_button.click()
-        await page.wait_for_timeout(2000)
+        await try_wait_for_state(page, "dora_changed", 5000, doraCount=state["doraCount"])
         
         # 暗カン後のメルド表示確認
         print(" 暗カン表示を確認...")
@@ -127,41 +113,40 @@ async def test_win_modal_meld_display(page):
     if six_p_count > 0:
         print(" 6筒を捨てる...")
         await six_p_tiles.first.click()
-        await page.wait_for_timeout(3000)
+        await try_wait_for_state(page, "cpu_turn", 5000)
     
     # テストモード停止
     stop_test_button = page.locator('button:has-text("テストモード停止")')
     if await stop_test_button.is_visible():
         print(" テストモード停止...")
         await stop_test_button.click()
-        await page.wait_for_timeout(2000)
     
     # CPUのターンが終わるまで待つ
-    await page.wait_for_timeout(8000)
+    await try_wait_for_state(page, "human_turn", 20000)
     
     # リーチ宣言
     riichi_button = page.get_by_role("button", name="リーチ")
-    if await riichi_button.is_visible():
+    if await try_wait_for_state(page, "riichi_available", 3000) and await riichi_button.is_visible():
         print(" リーチを実行...")
         await riichi_button.click()
-        await page.wait_for_timeout(2000)
-        
-        # CPUのターン完了を待つ
-        await page.wait_for_timeout(8000)
         
         # ツモボタンが表示されるまで待機
         max_attempts = 3
         for attempt in range(max_attempts):
             print(f" ツモボタン確認 (試行 {attempt + 1}/{max_attempts})...")
             
+            # CPUのターン完了を待つ
+            await try_wait_for_state(page, "cpu_turn", 5000)
+            await try_wait_for_state(page, "human_turn", 20000)
+            
             tsumo_button = page.get_by_role("button", name="ツモ")
-            if await tsumo_button.is_visible():
+            if await try_wait_for_state(page, "tsumo_available", 3000) and await tsumo_button.is_visible():
                 print("✅ ツモボタンが表示されました！")
                 
                 # ツモを実行
                 print(" ツモを実行...")
                 await tsumo_button.click()
-                await page.wait_for_timeout(3000)
+                await try_wait_for_state(page, "win_modal_open", 5000)
                 
                 # Win Modal確認
                 win_modal = page.locator('.modal-container, .v-dialog')
@@ -202,7 +187,6 @@ async def test_win_modal_meld_display(page):
             else:
                 if attempt < max_attempts - 1:
                     print(" 次のツモを待機中...")
-                    await page.wait_for_timeout(6000)
                 else:
                     print("❌ ツモボタンが表示されませんでした")
                     break
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+処理時間の計測ヘルパー - アプリが公開する window.__MAHJONG_PROFILER__ を操作し、区間ごとの集計を取得する
+
+計測はデフォルトで無効のため、enable_profiler() を呼ぶか、URLに ?profile を付けて開く（例: #/four-player?profile）。
+"""
+
+
+async def enable_profiler(page, reset: bool = True):
+    """計測を有効にする（reset=True の場合はそれまでの集計を捨てる）"""
+    await page.wait_for_function("() => !!window.__MAHJONG_PROFILER__")
+    await page.evaluate(
+        "(reset) => { const p = window.__MAHJONG_PROFILER__; if (reset) p.reset(); p.enable() }", reset
+    )
+
+
+async def disable_profiler(page):
+    """計測を無効にする（集計は残る）"""
+    await page.evaluate("() => window.__MAHJONG_PROFILER__ && window.__MAHJONG_PROFILER__.disable()")
+
+
+async def get_profile(page) -> dict:
+    """
+    区間名 → {count, totalMs, meanMs, p50Ms, p95Ms, maxMs} を返す
+
+    例:
+        await enable_profiler(page)
+        ...（対局を進める）
+        profile = await get_profile(page)
+        print(profile["CpuAI.decideTileToDiscard"]["p95Ms"])
+    """
+    spans = await page.evaluate(
+        "() => window.__MAHJONG_PROFILER__ ? window.__MAHJONG_PROFILER__.snapshot() : []"
+    )
+    return {span["name"]: span for span in spans}
+
+
+def print_profile(profile: dict):
+    """区間ごとの集計を表示（合計時間の長い順）"""
+    print(f" {'区間':<34} {'回数':>7} {'合計ms':>9} {'p50ms':>8} {'p95ms':>8} {'最大ms':>8}")
+    for name, span in sorted(profile.items(), key=lambda item: -item[1]["totalMs"]):
+        print(f" {name:<34} {span['count']:>7} {span['totalMs']:>9.1f} "
+              f"{span['p50Ms']:>8.3f} {span['p95Ms']:>8.3f} {span['maxMs']:>8.3f}")
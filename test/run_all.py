@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+E2Eテスト並列ランナー - Chromiumを1回だけ起動し、各シナリオを独立したBrowserContextで並列実行する
+
+各テストスクリプトが公開している run_xxx(page, base_url) を呼び出す。
+BrowserContext単位で分離されるため、localStorageやCookieはシナリオ間で共有されない。
+"""
+
+import asyncio
+import argparse
+import importlib
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+from playwright.async_api import async_playwright
+
+# test/ 直下のスクリプトをモジュールとして読み込めるようにする
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# (シナリオ名, モジュール名, シナリオ関数名)
+SCENARIOS = [
+    ("kan", "kan_test", "run_kan_comprehensive"),
+    ("chinitsu", "yaku_test_1_chinitsu", "run_chinitsu_ryanpeikou"),
+    ("sankantsu", "yaku_test_2_sankantsu", "run_sankantsu_sanankou"),
+    ("haitei", "yaku_test_4_haitei", "run_haitei_junchan_sanshoku"),
+    ("all_meld", "all_meld_test", "run_all_meld_types"),
+    ("meld_view", "meld_view_test", "run_meld_displays"),
+    ("wall_count", "wall_count_test", "run_wall_count_reduction"),
+]
+
+
+@dataclass
+class ScenarioResult:
+    """シナリオ1件分の実行結果"""
+    name: str
+    success: bool
+    elapsed: float
+    error: str = ""
+
+
+async def run_scenario(browser, semaphore, name, module_name, func_name, base_url, verbose):
+    """1シナリオを専用のBrowserContextで実行"""
+    async with semaphore:
+        scenario = getattr(importlib.import_module(module_name), func_name)
+        context = await browser.new_context()
+        page = await context.new_page()
+
+        if verbose:
+            page.on("console", lambda msg: print(f"[{name}] CONSOLE: {msg.text}"))
+        page.on("pageerror", lambda error: print(f"[{name}] ❌ PAGE ERROR: {error}"))
+
+        print(f"▶ {name} 開始")
+        start = time.perf_counter()
+        try:
+            success = bool(await scenario(page, base_url))
+            error = ""
+        except Exception as e:
+            success = False
+            error = str(e)
+        finally:
+            elapsed = time.perf_counter() - start
+            await context.close()
+
+        print(f"{'✅' if success else '❌'} {name} 終了 ({elapsed:.1f}s)")
+        return ScenarioResult(name, success, elapsed, error)
+
+
+async def run_all(base_url: str, workers: int, headless: bool, only=None, verbose: bool = False):
+    """全シナリオを並列実行し、結果一覧と経過時間を返す"""
+    targets = [s for s in SCENARIOS if not only or s[0] in only]
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async with async_playwright() as p:
+        launch_start = time.perf_counter()
+        browser = await p.chromium.launch(headless=headless)
+        launch_time = time.perf_counter() - launch_start
+
+        wall_start = time.perf_counter()
+        try:
+            results = await asyncio.gather(*[
+                run_scenario(browser, semaphore, name, module_name, func_name, base_url, verbose)
+                for name, module_name, func_name in targets
+            ])
+        finally:
+            await browser.close()
+        wall_time = time.perf_counter() - wall_start
+
+    return results, launch_time, wall_time
+
+
+def print_report(results, launch_time: float, wall_time: float, workers: int):
+    """シナリオ別の所要時間と全体の短縮率を表示"""
+    print("\n" + "=" * 50)
+    print(f" 実行結果 (workers={workers})")
+    print("=" * 50)
+    for r in results:
+        mark = "✅" if r.success else "❌"
+        line = f" {mark} {r.name:<12} {r.elapsed:7.1f}s"
+        if r.error:
+            line += f"  {r.error}"
+        print(line)
+
+    serial_time = sum(r.elapsed for r in results)
+    print("-" * 50)
+    print(f" ブラウザ起動:         {launch_time:7.1f}s (1回のみ)")
+    print(f" シナリオ合計時間:     {serial_time:7.1f}s")
+    print(f" 実経過時間:           {wall_time:7.1f}s")
+    if wall_time > 0:
+        print(f" 並列化による短縮率:   {serial_time / wall_time:7.2f}x")
+    passed = sum(1 for r in results if r.success)
+    print(f" 成功: {passed}/{len(results)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='E2Eテスト並列ランナー')
+    parser.add_argument('url', nargs='?', default='http://localhost:5173',
+                       help='テスト対象のURL')
+    parser.add_argument('--headless', action='store_true',
+                       help='ヘッドレスモードで実行')
+    parser.add_argument('--workers', type=int, default=4,
+                       help='同時実行するシナリオ数の上限')
+    parser.add_argument('--only', nargs='*',
+                       choices=[name for name, _, _ in SCENARIOS],
+                       help='実行するシナリオ名（省略時は全て）')
+    parser.add_argument('--verbose', action='store_true',
+                       help='ブラウザのコンソールログを出力')
+
+    args = parser.parse_args()
+
+    print(f" E2Eテスト並列実行開始: {args.url}")
+    results, launch_time, wall_time = await run_all(
+        args.url, args.workers, args.headless, args.only, args.verbose
+    )
+    print_report(results, launch_time, wall_time, args.workers)
+
+    if not all(r.success for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+ヘッドレス対局シミュレーション - ブラウザを使わずに GameManager + CpuAI だけで対局を回し、処理速度を計測する
+
+Node側のCLI（scripts/simulate.ts）を vite-node で実行し、JSON出力を受け取って表示する。
+riichi-rs-bundlers のWASMを読み込むため、Nodeには --experimental-wasm-modules を付与する。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATE_SCRIPT = os.path.join("scripts", "simulate.ts")
+
+
+def build_command(games: int, game_type=None, cpu=None, player=None,
+                  manipulation_rate=None, hand_quality=None, seed=None, game_offset=None,
+                  save_log=None) -> list:
+    """scripts/simulate.ts の実行コマンドを組み立てる"""
+    command = ["npx", "vite-node", SIMULATE_SCRIPT, "--", "--games", str(games), "--json"]
+    if game_type:
+        command += ["--game-type", game_type]
+    if cpu:
+        command += ["--cpu", ",".join(cpu)]
+    if player:
+        command += ["--player", player]
+    if manipulation_rate is not None:
+        command += ["--manipulation-rate", str(manipulation_rate)]
+    if hand_quality:
+        command += ["--hand-quality", hand_quality]
+    if seed is not None:
+        command += ["--seed", str(seed)]
+    if game_offset is not None:
+        command += ["--game-offset", str(game_offset)]
+    if save_log:
+        command += ["--save-log", save_log]
+    return command
+
+
+def run_simulation(games: int, **options) -> dict:
+    """
+    シミュレーションを実行し、{"options": ..., "stats": ...} を返す
+
+    例:
+        result = run_simulation(20, cpu=["normal", "hard", "super"])
+        print(result["stats"]["gamesPerSec"])
+    """
+    env = dict(os.environ)
+    env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --experimental-wasm-modules".strip()
+
+    completed = subprocess.run(
+        build_command(games, **options),
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"シミュレーションに失敗しました:\n{completed.stderr}")
+
+    # ライブラリのログが混ざる場合があるため、JSONの行だけを読む
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"シミュレーション結果を取得できませんでした:\n{completed.stdout}")
+
+
+def print_report(stats: dict):
+    """集計結果と処理速度を表示"""
+    print("=" * 50)
+    print(" ヘッドレス対局シミュレーション結果")
+    print("=" * 50)
+    print(f" 対局数:        {stats['games']} ({stats['rounds']}局)")
+    print(f" 打牌判断:      {stats['decisions']}回")
+    print(f" 和了:          ツモ{stats['tsumoWins']} / ロン{stats['ronWins']} / 流局{stats['draws']}")
+    print(f" 席別和了数:    {' / '.join(str(w) for w in stats['winsBySeat'])}")
+    print(f" 経過時間:      {stats['elapsedMs'] / 1000:8.2f}s")
+    print("-" * 50)
+    print(f" games/sec:     {stats['gamesPerSec']:10.2f}")
+    print(f" rounds/sec:    {stats['roundsPerSec']:10.2f}")
+    print(f" decisions/sec: {stats['decisionsPerSec']:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ヘッドレス対局シミュレーション')
+    parser.add_argument('--games', type=int, default=10,
+                       help='対局数')
+    parser.add_argument('--game-type', choices=['tonpuusen', 'tonnanssen'],
+                       help='対局形式（省略時は東風戦）')
+    parser.add_argument('--cpu', nargs=3, choices=['easy', 'normal', 'hard', 'super'],
+                       help='CPU1〜3の強さ')
+    parser.add_argument('--player', choices=['easy', 'medium', 'hard', 'super'],
+                       help='0番（人間席）を操作するAIの強さ')
+    parser.add_argument('--manipulation-rate', type=int,
+                       help='牌操作率（0-100）')
+    parser.add_argument('--hand-quality',
+                       help='配牌の良さ')
+    parser.add_argument('--seed',
+                       help='乱数シード（指定時は牌山・ツモ・AIの判断が再現可能）')
+    parser.add_argument('--save-log', metavar='DIR',
+                       help='対局ごとの行動ログを保存するディレクトリ（scripts/replay.ts で再生可能）')
+    parser.add_argument('--json', action='store_true',
+                       help='結果をJSONで出力')
+
+    args = parser.parse_args()
+
+    result = run_simulation(
+        args.games,
+        game_type=args.game_type,
+        cpu=args.cpu,
+        player=args.player,
+        manipulation_rate=args.manipulation_rate,
+        hand_quality=args.hand_quality,
+        seed=args.seed,
+        save_log=os.path.abspath(args.save_log) if args.save_log else None,
+    )
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        print_report(result["stats"])
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
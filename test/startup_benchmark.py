@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+起動時間ベンチマーク - ページを開いてから「4人対戦を開始」を押せるまで、押してから配牌が表示されるまでを計測する
+
+コールド（新しいBrowserContext、HTTPキャッシュなし）とウォーム（同じBrowserContextでページを開き直す）をそれぞれN回実行し、
+Navigation Timing・アプリの Performance API の計測値（haisosa:*）・Chromiumのトレースから求めたスクリプト評価時間とWASMのコンパイル時間・
+読み込んだファイルの転送量を集計してJSONに書き出す。コミット間で --compare により中央値を比較できる。
+"""
+
+import asyncio
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from playwright.async_api import async_playwright
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUNDLE_STATS = os.path.join(REPO_ROOT, "dist", "bundle-stats.json")
+DEFAULT_TIMEOUT = 60000
+
+START_BUTTON_TEXT = "人対戦を開始"
+HAND_TILE_SELECTOR = ".player-bottom .hand-area .mahjong-tile"
+
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "v8",
+    "v8.execute",
+    "disabled-by-default-v8.compile",
+    "disabled-by-default-v8.wasm.detailed",
+    "v8.wasm",
+]
+# トレースのイベント名 → 集計先（ネストしたイベントは重なりを除いて合計する）
+SCRIPT_EVENTS = {"EvaluateScript", "v8.evaluateModule", "v8.run"}
+
+# 開始ボタンが押せる状態になった時刻（performance.now()）を返す
+START_BUTTON_READY = f"""() => {{
+  const button = [...document.querySelectorAll('button')]
+    .find(b => b.textContent.includes('{START_BUTTON_TEXT}') && !b.disabled && b.offsetParent !== null)
+  return button ? performance.now() : false
+}}"""
+
+# 人間の手牌が13枚以上表示された時刻を返す
+FIRST_DEAL_RENDERED = f"""() => {{
+  const tiles = document.querySelectorAll('{HAND_TILE_SELECTOR}')
+  return tiles.length >= 13 ? performance.now() : false
+}}"""
+
+# 開始ボタンのクリック時刻を記録する（クリックの処理より前に記録するためキャプチャで登録）
+RECORD_CLICK = """() => {
+  window.__startupProbeClickAt = null
+  document.addEventListener('click', () => {
+    if (window.__startupProbeClickAt === null) window.__startupProbeClickAt = performance.now()
+  }, { capture: true, once: true })
+}"""
+
+COLLECT_TIMINGS = """() => {
+  const navigation = performance.getEntriesByType('navigation')[0]
+  const measure = name => {
+    const entries = performance.getEntriesByName(name, 'measure')
+    return entries.length ? entries[entries.length - 1].duration : null
+  }
+  const resources = {}
+  for (const entry of performance.getEntriesByType('resource')) {
+    const path = new URL(entry.name).pathname
+    const extension = path.includes('.') ? path.split('.').pop() : 'other'
+    const type = { js: 'script', mjs: 'script', css: 'css', wasm: 'wasm', png: 'image', svg: 'image', woff: 'font', woff2: 'font' }[extension] || 'other'
+    const bucket = resources[type] || (resources[type] = { count: 0, transferBytes: 0, decodedBytes: 0 })
+    bucket.count += 1
+    bucket.transferBytes += entry.transferSize
+    bucket.decodedBytes += entry.decodedBodySize
+  }
+  return {
+    navigation: navigation ? {
+      responseEnd: navigation.responseEnd,
+      domContentLoaded: navigation.domContentLoadedEventEnd,
+      load: navigation.loadEventEnd,
+      transferBytes: navigation.transferSize
+    } : null,
+    appStartup: measure('haisosa:startup'),
+    wasmPreload: measure('haisosa:wasm-preload'),
+    clickAt: window.__startupProbeClickAt,
+    resources
+  }
+}"""
+
+
+def union_duration(intervals) -> float:
+    """区間の和集合の長さ（ネスト・重複したイベントを二重に数えない）"""
+    total = 0.0
+    end = None
+    start = None
+    for begin, finish in sorted(intervals):
+        if end is None or begin > end:
+            if end is not None:
+                total += end - start
+            start, end = begin, finish
+        else:
+            end = max(end, finish)
+    if end is not None:
+        total += end - start
+    return total
+
+
+def parse_trace(trace: bytes) -> dict:
+    """トレースからスクリプト評価時間とWASMのコンパイル時間（ms）を求める"""
+    data = json.loads(trace)
+    events = data["traceEvents"] if isinstance(data, dict) else data
+
+    script = {}
+    wasm = {}
+    for event in events:
+        if event.get("ph") != "X" or "dur" not in event:
+            continue
+        name = event.get("name", "")
+        key = (event.get("pid"), event.get("tid"))
+        interval = (event["ts"], event["ts"] + event["dur"])
+        if name in SCRIPT_EVENTS:
+            script.setdefault(key, []).append(interval)
+        elif "wasm" in event.get("cat", "") or "wasm" in name.lower():
+            wasm.setdefault(key, []).append(interval)
+
+    # トレースの時間はマイクロ秒
+    return {
+        "scriptEvaluation": sum(union_duration(v) for v in script.values()) / 1000,
+        "wasmCompile": sum(union_duration(v) for v in wasm.values()) / 1000,
+    }
+
+
+async def measure_run(browser, context, url: str, cpu_throttle: float, trace: bool) -> dict:
+    """1回分の起動を計測"""
+    page = await context.new_page()
+    if cpu_throttle > 1:
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": cpu_throttle})
+
+    if trace:
+        await browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+    try:
+        await page.goto(url, wait_until="commit", timeout=DEFAULT_TIMEOUT)
+        ready = await page.wait_for_function(START_BUTTON_READY, timeout=DEFAULT_TIMEOUT, polling="raf")
+        start_button_ready = await ready.json_value()
+
+        await page.evaluate(RECORD_CLICK)
+        await page.get_by_role("button", name=START_BUTTON_TEXT).first.click()
+        dealt = await page.wait_for_function(FIRST_DEAL_RENDERED, timeout=DEFAULT_TIMEOUT, polling="raf")
+        first_deal_rendered = await dealt.json_value()
+
+        timings = await page.evaluate(COLLECT_TIMINGS)
+    finally:
+        trace_data = await browser.stop_tracing() if trace else None
+        await page.close()
+
+    result = {
+        "navigation": timings["navigation"],
+        "appStartup": timings["appStartup"],
+        "startButtonReady": start_button_ready,
+        "firstDeal": first_deal_rendered - timings["clickAt"] if timings["clickAt"] is not None else None,
+        "wasmPreload": timings["wasmPreload"],
+        "resources": timings["resources"],
+    }
+    if trace_data:
+        result.update(parse_trace(trace_data))
+    return result
+
+
+async def run_benchmark(url: str, runs: int, headless: bool = True, cpu_throttle: float = 1.0,
+                        trace: bool = True, modes=("cold", "warm")) -> dict:
+    """
+    コールド・ウォームをそれぞれ runs 回計測し、{"cold": [...], "warm": [...]} を返す
+
+    例:
+        results = asyncio.run(run_benchmark("http://localhost:4173/haisosa-mahjong/", 5))
+        print(summarize(results["cold"])["startButtonReady"]["median"])
+    """
+    results = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            if "cold" in modes:
+                results["cold"] = []
+                for i in range(runs):
+                    # BrowserContextごとにHTTPキャッシュ・コードキャッシュが分かれる
+                    context = await browser.new_context()
+                    try:
+                        results["cold"].append(await measure_run(browser, context, url, cpu_throttle, trace))
+                    finally:
+                        await context.close()
+                    print(f"  cold {i + 1}/{runs}", file=sys.stderr)
+
+            if "warm" in modes:
+                results["warm"] = []
+                context = await browser.new_context()
+                try:
+                    # キャッシュを温めるための1回目は集計しない
+                    await measure_run(browser, context, url, cpu_throttle, False)
+                    for i in range(runs):
+                        results["warm"].append(await measure_run(browser, context, url, cpu_throttle, trace))
+                        print(f"  warm {i + 1}/{runs}", file=sys.stderr)
+                finally:
+                    await context.close()
+        finally:
+            await browser.close()
+    return results
+
+
+def flatten(run: dict) -> dict:
+    """1回分の結果を「指標名 → 数値」に平らにする"""
+    metrics = {}
+    for name in ("startButtonReady", "firstDeal", "appStartup", "wasmPreload", "scriptEvaluation", "wasmCompile"):
+        if run.get(name) is not None:
+            metrics[name] = run[name]
+    for name, value in (run.get("navigation") or {}).items():
+        metrics[f"navigation.{name}"] = value
+    for kind, bucket in run.get("resources", {}).items():
+        metrics[f"resources.{kind}.count"] = bucket["count"]
+        metrics[f"resources.{kind}.transferBytes"] = bucket["transferBytes"]
+    return metrics
+
+
+def summarize(runs: list) -> dict:
+    """指標ごとの中央値・平均・最小・最大・p90"""
+    values = {}
+    for run in runs:
+        for name, value in flatten(run).items():
+            values.setdefault(name, []).append(value)
+
+    summary = {}
+    for name in sorted(values):
+        samples = sorted(values[name])
+        summary[name] = {
+            "median": statistics.median(samples),
+            "mean": statistics.fmean(samples),
+            "min": samples[0],
+            "max": samples[-1],
+            "p90": samples[min(len(samples) - 1, int(len(samples) * 0.9))],
+            "samples": len(samples),
+        }
+    return summary
+
+
+def git_revision() -> str:
+    """計測したコミット（作業ツリーに変更があれば -dirty を付ける）"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_bundle_stats(path: str):
+    """vite build が書き出す dist/bundle-stats.json の合計値（ファイルがなければ None）"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        stats = json.load(f)
+    return {"initial": stats["initial"], "total": stats["total"]}
+
+
+def print_summary(report: dict):
+    """モードごとの主要な指標を表示"""
+    print("=" * 78)
+    print(f" 起動時間ベンチマーク  {report['url']}  ({report['revision']}, CPU x{report['cpuThrottle']})")
+    print("=" * 78)
+    rows = [
+        ("開始ボタンが押せるまで", "startButtonReady", "ms"),
+        ("配牌の表示まで（クリックから）", "firstDeal", "ms"),
+        ("アプリの表示まで", "appStartup", "ms"),
+        ("DOMContentLoaded", "navigation.domContentLoaded", "ms"),
+        ("load", "navigation.load", "ms"),
+        ("スクリプト評価", "scriptEvaluation", "ms"),
+        ("WASMコンパイル", "wasmCompile", "ms"),
+        ("WASMの先読み", "wasmPreload", "ms"),
+        ("JSの転送量", "resources.script.transferBytes", "B"),
+        ("リクエスト数（画像）", "resources.image.count", ""),
+    ]
+    for mode, summary in report["summary"].items():
+        print(f" [{mode}] {report['runs']}回")
+        for label, key, unit in rows:
+            if key not in summary:
+                continue
+            s = summary[key]
+            print(f"   {label:<24} 中央値 {s['median']:>10.1f}{unit:<2}  p90 {s['p90']:>10.1f}{unit:<2}  "
+                  f"最小 {s['min']:>10.1f}{unit}")
+    if report.get("bundle"):
+        initial = report["bundle"]["initial"]
+        total = report["bundle"]["total"]
+        print(f" バンドル: 初期 {initial['bytes'] / 1024:.1f} kB (gzip {initial['gzipBytes'] / 1024:.1f} kB)"
+              f" / 全体 {total['bytes'] / 1024:.1f} kB (gzip {total['gzipBytes'] / 1024:.1f} kB)")
+
+
+def print_comparison(previous: dict, report: dict):
+    """以前の結果との中央値の差を表示"""
+    print("-" * 78)
+    print(f" 比較: {previous.get('revision', '?')} → {report['revision']}（中央値）")
+    for mode, summary in report["summary"].items():
+        before = previous.get("summary", {}).get(mode, {})
+        for key in sorted(summary):
+            if key not in before:
+                continue
+            old = before[key]["median"]
+            new = summary[key]["median"]
+            ratio = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+            print(f"   [{mode}] {key:<36} {old:>12.1f} → {new:>12.1f}  {ratio}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='起動時間ベンチマーク')
+    parser.add_argument('url', nargs='?', default='http://localhost:4173/haisosa-mahjong/',
+                       help='計測対象のURL（本番ビルドの npm run preview を推奨）')
+    parser.add_argument('--runs', type=int, default=5,
+                       help='コールド・ウォームそれぞれの計測回数')
+    parser.add_argument('--modes', nargs='+', choices=['cold', 'warm'], default=['cold', 'warm'],
+                       help='計測するモード')
+    parser.add_argument('--cpu-throttle', type=float, default=1.0,
+                       help='CPUの速度低下率（4 で低性能スマートフォン相当）')
+    parser.add_argument('--no-trace', action='store_true',
+                       help='トレースを取得しない（スクリプト評価時間・WASMコンパイル時間を計測しない）')
+    parser.add_argument('--bundle-stats', default=DEFAULT_BUNDLE_STATS,
+                       help='vite build が出力した bundle-stats.json のパス')
+    parser.add_argument('--output',
+                       help='結果のJSONの出力先')
+    parser.add_argument('--compare',
+                       help='比較する以前の結果のJSON')
+    parser.add_argument('--headed', action='store_true',
+                       help='ブラウザを表示して実行')
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = await run_benchmark(
+        args.url, args.runs, headless=not args.headed, cpu_throttle=args.cpu_throttle,
+        trace=not args.no_trace, modes=args.modes
+    )
+    report = {
+        "url": args.url,
+        "revision": git_revision(),
+        "runs": args.runs,
+        "cpuThrottle": args.cpu_throttle,
+        "summary": {mode: summarize(runs) for mode, runs in results.items()},
+        "bundle": load_bundle_stats(args.bundle_stats),
+        "results": results,
+        "elapsedSec": time.perf_counter() - started,
+    }
+
+    print_summary(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(json.load(f), report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f" 結果: {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
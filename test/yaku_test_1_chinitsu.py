@@ -9,6 +9,92 @@
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
+from deal_fixture import load_test_deal
+from game_state import open_four_player_game, try_wait_for_state, wait_for_state
+
+async def run_chinitsu_ryanpeikou(page, base_url: str) -> bool:
+    """清一色・リャンペーコー役のテスト（起動済みのページ上で実行するシナリオ本体）"""
+    try:
+        print(" 清一色・リャンペーコー役テストを開始...")
+        # 4人対戦画面を開き、配牌完了まで待機
+        await open_four_player_game(page, base_url)
+        
+        # テスト用配牌を直接適用（清一色・リャンペーコー形、8pツモで完成）
+        await load_test_deal(page, [
+            ("2p 3p 4p 2p 3p 4p 5p 6p 7p 5p 6p 7p 8p", "8p 8p 8p 8p"),
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 2w 3w 4w", "1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d"),  # プレイヤー2
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 2w 3w 4w", "1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d"),  # プレイヤー3
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 2w 3w 4w", "1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d"),  # プレイヤー4
+        ])
+        
+        print("✅ テストモード開始完了")
+        
+        # 即リーチ宣言（配牌即リーチ）
+        riichi_button = page.get_by_role("button", name="リーチ")
+        if await try_wait_for_state(page, "riichi_available", 5000) and await riichi_button.is_visible():
+            print(" 配牌即リーチを宣言...")
+            await riichi_button.click()
+            print("✅ リーチ宣言完了（ダブルリーチ狙い）")
+            
+            # 8筒を捨てる（リーチ後の自動打牌）
+            # 記録では8筒を最初にクリックしているので、それに合わせる
+            tile_8p = page.get_by_role("button", name="8筒").first
+            if await tile_8p.is_visible():
+                print(" 8筒を捨てます...")
+                await tile_8p.click()
+                await wait_for_state(page, "cpu_turn")
+                print("✅ 8筒打牌完了")
+            
+            # CPUのターンが一巡して自分のツモ番が来るまで待機（一発ツモ）
+            max_attempts = 3
+            for attempt in range(max_attempts):
+                print(f" ツモボタン確認 (試行 {attempt + 1}/{max_attempts})...")
+                
+                tsumo_button = page.get_by_role("button", name="ツモ")
+                await try_wait_for_state(page, "human_turn", 20000)
+                if await try_wait_for_state(page, "tsumo_available", 3000) and await tsumo_button.is_visible():
+                    print("✅ ツモボタンが表示されました！")
+                    
+                    # ツモを実行
+                    print(" ツモを実行...")
+                    await tsumo_button.click()
+                    await try_wait_for_state(page, "win_modal_open", 5000)
+                    
+                    # Win Modal確認と役の検証
+                    win_modal = page.locator('.modal-container, .v-dialog')
+                    if await win_modal.is_visible():
+                        print("✅ Win Modalが表示されました")
+                        
+                        # 役の確認
+                        await verify_yaku(page, win_modal)
+                        
+                        # スクリーンショット保存
+                        import os
+                        os.makedirs('test/screenshots', exist_ok=True)
+                        await page.screenshot(path='test/screenshots/yaku_test_1_chinitsu.png')
+                        print(" 清一色・リャンペーコー役のスクリーンショットを保存")
+                        
+                        return True
+                    else:
+                        print("❌ Win Modalが表示されていません")
+                        break
+                else:
+                    if attempt < max_attempts - 1:
+                        print(" 次のツモを待機中...")
+                        await try_wait_for_state(page, "cpu_turn", 20000)
+                    else:
+                        print("❌ ツモボタンが表示されませんでした")
+                        break
+        else:
+            print("❌ リーチボタンが見つかりません")
+            
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return False
+
 
 async def test_chinitsu_ryanpeikou(base_url: str, headless: bool = True):
     """清一色・リャンペーコー役のテスト"""
@@ -21,147 +107,9 @@ async def test_chinitsu_ryanpeikou(base_url: str, headless: bool = True):
         page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
         
         try:
-            print(" 清一色・リャンペーコー役テストを開始...")
-            await page.goto(base_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # 4人対戦開始
-            start_button = page.get_by_role("button", name="人対戦を開始")
-            await start_button.click()
-            await page.wait_for_timeout(2000)
-            
-            # ページリロード
-            await page.reload()
-            await page.wait_for_timeout(2000)
-            
-            # テストモック起動
-            test_mock_button = page.get_by_role("button", name="テストモック起動")
-            await test_mock_button.click()
-            await page.wait_for_timeout(1000)
-            
-            # 手牌設定（清一色・リャンペーコー形）13枚
-            # 234p 234p 567p 567p 8p（配牌13枚、8pツモで完成）
-            hand_textbox = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await hand_textbox.click()
-            await hand_textbox.fill("2p 3p 4p 2p 3p 4p 5p 6p 7p 5p 6p 7p 8p")
-            
-            # ツモ牌設定（8pでツモ上がり）
-            draw_textbox = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await draw_textbox.click()
-            await draw_textbox.fill("8p 8p 8p 8p")
-            
-            # 他のプレイヤーの手牌設定（CPUが正常に動作するように）
-            # プレイヤー2
-            await page.get_by_role("tab", name="プレイヤー2").click()
-            await page.wait_for_timeout(500)
-            player2_hand = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await player2_hand.click()
-            await player2_hand.fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 2w 3w 4w")
-            player2_draw = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await player2_draw.click()
-            await player2_draw.fill("1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d")
-            
-            # プレイヤー3
-            await page.get_by_role("tab", name="プレイヤー3").click()
-            await page.wait_for_timeout(500)
-            player3_hand = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await player3_hand.click()
-            await player3_hand.fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 2w 3w 4w")
-            player3_draw = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await player3_draw.click()
-            await player3_draw.fill("1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d")
-            
-            # プレイヤー4
-            await page.get_by_role("tab", name="プレイヤー4").click()
-            await page.wait_for_timeout(500)
-            player4_hand = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await player4_hand.click()
-            await player4_hand.fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 2w 3w 4w")
-            player4_draw = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await player4_draw.click()
-            await player4_draw.fill("1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d 1d 2d 3d")
-            
-            # プレイヤー1に戻る
-            await page.get_by_role("tab", name="プレイヤー1").click()
-            await page.wait_for_timeout(500)
-            
-            # テストモード開始
-            start_test_button = page.get_by_role("button", name="テストモード開始")
-            await start_test_button.click()
-            await page.wait_for_timeout(3000)
-            
-            print("✅ テストモード開始完了")
-            
-            # 即リーチ宣言（配牌即リーチ）
-            riichi_button = page.get_by_role("button", name="リーチ")
-            if await riichi_button.is_visible():
-                print(" 配牌即リーチを宣言...")
-                await riichi_button.click()
-                await page.wait_for_timeout(2000)
-                print("✅ リーチ宣言完了（ダブルリーチ狙い）")
-                
-                # 8筒を捨てる（リーチ後の自動打牌）
-                # 記録では8筒を最初にクリックしているので、それに合わせる
-                tile_8p = page.get_by_role("button", name="8筒").first
-                if await tile_8p.is_visible():
-                    print(" 8筒を捨てます...")
-                    await tile_8p.click()
-                    await page.wait_for_timeout(2000)
-                    print("✅ 8筒打牌完了")
-                
-                # CPUのターンを短縮して一発成立
-                await page.wait_for_timeout(3000)
-                
-                # ツモボタンが表示されるまで待機（一発ツモ）
-                max_attempts = 3
-                for attempt in range(max_attempts):
-                    print(f" ツモボタン確認 (試行 {attempt + 1}/{max_attempts})...")
-                    
-                    tsumo_button = page.get_by_role("button", name="ツモ")
-                    if await tsumo_button.is_visible():
-                        print("✅ ツモボタンが表示されました！")
-                        
-                        # ツモを実行
-                        print(" ツモを実行...")
-                        await tsumo_button.click()
-                        await page.wait_for_timeout(3000)
-                        
-                        # Win Modal確認と役の検証
-                        win_modal = page.locator('.modal-container, .v-dialog')
-                        if await win_modal.is_visible():
-                            print("✅ Win Modalが表示されました")
-                            
-                            # 役の確認
-                            await verify_yaku(page, win_modal)
-                            
-                            # スクリーンショット保存
-                            import os
-                            os.makedirs('test/screenshots', exist_ok=True)
-                            await page.screenshot(path='test/screenshots/yaku_test_1_chinitsu.png')
-                            print(" 清一色・リャンペーコー役のスクリーンショットを保存")
-                            
-                            return True
-                        else:
-                            print("❌ Win Modalが表示されていません")
-                            break
-                    else:
-                        if attempt < max_attempts - 1:
-                            print(" 次のツモを待機中...")
-                            await page.wait_for_timeout(3000)
-                        else:
-                            print("❌ ツモボタンが表示されませんでした")
-                            break
-            else:
-                print("❌ リーチボタンが見つかりません")
-                
-        except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
-            
+            return await run_chinitsu_ryanpeikou(page, base_url)
         finally:
             await browser.close()
-    
     return False
 
 async def verify_yaku(page, win_modal):
@@ -9,6 +9,89 @@
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
+from deal_fixture import load_test_deal
+from game_state import get_game_state, open_four_player_game, try_wait_for_state, wait_for_state
+
+async def run_sankantsu_sanankou(page, base_url: str) -> bool:
+    """三槓子・三暗刻・小三元役のテスト（起動済みのページ上で実行するシナリオ本体）"""
+    try:
+        print(" 三槓子・三暗刻・小三元役テストを開始...")
+        # 4人対戦画面を開き、配牌完了まで待機
+        await open_four_player_game(page, base_url)
+        
+        # テスト用配牌を直接適用（三槓子形: 白白白 發發發 東東東 111m 中）
+        await load_test_deal(page, [
+            ("haku haku haku hatsu hatsu hatsu ton ton ton 1m 1m 1m chun", "1p ton hatsu chun"),  # 1pツモ→東暗槓→發暗槓→中でリンシャンツモ
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 4p 4p 4p haku", "5p 5p 5p"),  # プレイヤー2（白を捨てる）
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 4p 4p 4p 1d", "5p 5p 5p"),  # プレイヤー3
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 4p 4p 4p 1d", "5p 5p 5p"),  # プレイヤー4
+        ])
+        
+        
+        print("✅ テストモード開始完了")
+        
+        # 最初に1pを捨てる
+        tile_1p = page.get_by_role("button", name="1筒")
+        if await tile_1p.is_visible():
+            print(" 1筒を捨てます...")
+            await tile_1p.click()
+            await wait_for_state(page, "cpu_turn")
+            
+            print("✅ 1筒打牌完了")
+        
+        # CPUのターンを待つ（プレイヤー2が白を捨てるまで）
+        # 白のミンカンボタンを待つ
+        print(" 白のミンカンを待機...")
+        minkan_button = page.get_by_role("button", name="カン")
+        if await try_wait_for_state(page, "kan_available", 20000) and await minkan_button.is_visible():
+            print(" 白のミンカンを実行...")
+            await minkan_button.click()
+            await try_wait_for_state(page, "human_turn", 5000)
+            print("✅ 白のミンカン完了")
+        
+        # 1回目の暗槓（東）- tonツモ後
+        success = await perform_ankan_new(page, 1)
+        if not success:
+            print("❌ 1回目の暗槓に失敗")
+            return False
+        
+        # 2回目の暗槓（發）- hatsuツモ後
+        success = await perform_ankan_new(page, 2)
+        if not success:
+            print("❌ 2回目の暗槓に失敗")
+            return False
+        
+        # リンシャンツモ（中でツモアガリ）
+        print(" リンシャンツモ（中）を実行...")
+        tsumo_button = page.get_by_role("button", name="ツモ")
+        if await try_wait_for_state(page, "tsumo_available", 5000) and await tsumo_button.is_visible():
+            print("✅ ツモボタンが表示されました！")
+            await tsumo_button.click()
+            await try_wait_for_state(page, "win_modal_open", 5000)
+            
+            # Win Modal確認と役の検証
+            win_modal = page.locator('.modal-container, .v-dialog')
+            if await win_modal.is_visible():
+                print("✅ Win Modalが表示されました")
+                
+                # 役の確認
+                await verify_yaku(page, win_modal)
+                
+                return True
+            else:
+                print("❌ Win Modalが表示されていません")
+                return False
+        else:
+            print("❌ ツモボタンが表示されませんでした")
+            return False
+                    
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return False
+
 
 async def test_sankantsu_sanankou(base_url: str, headless: bool = True):
     """三槓子・三暗刻・小三元役のテスト"""
@@ -21,141 +104,9 @@ async def test_sankantsu_sanankou(base_url: str, headless: bool = True):
         page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
         
         try:
-            print(" 三槓子・三暗刻・小三元役テストを開始...")
-            await page.goto(base_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # 4人対戦開始
-            start_button = page.get_by_role("button", name="人対戦を開始")
-            await start_button.click()
-            await page.wait_for_timeout(2000)
-            
-            # ページリロード
-            await page.reload()
-            await page.wait_for_timeout(2000)
-            
-            # テストモック起動
-            test_mock_button = page.get_by_role("button", name="テストモック起動")
-            await test_mock_button.click()
-            await page.wait_for_timeout(1000)
-            
-            # 手牌設定（三槓子形）13枚: 白白白 發發發 東東東 111m 中
-            hand_textbox = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await hand_textbox.click()
-            await hand_textbox.fill("haku haku haku hatsu hatsu hatsu ton ton ton 1m 1m 1m chun")
-            
-            # ツモ牌設定（1pツモ→白ミンカン用の白→東暗槓→發暗槓→中でリンシャンツモ）
-            draw_textbox = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await draw_textbox.click()
-            await draw_textbox.fill("1p ton hatsu chun")
-            
-            # 他のプレイヤーの手牌設定（CPUが正常に動作するように）
-            # プレイヤー2
-            await page.get_by_role("tab", name="プレイヤー2").click()
-            await page.wait_for_timeout(500)
-            player2_hand = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await player2_hand.click()
-            await player2_hand.fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 4p 4p 4p haku")
-            player2_draw = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await player2_draw.click()
-            await player2_draw.fill("5p 5p 5p")
-            
-            # プレイヤー3
-            await page.get_by_role("tab", name="プレイヤー3").click()
-            await page.wait_for_timeout(500)
-            player3_hand = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await player3_hand.click()
-            await player3_hand.fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 4p 4p 4p 1d")
-            player3_draw = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await player3_draw.click()
-            await player3_draw.fill("5p 5p 5p")
-            
-            # プレイヤー4
-            await page.get_by_role("tab", name="プレイヤー4").click()
-            await page.wait_for_timeout(500)
-            player4_hand = page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)")
-            await player4_hand.click()
-            await player4_hand.fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 4p 4p 4p 1d")
-            player4_draw = page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)")
-            await player4_draw.click()
-            await player4_draw.fill("5p 5p 5p")
-            
-            # テストモード開始
-            start_test_button = page.get_by_role("button", name="テストモード開始")
-            await start_test_button.click()
-            await page.wait_for_timeout(3000)
-            
-            
-            print("✅ テストモード開始完了")
-            
-            # 最初に1pを捨てる
-            tile_1p = page.get_by_role("button", name="1筒")
-            if await tile_1p.is_visible():
-                print(" 1筒を捨てます...")
-                await tile_1p.click()
-                await page.wait_for_timeout(2000)
-                
-                print("✅ 1筒打牌完了")
-            
-            # CPUのターンを待つ（プレイヤー2が白を捨てるまで）
-            await page.wait_for_timeout(5000)
-            
-            # 白のミンカンボタンを待つ
-            print(" 白のミンカンを待機...")
-            minkan_button = page.get_by_role("button", name="カン")
-            if await minkan_button.is_visible():
-                print(" 白のミンカンを実行...")
-                await minkan_button.click()
-                await page.wait_for_timeout(2000)
-                print("✅ 白のミンカン完了")
-            
-            # 1回目の暗槓（東）- tonツモ後
-            success = await perform_ankan_new(page, 1)
-            if not success:
-                print("❌ 1回目の暗槓に失敗")
-                return False
-            
-            # 2回目の暗槓（發）- hatsuツモ後
-            success = await perform_ankan_new(page, 2)
-            if not success:
-                print("❌ 2回目の暗槓に失敗")
-                return False
-            
-            # CPUのターンを待つ
-            await page.wait_for_timeout(3000)
-            
-            # リンシャンツモ（中でツモアガリ）
-            print(" リンシャンツモ（中）を実行...")
-            tsumo_button = page.get_by_role("button", name="ツモ")
-            if await tsumo_button.is_visible():
-                print("✅ ツモボタンが表示されました！")
-                await tsumo_button.click()
-                await page.wait_for_timeout(3000)
-                
-                # Win Modal確認と役の検証
-                win_modal = page.locator('.modal-container, .v-dialog')
-                if await win_modal.is_visible():
-                    print("✅ Win Modalが表示されました")
-                    
-                    # 役の確認
-                    await verify_yaku(page, win_modal)
-                    
-                    return True
-                else:
-                    print("❌ Win Modalが表示されていません")
-                    return False
-            else:
-                print("❌ ツモボタンが表示されませんでした")
-                return False
-                        
-        except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
-            
+            return await run_sankantsu_sanankou(page, base_url)
         finally:
             await browser.close()
-    
     return False
 
 async def perform_ankan(page, tile_name, kan_number):
@@ -163,9 +114,10 @@ async def perform_ankan(page, tile_name, kan_number):
     print(f" {kan_number}回目の暗槓（{tile_name}）を実行...")
     
     ankan_button = page.get_by_role("button", name="暗カン")
-    if await ankan_button.is_visible():
+    if await try_wait_for_state(page, "ankan_available", 5000) and await ankan_button.is_visible():
+        state = await get_game_state(page)
         await ankan_button.click()
-        await page.wait_for_timeout(2000)
+        await try_wait_for_state(page, "dora_changed", 5000, doraCount=state["doraCount"])
         print(f"✅ {kan_number}回目の暗槓完了")
         return True
     else:
@@ -178,9 +130,10 @@ async def perform_ankan_new(page, kan_number):
     
     # まず「カン」ボタンをクリック
     kan_button = page.get_by_role("button", name="カン")
-    if await kan_button.is_visible():
+    if await try_wait_for_state(page, "ankan_available", 5000) and await kan_button.is_visible():
+        state = await get_game_state(page)
         await kan_button.click()
-        await page.wait_for_timeout(2000)
+        await try_wait_for_state(page, "dora_changed", 5000, doraCount=state["doraCount"])
         
         print(f"✅ {kan_number}回目の暗槓完了")
         return True
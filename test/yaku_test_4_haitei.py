@@ -9,134 +9,127 @@
 import asyncio
 import argparse
 from playwright.async_api import async_playwright
+from deal_fixture import load_test_deal
+from game_state import get_game_state, wait_for_state
 
-async def test_haitei_junchan_sanshoku(base_url: str, headless: bool = True):
-    """ハイテイツモ・純チャン・三色同刻テスト（最新レコード通り）"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        page = await browser.new_page()
+async def run_haitei_junchan_sanshoku(page, base_url: str) -> bool:
+    """ハイテイツモ・純チャン・三色同刻テスト（最新レコード通り）（起動済みのページ上で実行するシナリオ本体）"""
+    try:
+        print(" ハイテイツモ・純チャン・三色同刻テストを開始...")
         
-        # コンソールログを出力
-        page.on("console", lambda msg: print(f" CONSOLE: {msg.text}"))
-        page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
+        # 最新レコード通りに実行
+        await page.goto(f"{base_url}/#/")
+        await page.get_by_role("button", name="人対戦を開始").click()
+        await wait_for_state(page, "ready")
+        await load_test_deal(page, [
+            ("1m 1m 1m 1p 1p 1p 1s 1s 1s 7m 8m 9m 9p", "3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p"),
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 1w 2w 2w", "3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w"),
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 1w 2w 2w", "3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w"),
+            ("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 1w 2w 2w", "3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w"),
+        ])
+        state = await get_game_state(page)
+        await page.get_by_role("button", name="西").click()
+        await wait_for_state(page, "wall_changed", wallRemaining=state["wallRemaining"])
+        
+        print(" 西をツモ切りしてハイテイまで進める...")
+        
+        # 最新レコード通り: 最初は drawn-tile-bottom をクリック
+        state = await wait_for_state(page, "human_turn")
+        await page.locator(".drawn-tile.drawn-tile-bottom").click()
+        await wait_for_state(page, "wall_changed", wallRemaining=state["wallRemaining"])
+        print("   1回目: drawn-tile-bottom をクリック")
         
+        # その後16回 .drawn-tile > .mahjong-tile をクリック
+        for i in range(16):
+            try:
+                state = await wait_for_state(page, "human_turn")
+                await page.locator(".drawn-tile > .mahjong-tile").click()
+                print(f"   {i+2}回目: drawn-tile > mahjong-tile をクリック")
+                await wait_for_state(page, "wall_changed", wallRemaining=state["wallRemaining"])
+            except Exception as e:
+                print(f"   {i+2}回目: クリックエラー - {e}")
+                break
+        
+        print(" ハイテイツモ（9p）を実行...")
+        
+        # ツモボタンをクリック
         try:
-            print(" ハイテイツモ・純チャン・三色同刻テストを開始...")
-            
-            # 最新レコード通りに実行
-            await page.goto(f"{base_url}/#/")
-            await page.get_by_role("button", name="人対戦を開始").click()
-            await page.get_by_role("button", name="テストモック起動").click()
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").click()
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").fill("1m 1m 1m 1p 1p 1p 1s 1s 1s 7m 8m 9m 9p")
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").click()
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").fill("3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p")
-            await page.get_by_role("tab", name="プレイヤー1(自分)").click()
-            await page.get_by_role("tab", name="プレイヤー2").click()
-            await page.wait_for_timeout(2000)
-
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").click()
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 1w 2w 2w ")
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").click()
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").fill("3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w")
-            await page.get_by_role("tab", name="プレイヤー3").click()
-            await page.wait_for_timeout(2000)
-
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").click()
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 1w 2w 2w")
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").click()
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").fill("3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w")
-            await page.get_by_role("tab", name="プレイヤー4").click()
-            await page.wait_for_timeout(2000)
-
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").click()
-            await page.get_by_role("textbox", name="手牌 (13枚または14枚) 手牌 (13枚または14枚)").fill("1m 2m 3m 1p 2p 3p 1s 2s 3s 1w 1w 2w 2w ")
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").click()
-            await page.get_by_role("textbox", name="ツモ牌 (順番通り) ツモ牌 (順番通り)").fill("3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 9p 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w 3w")
-            await page.get_by_role("button", name="テストモード開始").click()
-            await page.get_by_role("button", name="西").click()
-            
-            print(" 西をツモ切りしてハイテイまで進める...")
+            await wait_for_state(page, "tsumo_available", 20000)
+            await page.get_by_role("button", name="ツモ").click()
+            print("✅ ツモボタンをクリックしました")
+            await wait_for_state(page, "win_modal_open", 5000)
+        except Exception as e:
+            print(f"❌ ツモボタンクリックエラー: {e}")
+            return False
+        
+        # Win Modal確認
+        win_modal = page.locator('.modal-container, .v-dialog')
+        if await win_modal.is_visible():
+            print("✅ Win Modalが表示されました")
             
-            # 最新レコード通り: 最初は drawn-tile-bottom をクリック
-            await page.locator(".drawn-tile.drawn-tile-bottom").click()
-            print("   1回目: drawn-tile-bottom をクリック")
+            # 役一覧を取得
+            yaku_info = await get_yaku_list(page, win_modal)
+            print(" 検出された役:")
+            for yaku in yaku_info:
+                print(f"   - {yaku}")
             
-            # その後16回 .drawn-tile > .mahjong-tile をクリック
-            for i in range(16):
-                try:
-                    await page.locator(".drawn-tile > .mahjong-tile").click()
-                    print(f"   {i+2}回目: drawn-tile > mahjong-tile をクリック")
-                    await page.wait_for_timeout(200)  # 短い待機
-                except Exception as e:
-                    print(f"   {i+2}回目: クリックエラー - {e}")
-                    break
+            # 期待される役をチェック
+            expected_yaku = ["純全帯么九", "三色同刻", "海底摸月"]
+            found_yaku = []
             
-            print(" ハイテイツモ（9p）を実行...")
+            for expected in expected_yaku:
+                found = any(expected in yaku for yaku in yaku_info)
+                if found:
+                    found_yaku.append(expected)
+                    print(f"✅ {expected}: 検出")
+                else:
+                    print(f"❌ {expected}: 未検出")
             
-            # ツモボタンをクリック
-            try:
-                await page.get_by_role("button", name="ツモ").click()
-                print("✅ ツモボタンをクリックしました")
-                await page.wait_for_timeout(3000)
-            except Exception as e:
-                print(f"❌ ツモボタンクリックエラー: {e}")
-                return False
+            # スクリーンショット保存
+            import os
+            os.makedirs('test/screenshots', exist_ok=True)
+            await page.screenshot(path='test/screenshots/yaku_test_4_haitei.png')
+            print(" ハイテイツモテストのスクリーンショットを保存")
             
-            # Win Modal確認
-            win_modal = page.locator('.modal-container, .v-dialog')
-            if await win_modal.is_visible():
-                print("✅ Win Modalが表示されました")
-                
-                # 役一覧を取得
-                yaku_info = await get_yaku_list(page, win_modal)
-                print(" 検出された役:")
-                for yaku in yaku_info:
-                    print(f"   - {yaku}")
-                
-                # 期待される役をチェック
-                expected_yaku = ["純全帯么九", "三色同刻", "海底摸月"]
-                found_yaku = []
-                
-                for expected in expected_yaku:
-                    found = any(expected in yaku for yaku in yaku_info)
-                    if found:
-                        found_yaku.append(expected)
-                        print(f"✅ {expected}: 検出")
-                    else:
-                        print(f"❌ {expected}: 未検出")
-                
-                # スクリーンショット保存
-                import os
-                os.makedirs('test/screenshots', exist_ok=True)
-                await page.screenshot(path='test/screenshots/yaku_test_4_haitei.png')
-                print(" ハイテイツモテストのスクリーンショットを保存")
-                
-                # 結果判定
-                if len(found_yaku) >= 2:  # 最低2つの役は欲しい
-                    print("✅ テスト成功: 複数の役が検出されました")
-                    if any("海底" in yaku for yaku in found_yaku):
-                        print(" 海底摸月（ハイテイツモ）も正常に検出されています")
-                        return True
-                    else:
-                        print(" 海底摸月が検出されていません（要実装確認）")
-                        return True  # 他の役があれば一応成功とする
+            # 結果判定
+            if len(found_yaku) >= 2:  # 最低2つの役は欲しい
+                print("✅ テスト成功: 複数の役が検出されました")
+                if any("海底" in yaku for yaku in found_yaku):
+                    print(" 海底摸月（ハイテイツモ）も正常に検出されています")
+                    return True
                 else:
-                    print("❌ テスト失敗: 期待される役が不足しています")
-                    return False
+                    print(" 海底摸月が検出されていません（要実装確認）")
+                    return True  # 他の役があれば一応成功とする
             else:
-                print("❌ Win Modalが表示されていません")
+                print("❌ テスト失敗: 期待される役が不足しています")
                 return False
-                
-        except Exception as e:
-            print(f"❌ エラーが発生しました: {e}")
-            import traceback
-            traceback.print_exc()
+        else:
+            print("❌ Win Modalが表示されていません")
+            return False
             
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return False
+
+
+async def test_haitei_junchan_sanshoku(base_url: str, headless: bool = True):
+    """ハイテイツモ・純チャン・三色同刻テスト（最新レコード通り）"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        page = await browser.new_page()
+        
+        # コンソールログを出力
+        page.on("console", lambda msg: print(f" CONSOLE: {msg.text}"))
+        page.on("pageerror", lambda error: print(f"❌ PAGE ERROR: {error}"))
+        
+        try:
+            return await run_haitei_junchan_sanshoku(page, base_url)
         finally:
             await page.close()
             await browser.close()
-    
     return False
 
 async def get_yaku_list(page, win_modal):
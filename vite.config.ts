@@ -1,11 +1,61 @@
 import { fileURLToPath, URL } from 'node:url'
+import { gzipSync } from 'node:zlib'
 
-import { defineConfig } from 'vite'
+import { defineConfig, type Plugin } from 'vite'
 import vue from '@vitejs/plugin-vue'
 import vueDevTools from 'vite-plugin-vue-devtools'
 import wasm from 'vite-plugin-wasm'
 import topLevelAwait from 'vite-plugin-top-level-await'
 
+/**
+ * ビルド結果の各ファイルの大きさ（gzip後を含む）を出力し、dist/bundle-stats.json に書き出す
+ * initial はエントリーから静的に読み込まれるJS・CSS（ホーム画面の表示までに必要なもの）
+ */
+function bundleSizeReport(): Plugin {
+  return {
+    name: 'haisosa-bundle-size-report',
+    apply: 'build',
+    generateBundle(_options, bundle) {
+      const initialFiles = new Set<string>()
+      const visit = (fileName: string) => {
+        const output = bundle[fileName]
+        if (initialFiles.has(fileName) || !output || output.type !== 'chunk') return
+        initialFiles.add(fileName)
+        output.viteMetadata?.importedCss.forEach(css => initialFiles.add(css))
+        output.imports.forEach(visit)
+      }
+      Object.values(bundle).forEach(output => {
+        if (output.type === 'chunk' && output.isEntry) visit(output.fileName)
+      })
+
+      const files = Object.values(bundle).map(output => {
+        const source = output.type === 'chunk' ? output.code : output.source
+        return {
+          fileName: output.fileName,
+          bytes: typeof source === 'string' ? Buffer.byteLength(source) : source.byteLength,
+          gzipBytes: gzipSync(source).byteLength,
+          initial: initialFiles.has(output.fileName)
+        }
+      }).sort((a, b) => b.bytes - a.bytes)
+      const sum = (list: typeof files) => ({
+        bytes: list.reduce((total, file) => total + file.bytes, 0),
+        gzipBytes: list.reduce((total, file) => total + file.gzipBytes, 0)
+      })
+      const report = {
+        initial: sum(files.filter(file => file.initial)),
+        total: sum(files),
+        files
+      }
+
+      this.emitFile({ type: 'asset', fileName: 'bundle-stats.json', source: `${JSON.stringify(report, null, 2)}\n` })
+      const kb = (bytes: number) => `${(bytes / 1024).toFixed(1)} kB`
+      console.log(`\n[bundle-size] initial: ${kb(report.initial.bytes)} (gzip ${kb(report.initial.gzipBytes)}) / total: ${kb(report.total.bytes)} (gzip ${kb(report.total.gzipBytes)})`)
+      for (const file of files.filter(file => file.initial)) {
+        console.log(`[bundle-size]   ${file.fileName}: ${kb(file.bytes)} (gzip ${kb(file.gzipBytes)})`)
+      }
+    }
+  }
+}
 
 // https://vite.dev/config/
 export default defineConfig({
@@ -14,7 +64,14 @@ export default defineConfig({
     vueDevTools(),
     wasm(),
     topLevelAwait(),
+    bundleSizeReport(),
   ],
+  // 受け入れ計算Worker（src/utils/acceptance-worker.ts）・CPU判断Worker（src/utils/cpu-ai-worker.ts）はES Moduleとして出力する
+  // CPU判断Workerは和了判定で riichi-rs-bundlers（WASM）を読み込むため、Worker側にもWASMのプラグインを適用する
+  worker: {
+    format: 'es',
+    plugins: () => [wasm(), topLevelAwait()]
+  },
   optimizeDeps: {
     exclude: ['riichi-rs-bundlers']
   },